@@ -1,10 +1,16 @@
-from typing import Dict, Optional
+import logging
+
+from typing import Dict, List, Optional
+
+from django.db import IntegrityError, transaction
 
 from activitylogs.manager import default_manager
 from constants import user_system
 from event_manager.event import Event
 from event_manager.event_service import EventService
 
+_logger = logging.getLogger('polyaxon.activitylogs')
+
 
 class ActivityLogService(EventService):
     event_manager = default_manager
@@ -12,21 +18,54 @@ class ActivityLogService(EventService):
     def __init__(self):
         self.activity_log_manager = None
 
-    def record_event(self, event: Event) -> Optional[Dict]:
-        if not event.ref_id:
-            return
+    @staticmethod
+    def get_project_id(event: Event) -> Optional[int]:
+        from django.contrib.contenttypes.models import ContentType
+
+        from db.models.projects import Project
+
+        if event.instance_contenttype == ContentType.objects.get_for_model(Project).id:
+            return event.instance_id
+        return event.data.get('project.id')
+
+    @classmethod
+    def get_activity_log_values(cls, event: Event) -> Dict:
         assert event.actor_id is not None
         actor_id = event.data[event.actor_id]
-        return self.activity_log_manager.create(
+        return dict(
             ref=event.ref_id,
             event_type=event.event_type,
             actor_id=actor_id if actor_id != user_system.USER_SYSTEM_ID else None,
             context=event.data,
             created_at=event.datetime,
             object_id=event.instance_id,
-            content_type_id=event.instance_contenttype
+            content_type_id=event.instance_contenttype,
+            project_id=cls.get_project_id(event)
         )
 
+    def record_event(self, event: Event) -> Optional[Dict]:
+        if not event.ref_id:
+            return
+        return self.activity_log_manager.create(**self.get_activity_log_values(event))
+
+    def record_events(self, events: List[Event]) -> None:
+        activity_logs = [self.activity_log_manager.model(**self.get_activity_log_values(event))
+                         for event in events if event.ref_id]
+        if not activity_logs:
+            return
+        try:
+            with transaction.atomic():
+                self.activity_log_manager.bulk_create(activity_logs)
+        except IntegrityError:
+            # An activity log of the batch is not valid anymore, e.g. the actor was deleted
+            for activity_log in activity_logs:
+                try:
+                    with transaction.atomic():
+                        activity_log.save()
+                except IntegrityError:
+                    _logger.warning('Could not record the activity log `%s`',
+                                    activity_log.event_type)
+
     def setup(self) -> None:
         super().setup()
         # Load default event types
@@ -1,14 +1,12 @@
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 
-from django.db.models import Q
-
 import activitylogs
 
 from api.activitylogs.serializers import ActivityLogsSerializer
 from api.endpoint.activitylogs import ActivityLogEndpoint
 from api.endpoint.base import ListEndpoint
-from constants import content_types
+from api.paginator import CountModes, KeysetPagination
 from db.models.projects import Project
 
 
@@ -20,6 +18,8 @@ class HistoryLogsView(ActivityLogEndpoint, ListEndpoint):
     )
     serializer_class = ActivityLogsSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = KeysetPagination
+    count_mode = CountModes.ESTIMATED
 
     def filter_queryset(self, queryset):
         queryset = queryset.filter(actor=self.request.user)
@@ -34,6 +34,8 @@ class ActivityLogsView(ActivityLogEndpoint, ListEndpoint):
     )
     serializer_class = ActivityLogsSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = KeysetPagination
+    count_mode = CountModes.ESTIMATED
 
 
 class ProjectActivityLogsView(ActivityLogsView):
@@ -43,10 +45,6 @@ class ProjectActivityLogsView(ActivityLogsView):
         project_name = self.kwargs['name']
         username = self.kwargs['username']
         project = get_object_or_404(Project, user__username=username, name=project_name)
-        project_id = '{}'.format(project.id)
         # Filter for project/all events
-        queryset = queryset.filter(
-            Q(content_type__model=content_types.PROJECT, context__id=project_id) |
-            Q(**{'context__project.id': project_id})
-        )
+        queryset = queryset.filter(project_id=project.id)
         return super().filter_queryset(queryset=queryset)
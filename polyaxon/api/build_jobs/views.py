@@ -29,7 +29,7 @@ from api.endpoint.base import (
 from api.endpoint.build import BuildEndpoint, BuildResourceEndpoint, BuildResourceListEndpoint
 from api.endpoint.project import ProjectResourceListEndpoint
 from api.filters import OrderingFilter, QueryFilter
-from api.utils.files import stream_file
+from api.utils.files import stream_log_file, stream_log_lines, stream_logs_file
 from api.utils.views.bookmarks_mixin import BookmarkedListMixinView
 from db.models.build_jobs import BuildJob, BuildJobStatus
 from db.redis.heartbeat import RedisHeartBeat
@@ -45,8 +45,8 @@ from event_manager.events.build_job import (
     BUILD_JOB_VIEWED
 )
 from event_manager.events.project import PROJECT_BUILDS_VIEWED
-from libs.archive import archive_logs_file
-from logs_handlers.log_queries.build_job import process_logs
+from libs.logs_query import get_logs_query
+from logs_handlers.log_queries.build_job import fetch_logs, refresh_logs
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import SchedulerCeleryTasks
 from scopes.authentication.internal import InternalAuthentication
@@ -219,16 +219,21 @@ class BuildLogsView(BuildEndpoint, RetrieveEndpoint):
                        actor_id=request.user.id,
                        actor_name=request.user.username)
         job_name = self.build.unique_name
+        query = get_logs_query(request.query_params)
         if self.build.is_done:
             log_path = stores.get_job_logs_path(job_name=job_name, temp=False)
-            log_path = archive_logs_file(
-                log_path=log_path,
-                namepath=job_name)
-        else:
-            process_logs(build=self.build, temp=True)
-            log_path = stores.get_job_logs_path(job_name=job_name, temp=True)
-
-        return stream_file(file_path=log_path, logger=_logger)
+            return stream_logs_file(log_path=log_path,
+                                    namepath=job_name,
+                                    logger=_logger,
+                                    query=query)
+
+        if query and query.is_pod_query:
+            log_lines = fetch_logs(build=self.build,
+                                   tail_lines=query.tail,
+                                   since_seconds=query.since)
+            return stream_log_lines(log_lines=log_lines, filename=job_name)
+        log_path = refresh_logs(build=self.build)
+        return stream_log_file(file_path=log_path, logger=_logger, query=query)
 
 
 class BuildStopView(BuildEndpoint, CreateEndpoint):
@@ -1,11 +1,16 @@
+from typing import Any, Dict
+
 from rest_framework import mixins
 from rest_framework.generics import GenericAPIView
 from rest_framework.serializers import Serializer
 
 from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
 
 import auditor
 
+from api.endpoint import context
+from api.utils.gzip import accepts_gzip
 from scopes.authentication.utils import is_user
 
 
@@ -19,6 +24,8 @@ class BaseEndpoint(mixins.CreateModelMixin,
     CONTEXT_KEYS = ()
     QUERY_CONTEXT_KEYS = ()
     CONTEXT_OBJECTS = ()
+    # Relations of the endpoint's objects to context objects with other names
+    CONTEXT_RELATIONS = {}
     create_serializer_class = None
     _object = None  # This is a memoization for get_object, to avoid accidentally calling twice.
 
@@ -55,6 +62,22 @@ class BaseEndpoint(mixins.CreateModelMixin,
                            actor_name=self.request.user.username)
         return self._object
 
+    def get_context_relations(self) -> Dict[str, Any]:
+        relations = {key: getattr(self, key, None) for key in self.CONTEXT_OBJECTS}
+        relations.update({field: getattr(self, key, None)
+                          for field, key in self.CONTEXT_RELATIONS.items()})
+        return relations
+
+    def share_context(self, obj) -> None:
+        """Shares the loaded context objects with the relations of the endpoint's object,
+        so that the permissions and the views do not load them again.
+        """
+        context.set_related_objects(obj, **self.get_context_relations())
+
+    def check_object_permissions(self, request: HttpRequest, obj) -> None:
+        self.share_context(obj)
+        super().check_object_permissions(request, obj)
+
     def perform_update(self, serializer: Serializer) -> None:
         instance = serializer.save()
         if not self.AUDITOR_EVENT_TYPES:
@@ -145,8 +168,35 @@ class PostEndpoint(object):
 
 
 class ListEndpoint(object):
+    # Views opt in to stream the pages of their large paginators,
+    # a streamed page bypasses `list` and any post processing of its response
+    streaming = False
+
     def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
-        return self.list(request, *args, **kwargs)
+        if not self.streaming:
+            return self.list(request, *args, **kwargs)
+        if self.can_stream(request):
+            response = self.stream_list(request)
+        else:
+            response = self.list(request, *args, **kwargs)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    def can_stream(self, request: HttpRequest) -> bool:
+        """Large paginators stream their pages if the client accepts gzip encoding."""
+        return (self.streaming and
+                hasattr(self.paginator, 'get_streaming_response') and
+                accepts_gzip(request))
+
+    def stream_list(self, request: HttpRequest) -> HttpResponse:
+        """Similar to `list` but the page is read from a server side cursor,
+        and serialized, rendered, and compressed chunk by chunk.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        objects = self.paginator.paginate_queryset_iterator(queryset, request, view=self)
+        return self.paginator.get_streaming_response(
+            objects=objects,
+            serialize=lambda chunk: self.get_serializer(chunk, many=True).data)
 
 
 class RetrieveEndpoint(object):
@@ -1,10 +1,9 @@
-from rest_framework.generics import get_object_or_404
-
 from django.http import HttpRequest
 
 import access
 
 from access.resources import Resources
+from api.endpoint import context
 from api.endpoint.project import ProjectPermission, ProjectResourceEndpoint
 from db.models.build_jobs import BuildJob
 
@@ -15,26 +14,36 @@ class BuildEndpoint(ProjectResourceEndpoint):
     CONTEXT_OBJECTS = ProjectResourceEndpoint.CONTEXT_OBJECTS + ('build',)
     lookup_url_kwarg = 'build_id'
 
-    def _initialize_context(self) -> None:
+    def enrich_queryset(self, queryset):
+        return context.filter_project_resources(queryset=queryset,
+                                                owner_name=self.owner_name,
+                                                project_name=self.project_name)
+
+    def share_context(self, obj) -> None:
+        context.share_project_resource(obj)
+
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
         self.build = self.get_object()
+        self.project = self.build.project
 
 
 class BuildResourceListEndpoint(ProjectResourceEndpoint):
     CONTEXT_KEYS = ProjectResourceEndpoint.CONTEXT_KEYS + ('build_id',)
     CONTEXT_OBJECTS = ProjectResourceEndpoint.CONTEXT_OBJECTS + ('build',)
+    CONTEXT_RELATIONS = {'job': 'build'}
     lookup_url_kwarg = 'build'
 
     def enrich_queryset(self, queryset):
         return queryset.filter(job=self.build)
 
-    def _initialize_context(self) -> None:
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
-        self.build = get_object_or_404(BuildJob,
-                                       id=self.build_id,
-                                       project=self.project)
+        self.build = context.get_project_resource(queryset=BuildJob.objects,
+                                                  owner_name=self.owner_name,
+                                                  project_name=self.project_name,
+                                                  id=self.build_id)
+        self.project = self.build.project
 
 
 class BuildResourcePermission(ProjectPermission):
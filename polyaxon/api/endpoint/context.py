@@ -0,0 +1,109 @@
+from typing import Any, Iterable
+
+from rest_framework.generics import get_object_or_404
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, QuerySet
+
+from db.models.projects import Project
+
+PROJECT_RELATED = ('owner', 'user')
+
+
+def get_path(obj: Model, path: str) -> Any:
+    for field in path.split('__'):
+        obj = getattr(obj, field)
+    return obj
+
+
+def set_related_objects(obj: Model, **related_objects) -> Model:
+    """Sets the already loaded objects on the forward relations of `obj`.
+
+    A related object is only set if it's the object referenced by the relation,
+    this avoids loading again the same row when the relation is accessed.
+    """
+    for field_name, related_obj in related_objects.items():
+        if related_obj is None:
+            continue
+        try:
+            field = obj._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            continue
+        if not (field.many_to_one and isinstance(related_obj, field.related_model)):
+            continue
+        if getattr(obj, field.attname) != related_obj.pk:
+            continue
+        setattr(obj, field_name, related_obj)
+    return obj
+
+
+def share_project(project: Project) -> Project:
+    """The owner of a user's project is the project's user, which is loaded with the project."""
+    owner = project.owner
+    user = project.user
+    if (owner.object_id == user.pk and
+            owner.content_type_id == ContentType.objects.get_for_model(user).id):
+        owner.owner = user
+    return project
+
+
+def is_related_loaded(obj: Model, field_name: str) -> bool:
+    try:
+        return obj._meta.get_field(field_name).is_cached(obj)
+    except FieldDoesNotExist:
+        return False
+
+
+def share_project_resource(obj: Model, project_path: str = 'project') -> Model:
+    """Shares the project of a resource loaded with `filter_project_resources`,
+    with the project's owner and with the resource's group.
+    """
+    parent_path = project_path.rpartition('__')[0]
+    parent = get_path(obj, parent_path) if parent_path else obj
+    project = share_project(parent.project)
+    if is_related_loaded(parent, 'experiment_group') and parent.experiment_group:
+        set_related_objects(parent.experiment_group, project=project)
+    return obj
+
+
+def filter_project(queryset: QuerySet, owner_name: str, project_name: str) -> QuerySet:
+    return queryset.select_related(*PROJECT_RELATED).filter(owner__name=owner_name,
+                                                            name=project_name)
+
+
+def filter_project_resources(queryset: QuerySet,
+                             owner_name: str,
+                             project_name: str,
+                             project_path: str = 'project',
+                             related: Iterable[str] = ()) -> QuerySet:
+    """Filters the resources of a project, and joins the project and its owner."""
+    related = list(related) + [project_path] + [
+        '{}__{}'.format(project_path, field) for field in PROJECT_RELATED]
+    return queryset.select_related(*related).filter(**{
+        '{}__owner__name'.format(project_path): owner_name,
+        '{}__name'.format(project_path): project_name,
+    })
+
+
+def get_project(owner_name: str, project_name: str) -> Project:
+    project = get_object_or_404(filter_project(queryset=Project.objects,
+                                               owner_name=owner_name,
+                                               project_name=project_name))
+    return share_project(project)
+
+
+def get_project_resource(queryset: QuerySet,
+                         owner_name: str,
+                         project_name: str,
+                         project_path: str = 'project',
+                         related: Iterable[str] = (),
+                         **filters) -> Model:
+    """Loads a project's resource with its parents in a single joined query."""
+    queryset = filter_project_resources(queryset=queryset,
+                                        owner_name=owner_name,
+                                        project_name=project_name,
+                                        project_path=project_path,
+                                        related=related)
+    obj = get_object_or_404(queryset, **filters)
+    return share_project_resource(obj, project_path=project_path)
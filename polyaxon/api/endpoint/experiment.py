@@ -1,10 +1,9 @@
-from rest_framework.generics import get_object_or_404
-
 from django.http import HttpRequest
 
 import access
 
 from access.resources import Resources
+from api.endpoint import context
 from api.endpoint.project import ProjectPermission, ProjectResourceEndpoint
 from db.models.experiments import Experiment
 
@@ -15,10 +14,19 @@ class ExperimentEndpoint(ProjectResourceEndpoint):
     CONTEXT_OBJECTS = ProjectResourceEndpoint.CONTEXT_OBJECTS + ('experiment',)
     lookup_url_kwarg = 'experiment_id'
 
-    def _initialize_context(self) -> None:
+    def enrich_queryset(self, queryset):
+        return context.filter_project_resources(queryset=queryset,
+                                                owner_name=self.owner_name,
+                                                project_name=self.project_name,
+                                                related=('experiment_group',))
+
+    def share_context(self, obj) -> None:
+        context.share_project_resource(obj)
+
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
         self.experiment = self.get_object()
+        self.project = self.experiment.project
 
 
 class ExperimentResourceListEndpoint(ProjectResourceEndpoint):
@@ -29,12 +37,14 @@ class ExperimentResourceListEndpoint(ProjectResourceEndpoint):
     def enrich_queryset(self, queryset):
         return queryset.filter(experiment=self.experiment)
 
-    def _initialize_context(self) -> None:
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
-        self.experiment = get_object_or_404(Experiment,
-                                            id=self.experiment_id,
-                                            project=self.project)
+        self.experiment = context.get_project_resource(queryset=Experiment.objects,
+                                                       owner_name=self.owner_name,
+                                                       project_name=self.project_name,
+                                                       related=('experiment_group',),
+                                                       id=self.experiment_id)
+        self.project = self.experiment.project
 
 
 class ExperimentResourcePermission(ProjectPermission):
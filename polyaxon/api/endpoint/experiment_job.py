@@ -1,10 +1,9 @@
-from rest_framework.generics import get_object_or_404
-
 from django.http import HttpRequest
 
 import access
 
 from access.resources import Resources
+from api.endpoint import context
 from api.endpoint.experiment import ExperimentResourceEndpoint, ExperimentResourcePermission
 from db.models.experiment_jobs import ExperimentJob
 
@@ -15,10 +14,22 @@ class ExperimentJobEndpoint(ExperimentResourceEndpoint):
     CONTEXT_OBJECTS = ExperimentResourceEndpoint.CONTEXT_OBJECTS + ('job',)
     lookup_url_kwarg = 'job_id'
 
-    def _initialize_context(self):
+    def enrich_queryset(self, queryset):
+        return context.filter_project_resources(
+            queryset=queryset,
+            owner_name=self.owner_name,
+            project_name=self.project_name,
+            project_path='experiment__project',
+            related=('experiment__experiment_group',)).filter(experiment_id=self.experiment_id)
+
+    def share_context(self, obj) -> None:
+        context.share_project_resource(obj, project_path='experiment__project')
+
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
         self.job = self.get_object()
+        self.experiment = self.job.experiment
+        self.project = self.experiment.project
 
 
 class ExperimentJobResourceListEndpoint(ExperimentResourceEndpoint):
@@ -29,12 +40,17 @@ class ExperimentJobResourceListEndpoint(ExperimentResourceEndpoint):
     def enrich_queryset(self, queryset):
         return queryset.filter(job=self.job)
 
-    def _initialize_context(self) -> None:
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
-        self.job = get_object_or_404(ExperimentJob,
-                                     id=self.job_id,
-                                     experiment=self.experiment)
+        self.job = context.get_project_resource(queryset=ExperimentJob.objects,
+                                                owner_name=self.owner_name,
+                                                project_name=self.project_name,
+                                                project_path='experiment__project',
+                                                related=('experiment__experiment_group',),
+                                                id=self.job_id,
+                                                experiment_id=self.experiment_id)
+        self.experiment = self.job.experiment
+        self.project = self.experiment.project
 
 
 class ExperimentJobResourcePermission(ExperimentResourcePermission):
@@ -1,8 +1,7 @@
-from rest_framework.generics import get_object_or_404
-
 import access
 
 from access.resources import Resources
+from api.endpoint import context
 from api.endpoint.project import ProjectPermission, ProjectResourceEndpoint
 from db.models.experiment_groups import ExperimentGroup
 
@@ -13,26 +12,36 @@ class ExperimentGroupEndpoint(ProjectResourceEndpoint):
     CONTEXT_OBJECTS = ProjectResourceEndpoint.CONTEXT_OBJECTS + ('group',)
     lookup_url_kwarg = 'group_id'
 
-    def _initialize_context(self) -> None:
+    def enrich_queryset(self, queryset):
+        return context.filter_project_resources(queryset=queryset,
+                                                owner_name=self.owner_name,
+                                                project_name=self.project_name)
+
+    def share_context(self, obj) -> None:
+        context.share_project_resource(obj)
+
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
         self.group = self.get_object()
+        self.project = self.group.project
 
 
 class ExperimentGroupResourceListEndpoint(ProjectResourceEndpoint):
     CONTEXT_KEYS = ProjectResourceEndpoint.CONTEXT_KEYS + ('group_id',)
     CONTEXT_OBJECTS = ProjectResourceEndpoint.CONTEXT_OBJECTS + ('group',)
+    CONTEXT_RELATIONS = {'experiment_group': 'group'}
     lookup_url_kwarg = 'group_id'
 
     def enrich_queryset(self, queryset):
         return queryset.filter(experiment_group=self.group)
 
-    def _initialize_context(self) -> None:
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
-        self.group = get_object_or_404(ExperimentGroup,
-                                       id=self.group_id,
-                                       project=self.project)
+        self.group = context.get_project_resource(queryset=ExperimentGroup.objects,
+                                                  owner_name=self.owner_name,
+                                                  project_name=self.project_name,
+                                                  id=self.group_id)
+        self.project = self.group.project
 
 
 class ExperimentGroupResourcePermission(ProjectPermission):
@@ -1,10 +1,9 @@
-from rest_framework.generics import get_object_or_404
-
 from django.http import HttpRequest
 
 import access
 
 from access.resources import Resources
+from api.endpoint import context
 from api.endpoint.project import ProjectPermission, ProjectResourceEndpoint
 from db.models.jobs import Job
 
@@ -15,10 +14,18 @@ class JobEndpoint(ProjectResourceEndpoint):
     CONTEXT_OBJECTS = ProjectResourceEndpoint.CONTEXT_OBJECTS + ('job',)
     lookup_url_kwarg = 'job_id'
 
-    def _initialize_context(self) -> None:
+    def enrich_queryset(self, queryset):
+        return context.filter_project_resources(queryset=queryset,
+                                                owner_name=self.owner_name,
+                                                project_name=self.project_name)
+
+    def share_context(self, obj) -> None:
+        context.share_project_resource(obj)
+
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
         self.job = self.get_object()
+        self.project = self.job.project
 
 
 class JobResourceListEndpoint(ProjectResourceEndpoint):
@@ -29,12 +36,13 @@ class JobResourceListEndpoint(ProjectResourceEndpoint):
     def enrich_queryset(self, queryset):
         return queryset.filter(job=self.job)
 
-    def _initialize_context(self) -> None:
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
-        self.job = get_object_or_404(Job,
-                                     id=self.job_id,
-                                     project=self.project)
+        self.job = context.get_project_resource(queryset=Job.objects,
+                                                owner_name=self.owner_name,
+                                                project_name=self.project_name,
+                                                id=self.job_id)
+        self.project = self.job.project
 
 
 class JobResourcePermission(ProjectPermission):
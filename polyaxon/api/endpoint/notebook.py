@@ -1,5 +1,4 @@
-from rest_framework.generics import get_object_or_404
-
+from api.endpoint import context
 from api.endpoint.project import ProjectResourceEndpoint
 from db.models.notebooks import NotebookJob
 
@@ -10,10 +9,18 @@ class NotebookEndpoint(ProjectResourceEndpoint):
     CONTEXT_OBJECTS = ProjectResourceEndpoint.CONTEXT_OBJECTS + ('notebook',)
     lookup_url_kwarg = 'job_id'
 
-    def _initialize_context(self) -> None:
+    def enrich_queryset(self, queryset):
+        return context.filter_project_resources(queryset=queryset,
+                                                owner_name=self.owner_name,
+                                                project_name=self.project_name)
+
+    def share_context(self, obj) -> None:
+        context.share_project_resource(obj)
+
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
         self.notebook = self.get_object()
+        self.project = self.notebook.project
 
 
 class ProjectNotebookEndpoint(ProjectResourceEndpoint):
@@ -33,14 +40,16 @@ class ProjectNotebookEndpoint(ProjectResourceEndpoint):
 class NotebookResourceListEndpoint(ProjectResourceEndpoint):
     CONTEXT_KEYS = ProjectResourceEndpoint.CONTEXT_KEYS + ('job_id',)
     CONTEXT_OBJECTS = ProjectResourceEndpoint.CONTEXT_OBJECTS + ('notebook',)
+    CONTEXT_RELATIONS = {'job': 'notebook'}
     lookup_url_kwarg = 'job_id'
 
     def enrich_queryset(self, queryset):
         return queryset.filter(job=self.notebook)
 
-    def _initialize_context(self) -> None:
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
-        self.notebook = get_object_or_404(NotebookJob,
-                                          id=self.job_id,
-                                          project=self.project)
+        self.notebook = context.get_project_resource(queryset=NotebookJob.objects,
+                                                     owner_name=self.owner_name,
+                                                     project_name=self.project_name,
+                                                     id=self.job_id)
+        self.project = self.notebook.project
@@ -1,9 +1,9 @@
 from django.http import HttpRequest
-from django.shortcuts import get_object_or_404
 
 import access
 
 from access.resources import Resources
+from api.endpoint import context
 from api.endpoint.admin import AdminPermission
 from api.endpoint.base import BaseEndpoint
 from db.models.projects import Project
@@ -49,7 +49,10 @@ class ProjectEndpoint(BaseEndpoint):
     lookup_url_kwarg = 'project_name'
 
     def enrich_queryset(self, queryset):
-        return queryset.filter(owner__name=self.owner_name)
+        return queryset.select_related(*context.PROJECT_RELATED).filter(owner__name=self.owner_name)
+
+    def share_context(self, obj) -> None:
+        context.share_project(obj)
 
     def _initialize_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
@@ -68,12 +71,20 @@ class ProjectResourceListEndpoint(BaseEndpoint):
         queryset = queryset.filter(project=self.project)
         return super().enrich_queryset(queryset=queryset)
 
+    def _load_context(self) -> None:
+        """Loads the context objects of the endpoint.
+
+        Endpoints of nested resources load their resource, the project, and the owner
+        in a single joined query.
+        """
+        #  pylint:disable=attribute-defined-outside-init
+        self.project = context.get_project(owner_name=self.owner_name,
+                                           project_name=self.project_name)
+
     def _initialize_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
         super()._initialize_context()
-        self.project = get_object_or_404(Project,
-                                         owner__name=self.owner_name,
-                                         name=self.project_name)
+        self._load_context()
         self.owner = self.project.owner
 
     def _validate_resource_permission(self) -> None:
@@ -1,5 +1,6 @@
 from rest_framework.generics import get_object_or_404
 
+from api.endpoint import context
 from api.endpoint.project import ProjectResourceEndpoint
 from db.models.experiment_groups import ExperimentGroup
 from db.models.experiments import Experiment
@@ -20,10 +21,18 @@ class TensorboardEndpoint(ProjectResourceEndpoint):
     CONTEXT_OBJECTS = ProjectResourceEndpoint.CONTEXT_OBJECTS + ('tensorboard',)
     lookup_url_kwarg = 'job_id'
 
-    def _initialize_context(self) -> None:
+    def enrich_queryset(self, queryset):
+        return context.filter_project_resources(queryset=queryset,
+                                                owner_name=self.owner_name,
+                                                project_name=self.project_name)
+
+    def share_context(self, obj) -> None:
+        context.share_project_resource(obj)
+
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
         self.tensorboard = self.get_object()
+        self.project = self.tensorboard.project
 
 
 class ProjectTensorboardEndpoint(ProjectResourceEndpoint):
@@ -58,14 +67,16 @@ class ProjectTensorboardEndpoint(ProjectResourceEndpoint):
 class TensorboardResourceListEndpoint(ProjectResourceEndpoint):
     CONTEXT_KEYS = ProjectResourceEndpoint.CONTEXT_KEYS + ('job_id',)
     CONTEXT_OBJECTS = ProjectResourceEndpoint.CONTEXT_OBJECTS + ('tensorboard',)
+    CONTEXT_RELATIONS = {'job': 'tensorboard'}
     lookup_url_kwarg = 'job_id'
 
     def enrich_queryset(self, queryset):
         return queryset.filter(job=self.tensorboard)
 
-    def _initialize_context(self) -> None:
+    def _load_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
-        super()._initialize_context()
-        self.tensorboard = get_object_or_404(TensorboardJob,
-                                             id=self.job_id,
-                                             project=self.project)
+        self.tensorboard = context.get_project_resource(queryset=TensorboardJob.objects,
+                                                        owner_name=self.owner_name,
+                                                        project_name=self.project_name,
+                                                        id=self.job_id)
+        self.project = self.tensorboard.project
@@ -1,3 +1,5 @@
+from django.db.models import Count
+
 from db.models.experiment_groups import ExperimentGroup
 
 groups = ExperimentGroup.objects.select_related(
@@ -6,4 +8,5 @@ groups = ExperimentGroup.objects.select_related(
     'project__user',
     'status',
 )
-groups_details = groups
+groups_details = groups.prefetch_related('status_counters').annotate(
+    num_iterations=Count('iterations', distinct=True))
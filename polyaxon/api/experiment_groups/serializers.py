@@ -1,3 +1,5 @@
+from typing import Dict
+
 from rest_framework import fields, serializers
 from rest_framework.exceptions import ValidationError
 
@@ -7,6 +9,7 @@ from api.utils.serializers.project import ProjectMixin
 from api.utils.serializers.tags import TagsSerializerMixin
 from api.utils.serializers.tensorboard import TensorboardSerializerMixin
 from api.utils.serializers.user import UserMixin
+from constants.experiments import ExperimentLifeCycle
 from db.models.experiment_groups import (
     ExperimentGroup,
     ExperimentGroupChartView,
@@ -93,28 +96,44 @@ class ExperimentGroupDetailSerializer(BookmarkedExperimentGroupSerializer,
             'num_stopped_experiments',
         )
 
+    def get_status_counts(self, obj: ExperimentGroup) -> Dict[str, int]:
+        """Computes the status counts once per group for all the `num_*` fields."""
+        if not hasattr(self, '_status_counts'):
+            self._status_counts = {}
+        if obj.pk not in self._status_counts:
+            self._status_counts[obj.pk] = obj.get_status_counts()
+        return self._status_counts[obj.pk]
+
+    def count_experiments(self, obj: ExperimentGroup, statuses=None) -> int:
+        return obj.count_experiments(statuses=statuses,
+                                     status_counts=self.get_status_counts(obj))
+
     def get_num_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.group_experiments.count()
+        return self.count_experiments(obj)
 
     def get_num_pending_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.pending_experiments.count()
+        return self.count_experiments(obj, statuses=ExperimentLifeCycle.PENDING_STATUS)
 
     def get_num_running_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.running_experiments.count()
+        return self.count_experiments(obj, statuses=ExperimentLifeCycle.RUNNING_STATUS)
 
     def get_num_scheduled_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.scheduled_experiments.count()
+        return self.count_experiments(obj, statuses=[ExperimentLifeCycle.SCHEDULED])
 
     def get_num_succeeded_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.succeeded_experiments.count()
+        return self.count_experiments(obj, statuses=[ExperimentLifeCycle.SUCCEEDED])
 
     def get_num_failed_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.failed_experiments.count()
+        return self.count_experiments(obj, statuses=[ExperimentLifeCycle.FAILED])
 
     def get_num_stopped_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.stopped_experiments.count()
+        return self.count_experiments(obj, statuses=[ExperimentLifeCycle.STOPPED])
 
     def get_current_iteration(self, obj: ExperimentGroup):
+        # Uses the annotated number of iterations if any
+        num_iterations = getattr(obj, 'num_iterations', None)
+        if num_iterations is not None:
+            return num_iterations
         return obj.iterations.count()
 
     def validate_content(self, content):
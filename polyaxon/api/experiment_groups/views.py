@@ -267,6 +267,7 @@ class ExperimentGroupMetricsListView(ExperimentGroupResourceListEndpoint, ListEn
     queryset = ExperimentMetric.objects.all()
     serializer_class = ExperimentMetricSerializer
     pagination_class = LargeLimitOffsetPagination
+    streaming = True
 
     def filter_queryset(self, queryset):
         queryset = super(BaseEndpoint, self).filter_queryset(  # pylint:disable=bad-super-call
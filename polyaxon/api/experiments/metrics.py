@@ -0,0 +1,88 @@
+from typing import Dict, List
+
+from hestia.datetime_typing import AwareDT
+
+from django.db import connection
+
+from db.models.experiments import ExperimentMetric
+
+# Explodes the metrics' values into one (name, time, value) point per numeric value.
+POINTS_QUERY = """
+SELECT kv.key AS name, m.created_at AS t, (kv.value)::text::double precision AS v
+FROM {table} m CROSS JOIN LATERAL jsonb_each(m."values") kv
+WHERE {filters}
+"""
+
+# Min/max bucketing: the points of each metric are split in buckets of consecutive points,
+# and only the min and max points of every bucket are kept, or only the min for a single point.
+DOWNSAMPLED_QUERY = """
+SELECT name, t, v FROM (
+    SELECT name, t, v, total,
+           row_number() OVER (PARTITION BY name, bucket ORDER BY v, t) AS min_rank,
+           row_number() OVER (PARTITION BY name, bucket ORDER BY v DESC, t) AS max_rank
+    FROM (
+        SELECT name, t, v,
+               count(*) OVER (PARTITION BY name) AS total,
+               (row_number() OVER (PARTITION BY name ORDER BY t) - 1) * %s /
+               count(*) OVER (PARTITION BY name) AS bucket
+        FROM ({points}) points
+    ) buckets
+) ranked
+WHERE total <= %s OR min_rank = 1 OR (max_rank = 1 AND %s)
+ORDER BY name, t
+"""
+
+
+def get_columnar_metrics(experiment_id: int,
+                         names: List[str] = None,
+                         start_date: AwareDT = None,
+                         end_date: AwareDT = None,
+                         start_step: float = None,
+                         end_step: float = None,
+                         max_points: int = None) -> Dict[str, Dict[str, List]]:
+    """Returns the metrics of an experiment as column arrays per metric name.
+
+    e.g. `{"loss": {"t": [...], "v": [...]}}`
+
+    The aggregation happens in Postgres, if `max_points` is provided,
+    every metric is downsampled with min/max bucketing to at most `max_points` points.
+    """
+    filters = ['m.experiment_id = %s', "jsonb_typeof(kv.value) = 'number'"]
+    params = [experiment_id]
+    if names:
+        filters.append('kv.key = ANY(%s)')
+        params.append(list(names))
+    if start_date:
+        filters.append('m.created_at >= %s')
+        params.append(start_date)
+    if end_date:
+        filters.append('m.created_at <= %s')
+        params.append(end_date)
+    if start_step is not None or end_step is not None:
+        filters.append("""jsonb_typeof(m."values"->'step') = 'number'""")
+    if start_step is not None:
+        filters.append("""(m."values"->>'step')::double precision >= %s""")
+        params.append(start_step)
+    if end_step is not None:
+        filters.append("""(m."values"->>'step')::double precision <= %s""")
+        params.append(end_step)
+
+    query = POINTS_QUERY.format(table=ExperimentMetric._meta.db_table,
+                                filters=' AND '.join(filters))
+    if max_points:
+        query = DOWNSAMPLED_QUERY.format(points=query)
+        # Each bucket contributes at most 2 points, the min and the max,
+        # a single bucket only contributes its min if a single point is requested
+        params = [max(max_points // 2, 1)] + params + [max_points, max_points >= 2]
+    else:
+        query = '{} ORDER BY name, t'.format(query)
+
+    results = {}  # type: Dict[str, Dict[str, List]]
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        for name, t, v in cursor:
+            if name not in results:
+                results[name] = {'t': [], 'v': []}
+            results[name]['t'].append(t)
+            results[name]['v'].append(v)
+    return results
@@ -1,7 +1,7 @@
 import logging
 import os
 
-from typing import Optional
+from typing import Optional, Union
 
 from hestia.bool_utils import to_bool
 from polystores.exceptions import PolyaxonStoresException
@@ -12,6 +12,9 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+
 import auditor
 import conf
 import stores
@@ -37,6 +40,7 @@ from api.endpoint.experiment_job import (
 )
 from api.endpoint.project import ProjectResourceListEndpoint
 from api.experiments import queries
+from api.experiments.metrics import get_columnar_metrics
 from api.experiments.serializers import (
     BookmarkedExperimentSerializer,
     ExperimentChartViewSerializer,
@@ -52,8 +56,8 @@ from api.experiments.serializers import (
     ExperimentStatusSerializer
 )
 from api.filters import OrderingFilter, QueryFilter
-from api.paginator import LargeLimitOffsetPagination
-from api.utils.files import stream_file
+from api.paginator import KeysetPagination, LargeKeysetPagination, LargeLimitOffsetPagination
+from api.utils.files import stream_file, stream_log_file, stream_log_lines, stream_logs_file
 from api.utils.gzip import gzip
 from api.utils.views.bookmarks_mixin import BookmarkedListMixinView
 from api.utils.views.protected import ProtectedView
@@ -93,10 +97,12 @@ from event_manager.events.experiment_job import (
     EXPERIMENT_JOB_VIEWED
 )
 from event_manager.events.project import PROJECT_EXPERIMENTS_VIEWED
-from libs.archive import archive_logs_file, archive_outputs, archive_outputs_file
+from libs.archive import archive_outputs, archive_outputs_file
+from libs.logs_query import LogsQuery, get_logs_query
 from libs.spec_validation import validate_experiment_spec_config
-from logs_handlers.log_queries.experiment import process_logs
-from logs_handlers.log_queries.experiment_job import process_logs as process_experiment_job_logs
+from logs_handlers.log_queries.experiment import fetch_logs, refresh_logs
+from logs_handlers.log_queries.experiment_job import fetch_logs as fetch_experiment_job_logs
+from logs_handlers.log_queries.experiment_job import refresh_logs as refresh_experiment_job_logs
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import LogsCeleryTasks, SchedulerCeleryTasks
 from scopes.authentication.ephemeral import EphemeralAuthentication
@@ -137,6 +143,8 @@ class ProjectExperimentListView(BookmarkedListMixinView,
     ordering = ('-updated_at',)
     ordering_fields = ('created_at', 'updated_at', 'started_at', 'finished_at')
     ordering_proxy_fields = {'metric': 'last_metric'}
+    pagination_class = KeysetPagination
+    streaming = True
 
     def get_serializer_class(self):
         if self.create_serializer_class and self.request.method.lower() == 'post':
@@ -159,7 +167,7 @@ class ProjectExperimentListView(BookmarkedListMixinView,
     @property
     def paginator(self):
         if self.request.query_params.get('all', None):
-            self.pagination_class = LargeLimitOffsetPagination
+            self.pagination_class = LargeKeysetPagination
         return super().paginator
 
     def get_group(self, project, group_id):
@@ -480,6 +488,7 @@ class ExperimentStatusListView(ExperimentResourceListEndpoint,
     authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES + [
         InternalAuthentication,
     ]
+    pagination_class = KeysetPagination
 
     def perform_create(self, serializer):
         serializer.save(experiment=self.experiment)
@@ -507,7 +516,8 @@ class ExperimentMetricListView(ExperimentResourceEndpoint,
     authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES + [
         InternalAuthentication,
     ]
-    pagination_class = LargeLimitOffsetPagination
+    pagination_class = LargeKeysetPagination
+    streaming = True
     throttle_scope = 'high'
 
     def perform_create(self, serializer):
@@ -536,9 +546,51 @@ class ExperimentMetricListView(ExperimentResourceEndpoint,
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
+    def get_date_param(self, name):
+        value = self.request.query_params.get(name, None)
+        if not value:
+            return None
+        try:
+            date_value = parse_datetime(value)
+        except ValueError:
+            date_value = None
+        if date_value is None:
+            raise ValidationError('`{}` is not a valid datetime.'.format(name))
+        return date_value
+
+    def get_number_param(self, name, cast=float):
+        value = self.request.query_params.get(name, None)
+        if value is None:
+            return None
+        try:
+            return cast(value)
+        except ValueError:
+            raise ValidationError('`{}` is not a valid number.'.format(name))
+
+    def get_columnar_metrics(self):
+        """Returns column arrays per metric name, optionally downsampled and filtered."""
+        names = self.request.query_params.get('names', None)
+        max_points = self.get_number_param('points', cast=int)
+        if max_points is not None and max_points <= 0:
+            raise ValidationError('`points` must be a positive integer.')
+        return get_columnar_metrics(
+            experiment_id=self.experiment.id,
+            names=[name.strip() for name in names.split(',') if name.strip()] if names else None,
+            start_date=self.get_date_param('start_date'),
+            end_date=self.get_date_param('end_date'),
+            start_step=self.get_number_param('start_step'),
+            end_step=self.get_number_param('end_step'),
+            max_points=max_points)
+
     @gzip()
     def get(self, request, *args, **kwargs):
-        response = super().get(request, *args, **kwargs)
+        columns = to_bool(request.query_params.get('columns', None),
+                          handle_none=True,
+                          exception=ValidationError)
+        if columns:
+            response = Response(data=self.get_columnar_metrics(), status=status.HTTP_200_OK)
+        else:
+            response = super().get(request, *args, **kwargs)
         auditor.record(event_type=EXPERIMENT_METRICS_VIEWED,
                        instance=self.experiment,
                        actor_id=request.user.id,
@@ -594,38 +646,48 @@ class ExperimentJobDetailView(ExperimentJobEndpoint,
     AUDITOR_EVENT_TYPES = {'GET': EXPERIMENT_JOB_VIEWED}
 
 
-def get_experiment_logs_path(experiment: Experiment) -> Optional[str]:
+def stream_experiment_logs(
+        experiment: Experiment,
+        query: LogsQuery = None) -> Optional[Union[Response, StreamingHttpResponse]]:
     experiment_name = experiment.unique_name
     if experiment.is_done:
         log_path = stores.get_experiment_logs_path(experiment_name=experiment_name, temp=False)
-        logs_path = archive_logs_file(
-            log_path=log_path,
-            namepath=experiment_name)
+        return stream_logs_file(log_path=log_path,
+                                namepath=experiment_name,
+                                logger=_logger,
+                                query=query)
     elif experiment.in_cluster:
-        process_logs(experiment=experiment, temp=True)
-        logs_path = stores.get_experiment_logs_path(experiment_name=experiment_name, temp=True)
-    else:
-        return None
+        if query and query.is_pod_query:
+            log_lines = fetch_logs(experiment=experiment,
+                                   tail_lines=query.tail,
+                                   since_seconds=query.since)
+            return stream_log_lines(log_lines=log_lines, filename=experiment_name)
+        logs_path = refresh_logs(experiment=experiment)
+        return stream_log_file(file_path=logs_path, logger=_logger, query=query)
 
-    return logs_path
+    return None
 
 
-def get_experiment_job_logs_path(experiment: Experiment, job: ExperimentJob) -> Optional[str]:
+def stream_experiment_job_logs(
+        experiment: Experiment,
+        job: ExperimentJob,
+        query: LogsQuery = None) -> Optional[Union[Response, StreamingHttpResponse]]:
     if not job:
         return None
     job_name = job.unique_name
     if experiment.is_done:
         log_path = stores.get_experiment_job_logs_path(experiment_job_name=job_name, temp=False)
-        logs_path = archive_logs_file(
-            log_path=log_path,
-            namepath=job_name)
+        return stream_logs_file(log_path=log_path, namepath=job_name, logger=_logger, query=query)
     elif experiment.in_cluster:
-        process_experiment_job_logs(experiment_job=job, temp=True)
-        logs_path = stores.get_experiment_job_logs_path(experiment_job_name=job_name, temp=True)
-    else:
-        logs_path = None
+        if query and query.is_pod_query:
+            log_lines = fetch_experiment_job_logs(experiment_job=job,
+                                                  tail_lines=query.tail,
+                                                  since_seconds=query.since)
+            return stream_log_lines(log_lines=log_lines, filename=job_name)
+        logs_path = refresh_experiment_job_logs(experiment_job=job)
+        return stream_log_file(file_path=logs_path, logger=_logger, query=query)
 
-    return logs_path
+    return None
 
 
 class ExperimentLogsView(ExperimentEndpoint, RetrieveEndpoint, PostEndpoint):
@@ -641,16 +703,17 @@ class ExperimentLogsView(ExperimentEndpoint, RetrieveEndpoint, PostEndpoint):
                        instance=self.experiment,
                        actor_id=request.user.id,
                        actor_name=request.user.username)
+        query = get_logs_query(request.query_params)
         if self.experiment.is_distributed:
             job = self.experiment.jobs.order_by('created_at').first()
-            logs_path = get_experiment_job_logs_path(experiment=self.experiment, job=job)
+            response = stream_experiment_job_logs(experiment=self.experiment, job=job, query=query)
         else:
-            logs_path = get_experiment_logs_path(experiment=self.experiment)
-        if not logs_path:
+            response = stream_experiment_logs(experiment=self.experiment, query=query)
+        if not response:
             return Response(status=status.HTTP_404_NOT_FOUND,
                             data='Experiment has no logs.')
 
-        return stream_file(file_path=logs_path, logger=_logger)
+        return response
 
     def post(self, request, *args, **kwargs):
         log_lines = request.data
@@ -765,15 +828,18 @@ class ExperimentJobLogsView(ExperimentJobResourceEndpoint,
                        instance=self.experiment,
                        actor_id=request.user.id,
                        actor_name=request.user.username)
+        query = get_logs_query(request.query_params)
         if self.experiment.is_distributed:
-            logs_path = get_experiment_job_logs_path(experiment=self.experiment, job=self.job)
+            response = stream_experiment_job_logs(experiment=self.experiment,
+                                                  job=self.job,
+                                                  query=query)
         else:
-            logs_path = get_experiment_logs_path(experiment=self.experiment)
-        if not logs_path:
+            response = stream_experiment_logs(experiment=self.experiment, query=query)
+        if not response:
             return Response(status=status.HTTP_404_NOT_FOUND,
                             data='Experiment has no logs.')
 
-        return stream_file(file_path=logs_path, logger=_logger)
+        return response
 
 
 class ExperimentStopView(ExperimentEndpoint, CreateEndpoint):
@@ -32,7 +32,7 @@ from api.jobs.serializers import (
     JobSerializer,
     JobStatusSerializer
 )
-from api.utils.files import stream_file
+from api.utils.files import stream_file, stream_log_file, stream_log_lines, stream_logs_file
 from api.utils.views.bookmarks_mixin import BookmarkedListMixinView
 from api.utils.views.protected import ProtectedView
 from constants.jobs import JobLifeCycle
@@ -53,9 +53,10 @@ from event_manager.events.job import (
     JOB_VIEWED
 )
 from event_manager.events.project import PROJECT_JOBS_VIEWED
-from libs.archive import archive_logs_file, archive_outputs, archive_outputs_file
+from libs.archive import archive_outputs, archive_outputs_file
+from libs.logs_query import get_logs_query
 from libs.spec_validation import validate_job_spec_config
-from logs_handlers.log_queries.job import process_logs
+from logs_handlers.log_queries.job import fetch_logs, refresh_logs
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import SchedulerCeleryTasks
 from scopes.authentication.internal import InternalAuthentication
@@ -276,16 +277,19 @@ class JobLogsView(JobEndpoint, RetrieveEndpoint):
                        actor_id=request.user.id,
                        actor_name=request.user.username)
         job_name = self.job.unique_name
+        query = get_logs_query(request.query_params)
         if self.job.is_done:
             log_path = stores.get_job_logs_path(job_name=job_name, temp=False)
-            log_path = archive_logs_file(
-                log_path=log_path,
-                namepath=job_name)
-        else:
-            process_logs(job=self.job, temp=True)
-            log_path = stores.get_job_logs_path(job_name=job_name, temp=True)
-
-        return stream_file(file_path=log_path, logger=_logger)
+            return stream_logs_file(log_path=log_path,
+                                    namepath=job_name,
+                                    logger=_logger,
+                                    query=query)
+
+        if query and query.is_pod_query:
+            log_lines = fetch_logs(job=self.job, tail_lines=query.tail, since_seconds=query.since)
+            return stream_log_lines(log_lines=log_lines, filename=job_name)
+        log_path = refresh_logs(job=self.job)
+        return stream_log_file(file_path=log_path, logger=_logger, query=query)
 
 
 class JobStopView(JobEndpoint, PostEndpoint):
@@ -1,5 +1,316 @@
+import json
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q, prefetch_related_objects
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+
+import conf
+
+
+class CountModes(object):
+    EXACT = 'exact'
+    ESTIMATED = 'estimated'
+
+    VALUES = {EXACT, ESTIMATED}
+
+
+class EstimatedCountMixin(object):
+    """Allows clients and views to opt out of exact counts.
+
+    An exact `COUNT(*)` scans all the rows matching the filters,
+    with `?count=estimated` (or a view's `count_mode`) the count is estimated by Postgres:
+    the table statistics in `pg_class` for unfiltered querysets,
+    and the planner's row estimate for filtered querysets.
+    Estimates below `PAGINATION_EXACT_COUNT_THRESHOLD` are replaced by an exact count.
+    """
+    count_query_param = 'count'
+    count_mode = CountModes.EXACT
+
+    def get_count_mode(self, request, view=None) -> str:
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode in CountModes.VALUES:
+            return count_mode
+        return getattr(view, 'count_mode', self.count_mode)
+
+    @staticmethod
+    def get_estimated_count(queryset) -> Optional[int]:
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            if not queryset.query.where and not queryset.query.distinct:
+                cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                               [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+                # `reltuples` is negative or 0 if the table was never analyzed
+                return int(row[0]) if row and row[0] > 0 else None
+
+            sql, params = queryset.order_by().values('pk').query.sql_with_params()
+            cursor.execute('EXPLAIN (FORMAT JSON) {}'.format(sql), params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def get_count(self, queryset) -> int:
+        request = getattr(self, 'request', None)
+        if request and self.get_count_mode(request, getattr(self, 'view', None)) == \
+                CountModes.ESTIMATED:
+            count = self.get_estimated_count(queryset)
+            if count is not None and count >= conf.get('PAGINATION_EXACT_COUNT_THRESHOLD'):
+                return count
+        return super().get_count(queryset)
+
+
+class KeysetPagination(EstimatedCountMixin, LimitOffsetPagination):
+    """Paginates with a cursor over the queryset's ordering instead of an offset.
+
+    The ordering set by the view (or its `OrderingFilter`) is kept,
+    and the primary key is appended to break ties between equal values.
+    Every page is a range scan starting after the last row of the previous page,
+    so its cost does not depend on the page's position.
+
+    Requests with an `offset`, and orderings on other fields than `keyset_fields`
+    (which need to be non nullable), fall back to the limit/offset pagination.
+    """
+    cursor_query_param = 'cursor'
+    keyset_fields = ('created_at', 'updated_at', 'id')
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def __init__(self) -> None:
+        self.request = None
+        self.view = None
+        self.ordering = None
+        self.cursor = None
+        self.has_next = False
+        self.has_previous = False
+        self.first_position = None
+        self.last_position = None
+
+    def get_keyset_ordering(self, queryset) -> Optional[List[str]]:
+        """Returns the queryset's ordering with a trailing primary key,
+        or None if the ordering cannot be used as a keyset.
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not ordering or not queryset.query.default_ordering:
+            return None
+
+        pk_name = queryset.model._meta.pk.name
+        fields = []
+        for field in ordering:
+            if not isinstance(field, str) or field == '?':
+                return None
+            name = field.lstrip('-')
+            name = pk_name if name == 'pk' else name
+            if name not in self.keyset_fields:
+                return None
+            try:
+                if queryset.model._meta.get_field(name).null:
+                    return None
+            except FieldDoesNotExist:
+                return None
+            fields.append('-{}'.format(name) if field.startswith('-') else name)
+
+        if pk_name not in [field.lstrip('-') for field in fields]:
+            fields.append('-{}'.format(pk_name) if fields[-1].startswith('-') else pk_name)
+        return fields
+
+    def use_keyset(self, queryset, request) -> bool:
+        if request.query_params.get(self.offset_query_param):
+            return False
+        self.ordering = self.get_keyset_ordering(queryset)
+        return self.ordering is not None
+
+    def encode_cursor(self, position: List[Any], reverse: bool) -> str:
+        position = [value.isoformat() if isinstance(value, datetime) else value
+                    for value in position]
+        cursor = json.dumps({'p': position, 'r': reverse}, separators=(',', ':'))
+        cursor = urlsafe_b64encode(cursor.encode('ascii')).decode('ascii')
+        url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
 
+    def decode_cursor(self, request, model) -> Optional[Tuple[List[Any], bool]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
 
-class LargeLimitOffsetPagination(LimitOffsetPagination):
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')).decode('ascii'))
+            position = cursor['p']
+            if len(position) != len(self.ordering):
+                raise ValueError
+            position = [model._meta.get_field(field.lstrip('-')).to_python(value)
+                        for field, value in zip(self.ordering, position)]
+            return position, bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_position(self, instance) -> List[Any]:
+        return [getattr(instance, field.lstrip('-')) for field in self.ordering]
+
+    def filter_keyset(self, queryset):
+        """Orders the queryset and filters the rows after (or before) the cursor's position."""
+        ordering = self.ordering
+        if self.cursor and self.cursor[1]:
+            ordering = [field[1:] if field.startswith('-') else '-{}'.format(field)
+                        for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if not self.cursor:
+            return queryset
+
+        # (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...
+        position = self.cursor[0]
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = '{}__{}'.format(name, 'lt' if field.startswith('-') else 'gt')
+            previous = {ordering[i].lstrip('-'): position[i] for i in range(index)}
+            condition |= Q(**previous, **{lookup: position[index]})
+        return queryset.filter(condition)
+
+    def iter_keyset_page(self, objects: Iterable[Any]) -> Iterator[Any]:
+        """Yields up to `limit` objects and keeps the positions needed for the links."""
+        reverse = bool(self.cursor and self.cursor[1])
+        if reverse:
+            objects = list(objects)
+            has_more = len(objects) > self.limit
+            objects = list(reversed(objects[:self.limit]))
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_previous = self.cursor is not None
+
+        last = None
+        for index, instance in enumerate(objects):
+            if index == self.limit:
+                self.has_next = True
+                break
+            if index == 0:
+                self.first_position = self.get_position(instance)
+            last = instance
+            yield instance
+
+        if last is not None:
+            self.last_position = self.get_position(last)
+        elif self.cursor:
+            # Empty page, the links point back from the cursor's position
+            self.first_position = self.last_position = self.cursor[0]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        if not self.use_keyset(queryset, request):
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.cursor = self.decode_cursor(request, queryset.model)
+        self.count = self.get_count(queryset)
+        queryset = self.filter_keyset(queryset)
+        return list(self.iter_keyset_page(queryset[:self.limit + 1]))
+
+    def get_next_link(self) -> Optional[str]:
+        if self.ordering is None:
+            return super().get_next_link()
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if self.ordering is None:
+            return super().get_previous_link()
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.encode_cursor(self.first_position, reverse=True)
+
+
+class StreamingPaginationMixin(object):
+    streaming_chunk_size = 1000
+    prefetch_lookups = ()
+
+    def paginate_queryset_iterator(self, queryset, request, view=None) -> Iterator[Any]:
+        """Similar to `paginate_queryset` but returns a server side cursor over the page."""
+        self.count = self.get_count(queryset)
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        self.request = request
+        # `.iterator()` ignores `prefetch_related`, lookups are applied per chunk instead.
+        self.prefetch_lookups = queryset._prefetch_related_lookups
+        if self.count == 0 or self.offset > self.count:
+            return iter([])
+        return queryset[self.offset:self.offset + self.limit].iterator(
+            chunk_size=self.streaming_chunk_size)
+
+    def iter_chunks(self, objects: Iterator[Any]) -> Iterator[List[Any]]:
+        while True:
+            chunk = list(islice(objects, self.streaming_chunk_size))
+            if not chunk:
+                return
+            if self.prefetch_lookups:
+                prefetch_related_objects(chunk, *self.prefetch_lookups)
+            yield chunk
+
+    def iter_json(self, objects: Iterator[Any], serialize: Callable) -> Iterator[bytes]:
+        """Renders the paginated response as a JSON object incrementally.
+
+        `serialize` is called on chunks of objects, and should return their representations.
+        The links are rendered after the results, once the page was read.
+        """
+        encoder = JSONEncoder()
+        yield '{{"count": {}, "results": ['.format(self.count).encode('utf-8')
+        separator = ''
+        for chunk in self.iter_chunks(objects):
+            for data in serialize(chunk):
+                yield (separator + encoder.encode(data)).encode('utf-8')
+                separator = ','
+        yield '], "next": {}, "previous": {}}}'.format(
+            encoder.encode(self.get_next_link()),
+            encoder.encode(self.get_previous_link())).encode('utf-8')
+
+    def get_streaming_response(self,
+                               objects: Iterator[Any],
+                               serialize: Callable[[List[Any]], Iterable[Dict]]
+                               ) -> StreamingHttpResponse:
+        """Returns a gzipped json response, compressed chunk by chunk while it's rendered."""
+        response = StreamingHttpResponse(compress_sequence(self.iter_json(objects, serialize)),
+                                         content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+
+class LargeLimitOffsetPagination(StreamingPaginationMixin, LimitOffsetPagination):
+    default_limit = 300000
+
+
+class LargeKeysetPagination(StreamingPaginationMixin, KeysetPagination):
     default_limit = 300000
+
+    def paginate_queryset_iterator(self, queryset, request, view=None) -> Iterator[Any]:
+        self.request = request
+        self.view = view
+        if not self.use_keyset(queryset, request):
+            return super().paginate_queryset_iterator(queryset, request, view=view)
+
+        self.limit = self.get_limit(request)
+        self.cursor = self.decode_cursor(request, queryset.model)
+        self.count = self.get_count(queryset)
+        self.prefetch_lookups = queryset._prefetch_related_lookups
+        queryset = self.filter_keyset(queryset)
+        return self.iter_keyset_page(queryset[:self.limit + 1].iterator(
+            chunk_size=self.streaming_chunk_size))
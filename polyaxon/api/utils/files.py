@@ -1,7 +1,7 @@
 import mimetypes
 import os
 
-from typing import Any, Union
+from typing import Any, Iterable, Union
 from wsgiref.util import FileWrapper
 
 from rest_framework import status
@@ -9,6 +9,11 @@ from rest_framework.response import Response
 
 from django.http import StreamingHttpResponse
 
+import stores
+
+from libs.archive import archive_logs_file, archive_logs_stream
+from libs.logs_query import LogsQuery, query_log_file
+
 
 def stream_file(file_path: str, logger: Any) -> Union[Response, StreamingHttpResponse]:
     filename = os.path.basename(file_path)
@@ -28,3 +33,43 @@ def stream_file(file_path: str, logger: Any) -> Union[Response, StreamingHttpRes
         return Response(
             status=status.HTTP_400_BAD_REQUEST,
             data='Could not get the file, an error was encountered.')
+
+
+def stream_chunks(chunks: Iterable[bytes], filename: str) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(chunks, content_type=mimetypes.guess_type(filename)[0])
+    response['Content-Disposition'] = "attachment; filename={}".format(filename)
+    return response
+
+
+def stream_log_file(file_path: str,
+                    logger: Any,
+                    query: LogsQuery = None) -> Union[Response, StreamingHttpResponse]:
+    """Streams a log file, or only the lines of the query found with the log's index."""
+    if not query:
+        return stream_file(file_path=file_path, logger=logger)
+    if not os.path.exists(file_path):
+        logger.warning('File not found: file_path=%s', file_path)
+        return Response(status=status.HTTP_404_NOT_FOUND,
+                        data='File not found: file_path={}'.format(file_path))
+    return stream_chunks(chunks=query_log_file(log_path=file_path, query=query),
+                         filename=os.path.basename(file_path))
+
+
+def stream_log_lines(log_lines: str, filename: str) -> StreamingHttpResponse:
+    return stream_chunks(chunks=[log_lines.encode('utf-8') + b'\n'] if log_lines else [],
+                         filename=filename)
+
+
+def stream_logs_file(log_path: str,
+                     namepath: str,
+                     logger: Any,
+                     query: LogsQuery = None) -> Union[Response, StreamingHttpResponse]:
+    """Streams a log from the logs store,
+    logs persisted to a bucket are streamed without downloading the whole log first.
+    """
+    if stores.is_bucket_logs_persistence():
+        chunks = archive_logs_stream(log_path=log_path, namepath=namepath, query=query)
+        return stream_chunks(chunks=chunks, filename=os.path.basename(log_path))
+    return stream_log_file(file_path=archive_logs_file(log_path=log_path, namepath=namepath),
+                           logger=logger,
+                           query=query)
@@ -1,5 +1,6 @@
 from functools import wraps
 
+from django.utils.cache import patch_vary_headers
 from django.utils.decorators import available_attrs
 from django.utils.text import compress_string
 
@@ -12,6 +13,10 @@ class GzipDecorator(object):
         def inner(self, request, *args, **kwargs):
             response = func(self, request, *args, **kwargs)
 
+            # Streaming responses are already compressed chunk by chunk.
+            if response.streaming:
+                return response
+
             # Before we can access response.content, the response needs to be rendered.
             response = self.finalize_response(request, response, *args, **kwargs)
             response.render()  # should be rendered, before picklining while storing to cache
@@ -26,10 +31,15 @@ class GzipDecorator(object):
             response.content = compressed_content
             response['Content-Length'] = str(len(response.content))
             response['Content-Encoding'] = 'gzip'
+            patch_vary_headers(response, ('Accept-Encoding',))
 
             return response
 
         return inner
 
 
+def accepts_gzip(request) -> bool:
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+
 gzip = GzipDecorator
@@ -0,0 +1,74 @@
+import atexit
+import os
+import threading
+
+from typing import Dict, Iterable, List
+
+
+class EventsPipeline(object):
+    """Buffers the serialized events of the current process and publishes them in batches.
+
+    A batch is published when it reaches `batch_size` events or `batch_interval` seconds
+    after its first event, with one message per destination task.
+    """
+
+    def __init__(self, tasks: Iterable[str], batch_size: int, batch_interval: float) -> None:
+        self.tasks = tuple(tasks)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self._events = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._pid = os.getpid()
+        atexit.register(self.flush)
+
+    def _check_pid(self) -> None:
+        # The events buffered before a fork belong to the parent process
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._events = []
+            self._timer = None
+
+    def _pop_events(self) -> List[Dict]:
+        events, self._events = self._events, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return events
+
+    def _start_timer(self) -> None:
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(self.batch_interval, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def add(self, event: Dict) -> None:
+        with self._lock:
+            self._check_pid()
+            self._events.append(event)
+            if len(self._events) >= self.batch_size:
+                events = self._pop_events()
+            else:
+                events = None
+                self._start_timer()
+        if events:
+            self.publish(events)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._check_pid()
+            events = self._pop_events()
+        if events:
+            self.publish(events)
+
+    def publish(self, events: List[Dict]) -> None:
+        from polyaxon.celery_api import celery_app
+
+        if len(events) == 1:
+            kwargs = {'event': events[0]}
+        else:
+            kwargs = {'events': events}
+        for task in self.tasks:
+            celery_app.send_task(task, kwargs=kwargs)
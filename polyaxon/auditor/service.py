@@ -1,13 +1,19 @@
-from typing import Dict
+import random
+
+from typing import Dict, List
+
+import conf
 
 from auditor.manager import default_manager
+from auditor.pipeline import EventsPipeline
+from event_manager import event_context
 from event_manager.event import Event
 from event_manager.event_service import EventService
 
 
 class AuditorService(EventService):
     """An service that just passes the event to author services."""
-    __all__ = EventService.__all__ + ('log', 'notify', 'track')
+    __all__ = EventService.__all__ + ('log', 'log_many', 'notify', 'track', 'flush')
 
     event_manager = default_manager
 
@@ -17,6 +23,7 @@ class AuditorService(EventService):
         self.notifier = None
         self.tracker = None
         self.ref_id = None
+        self.pipeline = None
 
     def get_ref_id(self) -> str:
         if self.ref_id:
@@ -30,25 +37,32 @@ class AuditorService(EventService):
             pass
         return self.ref_id
 
+    @staticmethod
+    def should_publish(event: Event) -> bool:
+        """Only view events are sampled, the other events are always published."""
+        if not event_context.get_event_action(event.event_type).endswith('viewed'):
+            return True
+        rate = conf.get('AUDITOR_EVENTS_SAMPLING').get(event.event_type)
+        if rate is None:
+            return True
+        return random.random() < rate
+
     def record_event(self, event: Event) -> None:
         """
         Record the event async.
         """
-        from polyaxon.celery_api import celery_app
-        from polyaxon.settings import EventsCeleryTasks
-
         if not event.ref_id:
             event.ref_id = self.get_ref_id()
         serialized_event = event.serialize(dumps=False,
                                            include_actor_name=True,
                                            include_instance_info=True)
 
-        celery_app.send_task(EventsCeleryTasks.EVENTS_TRACK, kwargs={'event': serialized_event})
-        celery_app.send_task(EventsCeleryTasks.EVENTS_LOG, kwargs={'event': serialized_event})
-        celery_app.send_task(EventsCeleryTasks.EVENTS_NOTIFY, kwargs={'event': serialized_event})
-        # We include the instance in the serialized event for executor
-        serialized_event['instance'] = event.instance
-        self.executor.record(event_type=event.event_type, event_data=serialized_event)
+        if self.should_publish(event):
+            self.pipeline.add(serialized_event)
+        # We include the instance in a copy of the serialized event for executor,
+        # the buffered event is published later and needs to stay serializable
+        self.executor.record(event_type=event.event_type,
+                             event_data=dict(serialized_event, instance=event.instance))
 
     def notify(self, event: Dict) -> None:
         self.notifier.record(event_type=event['type'], event_data=event)
@@ -59,6 +73,14 @@ class AuditorService(EventService):
     def log(self, event: Dict) -> None:
         self.activitylogs.record(event_type=event['type'], event_data=event)
 
+    def log_many(self, events: List[Dict]) -> None:
+        self.activitylogs.record_many(events_data=events)
+
+    def flush(self) -> None:
+        """Publishes the buffered events."""
+        if self.pipeline:
+            self.pipeline.flush()
+
     def setup(self) -> None:
         super().setup()
         # Load default event types
@@ -73,3 +95,13 @@ class AuditorService(EventService):
         self.tracker = tracker
         self.activitylogs = activitylogs
         self.executor = executor
+
+        if self.pipeline is None:
+            from polyaxon.settings import EventsCeleryTasks
+
+            self.pipeline = EventsPipeline(
+                tasks=(EventsCeleryTasks.EVENTS_TRACK,
+                       EventsCeleryTasks.EVENTS_LOG,
+                       EventsCeleryTasks.EVENTS_NOTIFY),
+                batch_size=conf.get('AUDITOR_EVENTS_BATCH_SIZE'),
+                batch_interval=conf.get('AUDITOR_EVENTS_BATCH_INTERVAL'))
@@ -0,0 +1,80 @@
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.fields.jsonb import KeyTextTransform
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Case, F, IntegerField, Max, When
+from django.db.models.functions import Cast
+
+import conf
+
+from db.models.activitylogs import ActivityLog
+from db.models.projects import Project
+from db.partitions import MonthlyPartitions
+
+_logger = logging.getLogger('polyaxon.commands')
+
+
+class Command(BaseCommand):
+    """Management utility to migrate the existing activity logs to their new storage.
+
+    1. sets the project of the activity logs recorded before it was denormalized.
+    2. optionally converts the table to monthly partitions,
+       after which the retention drops partitions instead of deleting rows.
+
+    Both steps work in batches and can be interrupted and run again.
+    """
+    help = 'Used to backfill the activity logs projects and to partition the activity logs.'
+    requires_migrations_checks = True
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            dest='batch_size',
+            default=None,
+            help='Specifies the number of rows updated or copied per query.',
+        )
+        parser.add_argument(
+            '--partition',
+            dest='partition',
+            action='store_true',
+            default=False,
+            help='Converts the activity logs table to monthly partitions.',
+        )
+
+    @staticmethod
+    def backfill_projects(batch_size: int) -> int:
+        project_content_type = ContentType.objects.get_for_model(Project)
+        project_id = Case(
+            When(content_type=project_content_type, then=F('object_id')),
+            default=Cast(KeyTextTransform('project.id', 'context'), IntegerField()))
+
+        max_id = ActivityLog.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        num_updated = 0
+        for from_id in range(0, max_id, batch_size):
+            num_updated += ActivityLog.objects.filter(
+                id__gt=from_id,
+                id__lte=from_id + batch_size,
+                project_id__isnull=True,
+            ).update(project_id=project_id)
+            _logger.debug('Backfilled the activity logs up to %s', from_id + batch_size)
+        return num_updated
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options['batch_size'] or conf.get('CLEANING_DELETION_BATCH_SIZE')
+        if batch_size <= 0:
+            raise CommandError('The batch size must be a positive integer.')
+
+        partitions = MonthlyPartitions(ActivityLog)
+        if options['partition'] and not partitions.is_supported():
+            raise CommandError('Partitioning the activity logs requires Postgres 11 or later.')
+
+        num_updated = self.backfill_projects(batch_size=batch_size)
+        self.stdout.write('Backfilled the project of {} activity logs.'.format(num_updated))
+
+        if options['partition']:
+            if partitions.partition_table(batch_size=batch_size):
+                self.stdout.write('Partitioned the activity logs by month.')
+            else:
+                self.stdout.write('The activity logs are already partitioned.')
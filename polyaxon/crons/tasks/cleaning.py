@@ -1,14 +1,39 @@
+from django.db.models import QuerySet
+from django.utils import timezone
+
+import conf
+
 from crons.tasks.utils import get_date_check
 from db.models.activitylogs import ActivityLog
 from db.models.notification import NotificationEvent
+from db.partitions import MonthlyPartitions, get_next_month_start
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import CleaningIntervals, CronsCeleryTasks
 
 
+def delete_in_batches(queryset: QuerySet) -> int:
+    """Deletes the rows of a queryset with bounded queries, returns the number of rows deleted."""
+    batch_size = conf.get('CLEANING_DELETION_BATCH_SIZE')
+    pks = queryset.order_by().values_list('pk', flat=True)
+    num_deleted = 0
+    while True:
+        batch = list(pks[:batch_size])
+        if not batch:
+            return num_deleted
+        num_deleted += queryset.model.objects.filter(pk__in=batch).delete()[0]
+
+
 @celery_app.task(name=CronsCeleryTasks.CLEAN_ACTIVITY_LOGS, ignore_result=True)
 def clean_activity_logs() -> None:
     last_date = get_date_check(days=CleaningIntervals.ACTIVITY_LOGS)
-    ActivityLog.objects.filter(created_at__lte=last_date).delete()
+    partitions = MonthlyPartitions(ActivityLog)
+    if partitions.is_partitioned():
+        # The next month's partition exists before its first activity log
+        now = timezone.now()
+        partitions.create_partitions(start=now, end=get_next_month_start(now))
+        partitions.drop_partitions(before=last_date)
+    # The expired rows left in the current partitions, or in a non partitioned table
+    delete_in_batches(ActivityLog.objects.filter(created_at__lte=last_date))
 
 
 @celery_app.task(name=CronsCeleryTasks.CLEAN_NOTIFICATIONS, ignore_result=True)
@@ -2,7 +2,9 @@ from django.db.models import Count
 
 import conf
 
+from constants.experiment_groups import ExperimentGroupLifeCycle
 from constants.experiments import ExperimentLifeCycle
+from db.models.experiment_groups import ExperimentGroup, GroupTypes
 from db.models.experiments import Experiment
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import CronsCeleryTasks, SchedulerCeleryTasks
@@ -18,3 +20,18 @@ def experiments_sync_jobs_statuses() -> None:
             SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
             kwargs={'experiment_id': experiment.id},
             countdown=conf.get('GLOBAL_COUNTDOWN'))
+
+
+@celery_app.task(name=CronsCeleryTasks.EXPERIMENT_GROUPS_REPAIR_STATUS_COUNTERS,
+                 ignore_result=True)
+def experiment_groups_repair_status_counters(experiment_group_ids=None) -> None:
+    """Recomputes the status counters of the groups that are not done yet,
+    or of the given groups."""
+    experiment_groups = ExperimentGroup.objects.filter(group_type=GroupTypes.STUDY)
+    if experiment_group_ids:
+        experiment_groups = experiment_groups.filter(id__in=experiment_group_ids)
+    else:
+        experiment_groups = experiment_groups.exclude(
+            status__status__in=ExperimentGroupLifeCycle.DONE_STATUS)
+    for experiment_group in experiment_groups.only('id', 'group_type'):
+        experiment_group.repair_status_counters()
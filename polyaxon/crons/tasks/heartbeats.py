@@ -5,6 +5,7 @@ from constants.jobs import JobLifeCycle
 from db.models.build_jobs import BuildJob
 from db.models.experiments import Experiment
 from db.models.jobs import Job
+from db.redis.heartbeat import RedisHeartBeat
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import CronsCeleryTasks, SchedulerCeleryTasks
 
@@ -12,7 +13,9 @@ from polyaxon.settings import CronsCeleryTasks, SchedulerCeleryTasks
 @celery_app.task(name=CronsCeleryTasks.HEARTBEAT_EXPERIMENTS, ignore_result=True)
 def heartbeat_experiments() -> None:
     experiments = Experiment.objects.filter(status__status__in=ExperimentLifeCycle.HEARTBEAT_STATUS)
-    for experiment in experiments.values_list('id', flat=True):
+    # Only the experiments without heartbeat are checked
+    for experiment in RedisHeartBeat.get_dead_experiments(
+            experiments.values_list('id', flat=True)):
         celery_app.send_task(
             SchedulerCeleryTasks.EXPERIMENTS_CHECK_HEARTBEAT,
             kwargs={'experiment_id': experiment},
@@ -22,7 +25,8 @@ def heartbeat_experiments() -> None:
 @celery_app.task(name=CronsCeleryTasks.HEARTBEAT_JOBS, ignore_result=True)
 def heartbeat_jobs() -> None:
     jobs = Job.objects.filter(status__status__in=JobLifeCycle.HEARTBEAT_STATUS)
-    for job in jobs.values_list('id', flat=True):
+    # Only the jobs without heartbeat are checked
+    for job in RedisHeartBeat.get_dead_jobs(jobs.values_list('id', flat=True)):
         celery_app.send_task(
             SchedulerCeleryTasks.JOBS_CHECK_HEARTBEAT,
             kwargs={'job_id': job},
@@ -32,7 +36,8 @@ def heartbeat_jobs() -> None:
 @celery_app.task(name=CronsCeleryTasks.HEARTBEAT_BUILDS, ignore_result=True)
 def heartbeat_builds() -> None:
     build_jobs = BuildJob.objects.filter(status__status__in=JobLifeCycle.HEARTBEAT_STATUS)
-    for build_job in build_jobs.values_list('id', flat=True):
+    # Only the builds without heartbeat are checked
+    for build_job in RedisHeartBeat.get_dead_builds(build_jobs.values_list('id', flat=True)):
         celery_app.send_task(
             SchedulerCeleryTasks.BUILD_JOBS_CHECK_HEARTBEAT,
             kwargs={'build_job_id': build_job},
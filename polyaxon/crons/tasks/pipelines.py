@@ -0,0 +1,21 @@
+from constants.pipelines import PipelineStatuses
+from db.models.pipelines import PipelineRun
+from polyaxon.celery_api import celery_app
+from polyaxon.settings import CronsCeleryTasks, PipelinesCeleryTasks
+
+
+@celery_app.task(name=CronsCeleryTasks.PIPELINES_REPAIR_COUNTERS, ignore_result=True)
+def pipelines_repair_counters(pipeline_run_ids=None) -> None:
+    """Recomputes the scheduling counters of the running pipeline runs, or of the given ones,
+    and notifies the operation runs that can start, e.g. after a lost notification."""
+    pipeline_runs = PipelineRun.objects.all()
+    if pipeline_run_ids:
+        pipeline_runs = pipeline_runs.filter(id__in=pipeline_run_ids)
+    else:
+        pipeline_runs = pipeline_runs.filter(status__status__in=PipelineStatuses.RUNNING_STATUS)
+    for pipeline_run in pipeline_runs.only('id'):
+        pipeline_run.repair_counters()
+        for op_run in pipeline_run.get_operation_runs_to_schedule():
+            celery_app.send_task(
+                PipelinesCeleryTasks.PIPELINES_START_OPERATION,
+                kwargs={'operation_run_id': op_run.id})
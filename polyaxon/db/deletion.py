@@ -0,0 +1,121 @@
+import logging
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set
+
+from django.db import connections, models, router
+from django.db.models.deletion import ProtectedError, get_candidate_relations_to_delete
+
+import conf
+
+from db.models.bookmarks import Bookmark
+from db.models.utils import PersistenceModel
+
+_logger = logging.getLogger('polyaxon.db.deletion')
+
+# The models that can be bookmarked, their bookmarks are deleted with them
+BOOKMARKED_MODELS = {
+    'project',
+    'experimentgroup',
+    'experiment',
+    'job',
+    'buildjob',
+    'notebookjob',
+    'tensorboardjob',
+}
+
+
+class CascadeDeletion(object):
+    """Deletes an instance and all the rows depending on it in bounded batches.
+
+    The dependency tree is walked leaves first: for every batch of ids,
+    the dependent rows are deleted (`CASCADE`) or detached (`SET_NULL`) before the batch itself
+    is deleted with a raw `DELETE ... WHERE id IN (...)`.
+    The rows are never loaded and no deletion signals are sent.
+
+    The walk only depends on the rows left, and the instance is deleted last,
+    so an interrupted deletion is resumed by running it again.
+    """
+
+    def __init__(self, instance: models.Model, batch_size: int = None) -> None:
+        self.instance = instance
+        self.batch_size = batch_size or conf.get('CLEANING_DELETION_BATCH_SIZE')
+        self.using = router.db_for_write(instance.__class__, instance=instance)
+        self.deleted = Counter()
+        self._relations = {}
+
+    @property
+    def num_deleted(self) -> int:
+        return sum(self.deleted.values())
+
+    def get_relations(self, model) -> List[Any]:
+        if model not in self._relations:
+            self._relations[model] = list(get_candidate_relations_to_delete(model._meta))
+        return self._relations[model]
+
+    def get_outputs_persistences(self) -> Set[Optional[str]]:
+        """Returns the outputs persistences of the instance and of its direct dependents.
+
+        The dependents' outputs are stored under the instance's subpath,
+        the subpath needs to be deleted in every persistence.
+        """
+        model = self.instance.__class__
+        persistences = {self.instance.persistence_outputs}
+        for related in self.get_relations(model):
+            if not issubclass(related.related_model, PersistenceModel):
+                continue
+            persistences |= set(related.related_model._base_manager.using(self.using).filter(
+                **{related.field.name: self.instance}
+            ).order_by().values_list('persistence__outputs', flat=True).distinct())
+        return persistences
+
+    def delete(self) -> Dict[str, int]:
+        """Deletes the instance and its dependents, returns the number of rows per model."""
+        model = self.instance.__class__
+        self.delete_queryset(model._base_manager.using(self.using).filter(pk=self.instance.pk))
+        _logger.info('Deleted %s rows with `%s`: %s',
+                     self.num_deleted, self.instance, dict(self.deleted))
+        return dict(self.deleted)
+
+    def delete_queryset(self, queryset: models.QuerySet) -> None:
+        queryset = queryset.order_by().values_list('pk', flat=True)
+        while True:
+            pks = list(queryset[:self.batch_size])
+            if not pks:
+                return
+            self.delete_batch(queryset.model, pks)
+
+    def delete_batch(self, model, pks: List[Any]) -> None:
+        for related in self.get_relations(model):
+            field = related.field
+            on_delete = field.remote_field.on_delete
+            related_queryset = related.related_model._base_manager.using(self.using).filter(
+                **{'{}__in'.format(field.name): pks})
+            if on_delete == models.CASCADE:
+                self.delete_queryset(related_queryset)
+            elif on_delete == models.SET_NULL:
+                related_queryset.update(**{field.name: None})
+            elif on_delete == models.PROTECT:
+                raise ProtectedError(
+                    'Cannot delete `{}` rows, they are referenced through a protected '
+                    'foreign key `{}.{}`'.format(model.__name__,
+                                                 related.related_model.__name__,
+                                                 field.name),
+                    related_queryset)
+
+        if model._meta.model_name in BOOKMARKED_MODELS:
+            Bookmark.objects.using(self.using).filter(
+                content_type__model=model._meta.model_name,
+                object_id__in=pks).delete()
+
+        connection = connections[self.using]
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {} WHERE {} IN ({})'.format(
+                connection.ops.quote_name(model._meta.db_table),
+                connection.ops.quote_name(model._meta.pk.column),
+                ', '.join(['%s'] * len(pks))), pks)
+            num_deleted = cursor.rowcount
+
+        self.deleted[model._meta.label] += num_deleted
+        _logger.debug('Deleted %s `%s` rows with `%s`, %s rows deleted so far',
+                      num_deleted, model._meta.label, self.instance, self.num_deleted)
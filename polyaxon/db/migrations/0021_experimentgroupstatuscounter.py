@@ -0,0 +1,45 @@
+# Generated by Django 2.2 on 2026-10-18 10:12
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def migrate_experiment_group_status_counters(apps, schema_editor):
+    Experiment = apps.get_model('db', 'Experiment')
+    ExperimentGroupStatusCounter = apps.get_model('db', 'ExperimentGroupStatusCounter')
+
+    status_counts = Experiment.objects.filter(
+        deleted=False,
+        experiment_group__isnull=False,
+        experiment_group__group_type='study',
+    ).order_by().values_list('experiment_group_id', 'status__status').annotate(count=Count('id'))
+    ExperimentGroupStatusCounter.objects.bulk_create([
+        ExperimentGroupStatusCounter(experiment_group_id=experiment_group_id,
+                                     status=status,
+                                     count=count)
+        for experiment_group_id, status, count in status_counts
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0020_auto_20190307_1611'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExperimentGroupStatusCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(blank=True, choices=[('created', 'created'), ('resuming', 'resuming'), ('warning', 'warning'), ('building', 'building'), ('scheduled', 'scheduled'), ('starting', 'starting'), ('running', 'running'), ('succeeded', 'succeeded'), ('failed', 'failed'), ('stopped', 'stopped'), ('unknown', 'unknown')], max_length=64, null=True)),
+                ('count', models.IntegerField(default=0)),
+                ('experiment_group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_counters', to='db.ExperimentGroup')),
+            ],
+            options={
+                'unique_together': {('experiment_group', 'status')},
+            },
+        ),
+        migrations.RunPython(migrate_experiment_group_status_counters),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 2.2 on 2026-10-18 14:05
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+DONE_STATUS = ['succeeded', 'failed', 'upstream_failed', 'stopped', 'skipped']
+RUNNING_STATUS = ['scheduled', 'running']
+UPSTREAM_STATUS_COUNTERS = {
+    'n_upstream_done': DONE_STATUS,
+    'n_upstream_succeeded': ['succeeded'],
+    'n_upstream_failed': ['failed'],
+    'n_upstream_upstream_failed': ['upstream_failed'],
+}
+
+
+def migrate_pipelines_scheduling_counters(apps, schema_editor):
+    Operation = apps.get_model('db', 'Operation')
+    PipelineRun = apps.get_model('db', 'PipelineRun')
+    OperationRun = apps.get_model('db', 'OperationRun')
+
+    running_op_runs = OperationRun.objects.filter(deleted=False,
+                                                  status__status__in=RUNNING_STATUS).order_by()
+    for pipeline_run_id, count in running_op_runs.values_list('pipeline_run_id').annotate(
+            count=Count('id')):
+        PipelineRun.objects.filter(id=pipeline_run_id).update(n_running_operation_runs=count)
+    for operation_id, count in running_op_runs.values_list('operation_id').annotate(
+            count=Count('id')):
+        Operation.objects.filter(id=operation_id).update(n_running_runs=count)
+
+    live_upstream_runs = Q(upstream_runs__deleted=False)
+    annotations = {'count_n_upstream_runs': Count('upstream_runs', filter=live_upstream_runs)}
+    for name, statuses in UPSTREAM_STATUS_COUNTERS.items():
+        annotations['count_' + name] = Count(
+            'upstream_runs',
+            filter=live_upstream_runs & Q(upstream_runs__status__status__in=statuses))
+    counters = OperationRun.objects.filter(
+        upstream_runs__isnull=False).order_by().values('id').annotate(**annotations)
+    OperationRun.objects.bulk_update([
+        OperationRun(id=counter['id'],
+                     n_upstream_runs=counter['count_n_upstream_runs'],
+                     **{name: counter['count_' + name] for name in UPSTREAM_STATUS_COUNTERS})
+        for counter in counters
+    ], ['n_upstream_runs'] + list(UPSTREAM_STATUS_COUNTERS.keys()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0021_experimentgroupstatuscounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='operation',
+            name='n_running_runs',
+            field=models.IntegerField(default=0, editable=False, help_text='The number of runs of this operation in a running status.'),
+        ),
+        migrations.AddField(
+            model_name='pipelinerun',
+            name='n_running_operation_runs',
+            field=models.IntegerField(default=0, editable=False, help_text='The number of operation runs of this pipeline run in a running status.'),
+        ),
+        migrations.AddField(
+            model_name='operationrun',
+            name='n_upstream_runs',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='operationrun',
+            name='n_upstream_done',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='operationrun',
+            name='n_upstream_succeeded',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='operationrun',
+            name='n_upstream_failed',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='operationrun',
+            name='n_upstream_upstream_failed',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(migrate_pipelines_scheduling_counters,
+                             reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 2.2 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0022_pipelines_scheduling_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='project_id',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='The project of the activity, denormalized from the context. The project is not a foreign key, its logs outlive it.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['actor', 'created_at'], name='activitylog_actor_created'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['event_type', 'created_at'], name='activitylog_type_created'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['project_id', 'created_at'], name='activitylog_project_created'),
+        ),
+    ]
@@ -25,11 +25,22 @@ class ActivityLog(models.Model):
         related_name='+')
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey('content_type', 'object_id')
+    project_id = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='The project of the activity, denormalized from the context. '
+                  'The project is not a foreign key, its logs outlive it.')
 
     class Meta:
         app_label = 'db'
         verbose_name = 'activity log'
         verbose_name_plural = 'activities logs'
+        indexes = [
+            models.Index(fields=['actor', 'created_at'], name='activitylog_actor_created'),
+            models.Index(fields=['event_type', 'created_at'], name='activitylog_type_created'),
+            models.Index(fields=['project_id', 'created_at'], name='activitylog_project_created'),
+        ]
 
     def __str__(self) -> str:
         return '{} - {}'.format(self.event_type, self.created_at)
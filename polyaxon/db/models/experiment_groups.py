@@ -10,8 +10,8 @@ from hestia.datetime_typing import AwareDT
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
 from django.contrib.postgres.fields.jsonb import KeyTransform
-from django.db import models
-from django.db.models import Q
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q
 from django.utils.functional import cached_property
 
 from constants.experiment_groups import ExperimentGroupLifeCycle
@@ -38,6 +38,10 @@ from schemas.specifications import GroupSpecification
 
 _logger = logging.getLogger('polyaxon.db.experiment_groups')
 
+# Statuses of the experiments using the cluster resources
+K8S_STATUSES = (ExperimentLifeCycle.RUNNING_STATUS |
+                {ExperimentLifeCycle.UNKNOWN, ExperimentLifeCycle.WARNING})
+
 
 class GroupTypes(object):
     STUDY = 'study'
@@ -182,12 +186,14 @@ class ExperimentGroup(DiffModel,
         if not super().archive():
             return False
         self.experiments.update(deleted=True)
+        self.repair_status_counters()
         return True
 
     def restore(self) -> bool:
         if not super().restore():
             return False
         self.all_experiments.update(deleted=False)
+        self.repair_status_counters()
         return True
 
     @cached_property
@@ -284,10 +290,8 @@ class ExperimentGroup(DiffModel,
 
     @property
     def k8s_experiments(self):
-        scheduled_statuses = (ExperimentLifeCycle.RUNNING_STATUS |
-                              {ExperimentLifeCycle.UNKNOWN, ExperimentLifeCycle.WARNING})
         return self.group_experiments.filter(
-            status__status__in=scheduled_statuses).distinct()
+            status__status__in=K8S_STATUSES).distinct()
 
     @property
     def done_experiments(self):
@@ -304,7 +308,44 @@ class ExperimentGroup(DiffModel,
         """We need to check if we are allowed to start the experiment
         If the polyaxonfile has concurrency we need to check how many experiments are running.
         """
-        return self.concurrency - self.k8s_experiments.count()
+        return self.concurrency - self.count_experiments(statuses=K8S_STATUSES)
+
+    @property
+    def n_non_done_experiments(self) -> int:
+        status_counts = self.get_status_counts()
+        return sum(count for status, count in status_counts.items()
+                   if status not in ExperimentLifeCycle.DONE_STATUS)
+
+    def get_status_counts(self) -> Dict[str, int]:
+        """Returns the number of experiments by last status.
+
+        The counts are served from the precomputed status counters,
+        except for selections which are counted with a single query.
+        """
+        if self.is_selection:
+            return dict(self.group_experiments.order_by().values_list(
+                'status__status').annotate(count=Count('id', distinct=True)))
+        # Uses the prefetched counters if any
+        return {counter.status: counter.count
+                for counter in self.status_counters.all() if counter.count}
+
+    def count_experiments(self, statuses=None, status_counts: Dict[str, int] = None) -> int:
+        status_counts = status_counts if status_counts is not None else self.get_status_counts()
+        if statuses is None:
+            return sum(status_counts.values())
+        return sum(status_counts.get(status, 0) for status in statuses)
+
+    def repair_status_counters(self) -> None:
+        """Recomputes the status counters from the experiments' last statuses."""
+        with transaction.atomic():
+            self.status_counters.all().delete()
+            if self.is_selection:
+                return
+            ExperimentGroupStatusCounter.objects.bulk_create([
+                ExperimentGroupStatusCounter(experiment_group=self, status=status, count=count)
+                for status, count in self.experiments.order_by().values_list(
+                    'status__status').annotate(count=Count('id'))
+            ])
 
     @property
     def iteration(self):
@@ -426,6 +467,60 @@ class ExperimentGroupIteration(DiffModel):
         return '{} <{}>'.format(self.experiment_group, self.created_at)
 
 
+class ExperimentGroupStatusCounter(models.Model):
+    """A denormalized number of experiments of a group in a given status.
+
+    The counters are updated on every experiment status change,
+    and can be recomputed with `ExperimentGroup.repair_status_counters`.
+    """
+    experiment_group = models.ForeignKey(
+        'db.ExperimentGroup',
+        on_delete=models.CASCADE,
+        related_name='status_counters')
+    status = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        choices=ExperimentLifeCycle.CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        app_label = 'db'
+        unique_together = (('experiment_group', 'status'),)
+
+    def __str__(self) -> str:
+        return '{} <{}: {}>'.format(self.experiment_group, self.status, self.count)
+
+    @classmethod
+    def increment(cls, experiment_group_id: int, status: Optional[str], value: int = 1) -> None:
+        counters = cls.objects.filter(experiment_group_id=experiment_group_id, status=status)
+        if counters.update(count=F('count') + value) or value < 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(experiment_group_id=experiment_group_id,
+                                   status=status,
+                                   count=value)
+        except IntegrityError:
+            # Created concurrently
+            counters.update(count=F('count') + value)
+
+    @classmethod
+    def update_status(cls,
+                      experiment_group_id: int,
+                      previous_status: Optional[str],
+                      status: Optional[str]) -> None:
+        """Moves an experiment from the previous status counter to the new one."""
+        if previous_status == status:
+            return
+        if previous_status:
+            cls.increment(experiment_group_id=experiment_group_id,
+                          status=previous_status,
+                          value=-1)
+        if status:
+            cls.increment(experiment_group_id=experiment_group_id, status=status)
+
+
 class ExperimentGroupStatus(StatusModel):
     """A model that represents an experiment group status at certain time."""
     STATUSES = ExperimentGroupLifeCycle
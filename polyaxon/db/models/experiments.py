@@ -17,6 +17,7 @@ from constants.jobs import JobLifeCycle
 from db.models.abstract_jobs import TensorboardJobMixin
 from db.models.charts import ChartViewModel
 from db.models.cloning_strategies import CloningStrategy
+from db.models.experiment_groups import ExperimentGroupStatusCounter
 from db.models.statuses import LastStatusMixin, StatusModel
 from db.models.unique_names import EXPERIMENT_UNIQUE_NAME_FORMAT
 from db.models.utils import (
@@ -241,6 +242,27 @@ class Experiment(DiffModel,
         """If the experiment belongs to a experiment_group or is independently created."""
         return self.experiment_group is None
 
+    def archive(self) -> bool:
+        if not super().archive():
+            return False
+        self.update_group_status_counters(previous_status=self.last_status, status=None)
+        return True
+
+    def restore(self) -> bool:
+        if not super().restore():
+            return False
+        self.update_group_status_counters(previous_status=None, status=self.last_status)
+        return True
+
+    def update_group_status_counters(self,
+                                     previous_status: Optional[str],
+                                     status: Optional[str]) -> None:
+        if not self.experiment_group_id:
+            return
+        ExperimentGroupStatusCounter.update_status(experiment_group_id=self.experiment_group_id,
+                                                   previous_status=previous_status,
+                                                   status=status)
+
     def update_status(self) -> bool:
         current_status = self.last_status
         calculated_status = self.calculated_status
@@ -1,7 +1,7 @@
 import logging
 import uuid
 
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from celery.result import AsyncResult
 from hestia.datetime_typing import AwareDT
@@ -9,6 +9,7 @@ from hestia.datetime_typing import AwareDT
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
 from django.db import models
+from django.db.models import Count, F, Q
 from django.dispatch import Signal
 
 from constants.pipelines import OperationStatuses, PipelineStatuses, TriggerPolicy
@@ -29,6 +30,16 @@ _logger = logging.getLogger('db.pipelines')
 
 status_change = Signal(providing_args=["instance", "status"])
 
+# The upstream statuses counted by each upstream counter of an operation run
+UPSTREAM_STATUS_COUNTERS = {
+    'n_upstream_done': OperationStatuses.DONE_STATUS,
+    'n_upstream_succeeded': {OperationStatuses.SUCCEEDED},
+    'n_upstream_failed': {OperationStatuses.FAILED},
+    'n_upstream_upstream_failed': {OperationStatuses.UPSTREAM_FAILED},
+}
+
+UPSTREAM_COUNTERS = ['n_upstream_runs'] + list(UPSTREAM_STATUS_COUNTERS.keys())
+
 
 class Schedule(DiffModel):
     """A model that represents the scheduling behaviour of an operation or a pipeline."""
@@ -137,12 +148,12 @@ class Pipeline(DiffModel, NameableModel, DescribableModel, TagModel, ExecutableM
         """Construct the DAG of this pipeline based on the its operations and their downstream."""
         from pipelines import dags
 
-        operations = self.operations.all().prefetch_related('downstream_operations')
-
-        def get_downstream(op):
-            return op.downstream_operations.values_list('id', flat=True)
+        # All the edges are fetched in a single query, (operation, downstream operation)
+        edges = Operation.upstream_operations.through.objects.filter(
+            to_operation__pipeline=self,
+            from_operation__deleted=False).values_list('to_operation_id', 'from_operation_id')
 
-        return dags.get_dag(operations, get_downstream)
+        return dags.get_dag_from_edges(self.operations.all(), edges)
 
 
 class Operation(DiffModel,
@@ -217,6 +228,10 @@ class Operation(DiffModel,
         blank=True,
         help_text="When set, an operation will be able to limit the concurrent "
                   "runs across execution_dates")
+    n_running_runs = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text="The number of runs of this operation in a running status.")
     run_as_user = models.CharField(
         max_length=64,
         null=True,
@@ -390,6 +405,10 @@ class PipelineRun(RunModel):
         null=True,
         editable=True,
         on_delete=models.SET_NULL)
+    n_running_operation_runs = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text="The number of operation runs of this pipeline run in a running status.")
 
     class Meta:
         app_label = 'db'
@@ -401,12 +420,13 @@ class PipelineRun(RunModel):
         """
         from pipelines import dags
 
-        operation_runs = self.operation_runs.all().prefetch_related('downstream_runs')
+        # All the edges are fetched in a single query, (operation run, downstream operation run)
+        edges = OperationRun.upstream_runs.through.objects.filter(
+            to_operationrun__pipeline_run=self,
+            from_operationrun__deleted=False).values_list('to_operationrun_id',
+                                                          'from_operationrun_id')
 
-        def get_downstream(op_run):
-            return op_run.downstream_runs.values_list('id', flat=True)
-
-        return dags.get_dag(operation_runs, get_downstream)
+        return dags.get_dag_from_edges(self.operation_runs.all(), edges)
 
     def on_finished(self, message: str = None) -> None:
         self.set_status(status=self.STATUSES.FINISHED, message=message)
@@ -456,8 +476,13 @@ class PipelineRun(RunModel):
 
     @property
     def n_operation_runs_to_start(self):
-        """We need to check if we are allowed to start any operations"""
-        return self.pipeline.concurrency - self.running_operation_runs.count()
+        """We need to check if we are allowed to start any operations.
+
+        The running operation runs are counted on every status change,
+        only the counter is read again.
+        """
+        self.refresh_from_db(fields=['n_running_operation_runs'])
+        return self.pipeline.concurrency - self.n_running_operation_runs
 
     def check_concurrency(self) -> bool:
         """ Check the pipeline concurrency.
@@ -473,6 +498,34 @@ class PipelineRun(RunModel):
 
         return self.n_operation_runs_to_start > 0
 
+    def get_operation_runs_to_schedule(self) -> List['OperationRun']:
+        """Returns the created operation runs whose upstream is decided,
+        i.e. that can start or that cannot start anymore."""
+        op_runs = self.operation_runs.filter(
+            status__status=OperationStatuses.CREATED).select_related('operation').order_by('id')
+        return [op_run for op_run in op_runs if op_run.get_upstream_state() is not None]
+
+    def repair_counters(self) -> None:
+        """Recomputes the scheduling counters from the operation runs' last statuses.
+
+        The running counters of the pipeline run and of its operations,
+        and the upstream counters of its operation runs.
+        """
+        running_op_runs = OperationRun.objects.filter(
+            status__status__in=OperationStatuses.RUNNING_STATUS).order_by()
+        PipelineRun.all.filter(id=self.id).update(
+            n_running_operation_runs=running_op_runs.filter(pipeline_run=self).count())
+
+        operation_ids = set(self.operation_runs.values_list('operation_id', flat=True))
+        n_running_runs = dict(running_op_runs.filter(
+            operation_id__in=operation_ids).values_list('operation_id').annotate(Count('id')))
+        for operation_id in operation_ids:
+            Operation.all.filter(id=operation_id).update(
+                n_running_runs=n_running_runs.get(operation_id, 0))
+
+        OperationRun.repair_upstream_counters(
+            operation_run_ids=self.operation_runs.values_list('id', flat=True))
+
 
 class OperationRun(RunModel):
     """A model that represents an execution behaviour/run of instance of an operation."""
@@ -503,6 +556,13 @@ class OperationRun(RunModel):
         null=True,
         help_text='The kwargs required to execute the celery task.')
     celery_task_id = models.CharField(max_length=36, null=False, blank=True)
+    # The upstream counters, the number of upstream runs, and of the ones in a given status,
+    # updated on every status change of the upstream runs.
+    n_upstream_runs = models.IntegerField(default=0, editable=False)
+    n_upstream_done = models.IntegerField(default=0, editable=False)
+    n_upstream_succeeded = models.IntegerField(default=0, editable=False)
+    n_upstream_failed = models.IntegerField(default=0, editable=False)
+    n_upstream_upstream_failed = models.IntegerField(default=0, editable=False)
 
     class Meta:
         app_label = 'db'
@@ -542,38 +602,149 @@ class OperationRun(RunModel):
         if not self.operation.concurrency:  # No concurrency set
             return True
 
-        ops_count = self.operation.runs.filter(
-            status__status__in=self.STATUSES.RUNNING_STATUS).count()
+        ops_count = Operation.all.filter(id=self.operation_id).values_list(
+            'n_running_runs', flat=True).get()
         return ops_count < self.operation.concurrency
 
+    @property
+    def upstream_counters(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in UPSTREAM_COUNTERS}
+
+    def refresh_upstream_counters(self) -> None:
+        self.refresh_from_db(fields=UPSTREAM_COUNTERS)
+
+    def _check_upstream_trigger(self, counters: Dict[str, int]) -> bool:
+        trigger_policy = self.operation.trigger_policy
+        if trigger_policy == TriggerPolicy.ONE_DONE:
+            return counters['n_upstream_done'] > 0
+        if trigger_policy == TriggerPolicy.ONE_SUCCEEDED:
+            return counters['n_upstream_succeeded'] > 0
+        if trigger_policy == TriggerPolicy.ONE_FAILED:
+            return counters['n_upstream_failed'] > 0
+
+        n_upstream_runs = counters['n_upstream_runs']
+        if trigger_policy == TriggerPolicy.ALL_DONE:
+            return counters['n_upstream_done'] == n_upstream_runs
+        if trigger_policy == TriggerPolicy.ALL_SUCCEEDED:
+            return counters['n_upstream_succeeded'] == n_upstream_runs
+        if trigger_policy == TriggerPolicy.ALL_FAILED:
+            n_failed = counters['n_upstream_failed'] + counters['n_upstream_upstream_failed']
+            return n_failed == n_upstream_runs
+        return False
+
     def check_upstream_trigger(self) -> bool:
         """Checks the upstream and the trigger rule."""
-        if self.operation.trigger_policy == TriggerPolicy.ONE_DONE:
-            return self.upstream_runs.filter(
-                status__status__in=self.STATUSES.DONE_STATUS).exists()
-        if self.operation.trigger_policy == TriggerPolicy.ONE_SUCCEEDED:
-            return self.upstream_runs.filter(
-                status__status=self.STATUSES.SUCCEEDED).exists()
-        if self.operation.trigger_policy == TriggerPolicy.ONE_FAILED:
-            return self.upstream_runs.filter(
-                status__status=self.STATUSES.FAILED).exists()
-
-        statuses = self.upstream_runs.values_list('status__status', flat=True)
-        if self.operation.trigger_policy == TriggerPolicy.ALL_DONE:
-            return not bool([True for status in statuses
-                             if status not in self.STATUSES.DONE_STATUS])
-        if self.operation.trigger_policy == TriggerPolicy.ALL_SUCCEEDED:
-            return not bool([True for status in statuses
-                             if status != self.STATUSES.SUCCEEDED])
-        if self.operation.trigger_policy == TriggerPolicy.ALL_FAILED:
-            return not bool([True for status in statuses
-                             if status not in self.STATUSES.FAILED_STATUS])
+        self.refresh_upstream_counters()
+        return self._check_upstream_trigger(self.upstream_counters)
 
     @property
     def is_upstream_done(self) -> bool:
-        statuses = self.upstream_runs.values_list('status__status', flat=True)
-        return not bool([True for status in statuses
-                         if status not in self.STATUSES.DONE_STATUS])
+        self.refresh_upstream_counters()
+        return self.n_upstream_done == self.n_upstream_runs
+
+    def get_upstream_state(self, counters: Dict[str, int] = None) -> Optional[bool]:
+        """Returns the state of the upstream based on the upstream counters.
+
+        Returns:
+            True if the trigger rule is met,
+            False if it cannot be met anymore because all the upstream runs are done,
+            None if it could still be met in the future.
+        """
+        counters = counters or self.upstream_counters
+        if self._check_upstream_trigger(counters):
+            return True
+        if counters['n_upstream_done'] == counters['n_upstream_runs']:
+            return False
+        return None
+
+    @classmethod
+    def repair_upstream_counters(cls, operation_run_ids: Iterable[int]) -> None:
+        """Recomputes the upstream counters of the operation runs from their upstream runs."""
+        live_upstream_runs = Q(upstream_runs__deleted=False)
+        annotations = {'count_n_upstream_runs': Count('upstream_runs', filter=live_upstream_runs)}
+        for name, statuses in UPSTREAM_STATUS_COUNTERS.items():
+            annotations['count_' + name] = Count(
+                'upstream_runs',
+                filter=live_upstream_runs & Q(upstream_runs__status__status__in=statuses))
+        counters = cls.all.filter(id__in=operation_run_ids).order_by().values('id').annotate(
+            **annotations)
+        cls.all.bulk_update([
+            cls(id=counter['id'], **{name: counter['count_' + name] for name in UPSTREAM_COUNTERS})
+            for counter in counters
+        ], UPSTREAM_COUNTERS, batch_size=1000)
+
+    def update_downstream_counters(self,
+                                   previous_status: Optional[str],
+                                   status: str) -> Dict[str, int]:
+        """Moves this operation run from the upstream counters of its previous status
+        to the ones of its new status in all its downstream runs.
+
+        Returns:
+            The changes of the counters.
+        """
+        delta = {}
+        for name, statuses in UPSTREAM_STATUS_COUNTERS.items():
+            value = int(status in statuses) - int(previous_status in statuses)
+            if value:
+                delta[name] = value
+        if delta:
+            OperationRun.all.filter(upstream_runs=self).update(
+                **{name: F(name) + value for name, value in delta.items()})
+        return delta
+
+    def update_running_counters(self, previous_status: Optional[str], status: str) -> int:
+        """Updates the running counters of the pipeline run and of the operation.
+
+        Returns:
+            The change of the counters, -1 if this operation run freed a running slot.
+        """
+        value = (int(status in self.STATUSES.RUNNING_STATUS) -
+                 int(previous_status in self.STATUSES.RUNNING_STATUS))
+        if value:
+            PipelineRun.all.filter(id=self.pipeline_run_id).update(
+                n_running_operation_runs=F('n_running_operation_runs') + value)
+            Operation.all.filter(id=self.operation_id).update(
+                n_running_runs=F('n_running_runs') + value)
+        return value
+
+    def get_downstream_runs_to_schedule(self, delta: Dict[str, int]) -> List['OperationRun']:
+        """Returns the created downstream runs whose upstream state was changed
+        by a change of the upstream counters.
+
+        Only these operation runs are either ready to start or cannot start anymore,
+        the other downstream runs are still waiting or were already scheduled.
+        """
+        if not delta:
+            return []
+
+        op_runs = []
+        for op_run in self.downstream_runs.filter(
+                status__status=self.STATUSES.CREATED).select_related('operation'):
+            counters = op_run.upstream_counters
+            previous_counters = {name: value - delta.get(name, 0)
+                                 for name, value in counters.items()}
+            state = op_run.get_upstream_state(counters)
+            if state is not None and state != op_run.get_upstream_state(previous_counters):
+                op_runs.append(op_run)
+        return op_runs
+
+    def get_waiting_runs_to_schedule(self) -> List['OperationRun']:
+        """Returns the created operation runs that were waiting for the running slot
+        freed by this operation run, in its pipeline run or for its operation.
+        """
+        filters = []
+        if self.pipeline_run.pipeline.concurrency:
+            filters.append(Q(pipeline_run_id=self.pipeline_run_id))
+        if self.operation.concurrency:
+            filters.append(Q(operation_id=self.operation_id))
+        if not filters:
+            return []
+
+        query = filters[0] | filters[1] if len(filters) > 1 else filters[0]
+        op_runs = OperationRun.objects.filter(
+            query,
+            status__status=self.STATUSES.CREATED).select_related('operation').order_by('id')
+        return [op_run for op_run in op_runs if op_run.get_upstream_state() is True]
 
     def schedule_start(self) -> bool:
         """Schedule the task: check first if the task can start:
@@ -591,26 +762,31 @@ class OperationRun(RunModel):
             * The upstream dependency is not met but could be met in the future,
               because some ops are still CREATED/SCHEDULED/RUNNING/...
               in this case nothing need to be done, every time an upstream operation finishes,
-              it will notify all the downstream ops including this one.
+              it will notify the downstream ops whose upstream counters met the dependency.
             * The upstream dependency is not met and could not be met at all.
               In this case we need to mark the task with `UPSTREAM_FAILED`.
         -> 3. If the pipeline has reached it's concurrency limit,
-           we just delay schedule based on the interval/time delay defined by the user.
-           The pipeline scheduler will keep checking until the task can be scheduled or stopped.
+           we just delay the schedule, every time an operation of the pipeline run stops running,
+           it will notify the waiting ops of the pipeline run.
         -> 4. If the operation has reached it's concurrency limit,
-           Same as above we keep trying based on an interval defined by the user.
+           Same as above, every time a run of the operation stops running,
+           it will notify the waiting runs of the operation.
 
         Returns:
-            boolean: Whether to try to schedule this operation run in the future or not.
+            boolean: Whether this operation run is waiting for a running slot or not.
         """
         if self.last_status != self.STATUSES.CREATED:
             return False
 
-        upstream_trigger_check = self.check_upstream_trigger()
-        if not upstream_trigger_check and self.is_upstream_done:
+        self.refresh_upstream_counters()
+        upstream_state = self.get_upstream_state()
+        if upstream_state is False:
             # This task cannot be scheduled anymore
             self.on_upstream_failed()
             return False
+        if upstream_state is None:
+            # The upstream runs will notify this task
+            return False
 
         if not self.pipeline_run.check_concurrency():
             return True
@@ -633,7 +809,7 @@ class OperationRun(RunModel):
             kwargs=kwargs,
             **self.operation.get_run_params())
         self.celery_task_id = async_result.id
-        self.save()
+        self.save(update_fields=['celery_task_id', 'updated_at'])
 
     def stop(self, message: str = None) -> None:
         if self.is_stoppable:
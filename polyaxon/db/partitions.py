@@ -0,0 +1,262 @@
+import logging
+import re
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+_logger = logging.getLogger('polyaxon.db.partitions')
+
+# Postgres supports primary keys and foreign keys on partitioned tables since 11
+PARTITIONS_MIN_PG_VERSION = 110000
+
+
+def get_month_start(value: datetime) -> datetime:
+    value = timezone.localtime(value, timezone.utc) if timezone.is_aware(value) else value
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def get_next_month_start(value: datetime) -> datetime:
+    value = get_month_start(value)
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1)
+    return value.replace(month=value.month + 1)
+
+
+class MonthlyPartitions(object):
+    """Manages the monthly range partitions of a table partitioned on a date column.
+
+    Partitions are named `<table>_y<year>m<month>`, and a `<table>_default` partition
+    receives the rows outside of the existing ranges.
+    Dropping the partitions older than a retention date replaces deleting their rows.
+
+    An existing table is converted with `partition_table`,
+    until then `is_partitioned` is false and the table should be cleaned with deletes.
+    """
+
+    def __init__(self, model, column: str = 'created_at') -> None:
+        self.model = model
+        self.column = column
+        self.table = model._meta.db_table
+        self.using = router.db_for_write(model)
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    @property
+    def default_partition(self) -> str:
+        return '{}_default'.format(self.table)
+
+    def quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
+
+    def is_supported(self) -> bool:
+        return (self.connection.vendor == 'postgresql' and
+                self.connection.pg_version >= PARTITIONS_MIN_PG_VERSION)
+
+    def is_partitioned(self) -> bool:
+        if self.connection.vendor != 'postgresql':
+            return False
+        with self.connection.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM pg_partitioned_table '
+                           'WHERE partrelid = to_regclass(%s)', [self.table])
+            return cursor.fetchone() is not None
+
+    def get_partition_name(self, month: datetime) -> str:
+        month = get_month_start(month)
+        return '{}_y{:04d}m{:02d}'.format(self.table, month.year, month.month)
+
+    def get_partitions(self, table: str = None) -> Dict[datetime, str]:
+        """Returns the monthly partitions by the start of their month."""
+        pattern = re.compile(r'^{}_y(\d{{4}})m(\d{{2}})$'.format(re.escape(self.table)))
+        with self.connection.cursor() as cursor:
+            cursor.execute('SELECT child.relname FROM pg_inherits '
+                           'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+                           'WHERE pg_inherits.inhparent = to_regclass(%s)',
+                           [table or self.table])
+            names = [row[0] for row in cursor.fetchall()]
+
+        partitions = {}
+        for name in names:
+            match = pattern.match(name)
+            if match:
+                month = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+                partitions[month] = name
+        return partitions
+
+    def get_create_partition_sql(self, month: datetime, table: str = None) -> Tuple[str, str]:
+        month = get_month_start(month)
+        name = self.get_partition_name(month)
+        # Partition bounds must be literals before Postgres 12, the values are dates
+        return name, 'CREATE TABLE IF NOT EXISTS {} PARTITION OF {} FOR VALUES ' \
+                     "FROM ('{}') TO ('{}')".format(self.quote(name),
+                                                    self.quote(table or self.table),
+                                                    month.isoformat(),
+                                                    get_next_month_start(month).isoformat())
+
+    def create_partitions(self,
+                          start: datetime,
+                          end: datetime,
+                          table: str = None) -> List[str]:
+        """Creates the missing partitions for the months between `start` and `end`."""
+        existing = set(self.get_partitions(table=table).values())
+        created = []
+        month = get_month_start(start)
+        with self.connection.cursor() as cursor:
+            while month <= end:
+                name, sql = self.get_create_partition_sql(month, table=table)
+                if name not in existing:
+                    cursor.execute(sql)
+                    created.append(name)
+                month = get_next_month_start(month)
+        if created:
+            _logger.info('Created the partitions %s of `%s`', created, self.table)
+        return created
+
+    def drop_partitions(self, before: datetime) -> List[str]:
+        """Drops the partitions whose rows are all older than `before`."""
+        dropped = []
+        with self.connection.cursor() as cursor:
+            for month, name in sorted(self.get_partitions().items()):
+                if get_next_month_start(month) > before:
+                    continue
+                with transaction.atomic(using=self.using):
+                    cursor.execute('ALTER TABLE {} DETACH PARTITION {}'.format(
+                        self.quote(self.table), self.quote(name)))
+                    cursor.execute('DROP TABLE {}'.format(self.quote(name)))
+                dropped.append(name)
+        if dropped:
+            _logger.info('Dropped the partitions %s of `%s`', dropped, self.table)
+        return dropped
+
+    def _get_constraints(self, cursor) -> Tuple[Optional[str], List[str], List[Tuple[str, str]]]:
+        """Returns the primary key's name, the indexes' and foreign keys' definitions."""
+        cursor.execute("SELECT conname FROM pg_constraint "
+                       "WHERE conrelid = to_regclass(%s) AND contype = 'p'", [self.table])
+        row = cursor.fetchone()
+        primary_key = row[0] if row else None
+        cursor.execute('SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname != %s',
+                       [self.table, primary_key or ''])
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                       "WHERE conrelid = to_regclass(%s) AND contype = 'f'", [self.table])
+        foreign_keys = cursor.fetchall()
+        return primary_key, indexes, foreign_keys
+
+    def _copy_rows(self, cursor, source: str, target: str, from_pk: int, batch_size: int) -> int:
+        """Copies the rows after `from_pk` in batches, returns the last copied pk."""
+        pk = self.quote(self.model._meta.pk.column)
+        while True:
+            cursor.execute('SELECT MAX({pk}) FROM (SELECT {pk} FROM {source} WHERE {pk} > %s '
+                           'ORDER BY {pk} LIMIT %s) batch'.format(pk=pk, source=source),
+                           [from_pk, batch_size])
+            to_pk = cursor.fetchone()[0]
+            if to_pk is None:
+                return from_pk
+            cursor.execute('INSERT INTO {target} SELECT * FROM {source} '
+                           'WHERE {pk} > %s AND {pk} <= %s'.format(pk=pk,
+                                                                   source=source,
+                                                                   target=target),
+                           [from_pk, to_pk])
+            _logger.debug('Copied the rows of `%s` up to %s', self.table, to_pk)
+            from_pk = to_pk
+
+    def _sync_rows(self, cursor, source: str, target: str) -> None:
+        """Makes the target's rows the same as the source's rows.
+
+        The rows committed after their batch was copied, e.g. with a lower pk than the last
+        copied pk, are inserted, and the rows deleted after they were copied are deleted.
+        """
+        pk = self.quote(self.model._meta.pk.column)
+        cursor.execute('INSERT INTO {target} SELECT * FROM {source} WHERE NOT EXISTS '
+                       '(SELECT 1 FROM {target} copied WHERE copied.{pk} = {source}.{pk})'.format(
+                           pk=pk, source=source, target=target))
+        cursor.execute('DELETE FROM {target} WHERE NOT EXISTS '
+                       '(SELECT 1 FROM {source} original '
+                       'WHERE original.{pk} = {target}.{pk})'.format(
+                           pk=pk, source=source, target=target))
+
+    def partition_table(self, batch_size: int) -> bool:
+        """Converts the table to a table partitioned by month, returns false if it already was.
+
+        The rows are copied in batches to a new partitioned table,
+        the rows that changed in the meantime are synced while the table is locked for writes,
+        then the tables are swapped.
+        The primary key includes the partitioning column, as required by Postgres,
+        the indexes and foreign keys are recreated with their original names.
+
+        An interrupted conversion leaves the new table behind, it is resumed after its last row.
+        """
+        if self.is_partitioned():
+            return False
+
+        pk_column = self.model._meta.pk.column
+        partitioned_table = '{}_partitioned'.format(self.table)
+        table = self.quote(self.table)
+        with self.connection.cursor() as cursor:
+            primary_key, indexes, foreign_keys = self._get_constraints(cursor)
+            cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [partitioned_table])
+            if cursor.fetchone()[0]:
+                cursor.execute('SELECT MAX({}) FROM {}'.format(self.quote(pk_column),
+                                                               self.quote(partitioned_table)))
+                last_pk = cursor.fetchone()[0] or 0
+                _logger.info('Resuming the partitioning of `%s` after %s', self.table, last_pk)
+            else:
+                last_pk = 0
+                cursor.execute('CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS) '
+                               'PARTITION BY RANGE ({})'.format(self.quote(partitioned_table),
+                                                                table,
+                                                                self.quote(self.column)))
+                cursor.execute('ALTER TABLE {} ADD PRIMARY KEY ({}, {})'.format(
+                    self.quote(partitioned_table),
+                    self.quote(pk_column),
+                    self.quote(self.column)))
+                cursor.execute('CREATE TABLE {} PARTITION OF {} DEFAULT'.format(
+                    self.quote(self.default_partition), self.quote(partitioned_table)))
+
+            # The partitions are created before copying, the default partition stays empty
+            cursor.execute('SELECT MIN({column}), MAX({column}) FROM {table}'.format(
+                column=self.quote(self.column), table=table))
+            start, end = cursor.fetchone()
+            now = timezone.now()
+            self.create_partitions(start=min(start or now, now),
+                                   end=get_next_month_start(max(end or now, now)),
+                                   table=partitioned_table)
+
+            self._copy_rows(cursor,
+                            source=table,
+                            target=self.quote(partitioned_table),
+                            from_pk=last_pk,
+                            batch_size=batch_size)
+
+            with transaction.atomic(using=self.using):
+                cursor.execute('LOCK TABLE {} IN EXCLUSIVE MODE'.format(table))
+                self._sync_rows(cursor, source=table, target=self.quote(partitioned_table))
+                cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [self.table, pk_column])
+                sequence = cursor.fetchone()[0]
+                cursor.execute('ALTER TABLE {} RENAME TO {}'.format(
+                    table, self.quote('{}_unpartitioned'.format(self.table))))
+                cursor.execute('ALTER TABLE {} RENAME TO {}'.format(
+                    self.quote(partitioned_table), table))
+                if sequence:
+                    cursor.execute('ALTER SEQUENCE {} OWNED BY {}.{}'.format(
+                        sequence, table, self.quote(pk_column)))
+                cursor.execute('DROP TABLE {}'.format(
+                    self.quote('{}_unpartitioned'.format(self.table))))
+                if primary_key:
+                    cursor.execute('ALTER INDEX {} RENAME TO {}'.format(
+                        self.quote('{}_pkey'.format(partitioned_table)),
+                        self.quote(primary_key)))
+                # The definitions reference the table by its name, which is now the new table
+                for index in indexes:
+                    cursor.execute(index)
+                for name, definition in foreign_keys:
+                    cursor.execute('ALTER TABLE {} ADD CONSTRAINT {} {}'.format(
+                        table, self.quote(name), definition))
+
+        _logger.info('Partitioned `%s` by month on `%s`', self.table, self.column)
+        return True
+
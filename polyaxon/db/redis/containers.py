@@ -1,4 +1,4 @@
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from db.redis.base import BaseRedisDb
 from polyaxon.settings import RedisPools
@@ -14,8 +14,25 @@ class RedisJobContainers(BaseRedisDb):
     KEY_JOBS_TO_CONTAINERS = 'JOBS_TO_CONTAINERS:{}'  # Redis set, maps jobs to containers
     KEY_JOBS_TO_EXPERIMENTS = 'JOBS_TO_EXPERIMENTS:'  # Redis hash, maps jobs to experiments
 
+    # KEYS: jobs to containers, containers, containers to jobs, jobs to experiments
+    # ARGV: job uuid
+    LUA_REMOVE_JOB = """
+    local containers = redis.call('SMEMBERS', KEYS[1])
+    for _, container_id in ipairs(containers) do
+        redis.call('SREM', KEYS[2], container_id)
+        redis.call('HDEL', KEYS[3], container_id)
+    end
+    redis.call('DEL', KEYS[1])
+    redis.call('HDEL', KEYS[4], ARGV[1])
+    return #containers
+    """
+
     REDIS_POOL = RedisPools.JOB_CONTAINERS
 
+    @staticmethod
+    def _decode(value: Optional[bytes]) -> Optional[str]:
+        return value.decode('utf-8') if value else None
+
     @classmethod
     def get_containers(cls) -> List[str]:
         red = cls._get_redis()
@@ -28,6 +45,15 @@ class RedisJobContainers(BaseRedisDb):
         experiment_uuid = red.hget(cls.KEY_JOBS_TO_EXPERIMENTS, job_uuid)
         return experiment_uuid.decode('utf-8') if experiment_uuid else None
 
+    @classmethod
+    def get_experiments_for_jobs(cls, job_uuids: List[str], red=None) -> List[Optional[str]]:
+        """Batched version of `get_experiment_for_job`, uses a single `HMGET`."""
+        if not job_uuids:
+            return []
+        red = red or cls._get_redis()
+        experiment_uuids = red.hmget(cls.KEY_JOBS_TO_EXPERIMENTS, job_uuids)
+        return [cls._decode(experiment_uuid) for experiment_uuid in experiment_uuids]
+
     @classmethod
     def get_job(cls, container_id: str) -> Tuple[Optional[str], Optional[str]]:
         red = cls._get_redis()
@@ -41,24 +67,63 @@ class RedisJobContainers(BaseRedisDb):
             return job_uuid, experiment_uuid
         return None, None
 
+    @classmethod
+    def get_jobs(cls,
+                 container_ids: List[str]) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """Batched version of `get_job`.
+
+        Resolves the (job, experiment) of every container in two round-trips,
+        regardless of the number of containers.
+        """
+        if not container_ids:
+            return {}
+        red = cls._get_redis()
+        pipe = red.pipeline(transaction=False)
+        for container_id in container_ids:
+            pipe.sismember(cls.KEY_CONTAINERS, container_id)
+        pipe.hmget(cls.KEY_CONTAINERS_TO_JOBS, container_ids)
+        results = pipe.execute()
+        job_uuids = [cls._decode(job_uuid) if is_member else None
+                     for is_member, job_uuid in zip(results[:-1], results[-1])]
+
+        known_job_uuids = [job_uuid for job_uuid in job_uuids if job_uuid]
+        experiment_uuids = dict(zip(
+            known_job_uuids,
+            cls.get_experiments_for_jobs(job_uuids=known_job_uuids, red=red)))
+        return {
+            container_id: (job_uuid, experiment_uuids[job_uuid]) if job_uuid else (None, None)
+            for container_id, job_uuid in zip(container_ids, job_uuids)
+        }
+
     @classmethod
     def remove_container(cls, container_id: str, red=None) -> None:
         red = red or cls._get_redis()
-        red.srem(cls.KEY_CONTAINERS, container_id)
-        red.hdel(cls.KEY_CONTAINERS_TO_JOBS, container_id)
+        pipe = red.pipeline()
+        pipe.srem(cls.KEY_CONTAINERS, container_id)
+        pipe.hdel(cls.KEY_CONTAINERS_TO_JOBS, container_id)
+        pipe.execute()
 
     @classmethod
-    def remove_job(cls, job_uuid: str) -> None:
+    def remove_containers(cls, container_ids: Iterable[str]) -> None:
+        container_ids = list(container_ids)
+        if not container_ids:
+            return
         red = cls._get_redis()
-        key_jobs_to_containers = cls.KEY_JOBS_TO_CONTAINERS.format(job_uuid)
-        containers = red.smembers(key_jobs_to_containers)
-        for container_id in containers:
-            container_id = container_id.decode('utf-8')
-            red.srem(key_jobs_to_containers, container_id)
-            cls.remove_container(container_id=container_id, red=red)
+        pipe = red.pipeline()
+        pipe.srem(cls.KEY_CONTAINERS, *container_ids)
+        pipe.hdel(cls.KEY_CONTAINERS_TO_JOBS, *container_ids)
+        pipe.execute()
 
-        # Remove the experiment too
-        red.hdel(cls.KEY_CONTAINERS_TO_JOBS, job_uuid)
+    @classmethod
+    def remove_job(cls, job_uuid: str) -> None:
+        """Removes the job, its containers, and its experiment mapping atomically."""
+        red = cls._get_redis()
+        remove_job = red.register_script(cls.LUA_REMOVE_JOB)
+        remove_job(keys=[cls.KEY_JOBS_TO_CONTAINERS.format(job_uuid),
+                         cls.KEY_CONTAINERS,
+                         cls.KEY_CONTAINERS_TO_JOBS,
+                         cls.KEY_JOBS_TO_EXPERIMENTS],
+                   args=[job_uuid])
 
     @classmethod
     def monitor(cls, container_id: str, job_uuid: str) -> None:
@@ -67,13 +132,16 @@ class RedisJobContainers(BaseRedisDb):
             from db.models.experiment_jobs import ExperimentJob
 
             try:
-                job = ExperimentJob.objects.get(uuid=job_uuid)
+                job = ExperimentJob.objects.select_related('experiment').get(uuid=job_uuid)
             except ExperimentJob.DoesNotExist:
                 return
 
-            red.sadd(cls.KEY_CONTAINERS, container_id)
-            red.hset(cls.KEY_CONTAINERS_TO_JOBS, container_id, job_uuid)
+            # The container and its mappings are registered in a single MULTI/EXEC
+            pipe = red.pipeline()
+            pipe.sadd(cls.KEY_CONTAINERS, container_id)
+            pipe.hset(cls.KEY_CONTAINERS_TO_JOBS, container_id, job_uuid)
             # Add container for job
-            red.sadd(cls.KEY_JOBS_TO_CONTAINERS.format(job_uuid), container_id)
+            pipe.sadd(cls.KEY_JOBS_TO_CONTAINERS.format(job_uuid), container_id)
             # Add job to experiment
-            red.hset(cls.KEY_JOBS_TO_EXPERIMENTS, job_uuid, job.experiment.uuid.hex)
+            pipe.hset(cls.KEY_JOBS_TO_EXPERIMENTS, job_uuid, job.experiment.uuid.hex)
+            pipe.execute()
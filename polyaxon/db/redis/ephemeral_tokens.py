@@ -78,17 +78,23 @@ class RedisEphemeralTokens(BaseRedisDb):
         token.set_state(ttl=ttl, value=value)
         return token
 
+    @classmethod
+    def _make_token(cls, key: str, salt: str, scope: List[str] = None) -> str:
+        value = key
+        if scope:
+            value += ''.join(scope)
+
+        return get_hmac(cls.KEY_SALT + salt, value)[::2]
+
     @classmethod
     def make_token(cls, ephemeral_token: 'RedisEphemeralTokens') -> str:
         """
         Returns a token to be used x number of times to allow a user account to access
         certain resource.
         """
-        value = ephemeral_token.key
-        if ephemeral_token.scope:
-            value += ''.join(ephemeral_token.scope)
-
-        return get_hmac(cls.KEY_SALT + ephemeral_token.salt, value)[::2]
+        return cls._make_token(key=ephemeral_token.key,
+                               salt=ephemeral_token.salt,
+                               scope=ephemeral_token.scope)
 
     def clear(self) -> None:
         if not self.redis_key:
@@ -108,18 +114,47 @@ class RedisEphemeralTokens(BaseRedisDb):
         return constant_time_compare(correct_token, token)
 
     @classmethod
-    def create_header_token(cls, ephemeral_token: 'RedisEphemeralTokens') -> str:
-        token = cls.make_token(ephemeral_token)
+    def _make_header_token(cls, token: str, key: str) -> str:
         return base64.b64encode(
             '{}{}{}'.format(token,
                             cls.SEPARATOR,
-                            ephemeral_token.key).encode('utf-8')).decode("utf-8")
+                            key).encode('utf-8')).decode("utf-8")
+
+    @classmethod
+    def create_header_token(cls, ephemeral_token: 'RedisEphemeralTokens') -> str:
+        token = cls.make_token(ephemeral_token)
+        return cls._make_header_token(token=token, key=ephemeral_token.key)
 
     @classmethod
     def generate_header_token(cls, scope: str) -> str:
         ephemeral_token = RedisEphemeralTokens.generate(scope=scope)
         return cls.create_header_token(ephemeral_token=ephemeral_token)
 
+    @classmethod
+    def generate_header_tokens(cls, scope: str, count: int, ttl: int = None) -> List[str]:
+        """
+        Batched version of `generate_header_token`, the tokens are stored in a single pipeline
+        and the header tokens are made from the generated values without reading them back.
+        """
+        ttl = ttl or conf.get('TTL_EPHEMERAL_TOKEN')
+        pipe = cls._get_redis().pipeline(transaction=False)
+        header_tokens = []
+        for _ in range(count):
+            key = uuid.uuid4().hex
+            salt = uuid.uuid4().hex
+            redis_key = cls.KEY_EPHEMERAL_TOKENS.format(key)
+            value = dumps({
+                'key': redis_key,
+                'salt': salt,
+                'scope': scope,
+                'ttl': ttl,
+            })
+            pipe.setex(name=redis_key, time=ttl, value=value)
+            token = cls._make_token(key=key, salt=salt, scope=scope)
+            header_tokens.append(cls._make_header_token(token=token, key=key))
+        pipe.execute()
+        return header_tokens
+
     @staticmethod
     def get_scope(user: str, model: str, object_id: str) -> List[str]:
         return ['user:{}'.format(user), '{}:{}'.format(model, object_id)]
@@ -1,3 +1,5 @@
+from typing import Iterable, List
+
 import conf
 
 from db.redis.base import BaseRedisDb
@@ -14,6 +16,8 @@ class RedisHeartBeat(BaseRedisDb):
 
     # A Run should report under this value, otherwise it could be considered zombie
     REDIS_POOL = RedisPools.HEARTBEAT
+    # Number of keys per MGET command when checking heartbeats in batches
+    MGET_CHUNK_SIZE = 1000
 
     def __init__(self, experiment: int = None, job: int = None, build: int = None) -> None:
         if len([1 for i in [experiment, job, build] if i]) != 1:
@@ -97,3 +101,29 @@ class RedisHeartBeat(BaseRedisDb):
     def build_is_alive(cls, build_id) -> bool:
         heart_beat = RedisHeartBeat(build=build_id)
         return heart_beat.is_alive()
+
+    @classmethod
+    def _get_dead(cls, key_format: str, ids: Iterable[int]) -> List[int]:
+        """Checks the heartbeats with MGET commands sent in a single pipeline,
+        and returns the ids without heartbeat."""
+        ids = list(ids)
+        if not ids:
+            return []
+
+        pipe = cls._get_redis().pipeline(transaction=False)
+        for i in range(0, len(ids), cls.MGET_CHUNK_SIZE):
+            pipe.mget([key_format.format(_id) for _id in ids[i:i + cls.MGET_CHUNK_SIZE]])
+        values = [value for chunk_values in pipe.execute() for value in chunk_values]
+        return [_id for _id, value in zip(ids, values) if not value]
+
+    @classmethod
+    def get_dead_experiments(cls, experiment_ids: Iterable[int]) -> List[int]:
+        return cls._get_dead(key_format=cls.KEY_EXPERIMENT, ids=experiment_ids)
+
+    @classmethod
+    def get_dead_jobs(cls, job_ids: Iterable[int]) -> List[int]:
+        return cls._get_dead(key_format=cls.KEY_JOB, ids=job_ids)
+
+    @classmethod
+    def get_dead_builds(cls, build_ids: Iterable[int]) -> List[int]:
+        return cls._get_dead(key_format=cls.KEY_BUILD, ids=build_ids)
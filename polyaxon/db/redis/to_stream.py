@@ -1,6 +1,6 @@
 import json
 
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Mapping, Optional, Union
 
 from db.redis.base import BaseRedisDb
 from polyaxon.settings import RedisPools
@@ -49,10 +49,27 @@ class RedisToStream(BaseRedisDb):
         red = cls._get_redis()
         return red.sismember(key, object_id)
 
+    @classmethod
+    def _are_monitored(cls, key: str, object_ids: List[Optional[str]]) -> List[bool]:
+        """Batched version of `_is_monitored`, all checks are sent in a single pipeline."""
+        if not object_ids:
+            return []
+        red = cls._get_redis()
+        pipe = red.pipeline(transaction=False)
+        for object_id in object_ids:
+            if object_id:
+                pipe.sismember(key, object_id)
+        results = iter(pipe.execute())
+        return [bool(next(results)) if object_id else False for object_id in object_ids]
+
     @classmethod
     def is_monitored_job_resources(cls, job_uuid: str) -> bool:
         return cls._is_monitored(cls.KEY_JOB_RESOURCES, job_uuid)
 
+    @classmethod
+    def are_monitored_jobs_resources(cls, job_uuids: List[Optional[str]]) -> List[bool]:
+        return cls._are_monitored(cls.KEY_JOB_RESOURCES, job_uuids)
+
     @classmethod
     def is_monitored_job_logs(cls, job_uuid: str) -> bool:
         return cls._is_monitored(cls.KEY_JOB_LOGS, job_uuid)
@@ -61,6 +78,11 @@ class RedisToStream(BaseRedisDb):
     def is_monitored_experiment_resources(cls, experiment_uuid: str) -> bool:
         return cls._is_monitored(cls.KEY_EXPERIMENT_RESOURCES, experiment_uuid)
 
+    @classmethod
+    def are_monitored_experiments_resources(cls,
+                                            experiment_uuids: List[Optional[str]]) -> List[bool]:
+        return cls._are_monitored(cls.KEY_EXPERIMENT_RESOURCES, experiment_uuids)
+
     @classmethod
     def is_monitored_experiment_logs(cls, experiment_uuid: str) -> bool:
         return cls._is_monitored(cls.KEY_EXPERIMENT_LOGS, experiment_uuid)
@@ -86,17 +108,22 @@ class RedisToStream(BaseRedisDb):
     def remove_experiment_logs(cls, experiment_uuid: str) -> None:
         cls._remove_object(cls.KEY_EXPERIMENT_LOGS, experiment_uuid)
 
+    @staticmethod
+    def _load_resources(resources: Optional[bytes], job_name: str) -> Optional[Dict]:
+        if not resources:
+            return None
+        resources = json.loads(resources.decode('utf-8'))
+        resources['job_name'] = job_name
+        return resources
+
     @classmethod
     def get_latest_job_resources(cls,
                                  job: str,
                                  job_name: str,
                                  as_json: bool = False) -> Optional[Union[str, Dict]]:
         red = cls._get_redis()
-        resources = red.hget(cls.KEY_JOB_LATEST_STATS, job)
+        resources = cls._load_resources(red.hget(cls.KEY_JOB_LATEST_STATS, job), job_name)
         if resources:
-            resources = resources.decode('utf-8')
-            resources = json.loads(resources)
-            resources['job_name'] = job_name
             return resources if as_json else json.dumps(resources)
         return None
 
@@ -105,15 +132,25 @@ class RedisToStream(BaseRedisDb):
                                         jobs: List[Dict],
                                         as_json: bool = False) -> List[Optional[Union[str, Dict]]]:
         stats = []
-        for job in jobs:
-            job_resources = cls.get_latest_job_resources(job=job['uuid'],
-                                                         job_name=job['name'],
-                                                         as_json=True)
-            if job_resources:
-                stats.append(job_resources)
+        if jobs:
+            red = cls._get_redis()
+            jobs_resources = red.hmget(cls.KEY_JOB_LATEST_STATS, [job['uuid'] for job in jobs])
+            for job, job_resources in zip(jobs, jobs_resources):
+                job_resources = cls._load_resources(job_resources, job['name'])
+                if job_resources:
+                    stats.append(job_resources)
         return stats if as_json else json.dumps(stats)
 
     @classmethod
     def set_latest_job_resources(cls, job: str, payload: Dict) -> None:
         red = cls._get_redis()
         red.hset(cls.KEY_JOB_LATEST_STATS, job, json.dumps(payload))
+
+    @classmethod
+    def set_latest_jobs_resources(cls, payloads: Mapping[str, Dict]) -> None:
+        """Batched version of `set_latest_job_resources`, uses a single `HMSET`."""
+        if not payloads:
+            return
+        red = cls._get_redis()
+        red.hmset(cls.KEY_JOB_LATEST_STATS,
+                  {job: json.dumps(payload) for job, payload in payloads.items()})
@@ -0,0 +1,35 @@
+import hashlib
+
+from typing import Iterable, Optional
+
+from db.redis.base import BaseRedisDb
+from polyaxon.settings import RedisPools
+
+
+class RedisTokensCache(BaseRedisDb):
+    """
+    RedisTokensCache provides a shared cache for the authentication tokens,
+    the values are the serialized tokens with their users, as JSON.
+    """
+    KEY_TOKEN = 'tokens.cache:{}'
+
+    REDIS_POOL = RedisPools.EPHEMERAL_TOKENS
+
+    @classmethod
+    def get_redis_key(cls, key: str) -> str:
+        # The raw token is not used as a redis key
+        return cls.KEY_TOKEN.format(hashlib.sha256(key.encode()).hexdigest())
+
+    @classmethod
+    def get(cls, key: str) -> Optional[bytes]:
+        return cls._get_redis().get(cls.get_redis_key(key))
+
+    @classmethod
+    def set(cls, key: str, value: bytes, ttl: int) -> None:
+        cls._get_redis().setex(name=cls.get_redis_key(key), value=value, time=ttl)
+
+    @classmethod
+    def delete(cls, keys: Iterable[str]) -> None:
+        redis_keys = [cls.get_redis_key(key) for key in keys]
+        if redis_keys:
+            cls._get_redis().delete(*redis_keys)
@@ -1,10 +1,10 @@
-from typing import Any, Mapping
+from typing import Any, Iterable, List, Mapping
 
 from hestia.service_interface import Service
 
 
 class EventService(Service):
-    __all__ = ('record',)
+    __all__ = ('record', 'record_many')
 
     event_manager = None
 
@@ -45,9 +45,32 @@ class EventService(Service):
         self.record_event(event)
         return event
 
+    def record_many(self, events_data: Iterable[Mapping]) -> List['Event']:
+        """ Validate and record a batch of serialized events.
+
+        >>> record_many([event_data1, event_data2])
+        """
+        if not self.is_setup:
+            return []
+
+        events = [
+            self.get_event(event_type=event_data['type'], event_data=event_data)
+            for event_data in events_data if self.can_handle(event_type=event_data['type'])
+        ]
+        self.record_events(events)
+        return events
+
     def record_event(self, event: 'Event') -> None:
         """ Record an event.
 
         >>> record_event(Event())
         """
         pass
+
+    def record_events(self, events: List['Event']) -> None:
+        """ Record a batch of events, services can override it to handle the batch at once.
+
+        >>> record_events([Event(), Event()])
+        """
+        for event in events:
+            self.record_event(event)
@@ -58,6 +58,7 @@ class ProjectDeletedEvent(Event):
     attributes = (
         Attribute('id'),
         Attribute('is_public', attr_type=bool),
+        Attribute('num_deleted', attr_type=int, is_required=False),
     )
 
 
@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 from django.db import IntegrityError
 
 import auditor
@@ -7,18 +9,23 @@ from polyaxon.settings import EventsCeleryTasks
 
 
 @celery_app.task(name=EventsCeleryTasks.EVENTS_NOTIFY, ignore_result=True)
-def events_notify(event: 'Event') -> None:
-    auditor.notify(event)
+def events_notify(event: Dict = None, events: List[Dict] = None) -> None:
+    for _event in events or [event]:
+        auditor.notify(_event)
 
 
 @celery_app.task(name=EventsCeleryTasks.EVENTS_LOG,
                  autoretry_for=(IntegrityError,),
                  max_retries=3,
                  ignore_result=True)
-def events_log(event: 'Event') -> None:
-    auditor.log(event)
+def events_log(event: Dict = None, events: List[Dict] = None) -> None:
+    if events:
+        auditor.log_many(events)
+    else:
+        auditor.log(event)
 
 
 @celery_app.task(name=EventsCeleryTasks.EVENTS_TRACK, ignore_result=True)
-def events_track(event: 'Event') -> None:
-    auditor.track(event)
+def events_track(event: Dict = None, events: List[Dict] = None) -> None:
+    for _event in events or [event]:
+        auditor.track(_event)
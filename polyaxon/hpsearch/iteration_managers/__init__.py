@@ -1,3 +1,4 @@
+from hpsearch.iteration_managers.asha import ASHAIterationManager
 from hpsearch.iteration_managers.base import BaseIterationManager
 from hpsearch.iteration_managers.bayesian_optimization import BOIterationManager
 from hpsearch.iteration_managers.hyperband import HyperbandIterationManager
@@ -6,6 +7,9 @@ from schemas.hptuning import SearchAlgorithms
 
 def get_search_iteration_manager(experiment_group):
     if SearchAlgorithms.is_hyperband(experiment_group.search_algorithm):
+        iteration_config = experiment_group.iteration_config
+        if iteration_config and iteration_config.asynchronous:
+            return ASHAIterationManager(experiment_group=experiment_group)
         return HyperbandIterationManager(experiment_group=experiment_group)
     if SearchAlgorithms.is_bo(experiment_group.search_algorithm):
         return BOIterationManager(experiment_group=experiment_group)
@@ -0,0 +1,89 @@
+from constants.experiments import ExperimentLifeCycle
+from hpsearch.iteration_managers.hyperband import HyperbandIterationManager
+from hpsearch.schemas import HyperbandIterationConfig
+from hpsearch.search_managers.asha import ASHASearchManager
+
+
+class ASHAIterationManager(HyperbandIterationManager):
+    """Iteration manager for asynchronous successive halving.
+
+    All the rungs are tracked in a single iteration,
+    results are recorded as soon as the experiments are done.
+    """
+
+    def __init__(self, experiment_group):
+        super().__init__(experiment_group=experiment_group)
+        self.search_manager = ASHASearchManager(
+            hptuning_config=experiment_group.hptuning_config)
+
+    def create_iteration(self, num_suggestions=0):
+        """Create the unique iteration of the experiment group."""
+        from db.models.experiment_groups import ExperimentGroupIteration
+
+        iteration_config = HyperbandIterationConfig(
+            iteration=0,
+            num_suggestions=num_suggestions,
+            bracket_iteration=0,
+            asynchronous=True,
+            experiments_rungs=[],
+            rungs_metrics=[],
+            promoted=[])
+        iteration_config.experiment_ids = []
+        return ExperimentGroupIteration.objects.create(
+            experiment_group=self.experiment_group,
+            data=iteration_config.to_dict())
+
+    def update_iteration(self):
+        """Record the metrics of the experiments that finished in their rungs."""
+        iteration_config = self.get_iteration_config()
+        if not iteration_config:
+            return
+        experiments_rungs = dict(iteration_config.experiments_rungs or [])
+        recorded = {xp_id for xp_id, _, _ in iteration_config.rungs_metrics or []}
+        done_ids = set(self.experiment_group.experiments.filter(
+            id__in=iteration_config.experiment_ids,
+            status__status__in=ExperimentLifeCycle.DONE_STATUS
+        ).values_list('id', flat=True)) - recorded
+        if not done_ids:
+            return iteration_config
+
+        experiments_metrics = dict(self.experiment_group.get_experiments_metrics(
+            experiment_ids=list(done_ids),
+            metric=self.get_metric_name()))
+        iteration_config.rungs_metrics = (iteration_config.rungs_metrics or []) + [
+            [xp_id, experiments_rungs.get(xp_id, 0), experiments_metrics.get(xp_id)]
+            for xp_id in sorted(done_ids)
+        ]
+        self._update_config(iteration_config)
+        return iteration_config
+
+    def add_iteration_experiments(self, experiment_ids, rung=0):
+        super().add_iteration_experiments(experiment_ids=experiment_ids)
+        iteration_config = self.experiment_group.iteration_config
+        iteration_config.experiments_rungs = (iteration_config.experiments_rungs or []) + [
+            [xp_id, rung] for xp_id in experiment_ids
+        ]
+        self._update_config(iteration_config)
+
+    def add_suggestions(self, n_suggestions):
+        iteration_config = self.experiment_group.iteration_config
+        iteration_config.num_suggestions += n_suggestions
+        self._update_config(iteration_config)
+
+    def promote(self, promotions):
+        """Resume/restart the promoted experiments with the resources of the next rung."""
+        iteration_config = self.experiment_group.iteration_config
+        experiments = {xp.id: xp for xp in self.experiment_group.experiments.filter(
+            id__in=[xp_id for xp_id, _ in promotions])}
+        iteration_config.promoted = (iteration_config.promoted or []) + promotions
+        self._update_config(iteration_config)
+
+        for xp_id, rung in promotions:
+            experiment = experiments.get(xp_id)
+            if not experiment:
+                continue
+            new_experiment = self.resume_experiment(
+                experiment=experiment,
+                resource_value=self.search_manager.get_rung_resource_value(rung=rung + 1),
+                description='Hyperband asynchronous promotion to rung: {}'.format(rung + 1))
+            self.add_iteration_experiments(experiment_ids=[new_experiment.id], rung=rung + 1)
@@ -88,26 +88,27 @@ class HyperbandIterationManager(BaseIterationManager):
         resource_value = self.experiment_group.search_manager.get_n_resources(
             n_resources=n_resources, bracket_iteration=iteration_config.bracket_iteration
         )
-        resource_name = hptuning_config.hyperband.resource.name
         resource_value = hptuning_config.hyperband.resource.cast_value(resource_value)
 
-        # Check if we need to resume or restart the experiments
         for experiment in experiments:
-            declarations = experiment.declarations
-            declarations[resource_name] = resource_value
-            declarations_spec = {'declarations': declarations}
-            specification = experiment.specification.patch(declarations_spec)
-            status_message = 'Hyperband iteration: {}, bracket iteration: {}'.format(
-                iteration_config.iteration,
-                iteration_config.bracket_iteration)
+            self.resume_experiment(experiment=experiment, resource_value=resource_value)
 
-            if hptuning_config.hyperband.resume:
-                experiment.resume(
-                    declarations=declarations,
-                    config=specification.parsed_data,
-                    message=status_message)
-            else:
-                experiment.restart(
-                    experiment_group=self.experiment_group,
-                    declarations=declarations,
-                    config=specification.parsed_data)
+    def resume_experiment(self, experiment, resource_value, description=None):
+        """Resume or restart the experiment with a new resource value."""
+        hptuning_config = self.experiment_group.hptuning_config
+        declarations = experiment.declarations
+        declarations[hptuning_config.hyperband.resource.name] = resource_value
+        declarations_spec = {'declarations': declarations}
+        specification = experiment.specification.patch(declarations_spec)
+
+        # Check if we need to resume or restart the experiments
+        if hptuning_config.hyperband.resume:
+            return experiment.resume(
+                description=description,
+                declarations=declarations,
+                config=specification.parsed_data)
+        return experiment.restart(
+            experiment_group=self.experiment_group,
+            description=description,
+            declarations=declarations,
+            config=specification.parsed_data)
@@ -50,18 +50,18 @@ class BOIterationConfig(BaseIterationConfig):
 
     @property
     def combined_experiment_ids(self):
-        experiment_ids = self.old_experiment_ids or []
+        experiment_ids = list(self.old_experiment_ids or [])
         experiment_ids += self.experiment_ids or []
         return experiment_ids
 
     @property
     def combined_experiments_configs(self):
-        experiments_configs = self.old_experiments_configs or []
+        experiments_configs = list(self.old_experiments_configs or [])
         experiments_configs += self.experiments_configs or []
         return experiments_configs
 
     @property
     def combined_experiments_metrics(self):
-        experiments_metrics = self.old_experiments_metrics or []
+        experiments_metrics = list(self.old_experiments_metrics or [])
         experiments_metrics += self.experiments_metrics or []
         return experiments_metrics
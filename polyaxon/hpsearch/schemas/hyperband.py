@@ -7,6 +7,13 @@ class HyperbandIterationSchema(BaseIterationSchema):
     bracket_iteration = fields.Int()
     experiments_metrics = fields.List(fields.List(fields.Raw(), validate=validate.Length(equal=2)),
                                       allow_none=True)
+    asynchronous = fields.Bool(allow_none=True)
+    experiments_rungs = fields.List(fields.List(fields.Int(), validate=validate.Length(equal=2)),
+                                    allow_none=True)
+    rungs_metrics = fields.List(fields.List(fields.Raw(), validate=validate.Length(equal=3)),
+                                allow_none=True)
+    promoted = fields.List(fields.List(fields.Int(), validate=validate.Length(equal=2)),
+                           allow_none=True)
 
     @post_load
     def make(self, data):
@@ -18,16 +25,32 @@ class HyperbandIterationSchema(BaseIterationSchema):
 
 
 class HyperbandIterationConfig(BaseIterationConfig):
+    """Hyperband iteration config.
+
+    In asynchronous mode (ASHA) a single iteration holds the state of all the rungs:
+        * experiments_rungs: [experiment_id, rung] of every experiment.
+        * rungs_metrics: [experiment_id, rung, metric] of every finished experiment.
+        * promoted: [experiment_id, rung] of the results already promoted to the next rung.
+    """
     SCHEMA = HyperbandIterationSchema
+    REDUCED_ATTRIBUTES = ['asynchronous', 'experiments_rungs', 'rungs_metrics', 'promoted']
 
     def __init__(self,
                  iteration,
                  num_suggestions,
                  bracket_iteration,
                  experiment_ids=None,
-                 experiments_metrics=None):
+                 experiments_metrics=None,
+                 asynchronous=None,
+                 experiments_rungs=None,
+                 rungs_metrics=None,
+                 promoted=None):
         super().__init__(iteration=iteration,
                          num_suggestions=num_suggestions,
                          experiment_ids=experiment_ids)
         self.bracket_iteration = bracket_iteration
         self.experiments_metrics = experiments_metrics
+        self.asynchronous = asynchronous
+        self.experiments_rungs = experiments_rungs
+        self.rungs_metrics = rungs_metrics
+        self.promoted = promoted
@@ -0,0 +1,100 @@
+from hpsearch.search_managers.hyperband import HyperbandSearchManager
+from hpsearch.search_managers.utils import get_random_suggestions
+from schemas.hptuning import Optimization
+
+
+class ASHASearchManager(HyperbandSearchManager):
+    """Asynchronous successive halving (ASHA) search manager for hyperparameter optimization.
+
+    Instead of waiting for all the configs of a rung to finish,
+    a config is promoted to the next rung as soon as it's in the top `1 / eta`
+    of the finished results in its rung, otherwise a new config is sampled in the base rung.
+
+    The algorithm runs in the following way:
+
+    def get_job(self):
+        for rung in reversed(range(self.s_max)):
+            candidates = top_k(rung, int(len(rung_results) / eta)) - promoted(rung)
+            if candidates:
+                return promote(candidates[0], rung + 1)
+        return new_config(rung=0)
+
+    The rungs use the resources of the most exploratory hyperband bracket,
+    i.e. `max_iter * eta ** (rung - s_max)`, and the total number of sampled configs
+    is the same as the total number of configs sampled by all the hyperband brackets.
+    """
+
+    @property
+    def max_rung(self):
+        return self.s_max
+
+    @property
+    def max_configs(self):
+        return sum(self.get_n_configs(bracket=bracket) for bracket in range(self.s_max + 1))
+
+    def get_rung_resources(self, rung):
+        return self.max_iter * self.eta ** (rung - self.s_max)
+
+    def get_rung_resource_value(self, rung):
+        return self.hptuning_config.hyperband.resource.cast_value(
+            self.get_rung_resources(rung=rung))
+
+    @property
+    def is_maximize(self):
+        return Optimization.maximize(self.hptuning_config.hyperband.metric.optimization)
+
+    def get_promotions(self, rungs_metrics, promoted, n_jobs):
+        """Return a list of [experiment_id, rung] to promote to `rung + 1`.
+
+        Params:
+            rungs_metrics: list of [experiment_id, rung, metric] of finished experiments.
+            promoted: list of [experiment_id, rung] of results already promoted.
+            n_jobs: maximum number of promotions.
+        """
+        promoted = {(xp_id, rung) for xp_id, rung in promoted or []}
+        promotions = []
+        for rung in reversed(range(self.max_rung)):
+            results = [(xp_id, metric) for xp_id, xp_rung, metric in rungs_metrics or []
+                       if xp_rung == rung and metric is not None]
+            results = sorted(results, key=lambda x: x[1], reverse=self.is_maximize)
+            for xp_id, _ in results[:int(len(results) / self.eta)]:
+                if len(promotions) == n_jobs:
+                    return promotions
+                if (xp_id, rung) not in promoted:
+                    promotions.append([xp_id, rung])
+        return promotions
+
+    def get_jobs(self, iteration_config, n_jobs):
+        """Return the promotions and the number of new configs to fill `n_jobs` slots."""
+        if n_jobs <= 0:
+            return [], 0
+        promotions = self.get_promotions(rungs_metrics=iteration_config.rungs_metrics,
+                                         promoted=iteration_config.promoted,
+                                         n_jobs=n_jobs)
+        n_new_configs = min(n_jobs - len(promotions),
+                            self.max_configs - iteration_config.num_suggestions)
+        return promotions, max(n_new_configs, 0)
+
+    def should_promote_or_create(self, iteration_config):
+        """Return a boolean to indicate if there's still, or there might be, more work to do."""
+        return (iteration_config.num_suggestions < self.max_configs or
+                bool(self.get_promotions(rungs_metrics=iteration_config.rungs_metrics,
+                                         promoted=iteration_config.promoted,
+                                         n_jobs=1)))
+
+    def get_suggestions(self, iteration_config=None, n_suggestions=None):
+        """Return a list of new configs for the base rung."""
+        if not iteration_config or not iteration_config.asynchronous:
+            return super().get_suggestions(iteration_config=iteration_config)
+        n_suggestions = n_suggestions or self.hptuning_config.concurrency or 1
+        suggestion_params = {
+            self.hptuning_config.hyperband.resource.name: self.get_rung_resource_value(rung=0)
+        }
+        # Offset the seed to not sample the same configs in every call
+        seed = self.hptuning_config.seed
+        if seed:
+            seed += iteration_config.num_suggestions
+        return get_random_suggestions(matrix=self.hptuning_config.matrix,
+                                      n_suggestions=n_suggestions,
+                                      suggestion_params=suggestion_params,
+                                      seed=seed)
@@ -1,7 +1,10 @@
 import numpy as np
 
+from scipy.linalg import solve_triangular
 from scipy.optimize import minimize
+from scipy.special import gamma, kv
 from scipy.stats import norm
+from sklearn.base import clone
 from sklearn.gaussian_process import GaussianProcessRegressor
 from sklearn.gaussian_process.kernels import RBF, Matern
 
@@ -67,48 +70,165 @@ class UtilityFunction(object):
         if AcquisitionFunctions.is_poi(self.acquisition_function):
             return self._compute_poi(x=x, y_max=y_max)
 
-    def max_compute(self, y_max, bounds, n_warmup=100000, n_iter=250):
+    def fit(self, x, y):
+        self.gaussian_process = self.get_gaussian_process(config=self.config.gaussian_process,
+                                                          random_generator=self.random_generator)
+        self.gaussian_process.fit(x, y)
+
+    def add_observation(self, x, y):
+        """Adds an observation to the fitted gaussian process.
+
+        The gaussian process is refitted with the fitted kernel's hyperparameters,
+        which are not optimized again.
+        """
+        gp = self.gaussian_process
+        x = np.asarray(x, dtype=float).reshape(1, -1)
+        gaussian_process = clone(gp).set_params(kernel=gp.kernel_, optimizer=None)
+        # The targets are not normalized, `y_train_` are the observed values
+        gaussian_process.fit(np.vstack([gp.X_train_, x]), np.append(gp.y_train_, y))
+        self.gaussian_process = gaussian_process
+
+    def _kernel_gradient(self, x, k_trans):
+        """The gradient of the kernel between `x` and the training points, w.r.t. `x`.
+
+        Returns `None` for kernels without an analytic gradient.
+        """
+        kernel = self.gaussian_process.kernel_
+        if not isinstance(kernel, (RBF, Matern)):
+            return None
+
+        length_scale = np.asarray(kernel.length_scale, dtype=float)
+        diff = (x[:, None, :] - self.gaussian_process.X_train_[None, :, :]) / length_scale ** 2
+        # Matern is a subclass of RBF
+        if not isinstance(kernel, Matern) or np.isinf(kernel.nu):
+            return -k_trans[:, :, None] * diff
+
+        dists = np.sqrt(np.sum(
+            ((x[:, None, :] - self.gaussian_process.X_train_[None, :, :]) / length_scale) ** 2,
+            axis=-1))
+        nu = kernel.nu
+        # dk/dr / r, for the different values of nu
+        if nu == 0.5:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                dk_dr = np.where(dists > 0, -np.exp(-dists) / dists, 0.)
+        elif nu == 1.5:
+            dk_dr = -3 * np.exp(-np.sqrt(3) * dists)
+        elif nu == 2.5:
+            dk_dr = -5. / 3 * (1 + np.sqrt(5) * dists) * np.exp(-np.sqrt(5) * dists)
+        else:
+            tmp = np.sqrt(2 * nu) * dists
+            with np.errstate(divide='ignore', invalid='ignore'):
+                dk_dr = np.where(
+                    dists > 0,
+                    -(2 ** (1. - nu)) / gamma(nu) * np.sqrt(2 * nu) * tmp ** nu *
+                    kv(nu - 1, tmp) / dists,
+                    0.)
+        return dk_dr[:, :, None] * diff
+
+    def _predict(self, x, return_gradient=False):
+        """Predicts the mean and std of the gaussian process at `x`, and their gradients.
+
+        It uses the documented fitted attributes of the gaussian process,
+        the targets are not normalized.
+        """
+        gp = self.gaussian_process
+        k_trans = gp.kernel_(x, gp.X_train_)
+        mean = k_trans.dot(gp.alpha_)
+        v = solve_triangular(gp.L_, k_trans.T, lower=True)
+        variance = np.clip(gp.kernel_.diag(x) - np.einsum('ij,ij->j', v, v), 1e-18, None)
+        std = np.sqrt(variance)
+        if not return_gradient:
+            return mean, std, None, None
+
+        kernel_gradient = self._kernel_gradient(x, k_trans)
+        if kernel_gradient is None:
+            return mean, std, None, None
+        mean_gradient = np.einsum('mnd,n->md', kernel_gradient, gp.alpha_)
+        k_inv_trans = solve_triangular(gp.L_.T, v, lower=False)
+        std_gradient = -np.einsum('mnd,nm->md', kernel_gradient, k_inv_trans) / std[:, None]
+        return mean, std, mean_gradient, std_gradient
+
+    def compute_with_gradient(self, x, y_max):
+        """Computes the acquisition function at `x` and its gradient, the gradient is `None`
+        if the kernel has no analytic gradient."""
+        mean, std, mean_gradient, std_gradient = self._predict(x, return_gradient=True)
+        if AcquisitionFunctions.is_ucb(self.acquisition_function):
+            values = mean + self.kappa * std
+            if mean_gradient is None:
+                return values, None
+            return values, mean_gradient + self.kappa * std_gradient
+
+        z = (mean - y_max - self.eps) / std
+        if AcquisitionFunctions.is_ei(self.acquisition_function):
+            values = (mean - y_max - self.eps) * norm.cdf(z) + std * norm.pdf(z)
+            if mean_gradient is None:
+                return values, None
+            return values, (norm.cdf(z)[:, None] * mean_gradient +
+                            norm.pdf(z)[:, None] * std_gradient)
+
+        values = norm.cdf(z)
+        if mean_gradient is None:
+            return values, None
+        return values, (norm.pdf(z) / std)[:, None] * (mean_gradient - z[:, None] * std_gradient)
+
+    def max_compute(self, y_max, bounds, n_warmup=100000, n_iter=250, warmup_batch_size=10000):
         """A function to find the maximum of the acquisition function
 
         It uses a combination of random sampling (cheap) and the 'L-BFGS-B' optimization method.
 
-        First by sampling `n_warmup` (1e5) points at random,
-        and then running L-BFGS-B from `n_iter` (250) random starting points.
+        First by scoring `n_warmup` (1e5) random points in batches,
+        and then running L-BFGS-B from `n_iter` (250) starting points.
+        All the starting points are optimized jointly, with analytic gradients when possible.
 
         Params:
             y_max: The current maximum known value of the target function.
             bounds: The variables bounds to limit the search of the acq max.
             n_warmup: The number of times to randomly sample the acquisition function
-            n_iter: The number of times to run scipy.minimize
+            n_iter: The number of starting points for L-BFGS-B
+            warmup_batch_size: The number of random points scored at once.
 
         Returns
             x_max: The arg max of the acquisition function.
         """
+        dim = bounds.shape[0]
+        x_max = None
+        max_acq = None
         # Warm up with random points
-        x_tries = self.random_generator.uniform(bounds[:, 0], bounds[:, 1],
-                                                size=(n_warmup, bounds.shape[0]))
-        ys = self.compute(x_tries, y_max=y_max)
-        x_max = x_tries[ys.argmax()]
-        max_acq = ys.max()
-
-        # Explore the parameter space more throughly
-        x_seeds = self.random_generator.uniform(bounds[:, 0], bounds[:, 1],
-                                                size=(n_iter, bounds.shape[0]))
-        for x_try in x_seeds:
-            # Find the minimum of minus the acquisition function
-            res = minimize(lambda x: -self.compute(x.reshape(1, -1), y_max=y_max),
-                           x_try.reshape(1, -1),
-                           bounds=bounds,
+        for i in range(0, n_warmup, warmup_batch_size):
+            x_tries = self.random_generator.uniform(bounds[:, 0], bounds[:, 1],
+                                                    size=(min(warmup_batch_size, n_warmup - i),
+                                                          dim))
+            ys, _ = self.compute_with_gradient(x_tries, y_max=y_max)
+            if max_acq is None or ys.max() > max_acq:
+                x_max = x_tries[ys.argmax()]
+                max_acq = ys.max()
+
+        # Explore the parameter space more throughly, starting from the best warmup point
+        x_seeds = self.random_generator.uniform(bounds[:, 0], bounds[:, 1], size=(n_iter, dim))
+        if x_max is not None and n_iter:
+            x_seeds[0] = x_max
+
+        def minus_acquisition(flat_x):
+            # The acquisition of the points are independent,
+            # so minimizing their sum optimizes every starting point at once
+            values, gradients = self.compute_with_gradient(flat_x.reshape(-1, dim), y_max=y_max)
+            if gradients is None:
+                return -values.sum()
+            return -values.sum(), -gradients.ravel()
+
+        if n_iter:
+            has_gradient = self.compute_with_gradient(x_seeds[:1], y_max=y_max)[1] is not None
+            res = minimize(minus_acquisition,
+                           x_seeds.ravel(),
+                           jac=has_gradient,
+                           bounds=np.tile(bounds, (n_iter, 1)),
                            method="L-BFGS-B")
-
-            # See if success
-            if not res.success:
-                continue
-
+            x_opts = np.clip(res.x.reshape(-1, dim), bounds[:, 0], bounds[:, 1])
+            ys, _ = self.compute_with_gradient(x_opts, y_max=y_max)
             # Store it if better than previous minimum(maximum).
-            if max_acq is None or -res.fun[0] >= max_acq:
-                x_max = res.x
-                max_acq = -res.fun[0]
+            if max_acq is None or ys.max() >= max_acq:
+                x_max = x_opts[ys.argmax()]
+                max_acq = ys.max()
 
         # Clip output to make sure it lies within the bounds. Due to floating
         # point technicalities this is not always the case.
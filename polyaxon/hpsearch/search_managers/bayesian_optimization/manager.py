@@ -33,9 +33,26 @@ class BOSearchManager(BaseSearchAlgorithmManager):
             return None
         optimizer = BOOptimizer(hptuning_config=self.hptuning_config)
         optimizer.add_observations(configs=configs, metrics=metrics)
-        suggestion = optimizer.get_suggestion()
-        return [suggestion] if suggestion else None
+        # Fill the concurrency with a batch of suggestions, within the remaining iterations
+        n_suggestions = min(self.hptuning_config.concurrency or 1,
+                            self.n_iterations - self.get_n_suggested(iteration_config))
+        suggestions = []
+        for _ in range(n_suggestions):
+            suggestion = optimizer.get_suggestion()
+            if not suggestion:
+                break
+            if suggestion not in suggestions:
+                suggestions.append(suggestion)
+        return suggestions or None
 
-    def should_reschedule(self, iteration):
+    def get_n_suggested(self, iteration_config):
+        """Returns the number of suggestions made after the initial trials.
+
+        Every suggestion counts as one of the `n_iterations`,
+        an iteration suggests up to `concurrency` experiments.
+        """
+        return max(len(iteration_config.combined_experiment_ids) - self.n_initial_trials, 0)
+
+    def should_reschedule(self, iteration_config):
         """Return a boolean to indicate if we need to reschedule another iteration."""
-        return iteration < self.n_iterations
+        return self.get_n_suggested(iteration_config) < self.n_iterations
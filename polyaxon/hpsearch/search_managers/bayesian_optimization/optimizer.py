@@ -12,13 +12,16 @@ class BOOptimizer(object):
             config=hptuning_config.bo.utility_function, seed=hptuning_config.seed)
         self.n_warmup = hptuning_config.bo.utility_function.n_warmup or 5
         self.n_iter = hptuning_config.bo.utility_function.n_iter or 10
+        self._is_fitted = False
 
     def _maximize(self):
         """ Find argmax of the acquisition function."""
         if not self.space.is_observations_valid():
             return None
         y_max = self.space.y.max()
-        self.utility_function.gaussian_process.fit(self.space.x, self.space.y)
+        if not self._is_fitted:
+            self.utility_function.fit(self.space.x, self.space.y)
+            self._is_fitted = True
         return self.utility_function.max_compute(y_max=y_max,
                                                  bounds=self.space.bounds,
                                                  n_warmup=self.n_warmup,
@@ -27,7 +30,16 @@ class BOOptimizer(object):
     def add_observations(self, configs, metrics):
         # Turn configs and metrics into data points
         self.space.add_observations(configs=configs, metrics=metrics)
+        self._is_fitted = False
 
     def get_suggestion(self):
+        """Returns the next suggestion.
+
+        The suggestion is added to the fitted gaussian process as a pending observation
+        with the worst observed value (constant liar), so that consecutive calls
+        return a batch of diverse suggestions without optimizing the kernel again.
+        """
         x = self._maximize()
+        if x is not None:
+            self.utility_function.add_observation(x, self.space.y.min())
         return self.space.get_suggestion(x)
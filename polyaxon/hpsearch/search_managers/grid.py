@@ -1,16 +1,64 @@
-import itertools
-
 from hpsearch.search_managers.base import BaseSearchAlgorithmManager
 from schemas.hptuning import SearchAlgorithms
 
 
+class GridSuggestions(object):
+    """A lazy, index addressable sequence of the grid's combinations.
+
+    The k-th combination is computed by mixed-radix decoding of k,
+    in the same order as `itertools.product`, i.e. the last hyperparam varies the fastest.
+    """
+
+    def __init__(self, keys, values, n_suggestions=None):
+        self.keys = keys
+        self.values = values
+        self.radices = [len(v) for v in values]
+        total = 1
+        for radix in self.radices:
+            total *= radix
+        if n_suggestions:
+            total = min(total, n_suggestions)
+        self.total = total if keys else 0
+
+    def __len__(self):
+        return self.total
+
+    def __bool__(self):
+        return self.total > 0
+
+    def __iter__(self):
+        for index in range(self.total):
+            yield self.get(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.get(i) for i in range(*index.indices(self.total))]
+        if index < 0:
+            index += self.total
+        if not 0 <= index < self.total:
+            raise IndexError('Grid suggestion index out of range.')
+        return self.get(index)
+
+    def get(self, index):
+        suggestion = {}
+        for key, value, radix in zip(reversed(self.keys),
+                                     reversed(self.values),
+                                     reversed(self.radices)):
+            index, position = divmod(index, radix)
+            suggestion[key] = value[position]
+        return {key: suggestion[key] for key in self.keys}
+
+    def get_range(self, start, end):
+        return [self.get(index) for index in range(start, min(end, self.total))]
+
+
 class GridSearchManager(BaseSearchAlgorithmManager):
     """Grid search algorithm manager for hyperparameter optimization."""
 
     NAME = SearchAlgorithms.GRID
 
     def get_suggestions(self, iteration_config=None):
-        """Return a list of suggestions based on grid search.
+        """Return a lazy sequence of suggestions based on grid search.
 
         Params:
             matrix: `dict` representing the {hyperparam: hyperparam matrix config}.
@@ -18,14 +66,10 @@ class GridSearchManager(BaseSearchAlgorithmManager):
         """
         matrix = self.hptuning_config.matrix
 
-        suggestions = []
         keys = list(matrix.keys())
         values = [v.to_numpy() for v in matrix.values()]
-        for v in itertools.product(*values):
-            suggestions.append(dict(zip(keys, v)))
 
+        n_suggestions = None
         if self.hptuning_config.grid_search:
             n_suggestions = self.hptuning_config.grid_search.n_experiments
-            if n_suggestions:
-                return suggestions[:n_suggestions]
-        return suggestions
+        return GridSuggestions(keys=keys, values=values, n_suggestions=n_suggestions)
@@ -1,4 +1,3 @@
-import copy
 import numpy as np
 import uuid
 
@@ -38,10 +37,53 @@ def get_random_generator(seed=None):
     return np.random.RandomState(seed) if seed else np.random
 
 
+def sample_values(matrix_config, size, rand_generator):
+    """Draws `size` values of a hyperparam matrix config in a single call."""
+    if size == 1:
+        return [matrix_config.sample(rand_generator=rand_generator)]
+
+    # Numpy can't vectorize choices over nested values, they are drawn one at a time
+    values = matrix_config.values
+    if values and any(isinstance(value, (list, tuple, dict)) for value in values):
+        return [matrix_config.sample(rand_generator=rand_generator) for _ in range(size)]
+
+    return matrix_config.sample(size=size, rand_generator=rand_generator)
+
+
+def get_discrete_space(matrix):
+    """Returns the values and the probability of every value per hyperparam."""
+    space = []
+    for v in matrix.values():
+        if v.pvalues:
+            values = [pv[0] for pv in v.pvalues]
+            probabilities = np.array([pv[1] or 0 for pv in v.pvalues], dtype=float)
+            probabilities /= probabilities.sum()
+        else:
+            values = v.to_numpy()
+            probabilities = np.full(len(values), 1. / len(values))
+        space.append((values, probabilities))
+    return space
+
+
+def get_discrete_suggestions(matrix, n_suggestions, rand_generator):
+    """Samples the combinations' indices of a discrete space without replacement."""
+    space = get_discrete_space(matrix)
+    probabilities = reduce(np.outer, [p for _, p in space]).ravel()
+    n_suggestions = min(n_suggestions, np.count_nonzero(probabilities))
+    indices = rand_generator.choice(probabilities.size,
+                                    size=n_suggestions,
+                                    replace=False,
+                                    p=probabilities)
+    indices = np.unravel_index(indices, [len(values) for values, _ in space])
+    return [
+        {k: space[i][0][indices[i][j]] for i, k in enumerate(matrix.keys())}
+        for j in range(n_suggestions)
+    ]
+
+
 def get_random_suggestions(matrix, n_suggestions, suggestion_params=None, seed=None):
     if not n_suggestions:
         raise ValueError('This search algorithm requires `n_experiments`.')
-    suggestions = []
     suggestion_params = suggestion_params or {}
     rand_generator = get_random_generator(seed=seed)
     # Validate number of suggestions and total space
@@ -53,12 +95,28 @@ def get_random_suggestions(matrix, n_suggestions, suggestion_params=None, seed=N
     if all_discrete:
         space = reduce(mul, [v.length for v in matrix.values()])
         n_suggestions = n_suggestions if n_suggestions <= space else space
+        # Rejection sampling slows down when the space is nearly exhausted
+        if space <= 2 * n_suggestions:
+            suggestions = []
+            for params in get_discrete_suggestions(matrix=matrix,
+                                                   n_suggestions=n_suggestions,
+                                                   rand_generator=rand_generator):
+                suggestion = dict(suggestion_params)
+                suggestion.update(params)
+                suggestions.append(suggestion)
+            return suggestions
 
-    while n_suggestions > 0:
-        params = copy.deepcopy(suggestion_params)
-        params.update({k: v.sample(rand_generator=rand_generator) for k, v in matrix.items()})
-        suggestion = Suggestion(params=params)
-        if suggestion not in suggestions:
-            suggestions.append(suggestion)
-            n_suggestions -= 1
-    return [suggestion.params for suggestion in suggestions]
+    suggestions = {}  # Suggestion -> params, keeps the sampling order
+    while len(suggestions) < n_suggestions:
+        size = n_suggestions - len(suggestions)
+        samples = {k: sample_values(v, size=size, rand_generator=rand_generator)
+                   for k, v in matrix.items()}
+        for i in range(size):
+            params = dict(suggestion_params)
+            params.update({k: values[i] for k, values in samples.items()})
+            suggestion = Suggestion(params=params)
+            if suggestion not in suggestions:
+                suggestions[suggestion] = params
+                if len(suggestions) == n_suggestions:
+                    break
+    return list(suggestions.values())
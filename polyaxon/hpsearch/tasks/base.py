@@ -1,20 +1,40 @@
+import json
 import traceback
 
 from hestia.np_utils import sanitize_np_types
 from rest_framework.exceptions import ValidationError
 
+from django.db import transaction
+
+import auditor
 import conf
 
 from constants.experiment_groups import ExperimentGroupLifeCycle
-from db.models.experiments import Experiment
+from constants.experiments import ExperimentLifeCycle
+from db.models.experiment_groups import ExperimentGroupStatusCounter
+from db.models.experiments import Experiment, ExperimentStatus
 from db.redis.group_check import GroupChecks
+from event_manager.events.experiment_group import EXPERIMENT_GROUP_EXPERIMENTS_CREATED
 from hpsearch.exceptions import ExperimentGroupException
 from hpsearch.tasks.logger import logger
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import SchedulerCeleryTasks
+from schemas.experiments import ExperimentBackend
+from signals.backend import set_backend
+from signals.framework import set_framework
+from signals.outputs import set_outputs, set_outputs_refs
+from signals.persistence import set_persistence
+from signals.tags import set_tags
+
+BULK_BATCH_SIZE = 500
+
 
+def get_suggestions(experiment_group, start=None, end=None):
+    """Returns the sanitized suggestions of the group.
 
-def get_suggestions(experiment_group):
+    `start` and `end` limit the suggestions to a range,
+    only that range is computed for the lazy grid suggestions.
+    """
     # Parse polyaxonfile content and create the experiments
     specification = experiment_group.specification
     suggestions = experiment_group.get_suggestions()
@@ -25,36 +45,93 @@ def get_suggestions(experiment_group):
                      extra={'stack': True})
         return
 
+    if start is not None or end is not None:
+        suggestions = suggestions[start:end]
+    return sanitize_suggestions(suggestions)
+
+
+def sanitize_suggestions(suggestions):
     # We sanitize numpy types to be able to jsonify and split the scheduling of different tasks
     return [{k: sanitize_np_types(v) for k, v in suggestion.items()} for suggestion in suggestions]
 
 
-def create_group_experiments(experiment_group, suggestions):
-    # Parse polyaxonfile content and create the experiments
+def build_group_experiments(experiment_group, suggestions):
+    """Returns the unsaved experiments of the suggestions.
+
+    The group spec is only parsed once, and the values that the experiment signals
+    would compute on save are set from the rendered experiment specs.
+    """
     specification = experiment_group.specification
 
+    persistences = {}
     experiments = []
     for suggestion in suggestions:
-        # We need to check if we should create or restart
-        try:
-            experiment = Experiment.objects.create(
-                project_id=experiment_group.project_id,
-                user_id=experiment_group.user_id,
-                experiment_group=experiment_group,
-                config=specification.get_experiment_spec(matrix_declaration=suggestion).parsed_data,
-                code_reference_id=experiment_group.code_reference_id)
-        except ValidationError:
-            experiment_group.set_status(
-                ExperimentGroupLifeCycle.FAILED,
-                message='Experiment group could not create experiments, '
-                        'encountered a validation error.',
-                traceback=traceback.format_exc())
-            raise ExperimentGroupException()
+        experiment_spec = specification.get_experiment_spec(matrix_declaration=suggestion)
+        experiment = Experiment(
+            project_id=experiment_group.project_id,
+            user_id=experiment_group.user_id,
+            experiment_group=experiment_group,
+            config=experiment_spec.parsed_data,
+            declarations=experiment_spec.declarations,
+            code_reference_id=experiment_group.code_reference_id)
+        # Avoids parsing the config a second time
+        experiment.specification = experiment_spec
+        set_tags(instance=experiment)
+        set_backend(instance=experiment, default_backend=ExperimentBackend.NATIVE)
+        set_framework(instance=experiment)
+        persistence_key = json.dumps(
+            experiment_spec.persistence.to_dict() if experiment_spec.persistence else None,
+            sort_keys=True)
+        if persistence_key not in persistences:
+            set_persistence(instance=experiment)
+            persistences[persistence_key] = experiment.persistence
+        experiment.persistence = persistences[persistence_key]
+        set_outputs(instance=experiment)
+        set_outputs_refs(instance=experiment)
         experiments.append(experiment)
 
     return experiments
 
 
+def create_group_experiments(experiment_group, suggestions):
+    """Creates the experiments of the suggestions in bulk.
+
+    The experiments and their `created` statuses are inserted in a single transaction,
+    and a single event is recorded for the group instead of the experiments' events.
+    """
+    try:
+        experiments = build_group_experiments(experiment_group=experiment_group,
+                                              suggestions=suggestions)
+    except ValidationError:
+        experiment_group.set_status(
+            ExperimentGroupLifeCycle.FAILED,
+            message='Experiment group could not create experiments, '
+                    'encountered a validation error.',
+            traceback=traceback.format_exc())
+        raise ExperimentGroupException()
+
+    if not experiments:
+        return experiments
+
+    with transaction.atomic():
+        Experiment.objects.bulk_create(experiments, batch_size=BULK_BATCH_SIZE)
+        statuses = ExperimentStatus.objects.bulk_create(
+            [ExperimentStatus(experiment=experiment, status=ExperimentLifeCycle.CREATED)
+             for experiment in experiments],
+            batch_size=BULK_BATCH_SIZE)
+        for experiment, status in zip(experiments, statuses):
+            experiment.status = status
+        Experiment.objects.bulk_update(experiments, ['status'], batch_size=BULK_BATCH_SIZE)
+        ExperimentGroupStatusCounter.increment(experiment_group_id=experiment_group.id,
+                                               status=ExperimentLifeCycle.CREATED,
+                                               value=len(experiments))
+
+    auditor.record(event_type=EXPERIMENT_GROUP_EXPERIMENTS_CREATED,
+                   instance=experiment_group,
+                   num_experiments=len(experiments))
+    return experiments
+
+
 def start_group_experiments(experiment_group):
     # Check for early stopping before starting new experiments from this group
     if experiment_group.should_stop_early():
@@ -73,7 +150,8 @@ def start_group_experiments(experiment_group):
                 not experiment_group.scheduled_all_suggestions())
     pending_experiments = experiment_group.pending_experiments.values_list(
         'id', flat=True)[:experiment_to_start]
-    n_pending_experiment = experiment_group.pending_experiments.count()
+    n_pending_experiment = experiment_group.count_experiments(
+        statuses=ExperimentLifeCycle.PENDING_STATUS)
 
     for experiment in pending_experiments:
         celery_app.send_task(
@@ -97,7 +97,7 @@ def hp_bo_iterate(self, experiment_group_id, auto_retry=False):
     if not experiment_group:
         return
 
-    if experiment_group.non_done_experiments.count() > 0:
+    if experiment_group.n_non_done_experiments > 0:
         if auto_retry:
             # Schedule another task, because all experiment must be done
             self.retry(countdown=Intervals.EXPERIMENTS_SCHEDULER)
@@ -109,7 +109,7 @@ def hp_bo_iterate(self, experiment_group_id, auto_retry=False):
 
     iteration_manager.update_iteration()
 
-    if search_manager.should_reschedule(iteration=iteration_config.iteration):
+    if search_manager.should_reschedule(iteration_config=iteration_config):
         celery_app.send_task(
             HPCeleryTasks.HP_BO_CREATE,
             kwargs={'experiment_group_id': experiment_group_id})
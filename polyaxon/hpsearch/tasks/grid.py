@@ -1,3 +1,5 @@
+import traceback
+
 import conf
 
 from constants.experiment_groups import ExperimentGroupLifeCycle
@@ -10,7 +12,8 @@ from polyaxon.settings import HPCeleryTasks, Intervals
 
 
 def create(experiment_group):
-    suggestions = base.get_suggestions(experiment_group=experiment_group)
+    # Only the first suggestion is computed to check the group, the chunks compute the others
+    suggestions = base.get_suggestions(experiment_group=experiment_group, end=1)
     if not suggestions:
         logger.error('Experiment group `%s` could not create any suggestion.',
                      experiment_group.id)
@@ -18,24 +21,12 @@ def create(experiment_group):
                                     message='Experiment group could not create new suggestions.')
         return
 
-    experiment_group.iteration_manager.create_iteration(num_suggestions=len(suggestions))
-
-    def send_chunk():
-        celery_app.send_task(
-            HPCeleryTasks.HP_GRID_SEARCH_CREATE_EXPERIMENTS,
-            kwargs={'experiment_group_id': experiment_group.id,
-                    'suggestions': chunk_suggestions},
-            countdown=1)
+    experiment_group.iteration_manager.create_iteration(
+        num_suggestions=len(experiment_group.get_suggestions()))
 
-    chunk_suggestions = []
-    for suggestion in suggestions:
-        chunk_suggestions.append(suggestion)
-        if len(chunk_suggestions) == conf.get('GROUP_CHUNKS'):
-            send_chunk()
-            chunk_suggestions = []
-
-    if chunk_suggestions:
-        send_chunk()
+    # The suggestions are created lazily by index ranges,
+    # each chunk schedules the next one, and the group can start with the first chunk.
+    send_chunk(experiment_group_id=experiment_group.id, start=0)
 
     celery_app.send_task(
         HPCeleryTasks.HP_GRID_SEARCH_START,
@@ -43,20 +34,52 @@ def create(experiment_group):
         countdown=1)
 
 
+def send_chunk(experiment_group_id, start):
+    celery_app.send_task(
+        HPCeleryTasks.HP_GRID_SEARCH_CREATE_EXPERIMENTS,
+        kwargs={'experiment_group_id': experiment_group_id, 'start': start},
+        countdown=1)
+
+
+def create_chunk(experiment_group, start, suggestions=None):
+    next_start = None
+    if suggestions is None:
+        end = start + conf.get('GROUP_CHUNKS')
+        suggestions = base.get_suggestions(experiment_group=experiment_group,
+                                           start=start,
+                                           end=end)
+        if not suggestions:
+            raise ValueError('No suggestions were made from `{}`.'.format(start))
+        if end < experiment_group.get_num_suggestions():
+            next_start = end
+
+    experiments = base.create_group_experiments(experiment_group=experiment_group,
+                                                suggestions=suggestions)
+    experiment_group.iteration_manager.add_iteration_experiments(
+        experiment_ids=[xp.id for xp in experiments])
+
+    if next_start is not None:
+        send_chunk(experiment_group_id=experiment_group.id, start=next_start)
+
+
 @celery_app.task(name=HPCeleryTasks.HP_GRID_SEARCH_CREATE_EXPERIMENTS, ignore_result=True)
-def hp_grid_search_create_experiments(experiment_group_id, suggestions):
+def hp_grid_search_create_experiments(experiment_group_id, start=0, suggestions=None):
     experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
     if not experiment_group:
         return
 
     try:
-        experiments = base.create_group_experiments(experiment_group=experiment_group,
-                                                    suggestions=suggestions)
+        create_chunk(experiment_group=experiment_group, start=start, suggestions=suggestions)
     except ExperimentGroupException:  # The experiments will be stopped
         return
-
-    experiment_group.iteration_manager.add_iteration_experiments(
-        experiment_ids=[xp.id for xp in experiments])
+    except Exception:
+        # The next chunks are scheduled by this one, the group would never get all its experiments
+        logger.error('Experiment group `%s` could not create the experiments from `%s`.',
+                     experiment_group_id, start, exc_info=True)
+        experiment_group.set_status(
+            ExperimentGroupLifeCycle.FAILED,
+            message='Experiment group could not create experiments.',
+            traceback=traceback.format_exc())
 
 
 @celery_app.task(name=HPCeleryTasks.HP_GRID_SEARCH_CREATE, ignore_result=True)
@@ -1,15 +1,67 @@
 import conf
 
 from constants.experiment_groups import ExperimentGroupLifeCycle
+from constants.experiments import ExperimentLifeCycle
 from db.getters.experiment_groups import get_running_experiment_group
 from hpsearch.exceptions import ExperimentGroupException
+from hpsearch.iteration_managers.asha import ASHAIterationManager
 from hpsearch.tasks import base
 from hpsearch.tasks.logger import logger
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import HPCeleryTasks, Intervals
 
 
+def is_asynchronous(experiment_group):
+    iteration_config = experiment_group.iteration_config
+    if iteration_config is None:
+        return conf.get('HP_HYPERBAND_ASYNC')
+    return bool(iteration_config.asynchronous)
+
+
+def create_asynchronous_configs(experiment_group, iteration_manager, n_suggestions):
+    search_manager = iteration_manager.search_manager
+    suggestions = search_manager.get_suggestions(
+        iteration_config=iteration_manager.get_iteration_config(),
+        n_suggestions=n_suggestions)
+    # The requested number is tracked, even if the space can't provide as many configs
+    iteration_manager.add_suggestions(n_suggestions=n_suggestions)
+    if not suggestions:
+        return []
+    experiments = base.create_group_experiments(
+        experiment_group=experiment_group,
+        suggestions=base.sanitize_suggestions(suggestions))
+    iteration_manager.add_iteration_experiments(experiment_ids=[xp.id for xp in experiments])
+    return experiments
+
+
+def create_asynchronous(experiment_group):
+    iteration_manager = ASHAIterationManager(experiment_group=experiment_group)
+    iteration_manager.create_iteration()
+    try:
+        experiments = create_asynchronous_configs(
+            experiment_group=experiment_group,
+            iteration_manager=iteration_manager,
+            n_suggestions=experiment_group.concurrency or 1)
+    except ExperimentGroupException:  # The experiments will be stopped
+        return
+    if not experiments:
+        logger.error('Experiment group `%s` could not create any suggestion.',
+                     experiment_group.id)
+        experiment_group.set_status(ExperimentGroupLifeCycle.FAILED,
+                                    message='Experiment group could not create new suggestions.')
+        return
+
+    celery_app.send_task(
+        HPCeleryTasks.HP_HYPERBAND_START,
+        kwargs={'experiment_group_id': experiment_group.id, 'auto_retry': True},
+        countdown=1)
+
+
 def create(experiment_group):
+    if is_asynchronous(experiment_group):
+        create_asynchronous(experiment_group=experiment_group)
+        return
+
     # This is a bit different since hyperband requires an iteration to work correctly
     # May search manager's needs to be updated.
     experiment_group.iteration_manager.create_iteration()
@@ -107,7 +159,11 @@ def hp_hyperband_iterate(self, experiment_group_id, auto_retry=False):
     if not experiment_group:
         return
 
-    if experiment_group.non_done_experiments.count() > 0:
+    if is_asynchronous(experiment_group):
+        iterate_asynchronous(task=self, experiment_group=experiment_group, auto_retry=auto_retry)
+        return
+
+    if experiment_group.n_non_done_experiments > 0:
         if auto_retry:
             # Schedule another task, because all experiment must be done
             self.retry(countdown=Intervals.EXPERIMENTS_SCHEDULER)
@@ -140,3 +196,35 @@ def hp_hyperband_iterate(self, experiment_group_id, auto_retry=False):
         return
 
     base.check_group_experiments_finished(experiment_group_id, auto_retry=auto_retry)
+
+
+def iterate_asynchronous(task, experiment_group, auto_retry):
+    """Promotes or creates configs as soon as slots are available, instead of waiting
+    for all the experiments of the bracket iteration to be done."""
+    iteration_manager = experiment_group.iteration_manager
+    search_manager = iteration_manager.search_manager
+    iteration_config = iteration_manager.update_iteration()
+
+    n_jobs = (experiment_group.n_experiments_to_start -
+              experiment_group.count_experiments(statuses=ExperimentLifeCycle.PENDING_STATUS))
+    promotions, n_suggestions = search_manager.get_jobs(iteration_config=iteration_config,
+                                                        n_jobs=n_jobs)
+    try:
+        if promotions:
+            iteration_manager.promote(promotions=promotions)
+        if n_suggestions:
+            create_asynchronous_configs(experiment_group=experiment_group,
+                                        iteration_manager=iteration_manager,
+                                        n_suggestions=n_suggestions)
+    except ExperimentGroupException:  # The experiments will be stopped
+        return
+    base.start_group_experiments(experiment_group=experiment_group)
+
+    if (experiment_group.n_non_done_experiments > 0 or
+            search_manager.should_promote_or_create(iteration_manager.get_iteration_config())):
+        if auto_retry:
+            # Schedule another task, to promote or create configs for the freed slots
+            task.retry(countdown=Intervals.EXPERIMENTS_SCHEDULER)
+        return
+
+    base.check_group_experiments_finished(experiment_group.id, auto_retry=auto_retry)
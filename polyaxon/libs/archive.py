@@ -1,7 +1,8 @@
+import itertools
 import os
 import tarfile
 
-from typing import Any, List, Tuple
+from typing import Any, Iterator, List, Tuple
 
 from hestia.paths import check_or_create_path
 from polystores.exceptions import PolyaxonStoresException
@@ -10,6 +11,7 @@ from rest_framework.exceptions import ValidationError
 import conf
 import stores
 
+from libs.logs_query import LogsQuery
 from stores.exceptions import VolumeNotFoundError  # pylint:disable=ungrouped-imports
 
 
@@ -97,3 +99,28 @@ def archive_logs_file(log_path: str, namepath: str, persistence_logs: str = 'def
     if store_manager.store.is_local_store:
         return log_path
     return download_filepath
+
+
+def archive_logs_stream(log_path: str,
+                        namepath: str,
+                        persistence_logs: str = 'default',
+                        query: LogsQuery = None) -> Iterator[bytes]:
+    """Streams a log persisted to a bucket, the log's segments are downloaded one at a time,
+    and only the segments of the query's lines are downloaded.
+    """
+    check_or_create_path(conf.get('LOGS_DOWNLOAD_ROOT'))
+    download_dir = os.path.join(conf.get('LOGS_DOWNLOAD_ROOT'), namepath.replace('.', '/'))
+    check_or_create_path(download_dir)
+    try:
+        segments_reader = stores.get_logs_segments_reader(logs_path=log_path,
+                                                          download_dir=download_dir,
+                                                          persistence=persistence_logs)
+        if query:
+            chunks = segments_reader.query(query=query)
+        else:
+            chunks = segments_reader.iter_chunks(paths=segments_reader.get_paths())
+        # Download the first object before streaming, to raise if the log does not exist
+        first_chunk = next(chunks, b'')
+    except (PolyaxonStoresException, VolumeNotFoundError) as e:
+        raise ValidationError(e)
+    return itertools.chain([first_chunk], chunks)
@@ -0,0 +1,263 @@
+import json
+import os
+import zlib
+
+from collections import deque, namedtuple
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rest_framework.exceptions import ValidationError
+
+import conf
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+TIMESTAMP_LENGTH = 19
+INDEX_SUFFIX = '.index'
+
+# A log position, the line number and the byte offset of a line, and the line's timestamp
+LogCheckpoint = namedtuple('LogCheckpoint', ['line', 'offset', 'timestamp'])
+
+FIRST_CHECKPOINT = LogCheckpoint(line=0, offset=0, timestamp=None)
+
+
+class LogsQuery(object):
+    """A query of a log, either the last `tail` lines, the lines of the last `since` seconds,
+    or a range of `lines` or `bytes`; ranges are (start, end) with an exclusive optional end.
+    """
+
+    def __init__(self,
+                 tail: int = None,
+                 since: int = None,
+                 lines: Tuple[int, Optional[int]] = None,
+                 bytes_range: Tuple[int, Optional[int]] = None) -> None:
+        self.tail = tail
+        self.since = since
+        self.lines = lines
+        self.bytes_range = bytes_range
+
+    @property
+    def is_pod_query(self) -> bool:
+        """The tail and since queries can be read directly from the logs of a pod."""
+        return self.tail is not None or self.since is not None
+
+    @property
+    def since_timestamp(self) -> Optional[str]:
+        if self.since is None:
+            return None
+        return (datetime.utcnow() - timedelta(seconds=self.since)).strftime(TIMESTAMP_FORMAT)
+
+    def get_lines(self, num_lines: Optional[int]) -> Optional[Tuple[int, Optional[int]]]:
+        """The range of lines of the query, the tail is a range if the number of lines is known."""
+        if self.tail is not None and num_lines is not None:
+            return max(num_lines - self.tail, 0), None
+        return self.lines
+
+
+def _get_int_param(query_params: Dict, name: str) -> Optional[int]:
+    value = query_params.get(name)
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError('`{}` must be an integer, received `{}`.'.format(name, value))
+    if value < 0:
+        raise ValidationError('`{}` must be a positive integer.'.format(name))
+    return value
+
+
+def _get_range_param(query_params: Dict, name: str) -> Optional[Tuple[int, Optional[int]]]:
+    value = query_params.get(name)
+    if value is None:
+        return None
+    start, sep, end = value.partition('-')
+    try:
+        start = int(start)
+        end = int(end) if end else None
+    except ValueError:
+        start = None
+    if not sep or start is None or start < 0 or (end is not None and end < start):
+        raise ValidationError(
+            '`{}` must be a range `start-end` or `start-`, received `{}`.'.format(name, value))
+    return start, end
+
+
+def get_logs_query(query_params: Dict) -> Optional[LogsQuery]:
+    """Returns the logs query of the request's params, or None if the whole log is requested."""
+    query = LogsQuery(tail=_get_int_param(query_params, 'tail'),
+                      since=_get_int_param(query_params, 'since'),
+                      lines=_get_range_param(query_params, 'lines'),
+                      bytes_range=_get_range_param(query_params, 'bytes'))
+    params = [query.tail, query.since, query.lines, query.bytes_range]
+    num_params = len([param for param in params if param is not None])
+    if num_params > 1:
+        raise ValidationError('Only one of `tail`, `since`, `lines` or `bytes` can be requested.')
+    return query if num_params else None
+
+
+def get_line_timestamp(line: bytes) -> Optional[str]:
+    """Returns the timestamp prefix of a log line, the timestamps are sortable as strings."""
+    timestamp = line[:TIMESTAMP_LENGTH].decode('utf-8', errors='ignore')
+    try:
+        datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+    return timestamp
+
+
+def get_start_index(checkpoints: List[LogCheckpoint],
+                    query: LogsQuery,
+                    num_lines: Optional[int]) -> int:
+    """Returns the index of the last checkpoint before the first line of the query."""
+    lines = query.get_lines(num_lines)
+    since = query.since_timestamp
+
+    def is_before(checkpoint):
+        if lines is not None:
+            return checkpoint.line <= lines[0]
+        if query.bytes_range is not None:
+            return checkpoint.offset <= query.bytes_range[0]
+        if since is not None:
+            return checkpoint.timestamp is not None and checkpoint.timestamp < since
+        return False
+
+    start = 0
+    for i, checkpoint in enumerate(checkpoints):
+        if not is_before(checkpoint):
+            break
+        start = i
+    return start
+
+
+def filter_lines(lines: Iterable[bytes],
+                 query: LogsQuery,
+                 checkpoint: LogCheckpoint = FIRST_CHECKPOINT,
+                 num_lines: int = None) -> Iterator[bytes]:
+    """Filters the lines of a log read from `checkpoint`.
+
+    If the number of lines of the log is not known, the tail is kept in memory.
+    """
+    if query.tail is not None and num_lines is None:
+        yield from deque(lines, maxlen=query.tail)
+        return
+
+    line_range = query.get_lines(num_lines)
+    since = query.since_timestamp
+    line_number, offset = checkpoint.line, checkpoint.offset
+    is_since = False
+    for line in lines:
+        if line_range is not None:
+            start, end = line_range
+            if end is not None and line_number >= end:
+                return
+            if line_number >= start:
+                yield line
+        elif query.bytes_range is not None:
+            start, end = query.bytes_range
+            if end is not None and offset >= end:
+                return
+            if offset + len(line) > start:
+                yield line[max(start - offset, 0):end - offset if end is not None else None]
+        elif since is not None:
+            if not is_since:
+                timestamp = get_line_timestamp(line)
+                is_since = timestamp is not None and timestamp >= since
+            if is_since:
+                yield line
+        else:
+            yield line
+        line_number += 1
+        offset += len(line)
+
+
+class LogFileIndex(object):
+    """A line offsets index of a log file, persisted next to the file.
+
+    The index keeps a checkpoint every `checkpoint_lines` lines,
+    it's updated with the lines appended since, and rebuilt if the file was replaced,
+    i.e. it has a new inode, or if it was truncated or rewritten in place,
+    i.e. the last indexed line changed.
+    """
+
+    def __init__(self, log_path: str, checkpoint_lines: int) -> None:
+        self.log_path = log_path
+        self.checkpoint_lines = checkpoint_lines
+
+    @property
+    def index_path(self) -> str:
+        return self.log_path + INDEX_SUFFIX
+
+    @staticmethod
+    def get_empty_index(stat: os.stat_result) -> Dict[str, Any]:
+        return {
+            'inode': [stat.st_dev, stat.st_ino],
+            'size': 0,
+            'lines': 0,
+            'last_line': [0, 0],
+            'checkpoints': [],
+        }
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.index_path, 'r') as index_file:
+                return json.loads(index_file.read())
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, index: Dict[str, Any]) -> None:
+        temp_path = '{}.{}'.format(self.index_path, os.getpid())
+        try:
+            with open(temp_path, 'w') as index_file:
+                index_file.write(json.dumps(index))
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            # The index is only an optimization, e.g. the logs volume can be read only
+            pass
+
+    def _is_valid(self, index: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+        if not index or index.get('inode') != [stat.st_dev, stat.st_ino]:
+            return False
+        if index['size'] > stat.st_size:
+            return False
+        offset, crc = index['last_line']
+        with open(self.log_path, 'rb') as log_file:
+            log_file.seek(offset)
+            return zlib.crc32(log_file.read(index['size'] - offset)) == crc
+
+    def update(self) -> Tuple[List[LogCheckpoint], int]:
+        """Indexes the new complete lines, returns the checkpoints and the number of lines."""
+        stat = os.stat(self.log_path)
+        index = self._load()
+        if not self._is_valid(index=index, stat=stat):
+            index = self.get_empty_index(stat)
+        if index['size'] < stat.st_size:
+            offset, num_lines = index['size'], index['lines']
+            with open(self.log_path, 'rb') as log_file:
+                log_file.seek(offset)
+                for line in log_file:
+                    if not line.endswith(b'\n'):
+                        break
+                    if num_lines % self.checkpoint_lines == 0:
+                        index['checkpoints'].append([num_lines, offset, get_line_timestamp(line)])
+                    index['last_line'] = [offset, zlib.crc32(line)]
+                    num_lines += 1
+                    offset += len(line)
+            if offset > index['size']:
+                index.update(size=offset, lines=num_lines)
+                self._save(index)
+        checkpoints = [LogCheckpoint(*checkpoint) for checkpoint in index['checkpoints']]
+        return checkpoints, index['lines']
+
+
+def query_log_file(log_path: str, query: LogsQuery) -> Iterator[bytes]:
+    checkpoints, num_lines = LogFileIndex(
+        log_path=log_path,
+        checkpoint_lines=conf.get('LOGS_INDEX_CHECKPOINT_LINES')).update()
+    start = get_start_index(checkpoints=checkpoints, query=query, num_lines=num_lines)
+    checkpoint = checkpoints[start] if checkpoints else FIRST_CHECKPOINT
+    with open(log_path, 'rb') as log_file:
+        log_file.seek(checkpoint.offset)
+        yield from filter_lines(lines=log_file,
+                                query=query,
+                                checkpoint=checkpoint,
+                                num_lines=num_lines)
@@ -9,13 +9,20 @@ from polyaxon_k8s.exceptions import PolyaxonK8SError
 def query_logs(k8s_manager: 'K8SManager',
                pod_id: str,
                container_job_name: str,
-               stream: bool = False) -> Any:
+               stream: bool = False,
+               tail_lines: int = None,
+               since_seconds: int = None) -> Any:
     params = {}
     if stream:
         params = {
             'follow': True,
             '_preload_content': False
         }
+    # Only the requested lines are read from the pod
+    if tail_lines is not None:
+        params['tail_lines'] = tail_lines
+    if since_seconds is not None:
+        params['since_seconds'] = since_seconds
 
     return k8s_manager.k8s_api.read_namespaced_pod_log(
         pod_id,
@@ -66,7 +73,9 @@ def process_logs(k8s_manager: 'K8SManager',
                  pod_id: str,
                  container_job_name: str,
                  task_type: str = None,
-                 task_idx: int = None) -> str:
+                 task_idx: int = None,
+                 tail_lines: int = None,
+                 since_seconds: int = None) -> str:
     logs = None
     retries = 0
     no_logs = True
@@ -74,7 +83,9 @@ def process_logs(k8s_manager: 'K8SManager',
         try:
             logs = query_logs(k8s_manager=k8s_manager,
                               pod_id=pod_id,
-                              container_job_name=container_job_name)
+                              container_job_name=container_job_name,
+                              tail_lines=tail_lines,
+                              since_seconds=since_seconds)
             no_logs = False
         except (PolyaxonK8SError, ApiException):
             retries += 1
@@ -1,9 +1,10 @@
 from typing import Iterable
 
 import conf
+import stores
 
 from logs_handlers.log_queries import base
-from logs_handlers.utils import safe_log_job
+from logs_handlers.utils import safe_log_job, safe_log_scratch
 from polyaxon_k8s.manager import K8SManager
 
 
@@ -14,10 +15,22 @@ def stream_logs(build: 'BuildJob') -> Iterable[str]:
                             container_job_name=conf.get('CONTAINER_NAME_DOCKERIZER_JOB'))
 
 
-def process_logs(build: 'BuildJob', temp: bool = True) -> None:
+def fetch_logs(build: 'BuildJob', tail_lines: int = None, since_seconds: int = None) -> str:
     k8s_manager = K8SManager(namespace=conf.get('K8S_NAMESPACE'), in_cluster=True)
-    log_lines = base.process_logs(k8s_manager=k8s_manager,
-                                  pod_id=build.pod_id,
-                                  container_job_name=conf.get('CONTAINER_NAME_DOCKERIZER_JOB'))
+    return base.process_logs(k8s_manager=k8s_manager,
+                             pod_id=build.pod_id,
+                             container_job_name=conf.get('CONTAINER_NAME_DOCKERIZER_JOB'),
+                             tail_lines=tail_lines,
+                             since_seconds=since_seconds)
+
+
+def process_logs(build: 'BuildJob', temp: bool = True) -> None:
+    log_lines = fetch_logs(build=build)
 
     safe_log_job(job_name=build.unique_name, log_lines=log_lines, temp=temp, append=False)
+
+
+def refresh_logs(build: 'BuildJob') -> str:
+    """Fetches the logs of a running build to be viewed, returns the path of their file."""
+    temp_path = stores.get_job_logs_path(job_name=build.unique_name, temp=True)
+    return safe_log_scratch(temp_path=temp_path, log_lines=fetch_logs(build=build))
@@ -1,12 +1,13 @@
 from typing import Iterable
 
 import conf
+import stores
 
 from constants.experiment_jobs import get_experiment_job_container_name
 from constants.k8s_jobs import EXPERIMENT_JOB_NAME_FORMAT
 from logs_handlers.log_queries import base
 from logs_handlers.log_queries.experiment_job import process_logs as process_experiment_job_logs
-from logs_handlers.utils import safe_log_experiment
+from logs_handlers.utils import safe_log_experiment, safe_log_scratch
 from polyaxon_k8s.manager import K8SManager
 
 
@@ -23,7 +24,9 @@ def stream_logs(experiment: 'Experiment') -> Iterable[str]:
                             container_job_name=container_job_name)
 
 
-def process_logs(experiment: 'Experiment', temp: bool = True) -> None:
+def fetch_logs(experiment: 'Experiment',
+               tail_lines: int = None,
+               since_seconds: int = None) -> str:
     pod_id = EXPERIMENT_JOB_NAME_FORMAT.format(
         task_type=experiment.default_job_role,
         task_idx=0,
@@ -31,9 +34,15 @@ def process_logs(experiment: 'Experiment', temp: bool = True) -> None:
     k8s_manager = K8SManager(namespace=conf.get('K8S_NAMESPACE'), in_cluster=True)
     container_job_name = get_experiment_job_container_name(backend=experiment.backend,
                                                            framework=experiment.framework)
-    log_lines = base.process_logs(k8s_manager=k8s_manager,
-                                  pod_id=pod_id,
-                                  container_job_name=container_job_name)
+    return base.process_logs(k8s_manager=k8s_manager,
+                             pod_id=pod_id,
+                             container_job_name=container_job_name,
+                             tail_lines=tail_lines,
+                             since_seconds=since_seconds)
+
+
+def process_logs(experiment: 'Experiment', temp: bool = True) -> None:
+    log_lines = fetch_logs(experiment=experiment)
 
     safe_log_experiment(experiment_name=experiment.unique_name,
                         log_lines=log_lines,
@@ -41,6 +50,12 @@ def process_logs(experiment: 'Experiment', temp: bool = True) -> None:
                         append=False)
 
 
+def refresh_logs(experiment: 'Experiment') -> str:
+    """Fetches the logs of a running experiment to be viewed, returns the path of their file."""
+    temp_path = stores.get_experiment_logs_path(experiment_name=experiment.unique_name, temp=True)
+    return safe_log_scratch(temp_path=temp_path, log_lines=fetch_logs(experiment=experiment))
+
+
 def process_experiment_jobs_logs(experiment: 'Experiment', temp: bool = True) -> None:
     k8s_manager = K8SManager(namespace=conf.get('K8S_NAMESPACE'), in_cluster=True)
     for experiment_job in experiment.jobs.all():
@@ -1,14 +1,16 @@
 import conf
+import stores
 
 from constants.experiment_jobs import get_experiment_job_container_name
 from logs_handlers.log_queries import base
-from logs_handlers.utils import safe_log_experiment_job
+from logs_handlers.utils import safe_log_experiment_job, safe_log_scratch
 from polyaxon_k8s.manager import K8SManager
 
 
-def process_logs(experiment_job: 'ExperimentJob',
-                 temp: bool = True,
-                 k8s_manager: 'K8SManager' = None) -> None:
+def fetch_logs(experiment_job: 'ExperimentJob',
+               k8s_manager: 'K8SManager' = None,
+               tail_lines: int = None,
+               since_seconds: int = None) -> str:
     task_type = experiment_job.role
     task_id = experiment_job.sequence
     if not k8s_manager:
@@ -16,13 +18,30 @@ def process_logs(experiment_job: 'ExperimentJob',
     container_job_name = get_experiment_job_container_name(
         backend=experiment_job.experiment.backend,
         framework=experiment_job.experiment.framework)
-    log_lines = base.process_logs(k8s_manager=k8s_manager,
-                                  pod_id=experiment_job.pod_id,
-                                  container_job_name=container_job_name,
-                                  task_type=task_type,
-                                  task_idx=task_id)
+    return base.process_logs(k8s_manager=k8s_manager,
+                             pod_id=experiment_job.pod_id,
+                             container_job_name=container_job_name,
+                             task_type=task_type,
+                             task_idx=task_id,
+                             tail_lines=tail_lines,
+                             since_seconds=since_seconds)
+
+
+def process_logs(experiment_job: 'ExperimentJob',
+                 temp: bool = True,
+                 k8s_manager: 'K8SManager' = None) -> None:
+    log_lines = fetch_logs(experiment_job=experiment_job, k8s_manager=k8s_manager)
 
     safe_log_experiment_job(experiment_job_name=experiment_job.unique_name,
                             log_lines=log_lines,
                             temp=temp,
                             append=False)
+
+
+def refresh_logs(experiment_job: 'ExperimentJob') -> str:
+    """Fetches the logs of a running experiment job to be viewed, returns the path of their file."""
+    temp_path = stores.get_experiment_job_logs_path(
+        experiment_job_name=experiment_job.unique_name,
+        temp=True)
+    return safe_log_scratch(temp_path=temp_path,
+                            log_lines=fetch_logs(experiment_job=experiment_job))
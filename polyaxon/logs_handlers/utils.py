@@ -1,9 +1,13 @@
 import fcntl
+import os
+import tempfile
 
 from typing import Iterable, Optional, Union
 
 import stores
 
+SCRATCH_SUFFIX = '.scratch'
+
 
 def _lock_log(log_path: str,
               log_lines: Optional[Union[str, Iterable[str]]],
@@ -17,6 +21,39 @@ def _lock_log(log_path: str,
         fcntl.flock(log_file, fcntl.LOCK_UN)
 
 
+def _segment_log(temp_path: str, logs_path: str, force: bool) -> None:
+    """Uploads the new lines of a bucket log as segments."""
+    segments_writer = stores.get_logs_segments_writer(temp_path=temp_path, logs_path=logs_path)
+    segments_writer.roll(force=force)
+
+
+def get_scratch_log_path(temp_path: str) -> str:
+    return temp_path + SCRATCH_SUFFIX
+
+
+def safe_log_scratch(temp_path: str, log_lines: Optional[Union[str, Iterable[str]]]) -> str:
+    """Writes the logs fetched from a pod to be viewed, returns the path of their file.
+
+    The file is apart from the temp log, which buffers the appended lines of the segments,
+    and it's replaced atomically, so that readers of the previous file are not affected.
+    """
+    scratch_path = get_scratch_log_path(temp_path)
+    if not log_lines:
+        return scratch_path
+    scratch_dir = os.path.dirname(scratch_path)
+    os.makedirs(scratch_dir, exist_ok=True)
+    fd, write_path = tempfile.mkstemp(dir=scratch_dir)
+    try:
+        with os.fdopen(fd, 'w') as log_file:
+            log_file.write(log_lines + '\n')
+        os.replace(write_path, scratch_path)
+    except OSError:
+        if os.path.exists(write_path):
+            os.remove(write_path)
+        raise
+    return scratch_path
+
+
 def safe_log_job(job_name: str,
                  log_lines: Optional[Union[str, Iterable[str]]],
                  temp: bool,
@@ -31,9 +68,15 @@ def safe_log_job(job_name: str,
             stores.create_job_logs_path(job_name=job_name, temp=_temp)
             _lock_log(log_path, log_lines, append=append)
 
-    # We are storing a temp file or a mounted path
-    if temp or not stores.is_bucket_logs_persistence():
+    # We are storing a mounted path
+    if not stores.is_bucket_logs_persistence():
         _safe_log_job()
+    elif append:
+        # We are storing a temp file and upload its new lines as segments
+        _safe_log_job(True)
+        _segment_log(temp_path=stores.get_job_logs_path(job_name=job_name, temp=True),
+                     logs_path=stores.get_job_logs_path(job_name=job_name, temp=False),
+                     force=not temp)
     else:
         # We are storing a file to bucket; Store the file as temp and then upload it
         _safe_log_job(True)
@@ -59,9 +102,17 @@ def safe_log_experiment(experiment_name: str,
     # Check if we are appending and the store is local
     if append and not stores.is_bucket_logs_persistence():
         _safe_log_experiment(False)
-    elif temp or not stores.is_bucket_logs_persistence():
-        # We are storing a temp file or a mounted path
+    elif not stores.is_bucket_logs_persistence():
+        # We are storing a mounted path
         _safe_log_experiment()
+    elif append:
+        # We are storing a temp file and upload its new lines as segments
+        _safe_log_experiment(True)
+        _segment_log(
+            temp_path=stores.get_experiment_logs_path(experiment_name=experiment_name, temp=True),
+            logs_path=stores.get_experiment_logs_path(experiment_name=experiment_name,
+                                                      temp=False),
+            force=not temp)
     else:
         # We are storing a file to bucket; Store the file as temp and then upload it
         _safe_log_experiment(True)
@@ -85,9 +136,18 @@ def safe_log_experiment_job(experiment_job_name: str,
                                                    temp=_temp)
             _lock_log(log_path, log_lines, append=append)
 
-    # We are storing a temp file or a mounted path
-    if temp or not stores.is_bucket_logs_persistence():
+    # We are storing a mounted path
+    if not stores.is_bucket_logs_persistence():
         _safe_log_experiment_job()
+    elif append:
+        # We are storing a temp file and upload its new lines as segments
+        _safe_log_experiment_job(True)
+        _segment_log(
+            temp_path=stores.get_experiment_job_logs_path(experiment_job_name=experiment_job_name,
+                                                          temp=True),
+            logs_path=stores.get_experiment_job_logs_path(experiment_job_name=experiment_job_name,
+                                                          temp=False),
+            force=not temp)
     else:
         # We are storing a file to bucket; Store the file as temp and then upload it
         _safe_log_experiment_job(True)
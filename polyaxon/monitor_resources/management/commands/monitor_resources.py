@@ -1,5 +1,7 @@
 import time
 
+from concurrent.futures import ThreadPoolExecutor
+
 import redis
 
 from hestia.bool_utils import to_bool
@@ -45,11 +47,18 @@ class Command(BaseMonitorCommand):
             "Started a new resources monitor with, "
             "log sleep interval: `{}` and persist: `{}`".format(log_sleep_interval, persist),
             ending='\n')
+        concurrency = conf.get('MONITOR_RESOURCES_CONCURRENCY')
+        executor = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+        docker_client = monitor.get_docker_client(max_pool_size=concurrency)
         containers = {}
         while True:
             try:
                 if node:
-                    monitor.run(containers, node, persist)
+                    monitor.run(containers,
+                                node,
+                                persist,
+                                docker_client=docker_client,
+                                executor=executor)
             except redis.exceptions.ConnectionError as e:
                 monitor.logger.warning("Redis connection is probably already closed %s\n", e)
             except Exception as e:
@@ -2,8 +2,10 @@ import json
 import logging
 import re
 import requests
+import time
 
-from typing import Any, Dict, List, Mapping, Optional
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
 import docker
 
@@ -11,6 +13,7 @@ from docker.errors import DockerException, NotFound
 
 import conf
 import polyaxon_gpustat
+import stats
 
 from constants.containers import ContainerStatuses
 from db.models.nodes import ClusterNode, NodeGPU
@@ -20,10 +23,14 @@ from schemas.containers import ContainerResourcesConfig
 
 logger = logging.getLogger('polyaxon.monitors.resources')
 
-try:
-    docker_client = docker.from_env(version="auto", timeout=10)
-except DockerException:
-    docker_client = None
+
+def get_docker_client(max_pool_size: int = None) -> Any:
+    """Returns a docker client, its connections pool should fit the concurrent stats calls."""
+    kwargs = {'max_pool_size': max_pool_size} if max_pool_size else {}
+    try:
+        return docker.from_env(version="auto", timeout=10, **kwargs)
+    except DockerException:
+        return None
 
 
 def get_gpu_resources() -> Any:
@@ -43,7 +50,7 @@ def get_container_gpu_indices(container: Any) -> List[int]:
     return gpus
 
 
-def get_container(containers: Dict, container_id: str) -> Any:
+def get_container(docker_client: Any, containers: Dict, container_id: str) -> Any:
     if not docker_client:
         return None
     try:  # we check first that the container is visible in this node
@@ -62,16 +69,30 @@ def get_container(containers: Dict, container_id: str) -> Any:
     return container
 
 
-def get_container_resources(node: 'ClusterNode',
-                            container: Any,
-                            gpu_resources: Mapping) -> Optional['ContainerResourcesConfig']:
+def get_container_resources(
+        node: 'ClusterNode',
+        container: Any,
+        gpu_resources: Mapping,
+        job: Tuple[Optional[str], Optional[str]] = None,
+        removed_container_ids: List[str] = None) -> Optional['ContainerResourcesConfig']:
+    """Returns the resources of the container.
+
+    The containers that should not be monitored anymore are added to `removed_container_ids`
+    to be removed in bulk, if it is provided, otherwise they are removed right away.
+    """
+    def remove_container():
+        if removed_container_ids is None:
+            RedisJobContainers.remove_container(container.id)
+        else:
+            removed_container_ids.append(container.id)
+
     # Check if the container is running
     if container.status != ContainerStatuses.RUNNING:
         logger.debug("`%s` container is not running", container.name)
-        RedisJobContainers.remove_container(container.id)
+        remove_container()
         return
 
-    job_uuid, experiment_uuid = RedisJobContainers.get_job(container.id)
+    job_uuid, experiment_uuid = job or RedisJobContainers.get_job(container.id)
 
     if not job_uuid:
         logger.debug("`%s` container is not recognised", container.name)
@@ -88,7 +109,7 @@ def get_container_resources(node: 'ClusterNode',
         return
     except NotFound:
         logger.debug("`%s` was not found", container.name)
-        RedisJobContainers.remove_container(container.id)
+        remove_container()
         return
     except requests.ReadTimeout:
         return
@@ -154,34 +175,99 @@ def update_cluster_node(node_gpus: Dict) -> None:
         node_gpu.save()
 
 
-def run(containers: Dict, node: 'ClusterNode', persist: bool) -> None:
+def safe_get_container_resources(node: 'ClusterNode',
+                                 container: Any,
+                                 gpu_resources: Mapping,
+                                 job: Tuple[Optional[str], Optional[str]],
+                                 removed_container_ids: List[str] = None) -> Optional[Dict]:
+    try:
+        payload = get_container_resources(node,
+                                          container,
+                                          gpu_resources,
+                                          job,
+                                          removed_container_ids=removed_container_ids)
+    except KeyError:
+        payload = None
+    except Exception as e:  # The other containers' resources are still collected
+        logger.warning("Could not collect the resources of container `%s`: %s",
+                       container.id, e, exc_info=True)
+        payload = None
+    return payload.to_dict() if payload else None
+
+
+def collect_resources(node: 'ClusterNode',
+                      containers: Iterable[Any],
+                      jobs: Mapping[str, Tuple[Optional[str], Optional[str]]],
+                      gpu_resources: Mapping,
+                      executor: Executor = None) -> List[Dict]:
+    """Collects the resources of all containers.
+
+    Every call to `container.stats` blocks for about a second in the docker daemon,
+    when an executor is provided the calls are dispatched concurrently,
+    so that a sweep takes about one stats interval regardless of the number of containers.
+    The containers that stopped are removed from the monitored containers at the end.
+    """
+    removed_container_ids = []
+
+    def get_payload(container):
+        return safe_get_container_resources(node=node,
+                                            container=container,
+                                            gpu_resources=gpu_resources,
+                                            job=jobs.get(container.id, (None, None)),
+                                            removed_container_ids=removed_container_ids)
+
+    if executor:
+        payloads = executor.map(get_payload, containers)
+    else:
+        payloads = (get_payload(container) for container in containers)
+    payloads = [payload for payload in payloads if payload]
+    RedisJobContainers.remove_containers(removed_container_ids)
+    return payloads
+
+
+def run(containers: Dict,
+        node: 'ClusterNode',
+        persist: bool,
+        docker_client: Any = None,
+        executor: Executor = None) -> None:
+    sweep_start = time.time()
     container_ids = RedisJobContainers.get_containers()
     gpu_resources = get_gpu_resources()
     if gpu_resources:
         gpu_resources = {gpu_resource['index']: gpu_resource for gpu_resource in gpu_resources}
     update_cluster_node(gpu_resources)
+    node_containers = []
     for container_id in container_ids:
-        container = get_container(containers, container_id)
-        if not container:
-            continue
-        try:
-            payload = get_container_resources(node, containers[container_id], gpu_resources)
-        except KeyError:
-            payload = None
-        if payload:
-            payload = payload.to_dict()
-            # todo: Re-enable publishing
-            # logger.debug("Publishing resources event")
-            # celery_app.send_task(
-            #     K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_RESOURCES,
-            #     kwargs={'payload': payload, 'persist': persist})
-
-            job_uuid = payload['job_uuid']
-            # Check if we should stream the payload
-            # Check if we have this container already in place
-            experiment_uuid = RedisJobContainers.get_experiment_for_job(job_uuid)
-            set_last_resources_cond = (
-                RedisToStream.is_monitored_job_resources(job_uuid) or
-                RedisToStream.is_monitored_experiment_resources(experiment_uuid))
-            if set_last_resources_cond:
-                RedisToStream.set_latest_job_resources(job_uuid, payload)
+        container = get_container(docker_client, containers, container_id)
+        if container:
+            node_containers.append(container)
+
+    # Resolve all containers' jobs in a fixed number of round-trips
+    jobs = RedisJobContainers.get_jobs([container.id for container in node_containers])
+    payloads = collect_resources(node=node,
+                                 containers=node_containers,
+                                 jobs=jobs,
+                                 gpu_resources=gpu_resources,
+                                 executor=executor)
+    # todo: Re-enable publishing
+    # logger.debug("Publishing resources event")
+    # celery_app.send_task(
+    #     K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_RESOURCES,
+    #     kwargs={'payload': payload, 'persist': persist})
+
+    # Check if we should stream the payloads
+    monitored_jobs = RedisToStream.are_monitored_jobs_resources(
+        [payload['job_uuid'] for payload in payloads])
+    monitored_experiments = RedisToStream.are_monitored_experiments_resources(
+        [payload['experiment_uuid'] for payload in payloads])
+    RedisToStream.set_latest_jobs_resources({
+        payload['job_uuid']: payload
+        for payload, is_monitored_job, is_monitored_experiment in zip(
+            payloads, monitored_jobs, monitored_experiments)
+        if is_monitored_job or is_monitored_experiment
+    })
+
+    sweep_duration = time.time() - sweep_start
+    logger.debug("Resources sweep over %s containers took %.2fs",
+                 len(node_containers), sweep_duration)
+    stats.timing('monitor_resources.sweep', sweep_duration)
@@ -1,7 +1,5 @@
-import copy
-
 from collections import deque
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 
 def get_dag(nodes, downstream_fn) -> Tuple[Dict, Dict]:
@@ -26,6 +24,26 @@ def get_dag(nodes, downstream_fn) -> Tuple[Dict, Dict]:
     return dag, node_by_ids
 
 
+def get_dag_from_edges(nodes, edges: Iterable[Tuple[int, int]]) -> Tuple[Dict, Dict]:
+    """Return a dag representation of the nodes passed and their edges.
+
+    Same as `get_dag`, but the downstream nodes are given as (node_id, downstream_node_id)
+    edges, e.g. the rows of a many to many table fetched in a single query.
+    The edges of nodes that are not part of the dag are ignored.
+    """
+    dag = {}
+    node_by_ids = {}
+    for node in nodes:
+        dag[node.id] = set()
+        node_by_ids[node.id] = node
+
+    for node_id, downstream_node_id in edges:
+        if node_id in dag:
+            dag[node_id].add(downstream_node_id)
+
+    return dag, node_by_ids
+
+
 def get_independent_nodes(dag):
     """Get a list of all node in the graph with no dependencies."""
     nodes = set(dag.keys())
@@ -47,31 +65,42 @@ def has_dependencies(node, dag):
     return False
 
 
-def sort_topologically(dag):
+def get_in_degrees(dag) -> Dict:
+    """Get the number of upstream nodes inside the dag of every node of the dag."""
+    in_degrees = {node: 0 for node in dag}
+    for downstream_nodes in dag.values():
+        for node in downstream_nodes:
+            if node in in_degrees:
+                in_degrees[node] += 1
+    return in_degrees
+
+
+def sort_topologically(dag) -> List:
     """Sort the dag breath first topologically.
 
     Only the nodes inside the dag are returned, i.e. the nodes that are also keys.
+    The nodes are sorted with Kahn's algorithm in O(V + E),
+    the independent nodes are visited in the order of the dag's keys.
 
     Returns:
          a topological ordering of the DAG.
     Raises:
          an error if this is not possible (graph is not valid).
     """
-    dag = copy.deepcopy(dag)
+    in_degrees = get_in_degrees(dag)
     sorted_nodes = []
-    independent_nodes = deque(get_independent_nodes(dag))
+    independent_nodes = deque(node for node, in_degree in in_degrees.items() if not in_degree)
     while independent_nodes:
         node = independent_nodes.popleft()
         sorted_nodes.append(node)
-        # this alters the dag so that we are sure we are visiting the nodes only once
-        downstream_nodes = dag[node]
-        while downstream_nodes:
-            downstream_node = downstream_nodes.pop(0)
-            if downstream_node not in dag:
+        for downstream_node in dag[node]:
+            if downstream_node not in in_degrees:
                 continue
-            if not has_dependencies(downstream_node, dag):
+            in_degrees[downstream_node] -= 1
+            if not in_degrees[downstream_node]:
                 independent_nodes.append(downstream_node)
 
     if len(sorted_nodes) != len(dag.keys()):
         raise ValueError('graph is not acyclic')
     return sorted_nodes
+
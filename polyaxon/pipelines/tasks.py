@@ -1,7 +1,6 @@
 import logging
 
 from constants.pipelines import OperationStatuses, PipelineStatuses
-from pipelines import dags
 from pipelines.utils import (
     get_operation_run,
     get_pipeline_run,
@@ -9,38 +8,25 @@ from pipelines.utils import (
     stop_operation_runs_for_pipeline_run
 )
 from polyaxon.celery_api import celery_app
-from polyaxon.settings import Intervals, PipelinesCeleryTasks
+from polyaxon.settings import PipelinesCeleryTasks
 
 _logger = logging.getLogger(__name__)
 
 
-@celery_app.task(name=PipelinesCeleryTasks.PIPELINES_START,
-                 bind=True,
-                 max_retries=None,
-                 ignore_result=True)
-def pipelines_start(self: 'celery_app.task', pipeline_run_id: int) -> None:
+@celery_app.task(name=PipelinesCeleryTasks.PIPELINES_START, ignore_result=True)
+def pipelines_start(pipeline_run_id: int) -> None:
     pipeline_run = get_pipeline_run(pipeline_run_id=pipeline_run_id)
     if not pipeline_run:
         _logger.info('Pipeline `%s` does not exist any more.', pipeline_run_id)
-
-    pipeline_run.on_schedule()
-    dag, op_runs = pipeline_run.dag
-    sorted_ops = dags.sort_topologically(dag=dag)
-    op_runs_to_start = [op_runs[op_run_id] for op_run_id in sorted_ops
-                        if op_runs[op_run_id].last_status == OperationStatuses.CREATED]
-    concurrency = pipeline_run.pipeline.n_operation_runs_to_start
-    future_check = False
-    while op_runs_to_start and concurrency > 0:
-        op_run = op_runs_to_start.pop()
-        if op_run.schedule_start():
-            # If we end up here it means that the task
-            future_check = True
-        else:
-            concurrency -= 1
-
-    if op_runs_to_start or future_check:
-        # Schedule another task
-        self.retry(countdown=Intervals.PIPELINES_SCHEDULER)
+        return
+
+    pipeline_run.on_scheduled()
+    # Only the operation runs with a decided upstream, e.g. without upstream, are scheduled,
+    # the other operation runs are notified by their upstream runs when they are done,
+    # and the ones waiting for a running slot when it is freed.
+    # The lost notifications are recovered by the `pipelines_repair_counters` cron.
+    for op_run in pipeline_run.get_operation_runs_to_schedule():
+        op_run.schedule_start()
 
 
 @celery_app.task(name=PipelinesCeleryTasks.PIPELINES_START_OPERATION, ignore_result=True)
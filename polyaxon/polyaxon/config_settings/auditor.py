@@ -0,0 +1,15 @@
+from polyaxon.config_manager import config
+
+# The auditor publishes the events of a process in batches,
+# a batch is published when it reaches the batch size or after the batch interval (in seconds)
+AUDITOR_EVENTS_BATCH_SIZE = config.get_int('POLYAXON_AUDITOR_EVENTS_BATCH_SIZE',
+                                           is_optional=True,
+                                           default=100)
+AUDITOR_EVENTS_BATCH_INTERVAL = config.get_float('POLYAXON_AUDITOR_EVENTS_BATCH_INTERVAL',
+                                                 is_optional=True,
+                                                 default=1)
+# Sampling rates of the view events, e.g. {"experiment.viewed": 0.1, "job.logs_viewed": 0},
+# a rate of 0 drops the event, the executor still handles all events
+AUDITOR_EVENTS_SAMPLING = config.get_dict('POLYAXON_AUDITOR_EVENTS_SAMPLING',
+                                          is_optional=True,
+                                          default={})
@@ -38,6 +38,10 @@ CELERYD_MAX_TASKS_PER_CHILD = config.get_int('POLYAXON_CELERYD_MAX_TASKS_PER_CHI
 GROUP_CHUNKS = config.get_int('POLYAXON_GROUP_CHUNKS',
                               is_optional=True,
                               default=50)
+# Use asynchronous successive halving (ASHA) for new hyperband groups
+HP_HYPERBAND_ASYNC = config.get_boolean('POLYAXON_HP_HYPERBAND_ASYNC',
+                                        is_optional=True,
+                                        default=False)
 
 
 class Intervals(object):
@@ -62,6 +66,14 @@ class Intervals(object):
         'POLYAXON_INTERVALS_EXPERIMENTS_SYNC',
         is_optional=True,
         default=30)
+    EXPERIMENT_GROUPS_REPAIR_COUNTERS = config.get_int(
+        'POLYAXON_INTERVALS_EXPERIMENT_GROUPS_REPAIR_COUNTERS',
+        is_optional=True,
+        default=60 * 10)
+    PIPELINES_REPAIR_COUNTERS = config.get_int(
+        'POLYAXON_INTERVALS_PIPELINES_REPAIR_COUNTERS',
+        is_optional=True,
+        default=60 * 5)
     CLUSTERS_UPDATE_SYSTEM_INFO = config.get_int(
         'POLYAXON_INTERVALS_CLUSTERS_UPDATE_SYSTEM_INFO',
         is_optional=True,
@@ -132,6 +144,9 @@ class CronsCeleryTasks(object):
     CRONS_HEALTH = 'crons_health'
 
     EXPERIMENTS_SYNC_JOBS_STATUSES = 'experiments_sync_jobs_statuses'
+    EXPERIMENT_GROUPS_REPAIR_STATUS_COUNTERS = 'experiment_groups_repair_status_counters'
+
+    PIPELINES_REPAIR_COUNTERS = 'pipelines_repair_counters'
 
     HEARTBEAT_EXPERIMENTS = 'heartbeat_experiments'
     HEARTBEAT_JOBS = 'heartbeat_jobs'
@@ -273,6 +288,7 @@ class SchedulerCeleryTasks(object):
     STORES_SCHEDULE_DATA_DELETION = 'stores_schedule_data_deletion'
     STORES_SCHEDULE_OUTPUTS_DELETION = 'stores_schedule_outputs_deletion'
     STORES_SCHEDULE_LOGS_DELETION = 'stores_schedule_logs_deletion'
+    STORES_SCHEDULE_PATHS_DELETION = 'stores_schedule_paths_deletion'
 
     DELETE_ARCHIVED_PROJECT = 'delete_archived_project'
     DELETE_ARCHIVED_EXPERIMENT_GROUP = 'delete_archived_experiment_group'
@@ -568,6 +584,8 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.SCHEDULER_STORES},
     SchedulerCeleryTasks.STORES_SCHEDULE_LOGS_DELETION:
         {'queue': CeleryQueues.SCHEDULER_STORES},
+    SchedulerCeleryTasks.STORES_SCHEDULE_PATHS_DELETION:
+        {'queue': CeleryQueues.SCHEDULER_STORES},
 
     # Scheduler deletion
     SchedulerCeleryTasks.DELETE_ARCHIVED_PROJECT:
@@ -593,6 +611,10 @@ CELERY_TASK_ROUTES = {
     # Crons
     CronsCeleryTasks.EXPERIMENTS_SYNC_JOBS_STATUSES:
         {'queue': CeleryQueues.CRONS_EXPERIMENTS},
+    CronsCeleryTasks.EXPERIMENT_GROUPS_REPAIR_STATUS_COUNTERS:
+        {'queue': CeleryQueues.CRONS_EXPERIMENTS},
+    CronsCeleryTasks.PIPELINES_REPAIR_COUNTERS:
+        {'queue': CeleryQueues.CRONS_PIPELINES},
 
     CronsCeleryTasks.HEARTBEAT_EXPERIMENTS:
         {'queue': CeleryQueues.CRONS_HEARTBEAT},
@@ -726,6 +748,20 @@ CELERY_BEAT_SCHEDULE = {
             'expires': Intervals.get_expires(Intervals.EXPERIMENTS_SYNC),
         },
     },
+    CronsCeleryTasks.EXPERIMENT_GROUPS_REPAIR_STATUS_COUNTERS + '_beat': {
+        'task': CronsCeleryTasks.EXPERIMENT_GROUPS_REPAIR_STATUS_COUNTERS,
+        'schedule': Intervals.get_schedule(Intervals.EXPERIMENT_GROUPS_REPAIR_COUNTERS),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.EXPERIMENT_GROUPS_REPAIR_COUNTERS),
+        },
+    },
+    CronsCeleryTasks.PIPELINES_REPAIR_COUNTERS + '_beat': {
+        'task': CronsCeleryTasks.PIPELINES_REPAIR_COUNTERS,
+        'schedule': Intervals.get_schedule(Intervals.PIPELINES_REPAIR_COUNTERS),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.PIPELINES_REPAIR_COUNTERS),
+        },
+    },
     CronsCeleryTasks.HEARTBEAT_EXPERIMENTS + '_beat': {
         'task': CronsCeleryTasks.HEARTBEAT_EXPERIMENTS,
         'schedule': Intervals.get_schedule(Intervals.HEARTBEAT_CHECK),
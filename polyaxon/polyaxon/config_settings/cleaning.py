@@ -14,3 +14,9 @@ class CleaningIntervals(object):
         'POLYAXON_CLEANING_INTERVALS_ARCHIVED',
         is_optional=True,
         default=7)
+
+
+# The number of rows deleted per query when deleting archived projects and experiment groups
+CLEANING_DELETION_BATCH_SIZE = config.get_int('POLYAXON_CLEANING_DELETION_BATCH_SIZE',
+                                              is_optional=True,
+                                              default=1000)
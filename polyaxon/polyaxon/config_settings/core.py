@@ -37,6 +37,18 @@ TTL_TOKEN = config.get_int('POLYAXON_TTL_TOKEN',
 TTL_EPHEMERAL_TOKEN = config.get_int('POLYAXON_TTL_EPHEMERAL_TOKEN',
                                      is_optional=True,
                                      default=60 * 60 * 3)
+# Tokens cache ttl in redis, entries are invalidated when the tokens or their users change
+TTL_TOKENS_CACHE = config.get_int('POLYAXON_TTL_TOKENS_CACHE',
+                                  is_optional=True,
+                                  default=60 * 10)
+# Tokens cache ttl in the process memory, it bounds the staleness across processes
+TTL_TOKENS_LOCAL_CACHE = config.get_int('POLYAXON_TTL_TOKENS_LOCAL_CACHE',
+                                        is_optional=True,
+                                        default=15)
+# Max number of tokens cached in the process memory
+TOKENS_LOCAL_CACHE_SIZE = config.get_int('POLYAXON_TOKENS_LOCAL_CACHE_SIZE',
+                                         is_optional=True,
+                                         default=1024)
 
 # Group checks interval
 GROUP_CHECKS_INTERVAL = config.get_int('POLYAXON_GROUP_CHECKS_INTERVAL',
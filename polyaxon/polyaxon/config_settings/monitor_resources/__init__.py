@@ -1,4 +1,6 @@
 from polyaxon.config_settings.labels import *
+from polyaxon.config_settings.resources import *
 from polyaxon.config_settings.spawner import *
+from polyaxon.config_settings.stats import *
 
 from .apps import *
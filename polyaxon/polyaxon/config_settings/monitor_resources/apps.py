@@ -2,6 +2,7 @@ from ..apps import *
 from ..auditor_apps import AUDITOR_APPS
 
 PROJECT_APPS = AUDITOR_APPS + (
+    'stats.apps.StatsConfig',
     'monitor_resources.apps.MonitorResourcesConfig',
 )
 
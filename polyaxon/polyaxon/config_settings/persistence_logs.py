@@ -1,3 +1,18 @@
 from polyaxon.config_manager import config
 
 PERSISTENCE_LOGS = config.get_dict('POLYAXON_PERSISTENCE_LOGS')
+
+# Logs persisted to a bucket are uploaded in segments,
+# a segment is rolled once it reaches the segment size (in bytes)
+# or after the segment interval (in seconds)
+LOGS_SEGMENT_SIZE = config.get_int('POLYAXON_LOGS_SEGMENT_SIZE',
+                                   is_optional=True,
+                                   default=4 * 1024 * 1024)
+LOGS_SEGMENT_INTERVAL = config.get_float('POLYAXON_LOGS_SEGMENT_INTERVAL',
+                                         is_optional=True,
+                                         default=60)
+# The stored logs are indexed with a checkpoint every number of lines,
+# to read a tail or a range of a log without reading the whole log
+LOGS_INDEX_CHECKPOINT_LINES = config.get_int('POLYAXON_LOGS_INDEX_CHECKPOINT_LINES',
+                                             is_optional=True,
+                                             default=1000)
@@ -0,0 +1,7 @@
+from polyaxon.config_manager import config
+
+# Number of containers for which stats are collected concurrently in a single sweep,
+# a value of 1 disables the thread pool and collects stats sequentially.
+MONITOR_RESOURCES_CONCURRENCY = config.get_int('POLYAXON_MONITOR_RESOURCES_CONCURRENCY',
+                                               is_optional=True,
+                                               default=10)
@@ -1,3 +1,5 @@
+from polyaxon.config_manager import config
+
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': (
         # 'djangorestframework_camel_case.render.CamelCaseJSONRenderer',  # Any other renders,
@@ -36,3 +38,8 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 20
 }
+
+# Paginators estimating their counts only run an exact `COUNT(*)` below this number of rows
+PAGINATION_EXACT_COUNT_THRESHOLD = config.get_int('POLYAXON_PAGINATION_EXACT_COUNT_THRESHOLD',
+                                                  is_optional=True,
+                                                  default=10000)
@@ -1,4 +1,5 @@
 from polyaxon.config_settings.ci import *
+from polyaxon.config_settings.cleaning import *
 from polyaxon.config_settings.cors import *
 from polyaxon.config_settings.dirs import *
 from polyaxon.config_settings.k8s import *
@@ -14,6 +14,12 @@ K8S_RBAC_ENABLED = config.get_boolean('POLYAXON_K8S_RBAC_ENABLED')
 K8S_INGRESS_ENABLED = config.get_boolean('POLYAXON_K8S_INGRESS_ENABLED')
 K8S_INGRESS_ANNOTATIONS = config.get_string('POLYAXON_K8S_INGRESS_ANNOTATIONS', is_optional=True)
 
+# Number of replicas of an experiment's task type created concurrently,
+# a value of 1 disables the thread pool and creates the replicas sequentially.
+SPAWNER_CONCURRENCY = config.get_int('POLYAXON_SPAWNER_CONCURRENCY',
+                                     is_optional=True,
+                                     default=10)
+
 # Builds
 BUILD_ALWAYS_PULL_LATEST = config.get_boolean('POLYAXON_BUILD_ALWAYS_PULL_LATEST',
                                               is_optional=True,
@@ -8,3 +8,6 @@ STATS_BACKEND = config.get_string(
     is_optional=True,
     default=STATS_BACKEND_NOOP,
     options=(STATS_BACKEND_NOOP, STATS_BACKEND_DATADOG, STATS_BACKEND_STATSD))
+DEFAULT_STATS_PREFIX = config.get_string('POLYAXON_STATS_PREFIX',
+                                         is_optional=True,
+                                         default='polyaxon')
@@ -4,12 +4,13 @@ import uuid
 
 from kubernetes.client.rest import ApiException
 
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 import conf
 
 from constants.experiments import ExperimentLifeCycle
-from db.models.experiment_jobs import ExperimentJob
+from constants.jobs import JobLifeCycle
+from db.models.experiment_jobs import ExperimentJob, ExperimentJobStatus
 from db.models.job_resources import JobResources
 from docker_images.image_info import get_image_info
 from scheduler.spawners.experiment_spawner import ExperimentSpawner
@@ -35,14 +36,36 @@ from stores.exceptions import VolumeNotFoundError
 _logger = logging.getLogger('polyaxon.scheduler.experiment')
 
 
-def create_job(job_uuid,
-               experiment,
-               role=None,
-               sequence=None,
-               resources=None,
-               node_selector=None,
-               affinity=None,
-               tolerations=None):
+def get_job_resources(resources):
+    job_resources = {}
+    if resources.memory:
+        _resources = resources.memory.to_dict()
+        if any(_resources.values()):
+            job_resources['memory'] = _resources
+    if resources.cpu:
+        _resources = resources.cpu.to_dict()
+        if any(_resources.values()):
+            job_resources['cpu'] = _resources
+    if resources.gpu:
+        _resources = resources.gpu.to_dict()
+        if any(_resources.values()):
+            job_resources['gpu'] = _resources
+    if resources.tpu:
+        _resources = resources.tpu.to_dict()
+        if any(_resources.values()):
+            job_resources['tpu'] = _resources
+    return job_resources
+
+
+def build_job(job_uuid,
+              experiment,
+              role=None,
+              sequence=None,
+              resources=None,
+              node_selector=None,
+              affinity=None,
+              tolerations=None):
+    """Returns the unsaved job and its resources values, if any."""
     job = ExperimentJob(uuid=uuid.UUID(job_uuid), experiment=experiment, definition={})
 
     if role:
@@ -60,39 +83,74 @@ def create_job(job_uuid,
     if tolerations:
         job.tolerations = tolerations
 
-    def set_resources():
-        job_resources = {}
-        if resources.memory:
-            _resources = resources.memory.to_dict()
-            if any(_resources.values()):
-                job_resources['memory'] = _resources
-        if resources.cpu:
-            _resources = resources.cpu.to_dict()
-            if any(_resources.values()):
-                job_resources['cpu'] = _resources
-        if resources.gpu:
-            _resources = resources.gpu.to_dict()
-            if any(_resources.values()):
-                job_resources['gpu'] = _resources
-        if resources.tpu:
-            _resources = resources.tpu.to_dict()
-            if any(_resources.values()):
-                job_resources['tpu'] = _resources
-        if job_resources:
-            job.resources = JobResources.objects.create(**job_resources)
-
-    if resources:
-        set_resources()
+    job_resources = get_job_resources(resources) if resources else None
+    return job, job_resources or None
+
+
+def create_job(job_uuid,
+               experiment,
+               role=None,
+               sequence=None,
+               resources=None,
+               node_selector=None,
+               affinity=None,
+               tolerations=None):
+    job, job_resources = build_job(job_uuid=job_uuid,
+                                   experiment=experiment,
+                                   role=role,
+                                   sequence=sequence,
+                                   resources=resources,
+                                   node_selector=node_selector,
+                                   affinity=affinity,
+                                   tolerations=tolerations)
+    if job_resources:
+        job.resources = JobResources.objects.create(**job_resources)
 
     job.save()
 
 
+def create_jobs(jobs):
+    """Creates the jobs returned by `build_job` in bulk.
+
+    The jobs, their resources and their `created` statuses are inserted in a single transaction,
+    so that no job is created if any of them fails.
+    The `created` status does not trigger any action, no event is recorded for it.
+    """
+    with transaction.atomic():
+        resources = JobResources.objects.bulk_create(
+            [JobResources(**job_resources) for _, job_resources in jobs if job_resources])
+        resources = iter(resources)
+        for job, job_resources in jobs:
+            if job_resources:
+                job.resources = next(resources)
+        jobs = ExperimentJob.objects.bulk_create([job for job, _ in jobs])
+        statuses = ExperimentJobStatus.objects.bulk_create(
+            [ExperimentJobStatus(job=job, status=JobLifeCycle.CREATED) for job in jobs])
+        for job, status in zip(jobs, statuses):
+            job.status = status
+        ExperimentJob.objects.bulk_update(jobs, ['status'])
+    return jobs
+
+
 def set_job_definition(job_uuid, definition):
     job = ExperimentJob.objects.get(uuid=job_uuid)
     job.definition = definition
     job.save(update_fields=['definition'])
 
 
+def set_jobs_definitions(responses):
+    """Sets the definitions of the jobs of the pods' responses in a single update."""
+    definitions = {}
+    for response in responses:
+        job_uuid = uuid.UUID(response['pod']['metadata']['labels']['job_uuid'])
+        definitions[job_uuid] = get_job_definition(response)
+
+    jobs = list(ExperimentJob.objects.filter(uuid__in=definitions.keys()).only('id', 'uuid'))
+    for job in jobs:
+        job.definition = definitions[job.uuid]
+    ExperimentJob.objects.bulk_update(jobs, ['definition'])
+
+
 def get_native_spawner_backend(framework):
     if framework == ExperimentFramework.TENSORFLOW:
         return TensorflowSpawner
@@ -136,17 +194,18 @@ def get_spawner_class(specification):
 
 
 def create_tensorflow_experiment_jobs(experiment, spawner):
+    jobs = []
     master_job_uuid = spawner.job_uuids[TaskType.MASTER][0]
     role = TaskType.MASTER
     if experiment.backend == ExperimentBackend.KUBEFLOW:
         role = TaskType.CHIEF
-    create_job(job_uuid=master_job_uuid,
-               experiment=experiment,
-               role=role,
-               resources=spawner.spec.master_resources,
-               node_selector=spawner.spec.master_node_selector,
-               affinity=spawner.spec.master_affinity,
-               tolerations=spawner.spec.master_tolerations)
+    jobs.append(build_job(job_uuid=master_job_uuid,
+                          experiment=experiment,
+                          role=role,
+                          resources=spawner.spec.master_resources,
+                          node_selector=spawner.spec.master_node_selector,
+                          affinity=spawner.spec.master_affinity,
+                          tolerations=spawner.spec.master_tolerations))
 
     cluster, is_distributed = spawner.spec.cluster_def
     environment = spawner.spec.config.tensorflow
@@ -173,14 +232,14 @@ def create_tensorflow_experiment_jobs(experiment, spawner):
     )
 
     for i, worker_job_uuid in enumerate(spawner.job_uuids[TaskType.WORKER]):
-        create_job(job_uuid=worker_job_uuid,
-                   experiment=experiment,
-                   role=TaskType.WORKER,
-                   sequence=i,
-                   resources=worker_resources.get(i),
-                   node_selector=worker_node_selectors.get(i),
-                   affinity=worker_affinities.get(i),
-                   tolerations=worker_tolerations.get(i))
+        jobs.append(build_job(job_uuid=worker_job_uuid,
+                              experiment=experiment,
+                              role=TaskType.WORKER,
+                              sequence=i,
+                              resources=worker_resources.get(i),
+                              node_selector=worker_node_selectors.get(i),
+                              affinity=worker_affinities.get(i),
+                              tolerations=worker_tolerations.get(i)))
 
     ps_resources = TensorflowSpecification.get_ps_resources(
         environment=environment,
@@ -204,42 +263,32 @@ def create_tensorflow_experiment_jobs(experiment, spawner):
     )
 
     for i, ps_job_uuid in enumerate(spawner.job_uuids[TaskType.PS]):
-        create_job(job_uuid=ps_job_uuid,
-                   experiment=experiment,
-                   role=TaskType.PS,
-                   sequence=i,
-                   resources=ps_resources.get(i),
-                   node_selector=ps_node_selectors.get(i),
-                   affinity=ps_affinities.get(i),
-                   tolerations=ps_tolerations.get(i))
-
-
-def handle_tensorflow_experiment(response):
-    master = response[TaskType.MASTER]
-    job_uuid = master['pod']['metadata']['labels']['job_uuid']
-    job_uuid = uuid.UUID(job_uuid)
+        jobs.append(build_job(job_uuid=ps_job_uuid,
+                              experiment=experiment,
+                              role=TaskType.PS,
+                              sequence=i,
+                              resources=ps_resources.get(i),
+                              node_selector=ps_node_selectors.get(i),
+                              affinity=ps_affinities.get(i),
+                              tolerations=ps_tolerations.get(i)))
 
-    set_job_definition(job_uuid=job_uuid, definition=get_job_definition(master))
+    create_jobs(jobs)
 
-    for worker in response[TaskType.WORKER]:
-        job_uuid = worker['pod']['metadata']['labels']['job_uuid']
-        job_uuid = uuid.UUID(job_uuid)
-        set_job_definition(job_uuid=job_uuid, definition=get_job_definition(worker))
 
-    for ps in response[TaskType.PS]:
-        job_uuid = ps['pod']['metadata']['labels']['job_uuid']
-        job_uuid = uuid.UUID(job_uuid)
-        set_job_definition(job_uuid=job_uuid, definition=get_job_definition(ps))
+def handle_tensorflow_experiment(response):
+    responses = [response[TaskType.MASTER]] + response[TaskType.WORKER] + response[TaskType.PS]
+    set_jobs_definitions(responses=responses)
 
 
 def create_horovod_experiment_jobs(experiment, spawner):
+    jobs = []
     master_job_uuid = spawner.job_uuids[TaskType.MASTER][0]
-    create_job(job_uuid=master_job_uuid,
-               experiment=experiment,
-               resources=spawner.spec.master_resources,
-               node_selector=spawner.spec.master_node_selector,
-               affinity=spawner.spec.master_affinity,
-               tolerations=spawner.spec.master_tolerations)
+    jobs.append(build_job(job_uuid=master_job_uuid,
+                          experiment=experiment,
+                          resources=spawner.spec.master_resources,
+                          node_selector=spawner.spec.master_node_selector,
+                          affinity=spawner.spec.master_affinity,
+                          tolerations=spawner.spec.master_tolerations))
 
     cluster, is_distributed = spawner.spec.cluster_def
     environment = spawner.spec.config.horovod
@@ -265,30 +314,24 @@ def create_horovod_experiment_jobs(experiment, spawner):
     )
 
     for i, worker_job_uuid in enumerate(spawner.job_uuids[TaskType.WORKER]):
-        create_job(job_uuid=worker_job_uuid,
-                   experiment=experiment,
-                   role=TaskType.WORKER,
-                   sequence=i,
-                   resources=worker_resources.get(i),
-                   node_selector=worker_node_selectors.get(i),
-                   affinity=worker_affinities.get(i),
-                   tolerations=worker_tolerations.get(i))
+        jobs.append(build_job(job_uuid=worker_job_uuid,
+                              experiment=experiment,
+                              role=TaskType.WORKER,
+                              sequence=i,
+                              resources=worker_resources.get(i),
+                              node_selector=worker_node_selectors.get(i),
+                              affinity=worker_affinities.get(i),
+                              tolerations=worker_tolerations.get(i)))
 
+    create_jobs(jobs)
 
-def handle_horovod_experiment(response):
-    master = response[TaskType.MASTER]
-    job_uuid = master['pod']['metadata']['labels']['job_uuid']
-    job_uuid = uuid.UUID(job_uuid)
 
-    set_job_definition(job_uuid=job_uuid, definition=get_job_definition(master))
-
-    for worker in response[TaskType.WORKER]:
-        job_uuid = worker['pod']['metadata']['labels']['job_uuid']
-        job_uuid = uuid.UUID(job_uuid)
-        set_job_definition(job_uuid=job_uuid, definition=get_job_definition(worker))
+def handle_horovod_experiment(response):
+    set_jobs_definitions(responses=[response[TaskType.MASTER]] + response[TaskType.WORKER])
 
 
 def create_mpi_experiment_jobs(experiment, spawner):
+    jobs = []
     cluster, is_distributed = spawner.spec.cluster_def
     environment = spawner.spec.config.mpi
     worker_resources = MPISpecification.get_worker_resources(
@@ -314,32 +357,35 @@ def create_mpi_experiment_jobs(experiment, spawner):
 
     for i, worker_job_uuid in enumerate(spawner.job_uuids[TaskType.WORKER]):
         if i == 0:
-            create_job(job_uuid=worker_job_uuid,
-                       experiment=experiment,
-                       role=TaskType.WORKER,
-                       resources=spawner.spec.master_resources,
-                       node_selector=spawner.spec.master_node_selector,
-                       affinity=spawner.spec.master_affinity,
-                       tolerations=spawner.spec.master_tolerations)
+            jobs.append(build_job(job_uuid=worker_job_uuid,
+                                  experiment=experiment,
+                                  role=TaskType.WORKER,
+                                  resources=spawner.spec.master_resources,
+                                  node_selector=spawner.spec.master_node_selector,
+                                  affinity=spawner.spec.master_affinity,
+                                  tolerations=spawner.spec.master_tolerations))
         else:
-            create_job(job_uuid=worker_job_uuid,
-                       experiment=experiment,
-                       role=TaskType.WORKER,
-                       sequence=i,
-                       resources=worker_resources.get(i),
-                       node_selector=worker_node_selectors.get(i),
-                       affinity=worker_affinities.get(i),
-                       tolerations=worker_tolerations.get(i))
+            jobs.append(build_job(job_uuid=worker_job_uuid,
+                                  experiment=experiment,
+                                  role=TaskType.WORKER,
+                                  sequence=i,
+                                  resources=worker_resources.get(i),
+                                  node_selector=worker_node_selectors.get(i),
+                                  affinity=worker_affinities.get(i),
+                                  tolerations=worker_tolerations.get(i)))
+
+    create_jobs(jobs)
 
 
 def create_pytorch_experiment_jobs(experiment, spawner):
+    jobs = []
     master_job_uuid = spawner.job_uuids[TaskType.MASTER][0]
-    create_job(job_uuid=master_job_uuid,
-               experiment=experiment,
-               resources=spawner.spec.master_resources,
-               node_selector=spawner.spec.master_node_selector,
-               affinity=spawner.spec.master_affinity,
-               tolerations=spawner.spec.master_tolerations)
+    jobs.append(build_job(job_uuid=master_job_uuid,
+                          experiment=experiment,
+                          resources=spawner.spec.master_resources,
+                          node_selector=spawner.spec.master_node_selector,
+                          affinity=spawner.spec.master_affinity,
+                          tolerations=spawner.spec.master_tolerations))
 
     cluster, is_distributed = spawner.spec.cluster_def
     environment = spawner.spec.config.pytorch
@@ -366,37 +412,31 @@ def create_pytorch_experiment_jobs(experiment, spawner):
     )
 
     for i, worker_job_uuid in enumerate(spawner.job_uuids[TaskType.WORKER]):
-        create_job(job_uuid=worker_job_uuid,
-                   experiment=experiment,
-                   role=TaskType.WORKER,
-                   sequence=i,
-                   resources=worker_resources.get(i),
-                   node_selector=worker_node_selectors.get(i),
-                   affinity=worker_affinities.get(i),
-                   tolerations=worker_tolerations.get(i))
-
+        jobs.append(build_job(job_uuid=worker_job_uuid,
+                              experiment=experiment,
+                              role=TaskType.WORKER,
+                              sequence=i,
+                              resources=worker_resources.get(i),
+                              node_selector=worker_node_selectors.get(i),
+                              affinity=worker_affinities.get(i),
+                              tolerations=worker_tolerations.get(i)))
 
-def handle_pytorch_experiment(response):
-    master = response[TaskType.MASTER]
-    job_uuid = master['pod']['metadata']['labels']['job_uuid']
-    job_uuid = uuid.UUID(job_uuid)
+    create_jobs(jobs)
 
-    set_job_definition(job_uuid=job_uuid, definition=get_job_definition(master))
 
-    for worker in response[TaskType.WORKER]:
-        job_uuid = worker['pod']['metadata']['labels']['job_uuid']
-        job_uuid = uuid.UUID(job_uuid)
-        set_job_definition(job_uuid=job_uuid, definition=get_job_definition(worker))
+def handle_pytorch_experiment(response):
+    set_jobs_definitions(responses=[response[TaskType.MASTER]] + response[TaskType.WORKER])
 
 
 def create_mxnet_experiment_jobs(experiment, spawner):
+    jobs = []
     master_job_uuid = spawner.job_uuids[TaskType.MASTER][0]
-    create_job(job_uuid=master_job_uuid,
-               experiment=experiment,
-               resources=spawner.spec.master_resources,
-               node_selector=spawner.spec.master_node_selector,
-               affinity=spawner.spec.master_affinity,
-               tolerations=spawner.spec.master_tolerations)
+    jobs.append(build_job(job_uuid=master_job_uuid,
+                          experiment=experiment,
+                          resources=spawner.spec.master_resources,
+                          node_selector=spawner.spec.master_node_selector,
+                          affinity=spawner.spec.master_affinity,
+                          tolerations=spawner.spec.master_tolerations))
 
     cluster, is_distributed = spawner.spec.cluster_def
     environment = spawner.spec.config.mxnet
@@ -423,14 +463,14 @@ def create_mxnet_experiment_jobs(experiment, spawner):
     )
 
     for i, worker_job_uuid in enumerate(spawner.job_uuids[TaskType.WORKER]):
-        create_job(job_uuid=worker_job_uuid,
-                   experiment=experiment,
-                   role=TaskType.WORKER,
-                   sequence=i,
-                   resources=worker_resources.get(i),
-                   node_selector=worker_node_selectors.get(i),
-                   affinity=worker_affinities.get(i),
-                   tolerations=worker_tolerations.get(i))
+        jobs.append(build_job(job_uuid=worker_job_uuid,
+                              experiment=experiment,
+                              role=TaskType.WORKER,
+                              sequence=i,
+                              resources=worker_resources.get(i),
+                              node_selector=worker_node_selectors.get(i),
+                              affinity=worker_affinities.get(i),
+                              tolerations=worker_tolerations.get(i)))
 
     server_resources = MXNetSpecification.get_ps_resources(
         environment=environment,
@@ -453,50 +493,38 @@ def create_mxnet_experiment_jobs(experiment, spawner):
         is_distributed=is_distributed
     )
     for i, server_job_uuid in enumerate(spawner.job_uuids[TaskType.SERVER]):
-        create_job(job_uuid=server_job_uuid,
-                   experiment=experiment,
-                   role=TaskType.SERVER,
-                   sequence=i,
-                   resources=server_resources.get(i),
-                   node_selector=server_node_selectors,
-                   affinity=server_affinities,
-                   tolerations=server_tolerations)
-
+        jobs.append(build_job(job_uuid=server_job_uuid,
+                              experiment=experiment,
+                              role=TaskType.SERVER,
+                              sequence=i,
+                              resources=server_resources.get(i),
+                              node_selector=server_node_selectors,
+                              affinity=server_affinities,
+                              tolerations=server_tolerations))
 
-def handle_mxnet_experiment(response):
-    master = response[TaskType.MASTER]
-    job_uuid = master['pod']['metadata']['labels']['job_uuid']
-    job_uuid = uuid.UUID(job_uuid)
-
-    set_job_definition(job_uuid=job_uuid, definition=get_job_definition(master))
+    create_jobs(jobs)
 
-    for worker in response[TaskType.WORKER]:
-        job_uuid = worker['pod']['metadata']['labels']['job_uuid']
-        job_uuid = uuid.UUID(job_uuid)
-        set_job_definition(job_uuid=job_uuid, definition=get_job_definition(worker))
 
-    for server in response[TaskType.SERVER]:
-        job_uuid = server['pod']['metadata']['labels']['job_uuid']
-        job_uuid = uuid.UUID(job_uuid)
-        set_job_definition(job_uuid=job_uuid, definition=get_job_definition(server))
+def handle_mxnet_experiment(response):
+    responses = [response[TaskType.MASTER]] + response[TaskType.WORKER]
+    set_jobs_definitions(responses=responses + response[TaskType.SERVER])
 
 
 def create_base_experiment_job(experiment, spawner):
+    jobs = []
     master_job_uuid = spawner.job_uuids[TaskType.MASTER][0]
-    create_job(job_uuid=master_job_uuid,
-               experiment=experiment,
-               resources=spawner.spec.master_resources,
-               node_selector=spawner.spec.master_node_selector,
-               affinity=spawner.spec.master_affinity,
-               tolerations=spawner.spec.master_tolerations)
+    jobs.append(build_job(job_uuid=master_job_uuid,
+                          experiment=experiment,
+                          resources=spawner.spec.master_resources,
+                          node_selector=spawner.spec.master_node_selector,
+                          affinity=spawner.spec.master_affinity,
+                          tolerations=spawner.spec.master_tolerations))
 
+    create_jobs(jobs)
 
-def handle_base_experiment(response):
-    master = response[TaskType.MASTER]
-    job_uuid = master['pod']['metadata']['labels']['job_uuid']
-    job_uuid = uuid.UUID(job_uuid)
 
-    set_job_definition(job_uuid=job_uuid, definition=get_job_definition(master))
+def handle_base_experiment(response):
+    set_jobs_definitions(responses=[response[TaskType.MASTER]])
 
 
 def handle_experiment(experiment, response):
@@ -1,5 +1,7 @@
 import uuid
 
+from concurrent.futures import ThreadPoolExecutor
+
 from hestia.auth import AuthenticationTypes
 from hestia.internal_services import InternalServices
 from kubernetes.config import ConfigException
@@ -94,6 +96,8 @@ class ExperimentSpawner(K8SManager):
             health_check_url=get_experiment_health_url(self.experiment_name))
         self.token_scope = token_scope
         self.ports = self.get_ports(ports=ports)
+        self._job_volumes = None
+        self._job_refs = None
 
         super().__init__(k8s_config=k8s_config,
                          namespace=namespace,
@@ -146,29 +150,14 @@ class ExperimentSpawner(K8SManager):
                                          include_internal_token=True)
         return env_vars
 
-    def _create_job(self,
-                    task_type,
-                    task_idx,
-                    add_service,
-                    command=None,
-                    args=None,
-                    env_vars=None,
-                    resources=None,
-                    node_selector=None,
-                    affinity=None,
-                    tolerations=None,
-                    restart_policy='Never'):
-        ephemeral_token = None
-        if self.token_scope:
-            ephemeral_token = RedisEphemeralTokens.generate_header_token(scope=self.token_scope)
-        resource_name = self.resource_manager.get_resource_name(task_type=task_type,
-                                                                task_idx=task_idx)
-        job_uuid = self.get_job_uuids(task_type=task_type, task_idx=task_idx)
-        labels = self.resource_manager.get_labels(task_type=task_type,
-                                                  task_idx=task_idx,
-                                                  job_uuid=job_uuid)
+    def get_job_volumes(self):
+        """Returns the volumes, volume mounts and context mounts of the experiment's pods.
+
+        The volumes are the same for all the pods of the experiment, they are only computed once.
+        """
+        if self._job_volumes is not None:
+            return self._job_volumes
 
-        # Set and validate volumes
         volumes, volume_mounts = get_pod_volumes(
             persistence_outputs=self.persistence_config.outputs,
             persistence_data=self.persistence_config.data)
@@ -190,9 +179,49 @@ class ExperimentSpawner(K8SManager):
         volumes += context_volumes
         volume_mounts += context_mounts
 
+        self._job_volumes = volumes, volume_mounts, context_mounts
+        return self._job_volumes
+
+    def get_job_refs(self):
+        """Returns the validated secret and configmap refs of the experiment's pods."""
+        if self._job_refs is None:
+            self._job_refs = (validate_secret_refs(self.spec.secret_refs),
+                              validate_configmap_refs(self.spec.configmap_refs))
+        return self._job_refs
+
+    def get_ephemeral_tokens(self, count):
+        if not self.token_scope:
+            return [None] * count
+        return RedisEphemeralTokens.generate_header_tokens(scope=self.token_scope, count=count)
+
+    def _create_job(self,
+                    task_type,
+                    task_idx,
+                    add_service,
+                    command=None,
+                    args=None,
+                    env_vars=None,
+                    resources=None,
+                    node_selector=None,
+                    affinity=None,
+                    tolerations=None,
+                    ephemeral_token=None,
+                    init_env_vars=None,
+                    restart_policy='Never'):
+        if ephemeral_token is None:
+            ephemeral_token = self.get_ephemeral_tokens(count=1)[0]
+        resource_name = self.resource_manager.get_resource_name(task_type=task_type,
+                                                                task_idx=task_idx)
+        job_uuid = self.get_job_uuids(task_type=task_type, task_idx=task_idx)
+        labels = self.resource_manager.get_labels(task_type=task_type,
+                                                  task_idx=task_idx,
+                                                  job_uuid=job_uuid)
+
+        # Set and validate volumes
+        volumes, volume_mounts, context_mounts = self.get_job_volumes()
+
         # Validate secret and configmap refs
-        secret_refs = validate_secret_refs(self.spec.secret_refs)
-        configmap_refs = validate_configmap_refs(self.spec.configmap_refs)
+        secret_refs, configmap_refs = self.get_job_refs()
 
         pod = self.resource_manager.get_task_pod(
             task_type=task_type,
@@ -204,7 +233,7 @@ class ExperimentSpawner(K8SManager):
             command=command,
             args=args,
             ports=self.ports,
-            init_env_vars=self.get_init_env_vars(),
+            init_env_vars=init_env_vars or self.get_init_env_vars(),
             persistence_outputs=self.persistence_config.outputs,
             persistence_data=self.persistence_config.data,
             outputs_refs_jobs=self.outputs_refs_jobs,
@@ -230,27 +259,54 @@ class ExperimentSpawner(K8SManager):
             results['service'] = service_resp.to_dict()
         return results
 
-    def create_multi_jobs(self, task_type, add_service):
-        resp = []
+    def _get_multi_jobs_kwargs(self, task_type, add_service):
         n_pods = self.get_n_pods(task_type=task_type)
+        # The tokens are generated in a single round-trip, the volumes and refs are shared
+        ephemeral_tokens = self.get_ephemeral_tokens(count=n_pods)
+        init_env_vars = self.get_init_env_vars()
+        self.get_job_volumes()
+        self.get_job_refs()
+
+        jobs_kwargs = []
         for i in range(n_pods):
             command, args = self.get_pod_command_args(task_type=task_type, task_idx=i)
-            env_vars = self.get_env_vars(task_type=task_type, task_idx=i)
-            resources = self.get_resources(task_type=task_type, task_idx=i)
-            node_selector = self.get_node_selector(task_type=task_type, task_idx=i)
-            affinity = self.get_affinity(task_type=task_type, task_idx=i)
-            tolerations = self.get_tolerations(task_type=task_type, task_idx=i)
-            resp.append(self._create_job(task_type=task_type,
-                                         task_idx=i,
-                                         command=command,
-                                         args=args,
-                                         env_vars=env_vars,
-                                         resources=resources,
-                                         node_selector=node_selector,
-                                         affinity=affinity,
-                                         tolerations=tolerations,
-                                         add_service=add_service))
-        return resp
+            jobs_kwargs.append({
+                'task_type': task_type,
+                'task_idx': i,
+                'command': command,
+                'args': args,
+                'env_vars': self.get_env_vars(task_type=task_type, task_idx=i),
+                'resources': self.get_resources(task_type=task_type, task_idx=i),
+                'node_selector': self.get_node_selector(task_type=task_type, task_idx=i),
+                'affinity': self.get_affinity(task_type=task_type, task_idx=i),
+                'tolerations': self.get_tolerations(task_type=task_type, task_idx=i),
+                'ephemeral_token': ephemeral_tokens[i],
+                'init_env_vars': init_env_vars,
+                'add_service': add_service,
+            })
+        return jobs_kwargs
+
+    def create_multi_jobs(self, task_type, add_service):
+        """Creates the pods, and services, of all the replicas of a task type.
+
+        Up to `SPAWNER_CONCURRENCY` replicas are created concurrently.
+        If a replica fails, the replicas of the task type are deleted and the error is raised.
+        """
+        jobs_kwargs = self._get_multi_jobs_kwargs(task_type=task_type, add_service=add_service)
+        concurrency = min(conf.get('SPAWNER_CONCURRENCY'), len(jobs_kwargs))
+        try:
+            if concurrency <= 1:
+                return [self._create_job(**job_kwargs) for job_kwargs in jobs_kwargs]
+
+            # All the replicas are submitted before checking the results,
+            # so that no replica is created after the rollback
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(self._create_job, **job_kwargs)
+                           for job_kwargs in jobs_kwargs]
+            return [future.result() for future in futures]
+        except Exception:
+            self.delete_multi_jobs(task_type=task_type, has_service=add_service)
+            raise
 
     def _delete_job(self, task_type, task_idx, has_service):
         resource_name = self.resource_manager.get_resource_name(task_type=task_type,
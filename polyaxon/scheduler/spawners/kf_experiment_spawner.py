@@ -1,18 +1,10 @@
 from kubernetes.config import ConfigException
 
 from constants.k8s_jobs import EXPERIMENT_KF_JOB_NAME_FORMAT
-from db.redis.ephemeral_tokens import RedisEphemeralTokens
 from polyaxon_k8s.exceptions import PolyaxonK8SError
 from scheduler.spawners.experiment_spawner import ExperimentSpawner
-from scheduler.spawners.templates.env_vars import validate_configmap_refs, validate_secret_refs
 from scheduler.spawners.templates.kf_jobs import manager
 from scheduler.spawners.templates.kubeflow import KUBEFLOW_JOB_GROUP
-from scheduler.spawners.templates.volumes import (
-    get_auth_context_volumes,
-    get_pod_refs_outputs_volumes,
-    get_pod_volumes,
-    get_shm_volumes
-)
 from schemas.tasks import TaskType
 
 
@@ -39,37 +31,15 @@ class KFExperimentSpawner(ExperimentSpawner):
                     tolerations=None,
                     replicas=1,
                     restart_policy='Never'):
-        ephemeral_token = None
-        if self.token_scope:
-            ephemeral_token = RedisEphemeralTokens.generate_header_token(scope=self.token_scope)
+        ephemeral_token = self.get_ephemeral_tokens(count=1)[0]
         resource_name = self.resource_manager.get_kf_resource_name(task_type=task_type)
         labels = self.resource_manager.get_labels(task_type=task_type)
 
         # Set and validate volumes
-        volumes, volume_mounts = get_pod_volumes(
-            persistence_outputs=self.persistence_config.outputs,
-            persistence_data=self.persistence_config.data)
-        refs_volumes, refs_volume_mounts = get_pod_refs_outputs_volumes(
-            outputs_refs=self.outputs_refs_jobs,
-            persistence_outputs=self.persistence_config.outputs)
-        volumes += refs_volumes
-        volume_mounts += refs_volume_mounts
-        refs_volumes, refs_volume_mounts = get_pod_refs_outputs_volumes(
-            outputs_refs=self.outputs_refs_experiments,
-            persistence_outputs=self.persistence_config.outputs)
-        volumes += refs_volumes
-        volume_mounts += refs_volume_mounts
-        shm_volumes, shm_volume_mounts = get_shm_volumes()
-        volumes += shm_volumes
-        volume_mounts += shm_volume_mounts
-
-        context_volumes, context_mounts = get_auth_context_volumes()
-        volumes += context_volumes
-        volume_mounts += context_mounts
+        volumes, volume_mounts, context_mounts = self.get_job_volumes()
 
         # Validate secret and configmap refs
-        secret_refs = validate_secret_refs(self.spec.secret_refs)
-        configmap_refs = validate_configmap_refs(self.spec.configmap_refs)
+        secret_refs, configmap_refs = self.get_job_refs()
 
         pod_template_spec = self.resource_manager.get_pod_template_spec(
             resource_name=resource_name,
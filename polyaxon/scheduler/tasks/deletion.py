@@ -1,3 +1,9 @@
+from typing import Iterable, Optional
+
+import auditor
+import conf
+
+from db.deletion import CascadeDeletion
 from db.models.build_jobs import BuildJob
 from db.models.experiment_groups import ExperimentGroup
 from db.models.experiments import Experiment
@@ -5,24 +11,63 @@ from db.models.jobs import Job
 from db.models.notebooks import NotebookJob
 from db.models.projects import Project
 from db.models.tensorboards import TensorboardJob
+from event_manager.events.experiment_group import EXPERIMENT_GROUP_DELETED
+from event_manager.events.project import PROJECT_DELETED
+from libs.paths.projects import delete_project_repos
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import SchedulerCeleryTasks
 
 
+def schedule_stores_deletion(subpath: str,
+                             outputs_persistences: Iterable[Optional[str]],
+                             logs_persistence: Optional[str] = None) -> None:
+    """Deletes the subpath in every outputs persistence and in the logs with a single task."""
+    celery_app.send_task(
+        SchedulerCeleryTasks.STORES_SCHEDULE_PATHS_DELETION,
+        kwargs={
+            'outputs_paths': [(persistence, subpath)
+                              for persistence in sorted(outputs_persistences, key=str)],
+            'logs_paths': [(logs_persistence, subpath)],
+        },
+        countdown=conf.get('GLOBAL_COUNTDOWN'))
+
+
 @celery_app.task(name=SchedulerCeleryTasks.DELETE_ARCHIVED_PROJECT, ignore_result=True)
 def delete_archived_project(project_id):
     try:
-        Project.archived.get(id=project_id).delete()
+        project = Project.archived.get(id=project_id)
     except Project.DoesNotExist:
-        pass
+        return
+
+    # The project and its dependents are deleted in batches without signals,
+    # the stores are cleaned once for the whole project.
+    deletion = CascadeDeletion(instance=project)
+    delete_project_repos(project.unique_name)
+    schedule_stores_deletion(subpath=project.subpath,
+                             outputs_persistences=deletion.get_outputs_persistences(),
+                             logs_persistence=project.persistence_logs)
+    deletion.delete()
+    auditor.record(event_type=PROJECT_DELETED,
+                   instance=project,
+                   num_deleted=deletion.num_deleted)
 
 
 @celery_app.task(name=SchedulerCeleryTasks.DELETE_ARCHIVED_EXPERIMENT_GROUP, ignore_result=True)
 def delete_archived_experiment_group(group_id):
     try:
-        ExperimentGroup.archived.get(id=group_id).delete()
+        experiment_group = ExperimentGroup.archived.get(id=group_id)
     except ExperimentGroup.DoesNotExist:
-        pass
+        return
+
+    deletion = CascadeDeletion(instance=experiment_group)
+    if not experiment_group.is_selection:
+        schedule_stores_deletion(subpath=experiment_group.subpath,
+                                 outputs_persistences=deletion.get_outputs_persistences(),
+                                 logs_persistence=experiment_group.persistence_logs)
+    deletion.delete()
+    auditor.record(event_type=EXPERIMENT_GROUP_DELETED,
+                   instance=experiment_group,
+                   num_deleted=deletion.num_deleted)
 
 
 @celery_app.task(name=SchedulerCeleryTasks.DELETE_ARCHIVED_EXPERIMENT, ignore_result=True)
@@ -1,8 +1,15 @@
+import json
 import logging
 
+from typing import Dict, List
+
 from polystores.exceptions import PolyaxonStoresException
 from rest_framework.exceptions import ValidationError
 
+from django.db import transaction
+from django.db.models.expressions import RawSQL
+
+import auditor
 import conf
 import publisher
 import stores
@@ -10,7 +17,9 @@ import stores
 from api.experiments.serializers import ExperimentMetricSerializer
 from constants.experiments import ExperimentLifeCycle
 from db.getters.experiments import get_valid_experiment
+from db.models.experiments import Experiment, ExperimentMetric
 from db.redis.heartbeat import RedisHeartBeat
+from event_manager.events.experiment import EXPERIMENT_NEW_METRIC
 from logs_handlers import collectors
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import Intervals, SchedulerCeleryTasks
@@ -121,6 +130,32 @@ def experiments_check_heartbeat(experiment_id):
                           message='Experiment is in zombie state (no heartbeat was reported).')
 
 
+def bulk_create_metrics(experiment: 'Experiment', metrics_data: List[Dict]) -> None:
+    """Creates a batch of metrics with a fixed number of queries and events.
+
+    The `experiment_metric_post_save` signal is bypassed, so the experiment's `last_metric`
+    is merged once per batch, and a single aggregated audit event is recorded.
+    """
+    if not metrics_data:
+        return
+
+    metrics = [ExperimentMetric(experiment=experiment, **metric_data)
+               for metric_data in metrics_data]
+    last_metric = {}
+    for metric in metrics:
+        last_metric.update(metric.values)
+
+    with transaction.atomic():
+        ExperimentMetric.objects.bulk_create(metrics, batch_size=1000)
+        # Merging in the db keeps the update atomic with concurrent batches
+        Experiment.objects.filter(id=experiment.id).update(last_metric=RawSQL(
+            "COALESCE(last_metric, '{}'::jsonb) || %s::jsonb", (json.dumps(last_metric),)))
+
+    auditor.record(event_type=EXPERIMENT_NEW_METRIC,
+                   instance=experiment,
+                   num_metrics=len(metrics))
+
+
 @celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_SET_METRICS, ignore_result=True)
 def experiments_set_metrics(experiment_id, data):
     experiment = get_valid_experiment(experiment_id=experiment_id)
@@ -135,8 +170,12 @@ def experiments_set_metrics(experiment_id, data):
         serializer.is_valid(raise_exception=True)
     except ValidationError:
         _logger.error('Could not create metrics, a validation error was raised.')
+        return
 
-    serializer.save(experiment=experiment)
+    if isinstance(data, list):
+        bulk_create_metrics(experiment=experiment, metrics_data=serializer.validated_data)
+    else:
+        serializer.save(experiment=experiment)
 
 
 @celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_START, ignore_result=True)
@@ -21,3 +21,12 @@ def stores_schedule_outputs_deletion(persistence, subpath):
 @celery_app.task(name=SchedulerCeleryTasks.STORES_SCHEDULE_LOGS_DELETION, ignore_result=True)
 def stores_schedule_logs_deletion(persistence, subpath):
     stores.delete_logs_path(persistence=persistence, subpath=subpath)
+
+
+@celery_app.task(name=SchedulerCeleryTasks.STORES_SCHEDULE_PATHS_DELETION, ignore_result=True)
+def stores_schedule_paths_deletion(outputs_paths=None, logs_paths=None):
+    """Deletes many outputs and logs paths, every path is a `(persistence, subpath)` pair."""
+    for persistence, subpath in outputs_paths or []:
+        stores.delete_outputs_path(persistence=persistence, subpath=subpath)
+    for persistence, subpath in logs_paths or []:
+        stores.delete_logs_path(persistence=persistence, subpath=subpath)
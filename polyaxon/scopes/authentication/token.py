@@ -8,6 +8,7 @@ from django.http import HttpRequest
 
 from db.models.tokens import Token
 from scopes.authentication.base import PolyaxonAuthentication
+from scopes.authentication.tokens_cache import tokens_cache
 
 
 class TokenAuthentication(PolyaxonAuthentication):
@@ -45,12 +46,16 @@ class TokenAuthentication(PolyaxonAuthentication):
 
     def authenticate_credentials(self,  # pylint:disable=arguments-differ
                                  key: str) -> Optional[Tuple['User', 'Token']]:
-        try:
-            token = Token.objects.select_related('user').get(key=key)
-        except Token.DoesNotExist:
-            raise AuthenticationFailed('Invalid token.')
+        token = tokens_cache.get(key)
+        if token is None:
+            try:
+                token = Token.objects.select_related('user').get(key=key)
+            except Token.DoesNotExist:
+                raise AuthenticationFailed('Invalid token.')
+            tokens_cache.set(token)
 
         if token.is_expired:
+            tokens_cache.invalidate([key])
             raise AuthenticationFailed('Token expired')
 
         if not token.user.is_active:
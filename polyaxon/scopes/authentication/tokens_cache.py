@@ -0,0 +1,145 @@
+import json
+import logging
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+import redis
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model
+
+import conf
+import stats
+
+from db.models.tokens import Token
+from db.models.users import User
+from db.redis.tokens_cache import RedisTokensCache
+
+_logger = logging.getLogger('polyaxon.scopes.tokens_cache')
+
+# The fields cached to authenticate a request, the other fields are deferred
+TOKEN_FIELDS = ('id', 'user_id', 'key', 'scopes', 'started_at')
+USER_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name',
+               'is_active', 'is_staff', 'is_superuser')
+
+
+def _dump_instance(instance: Model, fields: Iterable[str]) -> Dict[str, Any]:
+    return {field: getattr(instance, field) for field in fields}
+
+
+def _load_instance(model, values: Dict[str, Any]) -> Model:
+    """Rebuilds an instance from its cached values, the missing fields are deferred."""
+    fields = [field for field in model._meta.concrete_fields if field.attname in values]
+    return model.from_db(None,
+                         [field.attname for field in fields],
+                         [field.to_python(values[field.attname]) for field in fields])
+
+
+def dumps_token(token: Token) -> bytes:
+    return json.dumps({
+        'token': _dump_instance(token, TOKEN_FIELDS),
+        'user': _dump_instance(token.user, USER_FIELDS),
+    }, cls=DjangoJSONEncoder).encode()
+
+
+def loads_token(value: bytes) -> Token:
+    payload = json.loads(value.decode())
+    token = _load_instance(Token, payload['token'])
+    token.user = _load_instance(User, payload['user'])
+    return token
+
+
+class TokensCache(object):
+    """A two levels cache for the authentication tokens and their users.
+
+    Tokens are looked up in a bounded in-process LRU, then in the shared redis cache.
+    Both levels have a ttl, and the entries are invalidated by the tokens and users signals,
+    since the signals only reach the current process, the local ttl is kept short.
+
+    The tokens are cached as JSON with the fields needed to authenticate,
+    and every lookup rebuilds new instances.
+
+    The hits and misses of every level are reported to the stats backend.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()  # key -> (expires_at, serialized token)
+        self._lock = threading.Lock()
+
+    def _get_local(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_local(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + conf.get('TTL_TOKENS_LOCAL_CACHE'), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > conf.get('TOKENS_LOCAL_CACHE_SIZE'):
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Token]:
+        value = self._get_local(key)
+        if value is not None:
+            stats.incr('tokens_cache.local.hit')
+            return loads_token(value)
+        stats.incr('tokens_cache.local.miss')
+
+        try:
+            value = RedisTokensCache.get(key)
+        except redis.RedisError:
+            _logger.warning('Could not read the tokens cache', exc_info=True)
+            value = None
+        if value is not None:
+            try:
+                token = loads_token(value)
+            except (ValueError, KeyError, TypeError, ValidationError):
+                # e.g. an entry written by a previous version
+                _logger.warning('Could not load a cached token', exc_info=True)
+                token = None
+            if token is not None:
+                stats.incr('tokens_cache.redis.hit')
+                self._set_local(key, value)
+                return token
+        stats.incr('tokens_cache.redis.miss')
+        return None
+
+    def set(self, token: Token) -> None:
+        """Caches a token, the token's user must be loaded."""
+        value = dumps_token(token)
+        self._set_local(token.key, value)
+        try:
+            RedisTokensCache.set(token.key, value, ttl=conf.get('TTL_TOKENS_CACHE'))
+        except redis.RedisError:
+            _logger.warning('Could not write the tokens cache', exc_info=True)
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        keys = [key for key in keys if key]
+        if not keys:
+            return
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        try:
+            RedisTokensCache.delete(keys)
+        except redis.RedisError:
+            _logger.warning('Could not invalidate the tokens cache', exc_info=True)
+
+    def clear(self) -> None:
+        """Clears the in-process entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+tokens_cache = TokensCache()
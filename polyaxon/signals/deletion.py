@@ -91,6 +91,9 @@ def experiment_group_post_delete(sender, **kwargs):
 def experiment_pre_delete(sender, **kwargs):
     instance = kwargs['instance']
 
+    if not instance.deleted:
+        instance.update_group_status_counters(previous_status=instance.last_status, status=None)
+
     # Delete outputs and logs
     if instance.is_independent:
         celery_app.send_task(
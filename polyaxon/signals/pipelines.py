@@ -1,6 +1,6 @@
 from hestia.signal_decorators import ignore_raw, ignore_updates
 
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import m2m_changed, post_save, pre_delete
 from django.dispatch import receiver
 
 from constants.pipelines import OperationStatuses, PipelineStatuses
@@ -61,6 +61,7 @@ def new_operation_run_status(sender, **kwargs):
     instance = kwargs['instance']
     operation_run = instance.operation_run
     pipeline_run = operation_run.pipeline_run
+    previous_status = operation_run.last_status
     # Update job last_status
     operation_run.status = instance
     set_started_at(instance=operation_run,
@@ -81,14 +82,41 @@ def new_operation_run_status(sender, **kwargs):
         kwargs={'pipeline_run_id': pipeline_run.id,
                 'status': instance.status,
                 'message': instance.message})
-    if operation_run.is_done:
-        # Notify downstream that instance is done, and that its dependency can start.
-        downstream_runs = operation_run.downstream_runs.filter(
-            status__status=OperationStatuses.CREATED)
-        for op_run in downstream_runs:
-            celery_app.send_task(
-                PipelinesCeleryTasks.PIPELINES_START_OPERATION,
-                kwargs={'operation_run_id': op_run.id})
+
+    # Notify the downstream runs that can start or that cannot start anymore,
+    # and the runs waiting for a running slot if the instance freed one.
+    delta = operation_run.update_downstream_counters(previous_status=previous_status,
+                                                     status=instance.status)
+    op_runs = operation_run.get_downstream_runs_to_schedule(delta=delta)
+    if operation_run.update_running_counters(previous_status=previous_status,
+                                             status=instance.status) < 0:
+        op_runs += operation_run.get_waiting_runs_to_schedule()
+    for op_run_id in sorted({op_run.id for op_run in op_runs}):
+        celery_app.send_task(
+            PipelinesCeleryTasks.PIPELINES_START_OPERATION,
+            kwargs={'operation_run_id': op_run_id})
+
+
+@receiver(m2m_changed,
+          sender=OperationRun.upstream_runs.through,
+          dispatch_uid="operation_run_upstream_runs_changed")
+def operation_run_upstream_runs_changed(sender, **kwargs):
+    instance = kwargs['instance']
+    action = kwargs['action']
+    if not kwargs['reverse']:
+        operation_run_ids = [instance.id]
+    elif action == 'pre_clear':
+        # The downstream runs are not known anymore after the clear
+        instance._cleared_downstream_ids = list(  # pylint:disable=protected-access
+            instance.downstream_runs.values_list('id', flat=True))
+        return
+    elif action == 'post_clear':
+        operation_run_ids = getattr(instance, '_cleared_downstream_ids', [])
+    else:
+        operation_run_ids = kwargs['pk_set']
+
+    if action in {'post_add', 'post_remove', 'post_clear'}:
+        OperationRun.repair_upstream_counters(operation_run_ids)
 
 
 @receiver(pre_delete, sender=OperationRun, dispatch_uid="operation_run_deleted")
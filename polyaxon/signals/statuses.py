@@ -288,6 +288,9 @@ def experiment_status_post_save(sender, **kwargs):
                     status=instance.status,
                     is_done=ExperimentLifeCycle.is_done)
     experiment.save(update_fields=['status', 'started_at', 'updated_at', 'finished_at'])
+    if not experiment.deleted:
+        experiment.update_group_status_counters(previous_status=previous_status,
+                                                status=instance.status)
     auditor.record(event_type=EXPERIMENT_NEW_STATUS,
                    instance=experiment,
                    previous_status=previous_status)
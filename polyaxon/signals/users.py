@@ -1,7 +1,7 @@
 from hestia.signal_decorators import ignore_raw, ignore_updates
 
 from django.conf import settings
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import Signal, receiver
 
 import auditor
@@ -9,6 +9,7 @@ import ownership
 
 from db.models.tokens import Token
 from event_manager.events.user import USER_REGISTERED, USER_UPDATED
+from scopes.authentication.tokens_cache import tokens_cache
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid="create_auth_token")
@@ -36,6 +37,40 @@ def delete_user_owner(sender, instance=None, created=False, **kwargs):
     ownership.delete_owner(name=instance.username)
 
 
+@receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid="user_invalidate_tokens_cache")
+@ignore_raw
+def user_invalidate_tokens_cache(sender, instance=None, created=False, **kwargs):
+    if created:
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    # The user could have been deactivated
+    tokens_cache.invalidate(instance.tokens.values_list('key', flat=True))
+
+
+@receiver(pre_save, sender=Token, dispatch_uid="token_pre_save")
+@ignore_raw
+def token_pre_save(sender, instance=None, **kwargs):
+    if not instance.pk:
+        return
+    # Keep the current key, the token could be rotated
+    instance._previous_key = Token.objects.filter(  # noqa
+        pk=instance.pk).values_list('key', flat=True).first()
+
+
+@receiver(post_save, sender=Token, dispatch_uid="token_post_save")
+@ignore_raw
+def token_post_save(sender, instance=None, created=False, **kwargs):
+    tokens_cache.invalidate([getattr(instance, '_previous_key', None), instance.key])
+
+
+@receiver(post_delete, sender=Token, dispatch_uid="token_post_delete")
+@ignore_raw
+def token_post_delete(sender, instance=None, **kwargs):
+    tokens_cache.invalidate([instance.key])
+
+
 # A new user has registered.
 user_registered = Signal(providing_args=["user", "request"])
 
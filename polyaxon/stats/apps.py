@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class StatsConfig(AppConfig):
     name = 'stats'
     verbose_name = 'Stats'
+
+    def ready(self):
+        from polyaxon.config_manager import config
+
+        config.setup_stats_service()
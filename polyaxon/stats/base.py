@@ -1,10 +1,14 @@
 from random import random
 from threading import local
 
+from hestia.service_interface import Service
+
 import conf
 
 
-class BaseStatsBackend(local):
+class BaseStatsBackend(local, Service):
+    __all__ = ('incr', 'timing')
+
     def __init__(self, prefix=None):  # pylint:disable=super-init-not-called
         if prefix is None:
             prefix = conf.get('DEFAULT_STATS_PREFIX')
@@ -21,5 +25,12 @@ class BaseStatsBackend(local):
     def _incr(self, key, amount=1, sample_rate=1, **kwargs):
         raise NotImplementedError
 
+    def _timing(self, key, value, sample_rate=1, **kwargs):
+        raise NotImplementedError
+
     def incr(self, key, amount=1, sample_rate=1, **kwargs):
         self._incr(key=self._get_key(key), amount=amount, sample_rate=sample_rate, **kwargs)
+
+    def timing(self, key, value, sample_rate=1, **kwargs):
+        """Records a duration, `value` is expressed in seconds."""
+        self._timing(key=self._get_key(key), value=value, sample_rate=sample_rate, **kwargs)
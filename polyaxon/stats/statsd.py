@@ -11,3 +11,7 @@ class StatsdStatsBackend(BaseStatsBackend):
 
     def _incr(self, key, amount=1, sample_rate=1, **kwargs):
         self.client.incr(key, amount, sample_rate)
+
+    def _timing(self, key, value, sample_rate=1, **kwargs):
+        # statsd expects timings in milliseconds
+        self.client.timing(key, value * 1000, sample_rate)
@@ -0,0 +1,264 @@
+import fcntl
+import json
+import os
+import tempfile
+import time
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from polystores import StoreManager
+from polystores.exceptions import PolyaxonStoresException
+
+from libs.logs_query import (
+    FIRST_CHECKPOINT,
+    LogCheckpoint,
+    LogsQuery,
+    filter_lines,
+    get_line_timestamp,
+    get_start_index
+)
+
+SEGMENTS_SUFFIX = '.segments'
+SEGMENTS_INDEX = 'index.json'
+SEGMENT_NAME = '{:08d}'
+
+
+def get_segments_path(logs_path: str) -> str:
+    return logs_path + SEGMENTS_SUFFIX
+
+
+def get_segment_path(logs_path: str, segment: str) -> str:
+    return os.path.join(get_segments_path(logs_path), segment)
+
+
+def get_index_path(logs_path: str) -> str:
+    return get_segment_path(logs_path, SEGMENTS_INDEX)
+
+
+def get_initial_state(next_segment: int = 0) -> Dict[str, Any]:
+    return {'offset': 0, 'rolled_at': time.time(), 'segments': [], 'next': next_segment}
+
+
+class LogSegmentsWriter(object):
+    """Uploads a growing log file to the logs store as a sequence of immutable segments.
+
+    The local log file is the buffer of the lines, a state file next to it keeps the offset
+    of the bytes already uploaded and the index of the uploaded segments.
+    The pending lines are rolled into segments of up to `segment_size` bytes once they reach
+    `segment_size` bytes, or `segment_interval` seconds after the last segment.
+
+    The index is uploaded after every roll, readers only use the segments of the index.
+    Every segment of the index has its number of lines, size and first timestamp,
+    so that readers only download the segments of the lines they need.
+    """
+
+    def __init__(self,
+                 store_manager: StoreManager,
+                 buffer_path: str,
+                 logs_path: str,
+                 segment_size: int,
+                 segment_interval: float) -> None:
+        self.store_manager = store_manager
+        self.buffer_path = buffer_path
+        self.logs_path = logs_path
+        self.segment_size = segment_size
+        self.segment_interval = segment_interval
+
+    @property
+    def state_path(self) -> str:
+        return self.buffer_path + SEGMENTS_SUFFIX
+
+    @contextmanager
+    def _lock_state(self) -> Iterator[Dict[str, Any]]:
+        with open(self.state_path, 'a+') as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            try:
+                state_file.seek(0)
+                content = state_file.read()
+                state = json.loads(content) if content else get_initial_state()
+                yield state
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(json.dumps(state))
+                state_file.flush()
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+
+    def _upload(self, content: bytes, path: str) -> None:
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(self.buffer_path)) as segment_file:
+            segment_file.write(content)
+            segment_file.flush()
+            self.store_manager.upload_file(filename=segment_file.name,
+                                           path=path,
+                                           use_basename=False)
+
+    def _upload_index(self, state: Dict[str, Any]) -> None:
+        index = {'base': False, 'segments': state['segments']}
+        self._upload(content=json.dumps(index).encode(), path=get_index_path(self.logs_path))
+
+    def _upload_segment(self, state: Dict[str, Any], lines: List[bytes]) -> None:
+        content = b''.join(lines)
+        segment = SEGMENT_NAME.format(state['next'])
+        self._upload(content=content, path=get_segment_path(self.logs_path, segment))
+        state['segments'].append({
+            'name': segment,
+            'lines': len(lines),
+            'size': len(content),
+            'timestamp': get_line_timestamp(lines[0]),
+        })
+        state['next'] += 1
+        state['offset'] += len(content)
+        state['rolled_at'] = time.time()
+
+    def _roll(self, state: Dict[str, Any], force: bool) -> bool:
+        """Uploads the pending lines as segments of up to `segment_size` bytes.
+
+        Only the complete lines are rolled, unless `force` is set.
+        """
+        lines, size, is_rolled = [], 0, False
+        with open(self.buffer_path, 'rb') as log_file:
+            log_file.seek(state['offset'])
+            for line in log_file:
+                if not (force or line.endswith(b'\n')):
+                    break
+                lines.append(line)
+                size += len(line)
+                if size >= self.segment_size:
+                    self._upload_segment(state=state, lines=lines)
+                    lines, size, is_rolled = [], 0, True
+        if lines:
+            self._upload_segment(state=state, lines=lines)
+            is_rolled = True
+        return is_rolled
+
+    def _delete_segments(self, segments: List[Dict[str, Any]]) -> None:
+        for segment in segments:
+            self.store_manager.delete(get_segment_path(self.logs_path, segment['name']))
+
+    def roll(self, force: bool = False) -> bool:
+        """Uploads the pending lines, returns True if a segment was uploaded.
+
+        `force` rolls the pending lines regardless of the segment size and interval.
+        """
+        if not os.path.exists(self.buffer_path):
+            return False
+        with self._lock_state() as state:
+            pending = os.path.getsize(self.buffer_path) - state['offset']
+            if pending <= 0:
+                return False
+            is_due = (pending >= self.segment_size or
+                      time.time() - state['rolled_at'] >= self.segment_interval)
+            if not (force or is_due):
+                return False
+
+            is_rolled = self._roll(state=state, force=force)
+            if is_rolled:
+                self._upload_index(state=state)
+            return is_rolled
+
+    def reset(self, rewrite: bool) -> None:
+        """Replaces the segments after the log file was rewritten.
+
+        If `rewrite` is True the rewritten file is uploaded as new segments,
+        otherwise the whole file is pending and will be rolled again.
+        The previous segments are deleted once the new index is uploaded.
+        """
+        with self._lock_state() as state:
+            segments = state['segments']
+            state.update(get_initial_state(next_segment=state['next']))
+            if rewrite and os.path.exists(self.buffer_path):
+                self._roll(state=state, force=True)
+            if segments or state['segments']:
+                self._upload_index(state=state)
+            self._delete_segments(segments)
+
+
+class LogSegmentsReader(object):
+    """Reads a log from the logs store, one object at a time.
+
+    Logs without segments index are read from the log object.
+    """
+
+    def __init__(self, store_manager: StoreManager, logs_path: str, download_dir: str) -> None:
+        self.store_manager = store_manager
+        self.logs_path = logs_path
+        self.download_dir = download_dir
+
+    def _download(self, path: str) -> str:
+        fd, download_path = tempfile.mkstemp(dir=self.download_dir)
+        os.close(fd)
+        try:
+            self.store_manager.download_file(path, download_path)
+        except PolyaxonStoresException:
+            os.remove(download_path)
+            raise
+        return download_path
+
+    def _read_index(self) -> Dict[str, Any]:
+        download_path = None
+        try:
+            download_path = self._download(get_index_path(self.logs_path))
+            with open(download_path, 'r') as index_file:
+                index = json.loads(index_file.read())
+        except (PolyaxonStoresException, ValueError):
+            # Logs uploaded before the segments do not have an index
+            return {'base': True, 'segments': []}
+        finally:
+            if download_path and os.path.exists(download_path):
+                os.remove(download_path)
+        # The first indexes only listed the segments' names
+        index['segments'] = [segment if isinstance(segment, dict) else {'name': segment}
+                             for segment in index['segments']]
+        return index
+
+    def _get_paths(self, index: Dict[str, Any]) -> List[str]:
+        paths = [self.logs_path] if index['base'] else []
+        return paths + [get_segment_path(self.logs_path, segment['name'])
+                        for segment in index['segments']]
+
+    def get_paths(self) -> List[str]:
+        return self._get_paths(index=self._read_index())
+
+    def _iter_files(self, paths: List[str]) -> Iterator[Any]:
+        for path in paths:
+            download_path = self._download(path)
+            try:
+                with open(download_path, 'rb') as log_file:
+                    yield log_file
+            finally:
+                os.remove(download_path)
+
+    def iter_chunks(self, paths: List[str], chunk_size: int = 8192) -> Iterator[bytes]:
+        for log_file in self._iter_files(paths):
+            chunk = log_file.read(chunk_size)
+            while chunk:
+                yield chunk
+                chunk = log_file.read(chunk_size)
+
+    def iter_lines(self, paths: List[str]) -> Iterator[bytes]:
+        for log_file in self._iter_files(paths):
+            yield from log_file
+
+    def query(self, query: LogsQuery) -> Iterator[bytes]:
+        """Reads the lines of the query, only the segments of these lines are downloaded."""
+        index = self._read_index()
+        segments = index['segments']
+        if index['base'] or any('lines' not in segment for segment in segments):
+            return filter_lines(lines=self.iter_lines(self._get_paths(index=index)), query=query)
+
+        checkpoints = []
+        num_lines, offset = 0, 0
+        for segment in segments:
+            checkpoints.append(LogCheckpoint(line=num_lines,
+                                             offset=offset,
+                                             timestamp=segment['timestamp']))
+            num_lines += segment['lines']
+            offset += segment['size']
+        start = get_start_index(checkpoints=checkpoints, query=query, num_lines=num_lines)
+        paths = [get_segment_path(self.logs_path, segment['name'])
+                 for segment in segments[start:]]
+        return filter_lines(lines=self.iter_lines(paths),
+                            query=query,
+                            checkpoint=checkpoints[start] if checkpoints else FIRST_CHECKPOINT,
+                            num_lines=num_lines)
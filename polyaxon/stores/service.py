@@ -8,6 +8,7 @@ from polystores import StoreManager
 from polystores.exceptions import PolyaxonStoresException
 from rhea import RheaError
 
+from libs.logs_query import INDEX_SUFFIX
 from libs.paths.experiment_jobs import create_experiment_job_path
 from libs.paths.experiments import create_experiment_path
 from libs.paths.jobs import create_job_path
@@ -15,6 +16,7 @@ from polyaxon.config_manager import config
 from stores.exceptions import VolumeNotFoundError
 from stores.schemas.store import StoreConfig
 from stores.schemas.volume import VolumeConfig
+from stores.segments import LogSegmentsReader, LogSegmentsWriter, get_segments_path
 from stores.store_secrets import get_store_secret_for_persistence, get_store_secret_from_definition
 
 
@@ -30,6 +32,8 @@ class StoresService(Service):
         'get_outputs_store',
         'get_logs_store',
         'is_bucket_logs_persistence',
+        'get_logs_segments_writer',
+        'get_logs_segments_reader',
         'get_experiment_group_outputs_path',
         'get_experiment_group_logs_path',
         'get_experiment_job_logs_path',
@@ -144,6 +148,10 @@ class StoresService(Service):
         store = cls.get_logs_store(persistence_logs=persistence)
         try:
             store.delete(path)
+            if cls.is_bucket_logs_persistence(persistence=persistence):
+                store.delete(get_segments_path(path))
+            else:
+                store.delete(path + INDEX_SUFFIX)
         except (PolyaxonStoresException, VolumeNotFoundError):
             pass
 
@@ -182,6 +190,29 @@ class StoresService(Service):
 
         return bool(conf.get('PERSISTENCE_LOGS').get('bucket'))
 
+    @classmethod
+    def get_logs_segments_writer(cls, temp_path, logs_path, persistence='default'):
+        import conf
+
+        return LogSegmentsWriter(store_manager=cls.get_logs_store(persistence_logs=persistence),
+                                 buffer_path=temp_path,
+                                 logs_path=logs_path,
+                                 segment_size=conf.get('LOGS_SEGMENT_SIZE'),
+                                 segment_interval=conf.get('LOGS_SEGMENT_INTERVAL'))
+
+    @classmethod
+    def get_logs_segments_reader(cls, logs_path, download_dir, persistence='default'):
+        return LogSegmentsReader(store_manager=cls.get_logs_store(persistence_logs=persistence),
+                                 logs_path=logs_path,
+                                 download_dir=download_dir)
+
+    @classmethod
+    def _upload_logs(cls, temp_path, logs_path, persistence='default'):
+        # The log is uploaded as new segments, to read its tail or a range without the whole log
+        cls.get_logs_segments_writer(temp_path=temp_path,
+                                     logs_path=logs_path,
+                                     persistence=persistence).reset(rewrite=True)
+
     @classmethod
     def get_experiment_group_outputs_path(cls, experiment_group_name, persistence):
         persistence_outputs = cls.get_outputs_path(persistence=persistence)
@@ -261,7 +292,6 @@ class StoresService(Service):
 
     @classmethod
     def upload_experiment_job_logs(cls, experiment_job_name, persistence='default'):
-        store = cls.get_logs_store(persistence_logs=persistence)
         temp_path = cls.get_experiment_job_logs_path(experiment_job_name=experiment_job_name,
                                                      temp=True,
                                                      persistence=persistence)
@@ -270,7 +300,7 @@ class StoresService(Service):
         logs_path = cls.get_experiment_job_logs_path(experiment_job_name=experiment_job_name,
                                                      temp=False,
                                                      persistence=persistence)
-        store.upload_file(filename=temp_path, path=logs_path, use_basename=False)
+        cls._upload_logs(temp_path=temp_path, logs_path=logs_path, persistence=persistence)
 
     @classmethod
     def create_experiment_job_logs_path(cls, experiment_job_name, temp, persistence='default'):
@@ -294,7 +324,6 @@ class StoresService(Service):
 
     @classmethod
     def upload_experiment_logs(cls, experiment_name, persistence='default'):
-        store = cls.get_logs_store(persistence_logs=persistence)
         temp_path = cls.get_experiment_logs_path(experiment_name=experiment_name,
                                                  temp=True,
                                                  persistence=persistence)
@@ -303,7 +332,7 @@ class StoresService(Service):
         logs_path = cls.get_experiment_logs_path(experiment_name=experiment_name,
                                                  temp=False,
                                                  persistence=persistence)
-        store.upload_file(filename=temp_path, path=logs_path, use_basename=False)
+        cls._upload_logs(temp_path=temp_path, logs_path=logs_path, persistence=persistence)
 
     @classmethod
     def create_experiment_logs_path(cls, experiment_name, temp, persistence='default'):
@@ -339,12 +368,11 @@ class StoresService(Service):
 
     @classmethod
     def upload_job_logs(cls, job_name, persistence='default'):
-        store = cls.get_logs_store(persistence_logs=persistence)
         temp_path = cls.get_job_logs_path(job_name=job_name, temp=True, persistence=persistence)
         if not os.path.exists(temp_path):
             return
         logs_path = cls.get_job_logs_path(job_name=job_name, temp=False, persistence=persistence)
-        store.upload_file(filename=temp_path, path=logs_path, use_basename=False)
+        cls._upload_logs(temp_path=temp_path, logs_path=logs_path, persistence=persistence)
 
     @classmethod
     def create_job_logs_path(cls, job_name, temp, persistence='default'):
@@ -56,6 +56,7 @@ async def notify_server_started(app, loop):  # pylint:disable=redefined-outer-na
     app.job_logs_ws_managers = {}
     app.job_logs_consumers = {}
     app.experiment_logs_consumers = {}
+    app.log_tailers = {}
 
 
 @app.listener('after_server_stop')
@@ -63,6 +64,9 @@ async def notify_server_stopped(app, loop):  # pylint:disable=redefined-outer-na
     app.job_resources_ws_managers = {}
     app.experiment_resources_ws_manager = {}
 
+    for tailer in list(app.log_tailers.values()):
+        tailer.stop()
+
     consumer_keys = list(app.job_logs_consumers.keys())
     for consumer_key in consumer_keys:
         consumer = app.job_logs_consumers.pop(consumer_key, None)
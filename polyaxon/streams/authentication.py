@@ -3,6 +3,7 @@ from functools import wraps
 from sanic.response import json
 
 from scopes.authentication.token import TokenAuthentication
+from streams.data_access import run_sync
 
 
 class SanicTokenAuthentication(TokenAuthentication):
@@ -33,7 +34,7 @@ def authorized():
     def decorator(f):
         @wraps(f)
         async def decorated_function(request, *args, **kwargs):
-            authorization = SanicTokenAuthentication().authenticate(request)
+            authorization = await run_sync(SanicTokenAuthentication().authenticate, request)
 
             if authorization is not None:
                 # the user is authorized.
@@ -2,3 +2,6 @@ SOCKET_SLEEP = 2
 MAX_RETRIES = 7
 RESOURCES_CHECK = 7
 CHECK_DELAY = 5
+LOG_SLEEP = 0.1
+LOG_BACKLOG_LINES = 1000
+DB_EXECUTOR_WORKERS = 10
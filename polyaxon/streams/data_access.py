@@ -0,0 +1,46 @@
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from django.db import close_old_connections
+
+from streams.constants import DB_EXECUTOR_WORKERS
+
+# The Django ORM is synchronous, every query issued by a coroutine would block
+# the event loop shared by all sockets, so they are run in this bounded thread pool instead.
+_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS)
+
+
+def _run_with_connection(func: Callable, *args, **kwargs) -> Any:
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_sync(func: Callable, *args, **kwargs) -> Any:
+    """Runs a blocking (ORM) call in the executor and awaits its result."""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        _executor, partial(_run_with_connection, func, *args, **kwargs))
+
+
+def _get_last_status(instance: Any) -> Optional[str]:
+    instance.refresh_from_db()
+    return instance.last_status
+
+
+async def get_last_status(instance: Any) -> Optional[str]:
+    """Refreshes an entity with statuses, and returns its last status."""
+    return await run_sync(_get_last_status, instance)
+
+
+async def get_experiment_jobs(experiment: 'Experiment') -> List['ExperimentJob']:
+    return await run_sync(lambda: list(experiment.jobs.all()))
+
+
+async def get_experiment_jobs_values(experiment: 'Experiment', *fields) -> List[Dict]:
+    return await run_sync(lambda: list(experiment.jobs.values(*fields)))
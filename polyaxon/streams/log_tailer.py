@@ -0,0 +1,152 @@
+import asyncio
+import json
+
+from collections import deque
+
+from logs_handlers.log_queries.base import process_log_line
+from streams.constants import LOG_BACKLOG_LINES, LOG_SLEEP
+from streams.logger import logger
+from streams.resources.utils import notify, notify_ws
+
+
+class LogTailer(object):
+    """Tails the logs of a (pod, container) and broadcasts them to the subscribed socket managers.
+
+    A single k8s log stream is opened per (pod, container), regardless of the number of viewers.
+    The tailer is reference counted: it starts with the first subscription,
+    and stops when the last viewer leaves.
+
+    The last `LOG_BACKLOG_LINES` lines are kept, and replayed to the viewers joining later.
+    If reading the logs fails, the error is kept and logged, the viewers are notified of it.
+    """
+
+    def __init__(self, registry, k8s_api, pod_id, namespace, container):
+        self.registry = registry
+        self.k8s_api = k8s_api
+        self.pod_id = pod_id
+        self.namespace = namespace
+        self.container = container
+        self.task = None
+        self.backlog = deque(maxlen=LOG_BACKLOG_LINES)
+        self._lock = asyncio.Lock()
+        self._refs = {}  # ws_manager -> number of viewers
+        self._names = {}  # ws_manager -> (task_type, task_idx)
+
+    @property
+    def key(self):
+        return self.pod_id, self.container
+
+    @property
+    def is_done(self):
+        return self.task is not None and self.task.done()
+
+    @property
+    def error(self):
+        """The exception raised while tailing the logs, if any."""
+        if not self.is_done or self.task.cancelled():
+            return None
+        return self.task.exception()
+
+    @classmethod
+    def get_or_create(cls, registry, k8s_api, pod_id, namespace, container):
+        tailer = registry.get((pod_id, container))
+        if tailer is None or tailer.is_done:
+            tailer = cls(registry=registry,
+                         k8s_api=k8s_api,
+                         pod_id=pod_id,
+                         namespace=namespace,
+                         container=container)
+            registry[tailer.key] = tailer
+        return tailer
+
+    def subscribe(self, ws_manager, task_type=None, task_idx=None):
+        self._refs[ws_manager] = self._refs.get(ws_manager, 0) + 1
+        self._names[ws_manager] = (task_type, task_idx)
+        if self.task is None:
+            logger.info('Starting log tailer for pod `%s`', self.pod_id)
+            self.task = asyncio.ensure_future(self.tail())
+            self.task.add_done_callback(self._on_done)
+
+    def unsubscribe(self, ws_manager):
+        self._refs[ws_manager] = self._refs.get(ws_manager, 1) - 1
+        if self._refs[ws_manager] <= 0:
+            self._refs.pop(ws_manager, None)
+            self._names.pop(ws_manager, None)
+        if not self._refs:
+            self.stop()
+
+    def stop(self):
+        self._unregister()
+        if self.task is not None and not self.task.done():
+            logger.info('Stopping log tailer for pod `%s`', self.pod_id)
+            self.task.cancel()
+
+    def _unregister(self):
+        if self.registry.get(self.key) is self:
+            self.registry.pop(self.key, None)
+
+    def _on_done(self, task):  # pylint:disable=unused-argument
+        self._unregister()
+        error = self.error
+        if error is not None:
+            logger.warning('Log tailer for pod `%s` failed: %s', self.pod_id, error,
+                           exc_info=error)
+
+    @staticmethod
+    def get_message(log_lines, task_type, task_idx):
+        return json.dumps({'log_lines': [
+            process_log_line(log_line=log_line, task_type=task_type, task_idx=task_idx)
+            for log_line in log_lines
+        ]})
+
+    async def replay(self, ws, task_type=None, task_idx=None):
+        """Sends the lines tailed before a viewer joined to its socket."""
+        async with self._lock:
+            if self.backlog:
+                await notify_ws(ws=ws, message=self.get_message(log_lines=list(self.backlog),
+                                                                task_type=task_type,
+                                                                task_idx=task_idx))
+
+    async def broadcast(self, log_lines):
+        log_lines = [log_line.decode('utf-8') for log_line in log_lines]
+        async with self._lock:
+            self.backlog.extend(log_lines)
+            await asyncio.gather(*[
+                notify(ws_manager, self.get_message(log_lines=log_lines,
+                                                    task_type=task_type,
+                                                    task_idx=task_idx))
+                for ws_manager, (task_type, task_idx) in list(self._names.items())
+            ])
+
+    async def tail(self):
+        resp = None
+        try:
+            resp = await self.k8s_api.read_namespaced_pod_log(self.pod_id,
+                                                              self.namespace,
+                                                              container=self.container,
+                                                              follow=True,
+                                                              _preload_content=False,
+                                                              timestamps=True)
+            buffer = b''
+            while True:
+                try:
+                    chunk = await resp.content.readany()
+                except asyncio.TimeoutError:
+                    chunk = None
+                if not chunk:
+                    break
+
+                # Only complete lines are broadcast, the remainder waits for the next chunk
+                log_lines = (buffer + chunk).split(b'\n')
+                buffer = log_lines.pop()
+                if log_lines:
+                    await self.broadcast(log_lines)
+
+                # Let more lines accumulate to send them in a single batch
+                await asyncio.sleep(LOG_SLEEP)
+            if buffer:
+                await self.broadcast([buffer])
+        finally:
+            self._unregister()
+            if resp is not None:
+                resp.release()
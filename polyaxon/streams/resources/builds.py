@@ -3,6 +3,7 @@ import conf
 
 from event_manager.events.build_job import BUILD_JOB_LOGS_VIEWED
 from streams.authentication import authorized
+from streams.data_access import run_sync
 from streams.resources.logs import log_job
 from streams.resources.utils import get_error_message
 from streams.validation.build import validate_build
@@ -10,7 +11,8 @@ from streams.validation.build import validate_build
 
 @authorized()
 async def build_logs_v2(request, ws, username, project_name, build_id):
-    job, message = validate_build(request=request,
+    job, message = await run_sync(validate_build,
+                                  request=request,
                                   username=username,
                                   project_name=project_name,
                                   build_id=build_id)
@@ -20,7 +22,8 @@ async def build_logs_v2(request, ws, username, project_name, build_id):
 
     pod_id = job.pod_id
 
-    auditor.record(event_type=BUILD_JOB_LOGS_VIEWED,
+    await run_sync(auditor.record,
+                   event_type=BUILD_JOB_LOGS_VIEWED,
                    instance=job,
                    actor_id=request.app.user.id,
                    actor_name=request.app.user.username)
@@ -6,10 +6,12 @@ import auditor
 import conf
 
 from constants.experiment_jobs import get_experiment_job_container_name
+from constants.experiments import ExperimentLifeCycle
 from db.redis.to_stream import RedisToStream
 from event_manager.events.experiment import EXPERIMENT_LOGS_VIEWED, EXPERIMENT_RESOURCES_VIEWED
 from streams.authentication import authorized
 from streams.constants import CHECK_DELAY, RESOURCES_CHECK, SOCKET_SLEEP
+from streams.data_access import get_experiment_jobs_values, get_last_status, run_sync
 from streams.logger import logger
 from streams.resources.logs import log_experiment
 from streams.resources.utils import get_error_message
@@ -19,15 +21,17 @@ from streams.validation.experiment import validate_experiment
 
 @authorized()
 async def experiment_resources(request, ws, username, project_name, experiment_id):
-    experiment, message = validate_experiment(request=request,
-                                              username=username,
-                                              project_name=project_name,
-                                              experiment_id=experiment_id)
+    experiment, message = await run_sync(validate_experiment,
+                                         request=request,
+                                         username=username,
+                                         project_name=project_name,
+                                         experiment_id=experiment_id)
     if experiment is None:
         await ws.send(get_error_message(message))
         return
     experiment_uuid = experiment.uuid.hex
-    auditor.record(event_type=EXPERIMENT_RESOURCES_VIEWED,
+    await run_sync(auditor.record,
+                   event_type=EXPERIMENT_RESOURCES_VIEWED,
                    instance=experiment,
                    actor_id=request.app.user.id,
                    actor_name=request.app.user.username)
@@ -52,7 +56,7 @@ async def experiment_resources(request, ws, username, project_name, experiment_i
         logger.info('Quitting resources socket for uuid %s', experiment_uuid)
 
     jobs = []
-    for job in experiment.jobs.values('uuid', 'role', 'id'):
+    for job in await get_experiment_jobs_values(experiment, 'uuid', 'role', 'id'):
         job['uuid'] = job['uuid'].hex
         job['name'] = '{}.{}'.format(job.pop('role'), job.pop('id'))
         jobs.append(job)
@@ -64,8 +68,8 @@ async def experiment_resources(request, ws, username, project_name, experiment_i
 
         # After trying a couple of time, we must check the status of the experiment
         if should_check > RESOURCES_CHECK:
-            experiment.refresh_from_db()
-            if experiment.is_done:
+            status = await get_last_status(experiment)
+            if ExperimentLifeCycle.is_done(status):
                 logger.info(
                     'removing all socket because the experiment `%s` is done', experiment_uuid)
                 ws_manager.ws = set([])
@@ -91,15 +95,17 @@ async def experiment_resources(request, ws, username, project_name, experiment_i
 
 @authorized()
 async def experiment_logs_v2(request, ws, username, project_name, experiment_id):
-    experiment, message = validate_experiment(request=request,
-                                              username=username,
-                                              project_name=project_name,
-                                              experiment_id=experiment_id)
+    experiment, message = await run_sync(validate_experiment,
+                                         request=request,
+                                         username=username,
+                                         project_name=project_name,
+                                         experiment_id=experiment_id)
     if experiment is None:
         await ws.send(get_error_message(message))
         return
 
-    auditor.record(event_type=EXPERIMENT_LOGS_VIEWED,
+    await run_sync(auditor.record,
+                   event_type=EXPERIMENT_LOGS_VIEWED,
                    instance=experiment,
                    actor_id=request.app.user.id,
                    actor_name=request.app.user.username)
@@ -1,13 +1,18 @@
 import asyncio
-import json
 
 from kubernetes_asyncio import client, config
 
 from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
-from logs_handlers.log_queries.base import process_log_line
 from streams.constants import SOCKET_SLEEP
-from streams.resources.utils import get_status_message, notify, notify_ws, should_disconnect
+from streams.data_access import get_experiment_jobs, get_last_status
+from streams.log_tailer import LogTailer
+from streams.resources.utils import (
+    get_error_message,
+    get_status_message,
+    notify_ws,
+    should_disconnect
+)
 from streams.socket_manager import SocketManager
 
 
@@ -24,9 +29,9 @@ async def log_job(request, ws, job, pod_id, namespace, container):
     # Stream phase changes
     status = None
     while status != JobLifeCycle.RUNNING and not JobLifeCycle.is_done(status):
-        job.refresh_from_db()
-        if status != job.last_status:
-            status = job.last_status
+        last_status = await get_last_status(job)
+        if status != last_status:
+            status = last_status
             await notify_ws(ws=ws, message=get_status_message(status))
             if should_disconnect(ws=ws, ws_manager=ws_manager):
                 return
@@ -38,7 +43,8 @@ async def log_job(request, ws, job, pod_id, namespace, container):
 
     config.load_incluster_config()
     k8s_api = client.CoreV1Api()
-    await log_job_pod(k8s_api=k8s_api,
+    await log_job_pod(request=request,
+                      k8s_api=k8s_api,
                       ws=ws,
                       ws_manager=ws_manager,
                       pod_id=pod_id,
@@ -59,9 +65,9 @@ async def log_experiment(request, ws, experiment, namespace, container):
     # Stream phase changes
     status = None
     while status != ExperimentLifeCycle.RUNNING and not ExperimentLifeCycle.is_done(status):
-        experiment.refresh_from_db()
-        if status != experiment.last_status:
-            status = experiment.last_status
+        last_status = await get_last_status(experiment)
+        if status != last_status:
+            status = last_status
             await notify_ws(ws=ws, message=get_status_message(status))
             if should_disconnect(ws=ws, ws_manager=ws_manager):
                 return
@@ -74,10 +80,11 @@ async def log_experiment(request, ws, experiment, namespace, container):
     config.load_incluster_config()
     k8s_api = client.CoreV1Api()
     log_requests = []
-    for job in experiment.jobs.all():
+    for job in await get_experiment_jobs(experiment):
         pod_id = job.pod_id
         log_requests.append(
-            log_job_pod(k8s_api=k8s_api,
+            log_job_pod(request=request,
+                        k8s_api=k8s_api,
                         ws=ws,
                         ws_manager=ws_manager,
                         pod_id=pod_id,
@@ -88,7 +95,8 @@ async def log_experiment(request, ws, experiment, namespace, container):
     await asyncio.wait(log_requests)
 
 
-async def log_job_pod(k8s_api,
+async def log_job_pod(request,
+                      k8s_api,
                       ws,
                       ws_manager,
                       pod_id,
@@ -96,29 +104,21 @@ async def log_job_pod(k8s_api,
                       namespace,
                       task_type=None,
                       task_idx=None):
-    resp = await k8s_api.read_namespaced_pod_log(pod_id,
-                                                 namespace,
-                                                 container=container,
-                                                 follow=True,
-                                                 _preload_content=False,
-                                                 timestamps=True)
-    should_quite = False
-    while True:
-        try:
-            log_line = await resp.content.readline()
-        except asyncio.TimeoutError:
-            log_line = None
-        if not log_line:
-            break
-        log_line = process_log_line(log_line=log_line.decode('utf-8'),
-                                    task_type=task_type,
-                                    task_idx=task_idx)
-        await notify(ws_manager, json.dumps({'log_lines': log_line}))
-
-        if should_disconnect(ws=ws, ws_manager=ws_manager):
-            should_quite = True
-
-        if should_quite:
-            return
-
-        await asyncio.sleep(0.1)
+    # All viewers of the same pod share one tailer that broadcasts to their socket managers
+    tailer = LogTailer.get_or_create(registry=request.app.log_tailers,
+                                     k8s_api=k8s_api,
+                                     pod_id=pod_id,
+                                     namespace=namespace,
+                                     container=container)
+    tailer.subscribe(ws_manager=ws_manager, task_type=task_type, task_idx=task_idx)
+    try:
+        await tailer.replay(ws=ws, task_type=task_type, task_idx=task_idx)
+        while not tailer.is_done:
+            if should_disconnect(ws=ws, ws_manager=ws_manager):
+                return
+            await asyncio.wait([tailer.task], timeout=SOCKET_SLEEP)
+        if tailer.error is not None:
+            await notify_ws(ws=ws, message=get_error_message(
+                'Could not read the logs of pod `{}`.'.format(pod_id)))
+    finally:
+        tailer.unsubscribe(ws_manager=ws_manager)
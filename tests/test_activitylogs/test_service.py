@@ -3,10 +3,19 @@ import uuid
 
 import pytest
 
+from django.contrib.contenttypes.models import ContentType
+
 import activitylogs
 
 from db.models.activitylogs import ActivityLog
-from event_manager.events.experiment import EXPERIMENT_DELETED_TRIGGERED
+from db.models.projects import Project
+from event_manager.events.experiment import (
+    EXPERIMENT_DELETED_TRIGGERED,
+    EXPERIMENT_VIEWED,
+    ExperimentDeletedTriggeredEvent,
+    ExperimentViewedEvent
+)
+from event_manager.events.project import PROJECT_VIEWED
 from event_manager.events.user import USER_ACTIVATED
 from factories.factory_experiments import ExperimentFactory
 from factories.factory_users import UserFactory
@@ -46,3 +55,48 @@ class ActivityLogsTest(BaseTest):
         assert activity.event_type == EXPERIMENT_DELETED_TRIGGERED
         assert activity.content_object == self.experiment
         assert activity.actor == self.admin
+
+    def test_record_many_creates_activities_in_bulk(self):
+        activitylogs.validate()
+        activitylogs.setup()
+        events_data = []
+        for event_class in [ExperimentDeletedTriggeredEvent, ExperimentViewedEvent]:
+            event = event_class.from_instance(self.experiment,
+                                              actor_id=self.admin.id,
+                                              actor_name=self.admin.username)
+            event.ref_id = uuid.uuid4()
+            events_data.append(event.serialize(include_instance_info=True))
+
+        # The project content type is cached once per process
+        ContentType.objects.get_for_model(Project)
+        with self.assertNumQueries(1):
+            activitylogs.record_many(events_data=events_data)
+
+        assert ActivityLog.objects.count() == 2
+        assert set(ActivityLog.objects.values_list('event_type', flat=True)) == {
+            EXPERIMENT_DELETED_TRIGGERED, EXPERIMENT_VIEWED}
+        for activity in ActivityLog.objects.all():
+            assert activity.content_object == self.experiment
+            assert activity.actor == self.admin
+
+    def test_record_sets_project(self):
+        activitylogs.record(ref_id=uuid.uuid4(),
+                            event_type=EXPERIMENT_VIEWED,
+                            instance=self.experiment,
+                            actor_id=self.admin.id,
+                            actor_name=self.admin.username)
+        assert ActivityLog.objects.last().project_id == self.experiment.project_id
+
+        activitylogs.record(ref_id=uuid.uuid4(),
+                            event_type=PROJECT_VIEWED,
+                            instance=self.experiment.project,
+                            actor_id=self.admin.id,
+                            actor_name=self.admin.username)
+        assert ActivityLog.objects.last().project_id == self.experiment.project_id
+
+        activitylogs.record(ref_id=uuid.uuid4(),
+                            event_type=USER_ACTIVATED,
+                            instance=self.user,
+                            actor_id=self.admin.id,
+                            actor_name=self.admin.username)
+        assert ActivityLog.objects.last().project_id is None
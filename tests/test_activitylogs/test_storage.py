@@ -0,0 +1,131 @@
+import uuid
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from crons.tasks.cleaning import clean_activity_logs
+from db.models.activitylogs import ActivityLog
+from db.partitions import MonthlyPartitions, get_month_start, get_next_month_start
+from event_manager.events.experiment import EXPERIMENT_VIEWED
+from event_manager.events.project import PROJECT_VIEWED
+from event_manager.events.user import USER_ACTIVATED
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_users import UserFactory
+from polyaxon.config_settings import CleaningIntervals
+from tests.utils import BaseTest
+
+
+@pytest.mark.activitylogs_mark
+class TestActivityLogsStorage(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.experiment = ExperimentFactory()
+        self.project = self.experiment.project
+
+    def create_activity_log(self, event_type, instance, context, created_at=None):
+        return ActivityLog.objects.create(
+            event_type=event_type,
+            actor_id=self.user.id,
+            context=context,
+            created_at=created_at or timezone.now(),
+            content_object=instance,
+            ref=uuid.uuid4())
+
+    def test_backfill_projects(self):
+        experiment_log = self.create_activity_log(
+            event_type=EXPERIMENT_VIEWED,
+            instance=self.experiment,
+            context={'id': self.experiment.id, 'project.id': self.project.id})
+        project_log = self.create_activity_log(
+            event_type=PROJECT_VIEWED,
+            instance=self.project,
+            context={'id': self.project.id})
+        user_log = self.create_activity_log(
+            event_type=USER_ACTIVATED,
+            instance=self.user,
+            context={'id': self.user.id})
+
+        call_command('backfill_activity_logs', batch_size=1)
+
+        experiment_log.refresh_from_db()
+        project_log.refresh_from_db()
+        user_log.refresh_from_db()
+        assert experiment_log.project_id == self.project.id
+        assert project_log.project_id == self.project.id
+        assert user_log.project_id is None
+
+    def test_get_month_start(self):
+        value = datetime(2026, 12, 18, 10, 30, tzinfo=timezone.utc)
+        assert get_month_start(value) == datetime(2026, 12, 1, tzinfo=timezone.utc)
+        assert get_next_month_start(value) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+        partitions = MonthlyPartitions(ActivityLog)
+        assert partitions.get_partition_name(value) == 'db_activitylog_y2026m12'
+
+    def test_partitioned_retention(self):
+        partitions = MonthlyPartitions(ActivityLog)
+        if not partitions.is_supported():
+            self.skipTest('Partitioning requires Postgres 11 or later.')
+
+        now = timezone.now()
+        expired_date = now - timedelta(days=CleaningIntervals.ACTIVITY_LOGS + 62)
+        expired_log = self.create_activity_log(event_type=PROJECT_VIEWED,
+                                               instance=self.project,
+                                               context={'id': self.project.id},
+                                               created_at=expired_date)
+        log = self.create_activity_log(event_type=PROJECT_VIEWED,
+                                       instance=self.project,
+                                       context={'id': self.project.id})
+
+        assert partitions.partition_table(batch_size=1) is True
+        assert partitions.is_partitioned() is True
+        assert partitions.partition_table(batch_size=1) is False
+        assert ActivityLog.objects.filter(id__in=[expired_log.id, log.id]).count() == 2
+        assert partitions.get_partition_name(expired_date) in partitions.get_partitions().values()
+
+        # New activity logs are still recorded
+        new_log = self.create_activity_log(event_type=PROJECT_VIEWED,
+                                           instance=self.project,
+                                           context={'id': self.project.id})
+        assert new_log.id > log.id
+
+        clean_activity_logs()
+
+        assert set(ActivityLog.objects.filter(
+            id__in=[expired_log.id, log.id, new_log.id]).values_list('id', flat=True)) == {
+            log.id, new_log.id}
+        partition_names = partitions.get_partitions().values()
+        assert partitions.get_partition_name(expired_date) not in partition_names
+        assert partitions.get_partition_name(get_next_month_start(now)) in partition_names
+
+    def test_partition_table_is_resumable(self):
+        partitions = MonthlyPartitions(ActivityLog)
+        if not partitions.is_supported():
+            self.skipTest('Partitioning requires Postgres 11 or later.')
+
+        logs = [self.create_activity_log(event_type=PROJECT_VIEWED,
+                                         instance=self.project,
+                                         context={'id': self.project.id})
+                for _ in range(3)]
+        with patch.object(partitions, '_sync_rows', side_effect=DatabaseError('Interrupted')):
+            with self.assertRaises(DatabaseError):
+                partitions.partition_table(batch_size=1)
+        assert partitions.is_partitioned() is False
+
+        # A row committed after its batch was copied is missing from the copy
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM db_activitylog_partitioned WHERE id = %s', [logs[0].id])
+        new_log = self.create_activity_log(event_type=PROJECT_VIEWED,
+                                           instance=self.project,
+                                           context={'id': self.project.id})
+
+        assert partitions.partition_table(batch_size=1) is True
+        assert partitions.is_partitioned() is True
+        assert ActivityLog.objects.filter(
+            id__in=[log.id for log in logs] + [new_log.id]).count() == 4
@@ -0,0 +1,145 @@
+# pylint:disable=ungrouped-imports
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from kombu.utils.json import dumps
+
+import auditor
+import conf
+
+from auditor.pipeline import EventsPipeline
+from auditor.service import AuditorService
+from event_manager.events import experiment as experiment_events
+from factories.factory_experiments import ExperimentFactory
+from tests.utils import BaseTest
+
+
+@pytest.mark.auditor_mark
+class EventsPipelineTest(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.pipeline = EventsPipeline(tasks=('task1', 'task2'),
+                                       batch_size=3,
+                                       batch_interval=60)
+        self.addCleanup(self.pipeline.flush)
+
+    @patch('polyaxon.celery_api.celery_app.send_task')
+    def test_publishes_batches_by_size(self, mock_send_task):
+        self.pipeline.add({'type': 'event1'})
+        self.pipeline.add({'type': 'event2'})
+        assert mock_send_task.call_count == 0
+
+        self.pipeline.add({'type': 'event3'})
+        assert mock_send_task.call_count == 2
+        assert [call[0][0] for call in mock_send_task.call_args_list] == ['task1', 'task2']
+        for call in mock_send_task.call_args_list:
+            assert call[1]['kwargs'] == {
+                'events': [{'type': 'event1'}, {'type': 'event2'}, {'type': 'event3'}]
+            }
+
+        # The buffer is empty
+        self.pipeline.flush()
+        assert mock_send_task.call_count == 2
+
+    @patch('polyaxon.celery_api.celery_app.send_task')
+    def test_flush(self, mock_send_task):
+        self.pipeline.flush()
+        assert mock_send_task.call_count == 0
+
+        self.pipeline.add({'type': 'event1'})
+        assert self.pipeline._timer is not None  # pylint:disable=protected-access
+        self.pipeline.flush()
+        assert self.pipeline._timer is None  # pylint:disable=protected-access
+        assert mock_send_task.call_count == 2
+        # Single events are published without a batch
+        for call in mock_send_task.call_args_list:
+            assert call[1]['kwargs'] == {'event': {'type': 'event1'}}
+
+    @patch('polyaxon.celery_api.celery_app.send_task')
+    def test_forked_process_does_not_publish_the_parent_events(self, mock_send_task):
+        self.pipeline.add({'type': 'event1'})
+        with patch('os.getpid', return_value=-1):
+            self.pipeline.add({'type': 'event2'})
+            self.pipeline.flush()
+        for call in mock_send_task.call_args_list:
+            assert call[1]['kwargs'] == {'event': {'type': 'event2'}}
+
+
+@pytest.mark.auditor_mark
+class AuditorSamplingTest(BaseTest):
+    DISABLE_AUDITOR = False
+    DISABLE_EXECUTOR = False
+
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        sampling = conf.get('AUDITOR_EVENTS_SAMPLING')
+        self.addCleanup(conf.set, 'AUDITOR_EVENTS_SAMPLING', sampling)
+
+    def record(self, event_type):
+        auditor.record(event_type=event_type,
+                       instance=self.experiment,
+                       actor_name='foo',
+                       actor_id=1)
+
+    @patch('executor.executor_service.ExecutorService.record_event')
+    @patch('tracker.service.TrackerService.record_event')
+    @patch('activitylogs.service.ActivityLogService.record_event')
+    def test_dropped_view_events(self, activitylogs_record, tracker_record, executor_record):
+        conf.set('AUDITOR_EVENTS_SAMPLING', {experiment_events.EXPERIMENT_VIEWED: 0})
+        self.record(experiment_events.EXPERIMENT_VIEWED)
+        assert tracker_record.call_count == 0
+        assert activitylogs_record.call_count == 0
+
+        # Other events are not sampled
+        self.record(experiment_events.EXPERIMENT_LOGS_VIEWED)
+        self.record(experiment_events.EXPERIMENT_UPDATED)
+        assert tracker_record.call_count == 2
+        assert activitylogs_record.call_count == 2
+
+    @patch('tracker.service.TrackerService.record_event')
+    @patch('activitylogs.service.ActivityLogService.record_event')
+    def test_sampled_view_events(self, activitylogs_record, tracker_record):
+        conf.set('AUDITOR_EVENTS_SAMPLING', {experiment_events.EXPERIMENT_VIEWED: 0.5})
+        with patch('random.random', side_effect=[0.2, 0.7]):
+            self.record(experiment_events.EXPERIMENT_VIEWED)
+            self.record(experiment_events.EXPERIMENT_VIEWED)
+        assert tracker_record.call_count == 1
+        assert activitylogs_record.call_count == 1
+
+
+@pytest.mark.auditor_mark
+class AuditorBatchTest(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        self.service = AuditorService()
+        self.service.pipeline = EventsPipeline(tasks=('task1',),
+                                               batch_size=2,
+                                               batch_interval=60)
+        self.service.setup()
+        self.service.executor = MagicMock()
+        self.addCleanup(self.service.flush)
+
+    @patch('polyaxon.celery_api.celery_app.send_task')
+    def test_buffered_events_are_serializable(self, mock_send_task):
+        for event_type in [experiment_events.EXPERIMENT_UPDATED,
+                           experiment_events.EXPERIMENT_DELETED_TRIGGERED]:
+            self.service.record(event_type=event_type,
+                                instance=self.experiment,
+                                actor_name='foo',
+                                actor_id=1)
+
+        assert mock_send_task.call_count == 1
+        events = mock_send_task.call_args[1]['kwargs']['events']
+        assert len(events) == 2
+        assert all('instance' not in event for event in events)
+        # The batch is serializable by the celery json serializer
+        dumps(events)
+
+        # The executor still receives the instances
+        assert self.service.executor.record.call_count == 2
+        for call in self.service.executor.record.call_args_list:
+            assert call[1]['event_data']['instance'] == self.experiment
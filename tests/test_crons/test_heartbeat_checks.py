@@ -5,6 +5,7 @@ from mock import patch
 from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
 from crons.tasks.heartbeats import heartbeat_builds, heartbeat_experiments, heartbeat_jobs
+from db.redis.heartbeat import RedisHeartBeat
 from factories.factory_build_jobs import BuildJobFactory, BuildJobStatusFactory
 from factories.factory_experiments import ExperimentFactory, ExperimentStatusFactory
 from factories.factory_jobs import JobFactory, JobStatusFactory
@@ -30,6 +31,15 @@ class TestHeartBeatCrons(BaseTest):
             heartbeat_experiments()
 
         assert mock_fct.call_count == 1
+        assert mock_fct.call_args[0][1] == {'experiment_id': experiment5.id}
+
+        # Experiments reporting a heartbeat are not checked
+        RedisHeartBeat.experiment_ping(experiment5.id)
+        with patch('scheduler.tasks.experiments'
+                   '.experiments_check_heartbeat.apply_async') as mock_fct:
+            heartbeat_experiments()
+
+        assert mock_fct.call_count == 0
 
     def test_heartbeat_jobs(self):
         job1 = JobFactory()
@@ -46,6 +56,12 @@ class TestHeartBeatCrons(BaseTest):
 
         assert mock_fct.call_count == 1
 
+        RedisHeartBeat.job_ping(job4.id)
+        with patch('scheduler.tasks.jobs.jobs_check_heartbeat.apply_async') as mock_fct:
+            heartbeat_jobs()
+
+        assert mock_fct.call_count == 0
+
     def test_heartbeat_builds(self):
         build1 = BuildJobFactory()
         BuildJobStatusFactory(job=build1, status=JobLifeCycle.SCHEDULED)
@@ -60,3 +76,9 @@ class TestHeartBeatCrons(BaseTest):
             heartbeat_builds()
 
         assert mock_fct.call_count == 1
+
+        RedisHeartBeat.build_ping(build4.id)
+        with patch('scheduler.tasks.build_jobs.build_jobs_check_heartbeat.apply_async') as mock_fct:
+            heartbeat_builds()
+
+        assert mock_fct.call_count == 0
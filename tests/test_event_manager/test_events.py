@@ -106,6 +106,8 @@ class TestEvents(BaseTest):
                 'experiment_group')
         assert (experiment_group.ExperimentGroupIterationEvent.get_event_subject() ==
                 'experiment_group')
+        assert (experiment_group.ExperimentGroupExperimentsCreatedEvent.get_event_subject() ==
+                'experiment_group')
         assert (experiment_group.ExperimentGroupRandomEvent.get_event_subject() ==
                 'experiment_group')
         assert experiment_group.ExperimentGroupGridEvent.get_event_subject() == 'experiment_group'
@@ -346,6 +348,8 @@ class TestEvents(BaseTest):
         assert (experiment_group.ExperimentGroupMetricsViewedEvent.get_event_action() ==
                 'metrics_viewed')
         assert experiment_group.ExperimentGroupIterationEvent.get_event_action() is None
+        assert (experiment_group.ExperimentGroupExperimentsCreatedEvent.get_event_action() is
+                None)
         assert experiment_group.ExperimentGroupRandomEvent.get_event_action() is None
         assert experiment_group.ExperimentGroupGridEvent.get_event_action() is None
         assert experiment_group.ExperimentGroupHyperbandEvent.get_event_action() is None
@@ -25,3 +25,22 @@ class BaseTestEventsHandling(BaseTest):
             events_track(None)
 
         self.assertEqual(mock_fct.call_count, 1)
+
+    def test_events_notify_batch(self):
+        with patch('auditor.notify') as mock_fct:
+            events_notify(events=[{'type': 'event1'}, {'type': 'event2'}])
+
+        self.assertEqual(mock_fct.call_count, 2)
+
+    def test_events_log_batch(self):
+        with patch('auditor.log_many') as mock_fct:
+            events_log(events=[{'type': 'event1'}, {'type': 'event2'}])
+
+        self.assertEqual(mock_fct.call_count, 1)
+        self.assertEqual(mock_fct.call_args[0][0], [{'type': 'event1'}, {'type': 'event2'}])
+
+    def test_events_track_batch(self):
+        with patch('auditor.track') as mock_fct:
+            events_track(events=[{'type': 'event1'}, {'type': 'event2'}])
+
+        self.assertEqual(mock_fct.call_count, 2)
@@ -0,0 +1,127 @@
+import threading
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from docker.errors import APIError, NotFound
+from mock import patch
+
+from constants.containers import ContainerStatuses
+from monitor_resources import monitor
+from tests.utils import BaseTest
+
+
+def get_stats():
+    return {
+        'precpu_stats': {
+            'cpu_usage': {'total_usage': 100, 'percpu_usage': [50, 50]},
+            'system_cpu_usage': 1000,
+        },
+        'cpu_stats': {
+            'cpu_usage': {'total_usage': 200, 'percpu_usage': [100, 100]},
+            'system_cpu_usage': 2000,
+        },
+        'memory_stats': {'usage': 100, 'limit': 1000},
+    }
+
+
+class FakeNode(object):
+    cpu = 2
+
+
+class FakeContainer(object):
+    def __init__(self, barrier, stats=None, error=None):
+        self.id = uuid.uuid4().hex
+        self.name = 'container-{}'.format(self.id)
+        self.status = ContainerStatuses.RUNNING
+        self.attrs = {'HostConfig': {'Devices': []}}
+        self.barrier = barrier
+        self._stats = stats
+        self.error = error
+
+    def stats(self, decode, stream):  # pylint:disable=unused-argument
+        # Only returns once all the containers' stats are requested at the same time
+        self.barrier.wait()
+        if self.error:
+            raise self.error
+        return self._stats
+
+
+@pytest.mark.monitors_mark
+class TestMonitorResources(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        super().tearDown()
+
+    def test_collect_resources_concurrently(self):
+        barrier = threading.Barrier(4, timeout=5)
+        containers = [FakeContainer(barrier=barrier, stats=get_stats()),
+                      FakeContainer(barrier=barrier, error=APIError('Daemon error')),
+                      FakeContainer(barrier=barrier, stats={'cpu_stats': {}}),
+                      FakeContainer(barrier=barrier, stats=get_stats())]
+        jobs = {container.id: (uuid.uuid4().hex, uuid.uuid4().hex) for container in containers}
+
+        with patch.object(monitor.logger, 'warning') as mock_warning:
+            payloads = monitor.collect_resources(node=FakeNode(),
+                                                 containers=containers,
+                                                 jobs=jobs,
+                                                 gpu_resources={},
+                                                 executor=self.executor)
+
+        # The stats were requested concurrently, otherwise the barrier would be broken
+        assert barrier.broken is False
+        assert [payload['container_id'] for payload in payloads] == [containers[0].id,
+                                                                      containers[3].id]
+        for payload, container in zip(payloads, [containers[0], containers[3]]):
+            assert payload['job_uuid'] == jobs[container.id][0]
+            assert payload['experiment_uuid'] == jobs[container.id][1]
+            assert payload['n_cpus'] == 2
+            assert payload['memory_used'] == 100
+            assert payload['memory_limit'] == 1000
+
+        # The daemon error is reported for its container, and did not stop the other containers
+        assert mock_warning.call_count == 1
+        assert mock_warning.call_args[0][1] == containers[1].id
+
+    def test_collect_resources_without_executor(self):
+        barrier = threading.Barrier(1)
+        containers = [FakeContainer(barrier=barrier, stats=get_stats()),
+                      FakeContainer(barrier=barrier, error=APIError('Daemon error'))]
+        jobs = {container.id: (uuid.uuid4().hex, uuid.uuid4().hex) for container in containers}
+
+        payloads = monitor.collect_resources(node=FakeNode(),
+                                             containers=containers,
+                                             jobs=jobs,
+                                             gpu_resources={})
+
+        assert [payload['container_id'] for payload in payloads] == [containers[0].id]
+
+    def test_collect_resources_removes_stopped_containers_in_bulk(self):
+        barrier = threading.Barrier(3, timeout=5)
+        containers = [FakeContainer(barrier=barrier, stats=get_stats()),
+                      FakeContainer(barrier=barrier, error=NotFound('Container not found')),
+                      FakeContainer(barrier=barrier, stats=get_stats()),
+                      FakeContainer(barrier=barrier, stats=get_stats())]
+        # The stats of a stopped container are not requested
+        containers[3].status = ContainerStatuses.TERMINATED
+        jobs = {container.id: (uuid.uuid4().hex, uuid.uuid4().hex) for container in containers}
+
+        with patch.object(monitor.RedisJobContainers, 'remove_container') as mock_remove:
+            with patch.object(monitor.RedisJobContainers, 'remove_containers') as mock_bulk:
+                payloads = monitor.collect_resources(node=FakeNode(),
+                                                     containers=containers,
+                                                     jobs=jobs,
+                                                     gpu_resources={},
+                                                     executor=self.executor)
+
+        assert [payload['container_id'] for payload in payloads] == [containers[0].id,
+                                                                      containers[2].id]
+        assert mock_remove.call_count == 0
+        assert mock_bulk.call_count == 1
+        assert sorted(mock_bulk.call_args[0][0]) == sorted([containers[1].id, containers[3].id])
@@ -6,12 +6,14 @@ import pytest
 
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError
 from django.test.client import MULTIPART_CONTENT
 
 from constants.experiment_groups import ExperimentGroupLifeCycle
 from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
 from constants.urls import API_V1
+from crons.tasks.experiments_statuses import experiment_groups_repair_status_counters
 from db.managers.deleted import ArchivedManager, LiveManager
 from db.models.build_jobs import BuildJobStatus
 from db.models.experiment_groups import ExperimentGroup, ExperimentGroupIteration, GroupTypes
@@ -42,9 +44,11 @@ from hpsearch.search_managers import (
     HyperbandSearchManager,
     RandomSearchManager
 )
+from hpsearch.tasks import base
 from hpsearch.tasks.bo import hp_bo_start
 from hpsearch.tasks.hyperband import hp_hyperband_start
 from scheduler.tasks.experiment_groups import experiments_group_stop_experiments
+from schemas.experiments import ExperimentBackend
 from schemas.hptuning import HPTuningConfig, MatrixConfig, SearchAlgorithms
 from schemas.specifications import GroupSpecification
 from tests.utils import BaseTest, BaseViewTest
@@ -446,6 +450,106 @@ class TestExperimentGroupModel(BaseTest):
         assert experiment_group.running_experiments.count() == 0
         assert experiment_group.succeeded_experiments.count() == 1
 
+    @patch('scheduler.tasks.experiment_groups.experiments_group_create.apply_async')
+    def test_create_group_experiments_in_bulk(self, _):
+        experiment_group = ExperimentGroupFactory()
+        suggestions = base.get_suggestions(experiment_group=experiment_group)
+        assert len(suggestions) == 2
+
+        with patch('hpsearch.tasks.base.auditor.record') as auditor_record:
+            experiments = base.create_group_experiments(experiment_group=experiment_group,
+                                                        suggestions=suggestions)
+
+        assert auditor_record.call_count == 1
+        assert auditor_record.call_args[1]['num_experiments'] == 2
+        assert len(experiments) == 2
+        assert experiment_group.experiments.count() == 2
+        assert experiment_group.get_status_counts() == {ExperimentLifeCycle.CREATED: 2}
+        for experiment, suggestion in zip(experiments, suggestions):
+            experiment = Experiment.objects.get(id=experiment.id)
+            assert experiment.last_status == ExperimentLifeCycle.CREATED
+            assert experiment.statuses.count() == 1
+            assert experiment.declarations == suggestion
+            assert experiment.persistence is not None
+            assert experiment.backend == ExperimentBackend.NATIVE
+
+        assert base.create_group_experiments(experiment_group=experiment_group,
+                                             suggestions=[]) == []
+
+    @patch('scheduler.tasks.experiment_groups.experiments_group_create.apply_async')
+    def test_get_suggestions_range(self, _):
+        experiment_group = ExperimentGroupFactory()
+        suggestions = base.get_suggestions(experiment_group=experiment_group)
+        assert base.get_suggestions(experiment_group=experiment_group, end=1) == suggestions[:1]
+        assert base.get_suggestions(experiment_group=experiment_group,
+                                    start=1,
+                                    end=10) == suggestions[1:]
+
+    def test_failed_chunk_fails_the_group(self):
+        with patch('hpsearch.tasks.grid.hp_grid_search_start.apply_async') as _:  # noqa
+            with patch('hpsearch.tasks.base.create_group_experiments',
+                       side_effect=DatabaseError('Interrupted')):
+                experiment_group = ExperimentGroupFactory()
+
+        experiment_group.refresh_from_db()
+        assert experiment_group.last_status == ExperimentGroupLifeCycle.FAILED
+        assert experiment_group.experiments.count() == 0
+
+    @patch('scheduler.dockerizer_scheduler.create_build_job')
+    def test_status_counters(self, create_build_job):
+        build = BuildJobFactory()
+        BuildJobStatus.objects.create(status=JobLifeCycle.SUCCEEDED, job=build)
+        create_build_job.return_value = build, True, True
+        with patch('hpsearch.tasks.grid.hp_grid_search_start.apply_async') as _:  # noqa
+            experiment_group = ExperimentGroupFactory()
+
+        def assert_counters():
+            assert experiment_group.count_experiments() == experiment_group.experiments.count()
+            assert experiment_group.count_experiments(
+                statuses=ExperimentLifeCycle.PENDING_STATUS
+            ) == experiment_group.pending_experiments.count()
+            assert experiment_group.count_experiments(
+                statuses=ExperimentLifeCycle.RUNNING_STATUS
+            ) == experiment_group.running_experiments.count()
+            assert experiment_group.n_non_done_experiments == (
+                experiment_group.non_done_experiments.count())
+            assert experiment_group.n_experiments_to_start == (
+                experiment_group.concurrency - experiment_group.k8s_experiments.count())
+
+        assert experiment_group.get_status_counts() == {ExperimentLifeCycle.CREATED: 2}
+        assert_counters()
+
+        experiment1, experiment2 = experiment_group.experiments.all()
+        ExperimentStatusFactory(experiment=experiment1, status=ExperimentLifeCycle.RUNNING)
+        assert experiment_group.get_status_counts() == {ExperimentLifeCycle.CREATED: 1,
+                                                        ExperimentLifeCycle.RUNNING: 1}
+        assert_counters()
+
+        with patch('scheduler.experiment_scheduler.stop_experiment') as _:  # noqa
+            ExperimentStatusFactory(experiment=experiment1, status=ExperimentLifeCycle.SUCCEEDED)
+        assert experiment_group.count_experiments(
+            statuses=[ExperimentLifeCycle.SUCCEEDED]) == 1
+        assert_counters()
+
+        # Archiving and restoring an experiment
+        experiment2.archive()
+        assert experiment_group.count_experiments() == 1
+        assert_counters()
+        experiment2.restore()
+        assert experiment_group.count_experiments() == 2
+        assert_counters()
+
+        # Deleting an experiment
+        experiment2.delete()
+        assert experiment_group.count_experiments() == 1
+        assert_counters()
+
+        # Repairing the counters
+        experiment_group.status_counters.update(count=10)
+        experiment_groups_repair_status_counters()
+        assert experiment_group.get_status_counts() == {ExperimentLifeCycle.SUCCEEDED: 1}
+        assert_counters()
+
     @patch('scheduler.dockerizer_scheduler.create_build_job')
     def test_experiment_group_deletion_triggers_stopping_for_running_experiment(self,
                                                                                 create_build_job):
@@ -772,6 +876,7 @@ class TestExperimentGroupModel(BaseTest):
         assert Experiment.all.filter(experiment_group=experiment_group).count() == 2
         assert experiment_group.experiments.count() == 0
         assert experiment_group.all_experiments.count() == 2
+        assert experiment_group.count_experiments() == 0
 
         experiment_group.restore()
         assert experiment_group.deleted is False
@@ -781,6 +886,7 @@ class TestExperimentGroupModel(BaseTest):
         assert Experiment.all.filter(experiment_group=experiment_group).count() == 2
         assert experiment_group.experiments.count() == 2
         assert experiment_group.all_experiments.count() == 2
+        assert experiment_group.count_experiments() == 2
 
 
 @pytest.mark.experiment_groups_mark
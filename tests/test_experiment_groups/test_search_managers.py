@@ -1,10 +1,15 @@
 # pylint:disable=too-many-lines
+import heapq
+import itertools
 import numpy as np
+import time
 
 from unittest.mock import patch
 
 import pytest
 
+from sklearn.gaussian_process import GaussianProcessRegressor
+
 from db.models.experiment_groups import ExperimentGroupIteration
 from factories.factory_experiment_groups import ExperimentGroupFactory
 from factories.fixtures import (
@@ -12,7 +17,7 @@ from factories.fixtures import (
     experiment_group_spec_content_early_stopping,
     experiment_group_spec_content_hyperband
 )
-from hpsearch.schemas import BOIterationConfig
+from hpsearch.schemas import BOIterationConfig, HyperbandIterationConfig
 from hpsearch.search_managers import (
     BOSearchManager,
     GridSearchManager,
@@ -20,8 +25,10 @@ from hpsearch.search_managers import (
     RandomSearchManager,
     get_search_algorithm_manager
 )
+from hpsearch.search_managers.asha import ASHASearchManager
 from hpsearch.search_managers.bayesian_optimization.optimizer import BOOptimizer
 from hpsearch.search_managers.bayesian_optimization.space import SearchSpace
+from hpsearch.search_managers.utils import Suggestion, get_random_suggestions
 from schemas.hptuning import HPTuningConfig, MatrixConfig
 from tests.utils import BaseTest
 
@@ -106,6 +113,41 @@ class TestGridSearchManager(BaseTest):
 
         assert to_numpy_mock.call_count == 2
 
+    def test_get_suggestions_matches_product_order(self):
+        hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 2,
+            'matrix': {
+                'feature1': {'values': [1, 2, 3]},
+                'feature2': {'values': ['a', 'b']},
+                'feature3': {'range': [1, 5, 1]}
+            }
+        })
+        manager = GridSearchManager(hptuning_config=hptuning_config)
+        suggestions = manager.get_suggestions()
+        expected = [{'feature1': v1, 'feature2': v2, 'feature3': v3}
+                    for v1, v2, v3 in itertools.product([1, 2, 3], ['a', 'b'], [1, 2, 3, 4])]
+        assert len(suggestions) == 24
+        assert list(suggestions) == expected
+        assert [suggestions[i] for i in range(24)] == expected
+        assert suggestions.get_range(5, 9) == expected[5:9]
+        assert suggestions.get_range(20, 30) == expected[20:]
+        assert suggestions[-1] == expected[-1]
+        with self.assertRaises(IndexError):
+            suggestions[24]  # noqa
+
+    def test_get_suggestions_is_lazy(self):
+        hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 2,
+            'grid_search': {'n_experiments': 10 ** 7},
+            'matrix': {'feature{}'.format(i): {'range': [0, 10, 1]} for i in range(10)}
+        })
+        manager = GridSearchManager(hptuning_config=hptuning_config)
+        suggestions = manager.get_suggestions()
+        assert len(suggestions) == 10 ** 7
+        suggestion = suggestions[1234567]
+        assert [suggestion['feature{}'.format(i)] for i in range(10)] == [
+            0, 0, 0, 1, 2, 3, 4, 5, 6, 7]
+
 
 @pytest.mark.experiment_groups_mark
 class TestRandomSearchManager(BaseTest):
@@ -194,6 +236,43 @@ class TestRandomSearchManager(BaseTest):
 
         assert sample_mock.call_count == 4
 
+    def test_get_suggestions_small_discrete_space(self):
+        matrix = {
+            'feature1': MatrixConfig.from_dict({'pvalues': [(1, 0.4), (2, 0.6)]}),
+            'feature2': MatrixConfig.from_dict({'range': [1, 5, 1]})
+        }
+        suggestions = get_random_suggestions(matrix=matrix,
+                                             n_suggestions=12,
+                                             suggestion_params={'steps': 10},
+                                             seed=33)
+        # The number of suggestions is capped by the space
+        assert len(suggestions) == 8
+        assert {(s['feature1'], s['feature2']) for s in suggestions} == {
+            (v1, v2) for v1 in [1, 2] for v2 in [1, 2, 3, 4]}
+        assert all(s['steps'] == 10 for s in suggestions)
+
+    def test_get_suggestions_benchmark(self):
+        matrix = {
+            'feature1': MatrixConfig.from_dict({'values': [1, 2, 3, 4]}),
+            'feature2': MatrixConfig.from_dict({'range': [0, 10, 1]}),
+            'feature3': MatrixConfig.from_dict({'pvalues': [(1, 0.2), (2, 0.3), (3, 0.5)]}),
+            'feature4': MatrixConfig.from_dict({'uniform': [0, 1]}),
+        }
+        start = time.time()
+        suggestions = get_random_suggestions(matrix=matrix, n_suggestions=10000, seed=33)
+        duration = time.time() - start
+        assert len(suggestions) == 10000
+        assert len({Suggestion(params=s) for s in suggestions}) == 10000
+
+        matrix = {'feature{}'.format(i): MatrixConfig.from_dict({'range': [0, 10, 1]})
+                  for i in range(4)}
+        start = time.time()
+        suggestions = get_random_suggestions(matrix=matrix, n_suggestions=9000, seed=33)
+        duration += time.time() - start
+        assert len({Suggestion(params=s) for s in suggestions}) == 9000
+
+        assert duration < 10
+
 
 @pytest.mark.experiment_groups_mark
 class TestHyperbandSearchManager(BaseTest):
@@ -649,6 +728,199 @@ class TestHyperbandSearchManager(BaseTest):
             assert 'feature4' in suggestion
 
 
+def simulate_configs(n_configs, seed):
+    rand_generator = np.random.RandomState(seed)
+    qualities = rand_generator.uniform(0, 1, size=n_configs)
+    # 10% of the configs are 5 times slower (stragglers)
+    speeds = np.where(rand_generator.uniform(size=n_configs) < 0.1, 5., 1.)
+    return qualities, speeds
+
+
+def simulate_loss(qualities, config, resources, max_iter):
+    # The loss converges to the quality of the config when the resources increase
+    return qualities[config] + (max_iter / resources) * 0.1 * ((config * 7919) % 13) / 13.
+
+
+def simulate_synchronous(manager, workers, qualities, speeds):
+    """Runs the hyperband brackets, with a barrier after every bracket iteration.
+
+    Returns the cluster utilization and the (loss, time) of the best config at `max_iter`.
+    """
+    now = 0.
+    busy = 0.
+    best = (None, None)
+    next_config = 0
+    for iteration in range(manager.s_max + 1):
+        bracket = manager.get_bracket(iteration=iteration)
+        n_configs = manager.get_n_configs(bracket=bracket)
+        configs = list(range(next_config, next_config + n_configs))
+        next_config += n_configs
+        for bracket_iteration in range(bracket + 1):
+            resources = manager.get_n_resources_for_iteration(
+                iteration=iteration, bracket_iteration=bracket_iteration)
+            workers_free_at = [now] * workers
+            results = []
+            for config in configs:
+                start = heapq.heappop(workers_free_at)
+                duration = resources * speeds[config]
+                busy += duration
+                heapq.heappush(workers_free_at, start + duration)
+                loss = simulate_loss(qualities, config, resources, manager.max_iter)
+                results.append((loss, config))
+                if resources >= manager.max_iter and (best[0] is None or loss < best[0]):
+                    best = (loss, start + duration)
+            now = max(workers_free_at)
+            n_keep = manager.get_n_config_to_keep_for_iteration(
+                iteration=iteration, bracket_iteration=bracket_iteration)
+            configs = [config for _, config in sorted(results)[:n_keep]]
+    return busy / (workers * now), best
+
+
+def simulate_asynchronous(manager, workers, qualities, speeds):
+    """Runs ASHA, free workers are immediately given a promotion or a new config.
+
+    Returns the cluster utilization and the (loss, time) of the best config at `max_iter`.
+    """
+    iteration_config = HyperbandIterationConfig(iteration=0,
+                                                num_suggestions=0,
+                                                bracket_iteration=0,
+                                                asynchronous=True,
+                                                rungs_metrics=[],
+                                                promoted=[])
+    running = []
+    configs = {}
+    now = 0.
+    busy = 0.
+    best = (None, None)
+    job_id = 0
+    while True:
+        promotions, n_new = manager.get_jobs(iteration_config=iteration_config,
+                                             n_jobs=workers - len(running))
+        iteration_config.promoted += promotions
+        jobs = [(configs[xp_id], rung + 1) for xp_id, rung in promotions]
+        jobs += [(iteration_config.num_suggestions + i, 0) for i in range(n_new)]
+        iteration_config.num_suggestions += n_new
+        for config, rung in jobs:
+            duration = manager.get_rung_resources(rung=rung) * speeds[config]
+            busy += duration
+            configs[job_id] = config
+            heapq.heappush(running, (now + duration, job_id, config, rung))
+            job_id += 1
+        if not running:
+            break
+        now, xp_id, config, rung = heapq.heappop(running)
+        resources = manager.get_rung_resources(rung=rung)
+        loss = simulate_loss(qualities, config, resources, manager.max_iter)
+        iteration_config.rungs_metrics.append([xp_id, rung, loss])
+        if resources >= manager.max_iter and (best[0] is None or loss < best[0]):
+            best = (loss, now)
+    return busy / (workers * now), best
+
+
+@pytest.mark.experiment_groups_mark
+class TestASHASearchManager(BaseTest):
+    DISABLE_RUNNER = True
+    DISABLE_EXECUTOR = True
+    DISABLE_AUDITOR = True
+
+    def setUp(self):
+        super().setUp()
+        self.hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 8,
+            'hyperband': {
+                'max_iter': 81,
+                'eta': 3,
+                'resource': {'name': 'steps', 'type': 'int'},
+                'resume': False,
+                'metric': {'name': 'loss', 'optimization': 'minimize'}
+            },
+            'matrix': {
+                'feature1': {'values': [1, 2, 3]},
+                'feature2': {'uniform': [0, 1]}
+            }
+        })
+        self.manager = ASHASearchManager(hptuning_config=self.hptuning_config)
+
+    def test_rungs(self):
+        assert self.manager.max_rung == 4
+        assert [self.manager.get_rung_resources(rung=rung) for rung in range(5)] == [
+            1, 3, 9, 27, 81]
+        assert self.manager.get_rung_resource_value(rung=2) == 9
+        assert self.manager.max_configs == sum(
+            self.manager.get_n_configs(bracket=bracket) for bracket in range(5))
+
+    def test_get_promotions(self):
+        rungs_metrics = [[1, 0, 0.5], [2, 0, 0.1], [3, 0, 0.9], [4, 0, None], [5, 0, 0.3]]
+        # Only the top 1 / eta of the finished results can be promoted
+        assert self.manager.get_promotions(
+            rungs_metrics=rungs_metrics, promoted=[], n_jobs=10) == [[2, 0]]
+        assert self.manager.get_promotions(
+            rungs_metrics=rungs_metrics, promoted=[[2, 0]], n_jobs=10) == []
+
+        rungs_metrics += [[6, 0, 0.05], [7, 1, 0.2], [8, 1, 0.4], [9, 1, 0.1]]
+        # Higher rungs are promoted first
+        assert self.manager.get_promotions(
+            rungs_metrics=rungs_metrics, promoted=[[2, 0]], n_jobs=10) == [[9, 1], [6, 0]]
+        assert self.manager.get_promotions(
+            rungs_metrics=rungs_metrics, promoted=[[2, 0]], n_jobs=1) == [[9, 1]]
+
+        # Top rung results are never promoted
+        assert self.manager.get_promotions(
+            rungs_metrics=[[1, 4, 0.1], [2, 4, 0.2], [3, 4, 0.3]],
+            promoted=[],
+            n_jobs=10) == []
+
+    def test_get_jobs(self):
+        iteration_config = HyperbandIterationConfig(iteration=0,
+                                                    num_suggestions=8,
+                                                    bracket_iteration=0,
+                                                    asynchronous=True,
+                                                    rungs_metrics=[[1, 0, 0.5],
+                                                                   [2, 0, 0.1],
+                                                                   [3, 0, 0.9]],
+                                                    promoted=[])
+        assert self.manager.get_jobs(iteration_config=iteration_config, n_jobs=0) == ([], 0)
+        assert self.manager.get_jobs(iteration_config=iteration_config, n_jobs=3) == (
+            [[2, 0]], 2)
+
+        iteration_config.num_suggestions = self.manager.max_configs
+        assert self.manager.get_jobs(iteration_config=iteration_config, n_jobs=3) == (
+            [[2, 0]], 0)
+        assert self.manager.should_promote_or_create(iteration_config) is True
+        iteration_config.promoted = [[2, 0]]
+        assert self.manager.should_promote_or_create(iteration_config) is False
+
+    def test_get_suggestions(self):
+        iteration_config = HyperbandIterationConfig(iteration=0,
+                                                    num_suggestions=0,
+                                                    bracket_iteration=0,
+                                                    asynchronous=True)
+        suggestions = self.manager.get_suggestions(iteration_config=iteration_config,
+                                                   n_suggestions=5)
+        assert len(suggestions) == 5
+        assert all(suggestion['steps'] == 1 for suggestion in suggestions)
+
+    def test_simulation_benchmark(self):
+        """Compares the cluster utilization and time to the best config of ASHA
+        against the synchronous hyperband brackets."""
+        synchronous_manager = HyperbandSearchManager(hptuning_config=self.hptuning_config)
+        workers = self.hptuning_config.concurrency
+        results = {'sync': [], 'async': []}
+        for seed in range(5):
+            qualities, speeds = simulate_configs(n_configs=self.manager.max_configs, seed=seed)
+            results['sync'].append(simulate_synchronous(
+                synchronous_manager, workers, qualities, speeds))
+            results['async'].append(simulate_asynchronous(
+                self.manager, workers, qualities, speeds))
+
+        sync_utilization = np.mean([utilization for utilization, _ in results['sync']])
+        async_utilization = np.mean([utilization for utilization, _ in results['async']])
+        sync_time_to_best = np.mean([best[1] for _, best in results['sync']])
+        async_time_to_best = np.mean([best[1] for _, best in results['async']])
+        assert async_utilization > sync_utilization
+        assert async_time_to_best < sync_time_to_best
+
+
 @pytest.mark.experiment_groups_mark
 class TestBOSearchManager(BaseTest):
     DISABLE_RUNNER = True
@@ -735,8 +1007,57 @@ class TestBOSearchManager(BaseTest):
         with patch.object(BOOptimizer, 'get_suggestion') as get_suggestion_mock:
             self.manager1.get_suggestions(iteration_config)
 
+        # One suggestion per concurrency slot
+        assert get_suggestion_mock.call_count == 2
+
+    def test_iteration_suggestions_fill_concurrency(self):
+        iteration_config = BOIterationConfig.from_dict({
+            'iteration': 1,
+            'num_suggestions': 3,
+            'old_experiment_ids': [],
+            'old_experiments_configs': [],
+            'old_experiments_metrics': [],
+            'experiment_ids': [1, 2, 3],
+            'experiments_configs': [
+                [1, {'feature1': 1, 'feature2': 1, 'feature3': 1,
+                     'feature4': 1, 'feature5': 'a'}],
+                [2, {'feature1': 2, 'feature2': 1.2, 'feature3': 2,
+                     'feature4': 4, 'feature5': 'b'}],
+                [3, {'feature1': 3, 'feature2': 1.3, 'feature3': 3,
+                     'feature4': 3, 'feature5': 'a'}]],
+            'experiments_metrics': [[1, 1], [2, 2], [3, 3]]
+        })
+        suggestions = self.manager2.get_suggestions(iteration_config)
+        assert 1 <= len(suggestions) <= 2
+        for suggestion in suggestions:
+            assert 1 <= suggestion['feature4'] <= 5
+            assert suggestion['feature5'] in ['a', 'b', 'c']
+
+    def test_iteration_suggestions_count_against_n_iterations(self):
+        iteration_config = BOIterationConfig.from_dict({
+            'iteration': 2,
+            'num_suggestions': 2,
+            'old_experiment_ids': [1, 2, 3, 4, 5, 6, 7],
+            'old_experiments_configs': [[1, {'feature1': 1, 'feature2': 1, 'feature3': 1}],
+                                        [2, {'feature1': 2, 'feature2': 1.2, 'feature3': 2}],
+                                        [3, {'feature1': 3, 'feature2': 1.3, 'feature3': 3}]],
+            'old_experiments_metrics': [[1, 1], [2, 2], [3, 3]],
+            'experiment_ids': [8, 9],
+            'experiments_configs': [[8, {'feature1': 2, 'feature2': 1.5, 'feature3': 4}]],
+            'experiments_metrics': [[8, 4]]
+        })
+        # 4 of the 5 iterations were suggested after the 5 initial trials
+        assert self.manager1.get_n_suggested(iteration_config) == 4
+        assert self.manager1.get_n_suggested(iteration_config) == 4
+        assert self.manager1.should_reschedule(iteration_config) is True
+        with patch.object(BOOptimizer, 'get_suggestion') as get_suggestion_mock:
+            self.manager1.get_suggestions(iteration_config)
+        # Only one suggestion is left
         assert get_suggestion_mock.call_count == 1
 
+        iteration_config.experiment_ids = [8, 9, 10]
+        assert self.manager1.should_reschedule(iteration_config) is False
+
     def test_space_search(self):
         # Space 1
         space1 = SearchSpace(hptuning_config=self.manager1.hptuning_config)
@@ -960,6 +1281,63 @@ class TestBOSearchManager(BaseTest):
         assert 1 <= suggestion['feature4'] <= 5
         assert suggestion['feature5'] in ['a', 'b', 'c']
 
+    def test_optimizer_acquisition_gradient(self):
+        optimizer = BOOptimizer(hptuning_config=self.manager2.hptuning_config)
+        configs = [
+            {'feature1': 1, 'feature2': 1, 'feature3': 1, 'feature4': 1, 'feature5': 'a'},
+            {'feature1': 2, 'feature2': 1.2, 'feature3': 2, 'feature4': 4, 'feature5': 'b'},
+            {'feature1': 3, 'feature2': 1.3, 'feature3': 3, 'feature4': 3, 'feature5': 'a'}
+        ]
+        optimizer.add_observations(configs=configs, metrics=[1, 2, 3])
+        utility_function = optimizer.utility_function
+        utility_function.fit(optimizer.space.x, optimizer.space.y)
+        bounds = optimizer.space.bounds
+        x = np.random.uniform(bounds[:, 0], bounds[:, 1], size=(4, optimizer.space.dim))
+
+        values, gradients = utility_function.compute_with_gradient(x, y_max=3)
+        assert np.allclose(values, utility_function.compute(x, y_max=3))
+        eps = 1e-6
+        for i in range(optimizer.space.dim):
+            x_plus, x_minus = x.copy(), x.copy()
+            x_plus[:, i] += eps
+            x_minus[:, i] -= eps
+            numerical_gradient = (utility_function.compute(x_plus, y_max=3) -
+                                  utility_function.compute(x_minus, y_max=3)) / (2 * eps)
+            assert np.allclose(gradients[:, i], numerical_gradient, atol=1e-5)
+
+    def test_optimizer_incremental_observation(self):
+        optimizer = BOOptimizer(hptuning_config=self.manager1.hptuning_config)
+        configs = [
+            {'feature1': 1, 'feature2': 1, 'feature3': 1},
+            {'feature1': 2, 'feature2': 1.2, 'feature3': 2},
+            {'feature1': 3, 'feature2': 1.3, 'feature3': 3}
+        ]
+        optimizer.add_observations(configs=configs, metrics=[1, 2, 3])
+        utility_function = optimizer.utility_function
+        utility_function.fit(optimizer.space.x, optimizer.space.y)
+        gaussian_process = utility_function.gaussian_process
+        kernel = gaussian_process.kernel_
+        x = np.array([[1, 1, 2], [3, 2, 1]])
+        mean, std = gaussian_process.predict(x, return_std=True)
+        x_new = np.array([2, 1.5, 4])
+        utility_function.add_observation(x_new, -4)
+
+        # The fitted gaussian process is not modified
+        assert np.allclose(gaussian_process.predict(x), mean)
+        # The kernel's hyperparameters are kept
+        assert utility_function.gaussian_process.kernel_ == kernel
+
+        mean, std = utility_function.gaussian_process.predict(x, return_std=True)
+        expected_gaussian_process = GaussianProcessRegressor(kernel=kernel, optimizer=None)
+        expected_gaussian_process.fit(np.vstack([optimizer.space.x, x_new]),
+                                      np.append(optimizer.space.y, -4))
+        expected_mean, expected_std = expected_gaussian_process.predict(x, return_std=True)
+        assert np.allclose(mean, expected_mean)
+        assert np.allclose(std, expected_std)
+        # The acquisition function uses the updated gaussian process
+        values, _ = utility_function.compute_with_gradient(x, y_max=3)
+        assert np.allclose(values, utility_function.compute(x, y_max=3))
+
     @pytest.mark.filterwarnings('ignore::UserWarning')
     def test_concrete_example(self):
         hptuning_config = HPTuningConfig.from_dict({
@@ -448,6 +448,40 @@ class TestExperimentModel(BaseTest):
 
         assert experiment.metrics.count() == 3
 
+    def test_set_metrics_batch_merges_last_metric(self):
+        experiment = ExperimentFactory()
+        with patch('auditor.record') as auditor_record:
+            experiments_set_metrics(experiment_id=experiment.id,
+                                    data=[{'values': {'accuracy': 0.8, 'loss': 0.3}},
+                                          {'values': {'accuracy': 0.9}}])
+
+        assert experiment.metrics.count() == 2
+        assert auditor_record.call_count == 1
+        assert auditor_record.call_args[1]['num_metrics'] == 2
+        experiment.refresh_from_db()
+        assert experiment.last_metric == {'accuracy': 0.9, 'loss': 0.3}
+
+        with patch('auditor.record') as auditor_record:
+            experiments_set_metrics(experiment_id=experiment.id,
+                                    data=[{'values': {'precision': 0.7}}])
+        experiment.refresh_from_db()
+        assert experiment.last_metric == {'accuracy': 0.9, 'loss': 0.3, 'precision': 0.7}
+
+    def test_set_metrics_throughput(self):
+        """Benchmark: ingesting 10k points of an experiment with a bounded number of queries."""
+        experiment = ExperimentFactory()
+        num_points = 10000
+        data = [{'values': {'loss': 1. / (i + 1), 'step': i}} for i in range(num_points)]
+
+        # Getting the experiment, the savepoint and its release,
+        # the inserts in batches of 1000, and the update of the last metric
+        with patch('auditor.record') as auditor_record:
+            with self.assertNumQueries(14):
+                experiments_set_metrics(experiment_id=experiment.id, data=data)
+
+        assert experiment.metrics.count() == num_points
+        assert auditor_record.call_count == 1
+
     def test_master_success_influences_other_experiment_workers_status(self):
         with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
             # with patch.object(Experiment, 'set_status') as _:  # noqa
@@ -1,4 +1,6 @@
 # pylint:disable=too-many-lines
+import gzip
+import json
 import os
 import time
 
@@ -9,6 +11,7 @@ import pytest
 
 from hestia.internal_services import InternalServices
 from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
 
 import conf
 import stores
@@ -1342,6 +1345,50 @@ class TestExperimentStatusListViewV1(BaseViewTest):
         assert len(data) == 1
         assert data == self.serializer_class(self.queryset[limit:], many=True).data
 
+    def test_keyset_pagination(self):
+        # Statuses with the same creation date are ordered by id
+        self.model_class.objects.update(created_at=self.objects[0].created_at)
+        queryset = self.queryset.order_by('created_at', 'id')
+
+        resp = self.auth_client.get("{}?limit=1".format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert 'cursor=' in resp.data['next']
+        assert resp.data['previous'] is None
+        assert resp.data['results'] == self.serializer_class(queryset[:1], many=True).data
+
+        resp = self.auth_client.get(resp.data['next'])
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == self.num_objects
+        assert resp.data['results'] == self.serializer_class(queryset[1:2], many=True).data
+
+        resp = self.auth_client.get(resp.data['previous'])
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['previous'] is None
+        assert resp.data['results'] == self.serializer_class(queryset[:1], many=True).data
+
+        # Offsets are still supported
+        resp = self.auth_client.get("{}?limit=1&offset=2".format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['next'] is None
+        assert 'offset=1' in resp.data['previous']
+        assert resp.data['results'] == self.serializer_class(queryset[2:], many=True).data
+
+        resp = self.auth_client.get("{}?cursor=foo".format(self.url))
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_estimated_count(self):
+        resp = self.auth_client.get("{}?count=estimated".format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        # Estimates below the threshold are replaced by exact counts
+        assert resp.data['count'] == self.num_objects
+
+        with patch('api.paginator.KeysetPagination.get_estimated_count') as mock_fct:
+            mock_fct.return_value = conf.get('PAGINATION_EXACT_COUNT_THRESHOLD')
+            resp = self.auth_client.get("{}?count=estimated".format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == conf.get('PAGINATION_EXACT_COUNT_THRESHOLD')
+        assert len(resp.data['results']) == self.num_objects
+
     def test_create(self):
         data = {}
         resp = self.auth_client.post(self.url, data)
@@ -1432,6 +1479,100 @@ class TestExperimentMetricListViewV1(BaseViewTest):
         assert len(data) == 1
         assert data == self.serializer_class(self.queryset[limit:], many=True).data
 
+    def test_get_streaming(self):
+        resp = self.auth_client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.streaming is True
+        assert resp['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in resp['Vary']
+
+        data = json.loads(gzip.decompress(b''.join(resp.streaming_content)).decode('utf-8'))
+        assert data['next'] is None
+        assert data['count'] == len(self.objects)
+        assert data['results'] == json.loads(
+            json.dumps(self.serializer_class(self.queryset, many=True).data, cls=JSONEncoder))
+
+    def test_streaming_pagination(self):
+        limit = self.num_objects - 1
+        resp = self.auth_client.get('{}?limit={}'.format(self.url, limit),
+                                    HTTP_ACCEPT_ENCODING='gzip')
+        assert resp.status_code == status.HTTP_200_OK
+
+        data = json.loads(gzip.decompress(b''.join(resp.streaming_content)).decode('utf-8'))
+        assert data['next'] is not None
+        assert data['count'] == self.queryset.count()
+        assert len(data['results']) == limit
+
+        resp = self.auth_client.get(data['next'], HTTP_ACCEPT_ENCODING='gzip')
+        assert resp.status_code == status.HTTP_200_OK
+
+        data = json.loads(gzip.decompress(b''.join(resp.streaming_content)).decode('utf-8'))
+        assert data['next'] is None
+        assert data['previous'] is not None
+        assert data['results'] == json.loads(json.dumps(
+            self.serializer_class(self.queryset[limit:], many=True).data, cls=JSONEncoder))
+
+    def test_get_columns(self):
+        resp = self.auth_client.get('{}?columns=true'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data == {
+            'accuracy': {
+                't': [obj.created_at for obj in self.queryset],
+                'v': [obj.values['accuracy'] for obj in self.queryset],
+            }
+        }
+
+    def test_get_columns_filters(self):
+        for i in range(5):
+            self.factory_class(experiment=self.experiment, values={'loss': i, 'step': i})
+
+        resp = self.auth_client.get('{}?columns=true&names=loss'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert list(resp.data.keys()) == ['loss']
+        assert resp.data['loss']['v'] == [0, 1, 2, 3, 4]
+
+        resp = self.auth_client.get(
+            '{}?columns=true&names=loss&start_step=1&end_step=3'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['loss']['v'] == [1, 2, 3]
+
+        start_date = self.queryset.filter(values__loss=2).first().created_at
+        resp = self.auth_client.get('{}?columns=true&names=loss&start_date={}'.format(
+            self.url, start_date.isoformat().replace('+', '%2B')))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['loss']['v'] == [2, 3, 4]
+
+    def test_get_columns_downsampled(self):
+        values = [(i * 7) % 100 for i in range(100)]
+        for value in values:
+            self.factory_class(experiment=self.experiment, values={'loss': value})
+
+        resp = self.auth_client.get('{}?columns=true&names=loss&points=10'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert len(resp.data['loss']['v']) <= 10
+        assert len(resp.data['loss']['t']) == len(resp.data['loss']['v'])
+        assert min(resp.data['loss']['v']) == min(values)
+        assert max(resp.data['loss']['v']) == max(values)
+        assert resp.data['loss']['t'] == sorted(resp.data['loss']['t'])
+
+        # Less points than the target are returned as is
+        resp = self.auth_client.get('{}?columns=true&names=loss&points=1000'.format(self.url))
+        assert resp.data['loss']['v'] == values
+
+        resp = self.auth_client.get('{}?columns=true&names=loss&points=1'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['loss']['v'] == [min(values)]
+        assert len(resp.data['loss']['t']) == 1
+
+        resp = self.auth_client.get('{}?columns=true&names=loss&points=3'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert len(resp.data['loss']['v']) <= 3
+
+    def test_get_columns_invalid_params(self):
+        for params in ['points=foo', 'points=0', 'start_step=foo', 'start_date=foo']:
+            resp = self.auth_client.get('{}?columns=true&{}'.format(self.url, params))
+            assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_create(self):
         data = {}
         resp = self.auth_client.post(self.url, data)
@@ -1507,6 +1648,14 @@ class TestExperimentStatusDetailViewV1(BaseViewTest):
         assert resp.status_code == status.HTTP_200_OK
         assert resp.data == self.serializer_class(self.object).data
 
+    def test_get_num_queries(self):
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        # The experiment's context is shared with the status' permission checks
+        with self.assert_max_queries(3):
+            resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+
     def test_patch(self):
         data = {'status': ExperimentLifeCycle.SUCCEEDED}
         resp = self.auth_client.patch(self.url, data=data)
@@ -1815,18 +1964,22 @@ class TestExperimentJobLogsViewV1(BaseViewTest):
         assert len(data) == len(self.logs)
         assert data == self.logs
 
-    @patch('api.experiments.views.process_experiment_job_logs')
-    def test_get_non_done_experiment(self, _):
+    @patch('logs_handlers.log_queries.experiment_job.fetch_logs')
+    def test_get_non_done_experiment(self, fetch_logs):
         self.assertFalse(self.experiment.is_done)
         # No logs
+        fetch_logs.return_value = ''
         resp = self.auth_client.get(self.url)
         assert resp.status_code == status.HTTP_404_NOT_FOUND
         # Check the it does not return non temp file
         self.create_logs(temp=False)
         resp = self.auth_client.get(self.url)
         assert resp.status_code == status.HTTP_404_NOT_FOUND
-        # Check returns the correct file
+        # Check returns the logs of the pod, without rewriting the temp file
         self.create_logs(temp=True)
+        temp_logs = self.logs
+        self.logs = temp_logs + ['pod log line']
+        fetch_logs.return_value = '\n'.join(self.logs)
         resp = self.auth_client.get(self.url)
         assert resp.status_code == status.HTTP_200_OK
 
@@ -1834,6 +1987,11 @@ class TestExperimentJobLogsViewV1(BaseViewTest):
         data = [d for d in data[0].decode('utf-8').split('\n') if d]
         assert len(data) == len(self.logs)
         assert data == self.logs
+        temp_path = stores.get_experiment_job_logs_path(
+            experiment_job_name=self.experiment_job.unique_name,
+            temp=True)
+        with open(temp_path, 'r') as log_file:
+            assert log_file.read() == ''.join(line + '\n' for line in temp_logs)
 
 
 @pytest.mark.experiments_mark
@@ -2176,18 +2334,22 @@ class TestExperimentLogsViewV1(BaseViewTest):
         assert len(data) == len(self.logs)
         assert data == self.logs
 
-    @patch('api.experiments.views.process_logs')
-    def test_get_non_done_experiment(self, _):
+    @patch('logs_handlers.log_queries.experiment.fetch_logs')
+    def test_get_non_done_experiment(self, fetch_logs):
         self.assertFalse(self.experiment.is_done)
         # No logs
+        fetch_logs.return_value = ''
         resp = self.auth_client.get(self.url)
         assert resp.status_code == status.HTTP_404_NOT_FOUND
         # Check the it does not return non temp file
         self.create_logs(temp=False)
         resp = self.auth_client.get(self.url)
         assert resp.status_code == status.HTTP_404_NOT_FOUND
-        # Check returns the correct file
+        # Check returns the logs of the pod, without rewriting the temp file
         self.create_logs(temp=True)
+        temp_logs = self.logs
+        self.logs = temp_logs + ['pod log line']
+        fetch_logs.return_value = '\n'.join(self.logs)
         resp = self.auth_client.get(self.url)
         assert resp.status_code == status.HTTP_200_OK
 
@@ -2195,6 +2357,39 @@ class TestExperimentLogsViewV1(BaseViewTest):
         data = [d for d in data[0].decode('utf-8').split('\n') if d]
         assert len(data) == len(self.logs)
         assert data == self.logs
+        temp_path = stores.get_experiment_logs_path(experiment_name=self.experiment.unique_name,
+                                                    temp=True)
+        with open(temp_path, 'r') as log_file:
+            assert log_file.read() == ''.join(line + '\n' for line in temp_logs)
+
+    def test_get_done_experiment_query(self):
+        self.experiment.set_status(ExperimentLifeCycle.SUCCEEDED)
+        self.create_logs(temp=False)
+
+        resp = self.auth_client.get(self.url + '?tail=3')
+        assert resp.status_code == status.HTTP_200_OK
+        data = b''.join(resp.streaming_content).decode('utf-8')
+        assert [d for d in data.split('\n') if d] == self.logs[-3:]
+
+        resp = self.auth_client.get(self.url + '?lines=2-4')
+        assert resp.status_code == status.HTTP_200_OK
+        data = b''.join(resp.streaming_content).decode('utf-8')
+        assert [d for d in data.split('\n') if d] == self.logs[2:4]
+
+        resp = self.auth_client.get(self.url + '?tail=foo')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    @patch('api.experiments.views.refresh_logs')
+    @patch('api.experiments.views.fetch_logs')
+    def test_get_non_done_experiment_tail(self, fetch_logs, refresh_logs):
+        fetch_logs.return_value = 'line 1\nline 2'
+        resp = self.auth_client.get(self.url + '?tail=2')
+        assert resp.status_code == status.HTTP_200_OK
+        data = b''.join(resp.streaming_content).decode('utf-8')
+        assert data == 'line 1\nline 2\n'
+        # Only the tail is read from the pod
+        assert fetch_logs.call_args[1]['tail_lines'] == 2
+        assert refresh_logs.call_count == 0
 
     def test_post_logs(self):
         resp = self.auth_client.post(self.url)
@@ -2214,6 +2409,16 @@ class TestExperimentLogsViewV1(BaseViewTest):
         assert resp.status_code == status.HTTP_200_OK
         assert mock_fct.call_count == 1
 
+    def test_get_num_queries(self):
+        self.experiment.set_status(ExperimentLifeCycle.SUCCEEDED)
+        self.create_logs(temp=False)
+        # The owner, project, and experiment are loaded in a single query
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        with self.assert_max_queries(3):
+            resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+
 
 @pytest.mark.experiments_mark
 class TestExperimentOutputsTreeViewV1(BaseFilesViewTest):
@@ -2257,6 +2462,13 @@ class TestExperimentOutputsTreeViewV1(BaseFilesViewTest):
         self.assert_same_content(resp.data['files'], self.second_level['files'])
         self.assert_same_content(resp.data['dirs'], self.second_level['dirs'])
 
+    def test_get_num_queries(self):
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        with self.assert_max_queries(3):
+            resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+
 
 @pytest.mark.experiments_mark
 class TestExperimentOutputsFilesViewV1(BaseFilesViewTest):
@@ -2465,6 +2677,13 @@ class TestExperimentChartViewListViewV1(BaseViewTest):
         assert len(data) == self.queryset.count()
         assert data == self.serializer_class(self.queryset, many=True).data
 
+    def test_get_does_not_stream(self):
+        # The view did not opt in to streaming
+        resp = self.auth_client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.streaming is False
+        assert resp.data['count'] == len(self.objects)
+
     def test_pagination(self):
         limit = self.num_objects - 1
         resp = self.auth_client.get("{}?limit={}".format(self.url, limit))
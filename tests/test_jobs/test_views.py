@@ -743,18 +743,22 @@ class TestJobLogsViewV1(BaseViewTest):
         assert len(data) == len(self.logs)
         assert data == self.logs
 
-    @patch('api.jobs.views.process_logs')
-    def test_get_non_done_job(self, _):
+    @patch('logs_handlers.log_queries.job.fetch_logs')
+    def test_get_non_done_job(self, fetch_logs):
         self.assertFalse(self.job.is_done)
         # No logs
+        fetch_logs.return_value = ''
         resp = self.auth_client.get(self.url)
         assert resp.status_code == status.HTTP_404_NOT_FOUND
         # Check the it does not return non temp file
         self.create_logs(temp=False)
         resp = self.auth_client.get(self.url)
         assert resp.status_code == status.HTTP_404_NOT_FOUND
-        # Check returns the correct file
+        # Check returns the logs of the pod, without rewriting the temp file
         self.create_logs(temp=True)
+        temp_logs = self.logs
+        self.logs = temp_logs + ['pod log line']
+        fetch_logs.return_value = '\n'.join(self.logs)
         resp = self.auth_client.get(self.url)
         assert resp.status_code == status.HTTP_200_OK
 
@@ -762,6 +766,9 @@ class TestJobLogsViewV1(BaseViewTest):
         data = [d for d in data[0].decode('utf-8').split('\n') if d]
         assert len(data) == len(self.logs)
         assert data == self.logs
+        temp_path = stores.get_job_logs_path(job_name=self.job.unique_name, temp=True)
+        with open(temp_path, 'r') as log_file:
+            assert log_file.read() == ''.join(line + '\n' for line in temp_logs)
 
 
 @pytest.mark.jobs_mark
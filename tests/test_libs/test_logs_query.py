@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from rest_framework.exceptions import ValidationError
+
+from libs.logs_query import (
+    TIMESTAMP_FORMAT,
+    LogFileIndex,
+    LogsQuery,
+    get_logs_query,
+    query_log_file
+)
+from tests.utils import BaseTest
+
+
+@pytest.mark.libs_mark
+class TestLogsQuery(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.tmp_dir, 'logs')
+        now = datetime.utcnow()
+        self.lines = [
+            '{} UTC -- line {}\n'.format(
+                (now - timedelta(minutes=10 - i)).strftime(TIMESTAMP_FORMAT), i)
+            for i in range(10)]
+        with open(self.log_path, 'w') as log_file:
+            log_file.write(''.join(self.lines))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        super().tearDown()
+
+    def query(self, **params):
+        return b''.join(query_log_file(log_path=self.log_path,
+                                       query=LogsQuery(**params))).decode()
+
+    def test_get_logs_query(self):
+        assert get_logs_query({}) is None
+        assert get_logs_query({'tail': '500'}).tail == 500
+        assert get_logs_query({'since': '60'}).since == 60
+        assert get_logs_query({'lines': '10-20'}).lines == (10, 20)
+        assert get_logs_query({'bytes': '1024-'}).bytes_range == (1024, None)
+
+        for params in [{'tail': 'foo'},
+                       {'tail': '-1'},
+                       {'lines': '10'},
+                       {'lines': '20-10'},
+                       {'bytes': 'a-b'},
+                       {'tail': '10', 'since': '60'}]:
+            with self.assertRaises(ValidationError):
+                get_logs_query(params)
+
+    def test_query_log_file(self):
+        assert self.query(tail=3) == ''.join(self.lines[7:])
+        assert self.query(tail=20) == ''.join(self.lines)
+        assert self.query(lines=(2, 5)) == ''.join(self.lines[2:5])
+        assert self.query(lines=(8, None)) == ''.join(self.lines[8:])
+        content = ''.join(self.lines)
+        assert self.query(bytes_range=(30, 100)) == content[30:100]
+        # The lines of the last 3 minutes and a half
+        assert self.query(since=210) == ''.join(self.lines[7:])
+
+    def test_index_is_updated_with_new_lines(self):
+        index = LogFileIndex(log_path=self.log_path, checkpoint_lines=4)
+        checkpoints, num_lines = index.update()
+        assert num_lines == 10
+        assert [checkpoint.line for checkpoint in checkpoints] == [0, 4, 8]
+        assert os.path.exists(index.index_path)
+
+        with open(self.log_path, 'a') as log_file:
+            log_file.write('line 10\nline 11\npartial')
+        checkpoints, num_lines = index.update()
+        assert num_lines == 12
+        assert [checkpoint.line for checkpoint in checkpoints] == [0, 4, 8]
+        assert checkpoints[2].offset == len(''.join(self.lines[:8]))
+
+        # The index is rebuilt if the log is truncated
+        with open(self.log_path, 'w') as log_file:
+            log_file.write('line 1\n')
+        checkpoints, num_lines = index.update()
+        assert num_lines == 1
+        assert checkpoints == [(0, 0, None)]
+
+    def test_index_is_rebuilt_if_the_log_is_rewritten(self):
+        index = LogFileIndex(log_path=self.log_path, checkpoint_lines=4)
+        index.update()
+
+        # A rewrite to a larger size in place
+        lines = ['rewritten line {}\n'.format(i) for i in range(12)]
+        with open(self.log_path, 'w') as log_file:
+            log_file.write(''.join(lines))
+        checkpoints, num_lines = index.update()
+        assert num_lines == 12
+        assert [checkpoint.offset for checkpoint in checkpoints] == [
+            len(''.join(lines[:i])) for i in [0, 4, 8]]
+        assert self.query(lines=(4, 6)) == ''.join(lines[4:6])
+
+        # A replaced file
+        replaced_lines = ['replaced line {:02d}\n'.format(i) for i in range(12)]
+        replaced_path = self.log_path + '.replaced'
+        with open(replaced_path, 'w') as log_file:
+            log_file.write(''.join(replaced_lines))
+        os.replace(replaced_path, self.log_path)
+        assert self.query(lines=(8, None)) == ''.join(replaced_lines[8:])
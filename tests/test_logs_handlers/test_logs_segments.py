@@ -0,0 +1,201 @@
+import os
+import shutil
+import tempfile
+import uuid
+
+from unittest.mock import patch
+
+import pytest
+
+from polystores.exceptions import PolyaxonStoresException
+
+import stores
+
+from libs.logs_query import LogsQuery
+from logs_handlers.utils import safe_log_experiment, safe_log_scratch
+from stores.segments import LogSegmentsReader, LogSegmentsWriter, get_segment_path
+from stores.service import StoresService
+from tests.utils import BaseTest
+
+
+class DirStoreManager(object):
+    """A bucket like store manager, the objects are kept in a local directory."""
+
+    def __init__(self, root):
+        self.root = root
+        self.uploads = []
+
+    def get_path(self, path):
+        return os.path.join(self.root, path.lstrip('/'))
+
+    def upload_file(self, filename, path, use_basename=False):
+        self.uploads.append(path)
+        os.makedirs(os.path.dirname(self.get_path(path)), exist_ok=True)
+        shutil.copy(filename, self.get_path(path))
+
+    def download_file(self, path, local_path):
+        if not os.path.exists(self.get_path(path)):
+            raise PolyaxonStoresException('File does not exist: {}'.format(path))
+        shutil.copy(self.get_path(path), local_path)
+
+    def delete(self, path):
+        if os.path.isfile(self.get_path(path)):
+            os.remove(self.get_path(path))
+        else:
+            shutil.rmtree(self.get_path(path), ignore_errors=True)
+
+
+@pytest.mark.logs_heandlers_mark
+class TestLogSegments(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store_manager = DirStoreManager(root=os.path.join(self.tmp_dir, 'bucket'))
+        self.buffer_path = os.path.join(self.tmp_dir, 'buffer')
+        self.logs_path = 'logs/user/project/experiments/1'
+        self.writer = LogSegmentsWriter(store_manager=self.store_manager,
+                                        buffer_path=self.buffer_path,
+                                        logs_path=self.logs_path,
+                                        segment_size=20,
+                                        segment_interval=3600)
+        self.reader = LogSegmentsReader(store_manager=self.store_manager,
+                                        logs_path=self.logs_path,
+                                        download_dir=self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        super().tearDown()
+
+    def write(self, content, mode='a'):
+        with open(self.buffer_path, mode) as log_file:
+            log_file.write(content)
+
+    def read(self):
+        return b''.join(self.reader.iter_chunks(paths=self.reader.get_paths(), chunk_size=4))
+
+    def test_roll_uploads_new_lines_only(self):
+        self.write('line 1\n')
+        assert self.writer.roll() is False
+        assert self.store_manager.uploads == []
+
+        self.write('line 2\nline 3\npartial')
+        assert self.writer.roll() is True
+        assert self.reader.get_paths() == [get_segment_path(self.logs_path, '00000000')]
+        assert self.read() == b'line 1\nline 2\nline 3\n'
+
+        self.write(' line\n')
+        assert self.writer.roll(force=True) is True
+        assert self.reader.get_paths() == [get_segment_path(self.logs_path, '00000000'),
+                                           get_segment_path(self.logs_path, '00000001')]
+        assert self.read() == b'line 1\nline 2\nline 3\npartial line\n'
+        assert self.writer.roll(force=True) is False
+
+    def test_roll_after_interval(self):
+        self.writer.segment_interval = 0
+        self.write('line 1\n')
+        assert self.writer.roll() is True
+        assert self.read() == b'line 1\n'
+
+    def test_reset_with_rewrite(self):
+        self.write('line 1\nline 2\nline 3\n')
+        assert self.writer.roll() is True
+
+        # The log is rewritten and uploaded again in segments
+        self.write('line 1\nline 2\nline 3\nline 4\n', mode='w')
+        self.writer.reset(rewrite=True)
+        assert self.reader.get_paths() == [get_segment_path(self.logs_path, '00000001'),
+                                           get_segment_path(self.logs_path, '00000002')]
+        assert not os.path.exists(
+            self.store_manager.get_path(get_segment_path(self.logs_path, '00000000')))
+        assert self.read() == b'line 1\nline 2\nline 3\nline 4\n'
+
+        self.write('line 5\nline 6\nline 7\n')
+        assert self.writer.roll() is True
+        assert self.read() == b'line 1\nline 2\nline 3\nline 4\nline 5\nline 6\nline 7\n'
+
+    def test_reset_without_rewrite(self):
+        self.write('line 1\nline 2\nline 3\n')
+        assert self.writer.roll() is True
+
+        # The log is rewritten, all lines are rolled again
+        self.write('line 1\nline 2\nline 3\nline 4\n', mode='w')
+        self.writer.reset(rewrite=False)
+        assert self.reader.get_paths() == []
+        assert self.writer.roll() is True
+        assert self.read() == b'line 1\nline 2\nline 3\nline 4\n'
+
+    def test_query_downloads_the_segments_of_the_lines(self):
+        lines = ['2019-03-07 16:1{}:00 UTC -- line {}\n'.format(i, i) for i in range(10)]
+        self.writer.segment_size = 100
+        self.write(''.join(lines))
+        self.writer.reset(rewrite=True)
+        # Every segment has 3 lines
+        assert len(self.reader.get_paths()) == 4
+
+        with patch.object(self.store_manager, 'download_file',
+                          wraps=self.store_manager.download_file) as download_file:
+            data = b''.join(self.reader.query(LogsQuery(tail=1)))
+        assert data == lines[9].encode()
+        # The index and the last segment
+        assert download_file.call_count == 2
+
+        data = b''.join(self.reader.query(LogsQuery(tail=2)))
+        assert data == ''.join(lines[8:]).encode()
+
+        data = b''.join(self.reader.query(LogsQuery(lines=(4, 6))))
+        assert data == ''.join(lines[4:6]).encode()
+
+        data = b''.join(self.reader.query(LogsQuery(bytes_range=(5, 20))))
+        assert data == ''.join(lines).encode()[5:20]
+
+    def test_read_logs_without_segments(self):
+        self.write('line 1\nline 2\n')
+        self.store_manager.upload_file(filename=self.buffer_path, path=self.logs_path)
+        assert self.reader.get_paths() == [self.logs_path]
+        assert self.read() == b'line 1\nline 2\n'
+
+    def test_safe_log_experiment_uploads_segments(self):
+        experiment_name = 'user.project.{}'.format(uuid.uuid4().hex)
+        logs_path = stores.get_experiment_logs_path(experiment_name=experiment_name, temp=False)
+        with patch('stores.is_bucket_logs_persistence', return_value=True):
+            with patch.object(StoresService, 'get_logs_store', return_value=self.store_manager):
+                safe_log_experiment(experiment_name=experiment_name,
+                                    log_lines='line 1',
+                                    temp=True,
+                                    append=True)
+                assert self.store_manager.uploads == []
+
+                # The final flush uploads the pending lines
+                safe_log_experiment(experiment_name=experiment_name,
+                                    log_lines='',
+                                    temp=False,
+                                    append=True)
+                assert self.store_manager.uploads == [
+                    get_segment_path(logs_path, '00000000'),
+                    get_segment_path(logs_path, 'index.json')]
+
+        reader = LogSegmentsReader(store_manager=self.store_manager,
+                                   logs_path=logs_path,
+                                   download_dir=self.tmp_dir)
+        assert b''.join(reader.iter_chunks(paths=reader.get_paths())) == b'line 1\n'
+
+    def test_safe_log_scratch_keeps_the_segments(self):
+        experiment_name = 'user.project.{}'.format(uuid.uuid4().hex)
+        temp_path = stores.get_experiment_logs_path(experiment_name=experiment_name, temp=True)
+        with patch('stores.is_bucket_logs_persistence', return_value=True):
+            with patch.object(StoresService, 'get_logs_store', return_value=self.store_manager):
+                safe_log_experiment(experiment_name=experiment_name,
+                                    log_lines='line 1',
+                                    temp=False,
+                                    append=True)
+                uploads = list(self.store_manager.uploads)
+
+                # Viewing the logs of the pod does not touch the buffer nor its segments
+                scratch_path = safe_log_scratch(temp_path=temp_path,
+                                                log_lines='line 1\nline 2')
+                assert self.store_manager.uploads == uploads
+
+        with open(temp_path, 'r') as log_file:
+            assert log_file.read() == 'line 1\n'
+        with open(scratch_path, 'r') as log_file:
+            assert log_file.read() == 'line 1\nline 2\n'
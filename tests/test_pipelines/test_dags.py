@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 from factories.factory_pipelines import OperationFactory
@@ -105,6 +107,43 @@ class TestDags(BaseTest):
         with self.assertRaises(ValueError):  # Cycles
             assert dags.sort_topologically(self.cycle2)
 
+    def test_sort_topologically_large_dag(self):
+        # Every node depends on up to 3 of the 50 previous nodes
+        random.seed(0)
+        n_nodes = 10000
+        dag = {node: set() for node in range(n_nodes)}
+        for node in range(1, n_nodes):
+            for upstream_node in random.sample(range(max(0, node - 50), node), min(node, 3)):
+                dag[upstream_node].add(node)
+
+        sorted_nodes = dags.sort_topologically(dag)
+        assert len(sorted_nodes) == n_nodes
+        positions = {node: i for i, node in enumerate(sorted_nodes)}
+        for node, downstream_nodes in dag.items():
+            for downstream_node in downstream_nodes:
+                assert positions[node] < positions[downstream_node]
+
+        # Add a cycle
+        dag[n_nodes - 1].add(0)
+        with self.assertRaises(ValueError):
+            dags.sort_topologically(dag)
+
+    def test_get_dag_from_edges(self):
+        operations = [OperationFactory() for _ in range(3)]
+        edges = [(operations[0].id, operations[1].id),
+                 (operations[0].id, operations[2].id),
+                 (operations[1].id, operations[2].id),
+                 # Edges of nodes outside the dag are ignored
+                 (-1, operations[0].id)]
+        assert dags.get_dag_from_edges(nodes=operations, edges=edges) == (
+            {
+                operations[0].id: {operations[1].id, operations[2].id},
+                operations[1].id: {operations[2].id},
+                operations[2].id: set(),
+            },
+            {op.id: op for op in operations}
+        )
+
     def test_get_dag(self):
         operations = [OperationFactory() for _ in range(4)]
         operations[0].upstream_operations.set(operations[2:])
@@ -8,7 +8,8 @@ from django.conf import settings
 from django.utils import timezone
 
 from constants.pipelines import OperationStatuses, PipelineStatuses, TriggerPolicy
-from db.models.pipelines import OperationRunStatus, PipelineRunStatus
+from crons.tasks.pipelines import pipelines_repair_counters
+from db.models.pipelines import OperationRun, OperationRunStatus, PipelineRun, PipelineRunStatus
 from factories.factory_pipelines import (
     OperationFactory,
     OperationRunFactory,
@@ -43,14 +44,27 @@ class TestPipelineModel(BaseTest):
         operation2 = OperationFactory()
         operation2.upstream_operations.set([operations[0], operations[2]])
 
+        with self.assertNumQueries(2):
+            assert pipeline.dag == (
+                {
+                    operations[0].id: {operation2.id, },
+                    operations[1].id: set(),
+                    operations[2].id: {operations[0].id, operations[1].id, operation2.id},
+                    operations[3].id: {operations[0].id, operations[1].id},
+                },
+                operation_by_ids
+            )
+
+        # Archived operations are not part of the dag
+        operation2.archive()
+        operations[3].archive()
         assert pipeline.dag == (
             {
-                operations[0].id: {operation2.id, },
+                operations[0].id: set(),
                 operations[1].id: set(),
-                operations[2].id: {operations[0].id, operations[1].id, operation2.id},
-                operations[3].id: {operations[0].id, operations[1].id},
+                operations[2].id: {operations[0].id, operations[1].id},
             },
-            operation_by_ids
+            {op.id: op for op in operations[:3]}
         )
 
 
@@ -853,3 +867,131 @@ class TestOperationRunModel(BaseTest):
 
         new_operation_run.refresh_from_db()
         assert new_operation_run.last_status == OperationStatuses.CREATED
+
+    def test_upstream_counters(self):
+        pipeline_run = PipelineRunFactory()
+        upstream_run1 = OperationRunFactory(pipeline_run=pipeline_run)
+        upstream_run2 = OperationRunFactory(pipeline_run=pipeline_run)
+        operation_run = OperationRunFactory(pipeline_run=pipeline_run)
+        operation_run.upstream_runs.set([upstream_run1, upstream_run2])
+        operation_run.refresh_upstream_counters()
+        assert operation_run.upstream_counters == {'n_upstream_runs': 2,
+                                                   'n_upstream_done': 0,
+                                                   'n_upstream_succeeded': 0,
+                                                   'n_upstream_failed': 0,
+                                                   'n_upstream_upstream_failed': 0}
+
+        OperationRunStatus.objects.create(status=OperationStatuses.RUNNING,
+                                          operation_run=upstream_run1)
+        pipeline_run.refresh_from_db()
+        assert pipeline_run.n_running_operation_runs == 1
+        upstream_run1.operation.refresh_from_db()
+        assert upstream_run1.operation.n_running_runs == 1
+
+        OperationRunStatus.objects.create(status=OperationStatuses.SUCCEEDED,
+                                          operation_run=upstream_run1)
+        OperationRunStatus.objects.create(status=OperationStatuses.UPSTREAM_FAILED,
+                                          operation_run=upstream_run2)
+        pipeline_run.refresh_from_db()
+        assert pipeline_run.n_running_operation_runs == 0
+        upstream_run1.operation.refresh_from_db()
+        assert upstream_run1.operation.n_running_runs == 0
+        operation_run.refresh_upstream_counters()
+        counters = {'n_upstream_runs': 2,
+                    'n_upstream_done': 2,
+                    'n_upstream_succeeded': 1,
+                    'n_upstream_failed': 0,
+                    'n_upstream_upstream_failed': 1}
+        assert operation_run.upstream_counters == counters
+
+        # Recomputing the counters gives the same values
+        OperationRun.objects.filter(id=operation_run.id).update(n_upstream_done=0)
+        OperationRun.repair_upstream_counters([operation_run.id])
+        operation_run.refresh_upstream_counters()
+        assert operation_run.upstream_counters == counters
+
+        # Removing an upstream run from the downstream side updates the counters
+        upstream_run2.downstream_runs.clear()
+        operation_run.refresh_upstream_counters()
+        assert operation_run.n_upstream_runs == 1
+        assert operation_run.n_upstream_done == 1
+
+    def test_downstream_runs_are_notified_once_when_ready(self):
+        pipeline_run = PipelineRunFactory()
+        upstream_run1 = OperationRunFactory(pipeline_run=pipeline_run)
+        upstream_run2 = OperationRunFactory(pipeline_run=pipeline_run)
+        operation_run = OperationRunFactory(pipeline_run=pipeline_run)
+        operation_run.operation.trigger_policy = TriggerPolicy.ALL_SUCCEEDED
+        operation_run.operation.save()
+        operation_run.upstream_runs.set([upstream_run1, upstream_run2])
+
+        with patch('pipelines.tasks.pipelines_start_operation.apply_async') as mock_fct:
+            OperationRunStatus.objects.create(status=OperationStatuses.SUCCEEDED,
+                                              operation_run=upstream_run1)
+        assert mock_fct.call_count == 0
+
+        with patch('pipelines.tasks.pipelines_start_operation.apply_async') as mock_fct:
+            OperationRunStatus.objects.create(status=OperationStatuses.SUCCEEDED,
+                                              operation_run=upstream_run2)
+        assert mock_fct.call_count == 1
+        assert mock_fct.call_args[0][1] == {'operation_run_id': operation_run.id}
+
+    def test_freed_running_slot_notifies_waiting_runs(self):
+        pipeline_run = PipelineRunFactory()
+        pipeline_run.pipeline.concurrency = 1
+        pipeline_run.pipeline.save()
+        operation_run1 = OperationRunFactory(pipeline_run=pipeline_run)
+        operation_run2 = OperationRunFactory(pipeline_run=pipeline_run)
+
+        with patch('db.models.pipelines.OperationRun.start') as mock_fct:
+            assert operation_run1.schedule_start() is False
+            assert operation_run2.schedule_start() is True
+        assert mock_fct.call_count == 1
+
+        with patch('pipelines.tasks.pipelines_start_operation.apply_async') as mock_fct:
+            OperationRunStatus.objects.create(status=OperationStatuses.RUNNING,
+                                              operation_run=operation_run1)
+        assert mock_fct.call_count == 0
+
+        with patch('pipelines.tasks.pipelines_start_operation.apply_async') as mock_fct:
+            OperationRunStatus.objects.create(status=OperationStatuses.SUCCEEDED,
+                                              operation_run=operation_run1)
+        assert mock_fct.call_count == 1
+        assert mock_fct.call_args[0][1] == {'operation_run_id': operation_run2.id}
+
+    def test_repair_counters_notifies_stalled_runs(self):
+        pipeline_run = PipelineRunFactory()
+        pipeline_run.pipeline.concurrency = 1
+        pipeline_run.pipeline.save()
+        operation_run1 = OperationRunFactory(pipeline_run=pipeline_run)
+        operation_run2 = OperationRunFactory(pipeline_run=pipeline_run)
+        operation_run3 = OperationRunFactory(pipeline_run=pipeline_run)
+        operation_run3.upstream_runs.set([operation_run1])
+
+        with patch('db.models.pipelines.OperationRun.start') as mock_fct:
+            assert operation_run1.schedule_start() is False
+            assert operation_run2.schedule_start() is True
+        assert mock_fct.call_count == 1
+
+        # A lost decrement of the running counter, and of an upstream counter
+        PipelineRun.objects.filter(id=pipeline_run.id).update(n_running_operation_runs=2)
+        with patch('pipelines.tasks.pipelines_start_operation.apply_async') as mock_fct:
+            OperationRunStatus.objects.create(status=OperationStatuses.SUCCEEDED,
+                                              operation_run=operation_run1)
+        OperationRun.objects.filter(id=operation_run3.id).update(n_upstream_done=0,
+                                                                 n_upstream_succeeded=0)
+        pipeline_run.refresh_from_db()
+        assert pipeline_run.n_running_operation_runs == 1
+        assert pipeline_run.check_concurrency() is False
+
+        with patch('pipelines.tasks.pipelines_start_operation.apply_async') as mock_fct:
+            pipelines_repair_counters()
+
+        pipeline_run.refresh_from_db()
+        assert pipeline_run.n_running_operation_runs == 0
+        operation_run1.operation.refresh_from_db()
+        assert operation_run1.operation.n_running_runs == 0
+        operation_run3.refresh_upstream_counters()
+        assert operation_run3.n_upstream_succeeded == 1
+        assert sorted(call[0][1]['operation_run_id'] for call in mock_fct.call_args_list) == [
+            operation_run2.id, operation_run3.id]
@@ -0,0 +1,32 @@
+import pytest
+
+from mock import patch
+
+from constants.pipelines import OperationStatuses, PipelineStatuses
+from factories.factory_pipelines import OperationRunFactory, PipelineRunFactory
+from pipelines.tasks import pipelines_start
+from tests.utils import BaseTest
+
+
+@pytest.mark.pipelines_mark
+class TestPipelinesStart(BaseTest):
+    def test_pipelines_start_schedules_operation_runs_without_upstream(self):
+        pipeline_run = PipelineRunFactory()
+        operation_runs = [OperationRunFactory(pipeline_run=pipeline_run) for _ in range(4)]
+        operation_runs[2].upstream_runs.set(operation_runs[:2])
+        operation_runs[3].upstream_runs.set([operation_runs[2]])
+
+        with patch('db.models.pipelines.OperationRun.start') as mock_fct:
+            pipelines_start(pipeline_run_id=pipeline_run.id)
+
+        assert mock_fct.call_count == 2
+        pipeline_run.refresh_from_db()
+        assert pipeline_run.last_status == PipelineStatuses.SCHEDULED
+        assert pipeline_run.n_running_operation_runs == 2
+        for operation_run in operation_runs:
+            operation_run.refresh_from_db()
+        assert [operation_run.last_status for operation_run in operation_runs] == [
+            OperationStatuses.SCHEDULED,
+            OperationStatuses.SCHEDULED,
+            OperationStatuses.CREATED,
+            OperationStatuses.CREATED]
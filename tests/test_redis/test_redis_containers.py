@@ -0,0 +1,60 @@
+import uuid
+
+import pytest
+
+from db.redis.containers import RedisJobContainers
+from factories.factory_experiments import ExperimentJobFactory
+from tests.utils import BaseTest
+
+
+@pytest.mark.redis_mark
+class TestRedisJobContainers(BaseTest):
+    def test_monitor_containers(self):
+        job = ExperimentJobFactory()
+        container_id = uuid.uuid4().hex
+        RedisJobContainers.monitor(container_id=container_id, job_uuid=job.uuid.hex)
+        assert RedisJobContainers.get_containers() == [container_id]
+        assert RedisJobContainers.get_job(container_id) == (job.uuid.hex,
+                                                            job.experiment.uuid.hex)
+
+    def test_monitor_unknown_job(self):
+        RedisJobContainers.monitor(container_id=uuid.uuid4().hex, job_uuid=uuid.uuid4().hex)
+        assert RedisJobContainers.get_containers() == []
+
+    def test_get_jobs(self):
+        job1 = ExperimentJobFactory()
+        job2 = ExperimentJobFactory()
+        container_ids = [uuid.uuid4().hex for _ in range(3)]
+        RedisJobContainers.monitor(container_id=container_ids[0], job_uuid=job1.uuid.hex)
+        RedisJobContainers.monitor(container_id=container_ids[1], job_uuid=job2.uuid.hex)
+
+        assert RedisJobContainers.get_jobs([]) == {}
+        assert RedisJobContainers.get_jobs(container_ids) == {
+            container_ids[0]: (job1.uuid.hex, job1.experiment.uuid.hex),
+            container_ids[1]: (job2.uuid.hex, job2.experiment.uuid.hex),
+            container_ids[2]: (None, None),
+        }
+        assert RedisJobContainers.get_experiments_for_jobs(
+            [job1.uuid.hex, job2.uuid.hex]) == [job1.experiment.uuid.hex,
+                                                 job2.experiment.uuid.hex]
+
+    def test_remove_job(self):
+        job = ExperimentJobFactory()
+        container_ids = [uuid.uuid4().hex for _ in range(2)]
+        for container_id in container_ids:
+            RedisJobContainers.monitor(container_id=container_id, job_uuid=job.uuid.hex)
+        assert sorted(RedisJobContainers.get_containers()) == sorted(container_ids)
+
+        RedisJobContainers.remove_job(job.uuid.hex)
+        assert RedisJobContainers.get_containers() == []
+        assert RedisJobContainers.get_job(container_ids[0]) == (None, None)
+        assert RedisJobContainers.get_experiment_for_job(job.uuid.hex) is None
+
+    def test_remove_containers(self):
+        job = ExperimentJobFactory()
+        container_ids = [uuid.uuid4().hex for _ in range(3)]
+        for container_id in container_ids:
+            RedisJobContainers.monitor(container_id=container_id, job_uuid=job.uuid.hex)
+
+        RedisJobContainers.remove_containers(container_ids[:2])
+        assert RedisJobContainers.get_containers() == [container_ids[2]]
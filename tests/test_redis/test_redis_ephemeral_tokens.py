@@ -1,3 +1,5 @@
+import base64
+
 import pytest
 
 import conf
@@ -42,3 +44,19 @@ class TestRedisEphemeralTokens(BaseTest):
         assert token.salt is None
         assert token.ttl is None
         assert token.scope is None
+
+    def test_generate_header_tokens(self):
+        scope = RedisEphemeralTokens.get_scope(1, 'experiment', 1)
+        header_tokens = RedisEphemeralTokens.generate_header_tokens(scope=scope, count=3)
+        assert len(header_tokens) == 3
+        assert len(set(header_tokens)) == 3
+
+        for header_token in header_tokens:
+            token, key = base64.b64decode(header_token).decode('utf-8').split(
+                RedisEphemeralTokens.SEPARATOR)
+            ephemeral_token = RedisEphemeralTokens(key)
+            assert ephemeral_token.scope == scope
+            assert ephemeral_token.ttl == conf.get('TTL_EPHEMERAL_TOKEN')
+            assert RedisEphemeralTokens.create_header_token(ephemeral_token) == header_token
+            assert ephemeral_token.check_token(token) is True
+            assert ephemeral_token.get_state() is None
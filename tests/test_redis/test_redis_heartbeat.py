@@ -72,3 +72,23 @@ class TestRedisHeartBeat(BaseTest):
         RedisHeartBeat.build_ping(1)
         self.assertEqual(heartbeat.is_alive(), True)
         self.assertEqual(RedisHeartBeat.build_is_alive(1), True)
+
+    def test_get_dead(self):
+        assert RedisHeartBeat.get_dead_experiments([]) == []
+        assert RedisHeartBeat.get_dead_experiments([1, 2, 3]) == [1, 2, 3]
+        RedisHeartBeat.experiment_ping(2)
+        assert RedisHeartBeat.get_dead_experiments([1, 2, 3]) == [1, 3]
+
+        RedisHeartBeat.job_ping(1)
+        assert RedisHeartBeat.get_dead_jobs([1, 2, 3]) == [2, 3]
+
+        RedisHeartBeat.build_ping(3)
+        assert RedisHeartBeat.get_dead_builds([1, 2, 3]) == [1, 2]
+
+    def test_get_dead_in_chunks(self):
+        ids = list(range(1, 2 * RedisHeartBeat.MGET_CHUNK_SIZE + 10))
+        alive = ids[::7]
+        for _id in alive:
+            RedisHeartBeat.experiment_ping(_id)
+        assert RedisHeartBeat.get_dead_experiments(ids) == [
+            _id for _id in ids if _id not in set(alive)]
@@ -105,3 +105,35 @@ class TestRedisToStream(BaseTest):
         assert RedisToStream.is_monitored_experiment_logs(experiment_uuid) is True
         RedisToStream.remove_experiment_logs(experiment_uuid)
         assert RedisToStream.is_monitored_experiment_logs(experiment_uuid) is False
+
+    def test_batched_monitoring_checks(self):
+        job_uuids = [uuid.uuid4().hex for _ in range(3)]
+        experiment_uuids = [uuid.uuid4().hex for _ in range(3)]
+        assert RedisToStream.are_monitored_jobs_resources([]) == []
+        assert RedisToStream.are_monitored_jobs_resources(job_uuids) == [False, False, False]
+
+        RedisToStream.monitor_job_resources(job_uuids[1])
+        RedisToStream.monitor_experiment_resources(experiment_uuids[2])
+        assert RedisToStream.are_monitored_jobs_resources(job_uuids) == [False, True, False]
+        assert RedisToStream.are_monitored_experiments_resources(
+            experiment_uuids + [None]) == [False, False, True, False]
+
+    def test_set_latest_jobs_resources(self):
+        jobs = [{'uuid': uuid.uuid4().hex, 'name': 'master.0'},
+                {'uuid': uuid.uuid4().hex, 'name': 'worker.0'},
+                {'uuid': uuid.uuid4().hex, 'name': 'worker.1'}]
+        payloads = {
+            jobs[0]['uuid']: {'job_uuid': jobs[0]['uuid'], 'cpu_percentage': 0.6},
+            jobs[2]['uuid']: {'job_uuid': jobs[2]['uuid'], 'cpu_percentage': 0.2},
+        }
+        RedisToStream.set_latest_jobs_resources(payloads)
+
+        assert RedisToStream.get_latest_job_resources(
+            jobs[0]['uuid'], 'master.0', True) == dict(payloads[jobs[0]['uuid']],
+                                                       job_name='master.0')
+        assert RedisToStream.get_latest_job_resources(jobs[1]['uuid'], 'worker.0') is None
+        assert RedisToStream.get_latest_experiment_resources(jobs, as_json=True) == [
+            dict(payloads[jobs[0]['uuid']], job_name='master.0'),
+            dict(payloads[jobs[2]['uuid']], job_name='worker.1'),
+        ]
+        assert RedisToStream.get_latest_experiment_resources([], as_json=True) == []
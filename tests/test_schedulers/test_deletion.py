@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+import pytest
+
+from db.deletion import CascadeDeletion
+from db.models.bookmarks import Bookmark
+from db.models.experiment_groups import ExperimentGroup
+from db.models.experiments import Experiment, ExperimentMetric, ExperimentStatus
+from db.models.jobs import Job
+from db.models.projects import Project
+from event_manager.events.project import PROJECT_DELETED
+from factories.factory_experiment_groups import ExperimentGroupFactory
+from factories.factory_experiments import ExperimentFactory, ExperimentMetricFactory
+from factories.factory_jobs import JobFactory
+from factories.factory_projects import ProjectFactory
+from scheduler.tasks.deletion import delete_archived_project
+from tests.utils import BaseTest
+
+
+@pytest.mark.scheduler_mark
+class TestCascadeDeletion(BaseTest):
+    def setUp(self):
+        super().setUp()
+        with patch('scheduler.tasks.experiment_groups.experiments_group_create.apply_async'):
+            self.project = ProjectFactory()
+            self.experiment_group = ExperimentGroupFactory(project=self.project)
+        self.experiments = [ExperimentFactory(project=self.project) for _ in range(3)]
+        self.experiments.append(ExperimentFactory(project=self.project,
+                                                  experiment_group=self.experiment_group))
+        for experiment in self.experiments:
+            for _ in range(3):
+                ExperimentMetricFactory(experiment=experiment)
+        # A clone keeps the original experiment until it's deleted
+        self.experiments[1].original_experiment = self.experiments[0]
+        self.experiments[1].save(update_fields=['original_experiment'])
+        JobFactory(project=self.project)
+        Bookmark.objects.create(user=self.project.user, content_object=self.experiments[0])
+
+        # Another project is not deleted
+        self.other_experiment = ExperimentFactory()
+        ExperimentMetricFactory(experiment=self.other_experiment)
+        Bookmark.objects.create(user=self.project.user, content_object=self.other_experiment)
+
+    def assert_project_deleted(self):
+        assert Project.all.filter(id=self.project.id).exists() is False
+        assert ExperimentGroup.all.filter(project=self.project.id).exists() is False
+        assert list(Experiment.all.values_list('id', flat=True)) == [self.other_experiment.id]
+        assert set(ExperimentMetric.objects.values_list('experiment_id', flat=True)) == {
+            self.other_experiment.id}
+        assert set(ExperimentStatus.objects.values_list('experiment_id', flat=True)) == {
+            self.other_experiment.id}
+        assert Job.all.filter(project=self.project.id).exists() is False
+        assert [bookmark.object_id for bookmark in Bookmark.objects.all()] == [
+            self.other_experiment.id]
+
+    def test_delete_in_batches(self):
+        deletion = CascadeDeletion(instance=self.project, batch_size=2)
+        with patch.object(deletion, 'delete_batch', wraps=deletion.delete_batch) as delete_batch:
+            deleted = deletion.delete()
+
+        self.assert_project_deleted()
+        assert deleted['db.Project'] == 1
+        assert deleted['db.Experiment'] == 4
+        assert deleted['db.ExperimentMetric'] == 12
+        assert deletion.num_deleted == sum(deleted.values())
+        assert all(len(call[0][1]) <= 2 for call in delete_batch.call_args_list)
+
+    def test_delete_is_resumable(self):
+        deletion = CascadeDeletion(instance=self.project, batch_size=2)
+        delete_batch = deletion.delete_batch
+
+        def fail_on_experiments(model, pks):
+            if model is Experiment:
+                raise ValueError('Interrupted')
+            delete_batch(model, pks)
+
+        with patch.object(deletion, 'delete_batch', side_effect=fail_on_experiments):
+            with self.assertRaises(ValueError):
+                deletion.delete()
+        assert Project.all.filter(id=self.project.id).exists() is True
+
+        CascadeDeletion(instance=self.project, batch_size=2).delete()
+        self.assert_project_deleted()
+
+    def test_delete_archived_project(self):
+        self.project.archive()
+        with patch('scheduler.tasks.storage.stores_schedule_paths_deletion.apply_async') as paths:
+            with patch('scheduler.tasks.storage.stores_schedule_outputs_deletion.'
+                       'apply_async') as outputs:
+                with patch('auditor.record') as auditor_record:
+                    with patch('libs.paths.projects.delete_path') as delete_repos:
+                        delete_archived_project(project_id=self.project.id)
+
+        self.assert_project_deleted()
+        assert delete_repos.call_count == 1
+        assert outputs.call_count == 0
+        assert paths.call_count == 1
+        assert paths.call_args[0][1] == {
+            'outputs_paths': [(None, self.project.subpath)],
+            'logs_paths': [(None, self.project.subpath)],
+        }
+        assert auditor_record.call_count == 1
+        assert auditor_record.call_args[1]['event_type'] == PROJECT_DELETED
+        assert auditor_record.call_args[1]['num_deleted'] > 1
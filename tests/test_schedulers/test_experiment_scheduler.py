@@ -2,9 +2,18 @@ import uuid
 
 import pytest
 
+from constants.jobs import JobLifeCycle
 from db.models.experiment_jobs import ExperimentJob
+from db.models.job_resources import JobResources
 from factories.factory_experiments import ExperimentFactory
-from scheduler.experiment_scheduler import create_job, get_spawner_class, set_job_definition
+from scheduler.experiment_scheduler import (
+    build_job,
+    create_job,
+    create_jobs,
+    get_spawner_class,
+    set_job_definition,
+    set_jobs_definitions
+)
 from scheduler.spawners.experiment_spawner import ExperimentSpawner
 from scheduler.spawners.horovod_spawner import HorovodSpawner
 from scheduler.spawners.mpi_job_spawner import MPIJobSpawner
@@ -14,6 +23,7 @@ from scheduler.spawners.pytorch_spawner import PytorchSpawner
 from scheduler.spawners.tensorflow_spawner import TensorflowSpawner
 from scheduler.spawners.tf_job_spawner import TFJobSpawner
 from schemas.experiments import ExperimentBackend, ExperimentFramework
+from schemas.pod_resources import PodResourcesConfig
 from schemas.tasks import TaskType
 from tests.utils import BaseTest
 
@@ -76,6 +86,48 @@ class TestExperimentScheduler(BaseTest):
         job = ExperimentJob.objects.last()
         assert job.definition == definition
 
+    def test_create_jobs(self):
+        experiment = ExperimentFactory()
+        resources = PodResourcesConfig.from_dict({'cpu': {'requests': 1, 'limits': 2}})
+        jobs = [build_job(job_uuid=uuid.uuid4().hex,
+                          experiment=experiment,
+                          resources=resources)]
+        jobs += [build_job(job_uuid=uuid.uuid4().hex,
+                           experiment=experiment,
+                           role=TaskType.WORKER,
+                           sequence=i,
+                           node_selector={'polyaxon': 'selector'})
+                 for i in range(3)]
+
+        create_jobs(jobs)
+
+        assert ExperimentJob.objects.count() == 4
+        assert JobResources.objects.count() == 1
+        master = ExperimentJob.objects.get(role=TaskType.MASTER)
+        assert master.resources.cpu == {'requests': 1, 'limits': 2}
+        assert master.last_status == JobLifeCycle.CREATED
+        workers = ExperimentJob.objects.filter(role=TaskType.WORKER).order_by('sequence')
+        assert [job.sequence for job in workers] == [0, 1, 2]
+        for job in workers:
+            assert job.resources is None
+            assert job.node_selector == {'polyaxon': 'selector'}
+            assert job.last_status == JobLifeCycle.CREATED
+            assert job.statuses.count() == 1
+
+    def test_set_jobs_definitions(self):
+        experiment = ExperimentFactory()
+        job_uuids = [uuid.uuid4().hex for _ in range(3)]
+        for job_uuid in job_uuids:
+            create_job(job_uuid=job_uuid, experiment=experiment)
+
+        responses = [{'pod': {'metadata': {'labels': {'job_uuid': job_uuid}},
+                              'spec': {'idx': i}}}
+                     for i, job_uuid in enumerate(job_uuids)]
+        set_jobs_definitions(responses=responses)
+        for i, job_uuid in enumerate(job_uuids):
+            job = ExperimentJob.objects.get(uuid=job_uuid)
+            assert job.definition == responses[i]
+
     def test_get_spawner_class(self):
         class DummySpec(object):
             def __init__(self, framework=None, backend=None, is_distributed=False):
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+
+from django.test import override_settings
+
+from polyaxon_k8s.exceptions import PolyaxonK8SError
+from scheduler.spawners.experiment_spawner import ExperimentSpawner
+from schemas.tasks import TaskType
+from tests.utils import BaseTest
+
+
+@pytest.mark.spawner_mark
+class TestExperimentSpawnerMultiJobs(BaseTest):
+    N_PODS = 5
+
+    def setUp(self):
+        super().setUp()
+        with patch.object(ExperimentSpawner, '__init__', return_value=None):
+            self.spawner = ExperimentSpawner()
+        self.spawner.token_scope = None
+        self.jobs_kwargs = [{'task_type': TaskType.WORKER, 'task_idx': i, 'add_service': True}
+                            for i in range(self.N_PODS)]
+
+    def create_multi_jobs(self, create_job):
+        with patch.object(self.spawner, '_get_multi_jobs_kwargs',
+                          return_value=self.jobs_kwargs):
+            with patch.object(self.spawner, '_create_job', side_effect=create_job):
+                with patch.object(self.spawner, 'delete_multi_jobs') as delete_multi_jobs:
+                    try:
+                        return self.spawner.create_multi_jobs(task_type=TaskType.WORKER,
+                                                              add_service=True)
+                    finally:
+                        self.delete_multi_jobs_calls = delete_multi_jobs.call_args_list
+
+    def test_create_multi_jobs(self):
+        def create_job(task_type, task_idx, add_service):
+            return {'pod': '{}-{}'.format(task_type, task_idx)}
+
+        for concurrency in [1, 3]:
+            with override_settings(SPAWNER_CONCURRENCY=concurrency):
+                resp = self.create_multi_jobs(create_job)
+            assert resp == [{'pod': '{}-{}'.format(TaskType.WORKER, i)}
+                            for i in range(self.N_PODS)]
+            assert self.delete_multi_jobs_calls == []
+
+    def test_create_multi_jobs_rollback(self):
+        def create_job(task_type, task_idx, add_service):
+            if task_idx == 2:
+                raise PolyaxonK8SError('Could not create pod')
+            return {'pod': '{}-{}'.format(task_type, task_idx)}
+
+        for concurrency in [1, 3]:
+            with override_settings(SPAWNER_CONCURRENCY=concurrency):
+                with self.assertRaises(PolyaxonK8SError):
+                    self.create_multi_jobs(create_job)
+            assert len(self.delete_multi_jobs_calls) == 1
+            assert self.delete_multi_jobs_calls[0][1] == {'task_type': TaskType.WORKER,
+                                                          'has_service': True}
+
+    def test_ephemeral_tokens_are_generated_in_batch(self):
+        assert self.spawner.get_ephemeral_tokens(count=3) == [None, None, None]
+
+        self.spawner.token_scope = ['user:1', 'experiment:1']
+        with patch('db.redis.ephemeral_tokens.RedisEphemeralTokens.'
+                   'generate_header_tokens') as generate_header_tokens:
+            generate_header_tokens.return_value = ['token1', 'token2', 'token3']
+            assert self.spawner.get_ephemeral_tokens(count=3) == ['token1', 'token2', 'token3']
+        generate_header_tokens.assert_called_once_with(scope=self.spawner.token_scope, count=3)
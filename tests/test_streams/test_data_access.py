@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from django.test import SimpleTestCase
+
+from streams.constants import DB_EXECUTOR_WORKERS
+from streams.data_access import run_sync
+
+
+def blocking_query(value, delay=0.02):
+    time.sleep(delay)
+    return value
+
+
+@pytest.mark.streams_mark
+class TestDataAccess(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        super().tearDown()
+
+    def test_run_sync_returns_results(self):
+        assert self.loop.run_until_complete(run_sync(blocking_query, 1, delay=0)) == 1
+
+    def test_run_sync_propagates_exceptions(self):
+        def failing_query():
+            raise ValueError('failed')
+
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(run_sync(failing_query))
+
+    def test_queries_run_concurrently_without_blocking_the_loop(self):
+        num_sockets = 3 * DB_EXECUTOR_WORKERS
+        # Every query of a batch waits for the other queries of the executor's workers,
+        # and for the event loop to run a coroutine, while it is running.
+        barrier = threading.Barrier(DB_EXECUTOR_WORKERS, timeout=5)
+        loop_ran = threading.Event()
+        calls = []
+
+        def query(idx):
+            calls.append(idx)
+            barrier.wait()
+            assert loop_ran.wait(timeout=5)
+            return idx
+
+        async def mark_loop_ran():
+            # Only runs while the queries are blocked if they do not block the loop
+            while len(calls) < DB_EXECUTOR_WORKERS:
+                await asyncio.sleep(0.01)
+            loop_ran.set()
+
+        async def run():
+            sockets = asyncio.gather(*[run_sync(query, idx) for idx in range(num_sockets)])
+            await mark_loop_ran()
+            return await sockets
+
+        assert self.loop.run_until_complete(run()) == list(range(num_sockets))
+        assert sorted(calls) == list(range(num_sockets))
+        assert barrier.broken is False
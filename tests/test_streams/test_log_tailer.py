@@ -0,0 +1,223 @@
+import asyncio
+import json
+
+from unittest.mock import patch
+
+import pytest
+
+from django.test import SimpleTestCase
+
+from logs_handlers.log_queries.base import process_log_line
+from streams.log_tailer import LogTailer
+from streams.resources.logs import log_job_pod
+from streams.socket_manager import SocketManager
+
+
+class FakeContent(object):
+    def __init__(self):
+        self.chunks = asyncio.Queue()
+
+    async def readany(self):
+        return await self.chunks.get()
+
+
+class FakeResponse(object):
+    def __init__(self):
+        self.content = FakeContent()
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+
+class FakeK8SApi(object):
+    def __init__(self, error=None):
+        self.error = error
+        self.responses = []
+
+    async def read_namespaced_pod_log(self, *args, **kwargs):
+        if self.error:
+            raise self.error
+        response = FakeResponse()
+        self.responses.append(response)
+        return response
+
+
+class FakeWebSocket(object):
+    def __init__(self):
+        self._connection_lost = False
+        self.messages = []
+
+    async def send(self, message):
+        self.messages.append(json.loads(message))
+
+
+class FakeApp(object):
+    def __init__(self):
+        self.log_tailers = {}
+
+
+class FakeRequest(object):
+    def __init__(self):
+        self.app = FakeApp()
+
+
+def get_log_lines(ws):
+    return [log_line for message in ws.messages for log_line in message.get('log_lines') or []]
+
+
+def get_expected_log_lines(log_lines, task_type=None, task_idx=None):
+    return [process_log_line(log_line=log_line, task_type=task_type, task_idx=task_idx)
+            for log_line in log_lines]
+
+
+@pytest.mark.streams_mark
+class TestLogTailer(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop_errors = []
+        self.loop.set_exception_handler(lambda loop, context: self.loop_errors.append(context))
+        self.registry = {}
+
+    def tearDown(self):
+        self.loop.close()
+        super().tearDown()
+
+    def get_tailer(self, k8s_api):
+        return LogTailer.get_or_create(registry=self.registry,
+                                       k8s_api=k8s_api,
+                                       pod_id='pod',
+                                       namespace='namespace',
+                                       container='container')
+
+    @staticmethod
+    def get_ws_manager():
+        ws = FakeWebSocket()
+        ws_manager = SocketManager()
+        ws_manager.add_socket(ws)
+        return ws, ws_manager
+
+    def run(self, coroutine):  # pylint:disable=arguments-differ
+        return self.loop.run_until_complete(coroutine)
+
+    def test_broadcasts_to_all_subscribers(self):
+        k8s_api = FakeK8SApi()
+        ws1, ws_manager1 = self.get_ws_manager()
+        ws2, ws_manager2 = self.get_ws_manager()
+
+        async def run():
+            tailer = self.get_tailer(k8s_api)
+            tailer.subscribe(ws_manager=ws_manager1, task_type='worker', task_idx=0)
+            assert self.get_tailer(k8s_api) is tailer
+            tailer.subscribe(ws_manager=ws_manager2, task_type='worker', task_idx=0)
+            await asyncio.sleep(0)
+            response = k8s_api.responses[0]
+            await response.content.chunks.put(b'line 1\nline 2\npar')
+            await response.content.chunks.put(b'tial\n')
+            await response.content.chunks.put(b'')
+            await asyncio.wait([tailer.task])
+            return tailer
+
+        tailer = self.run(run())
+        # A single log stream is read for both subscribers
+        assert len(k8s_api.responses) == 1
+        assert k8s_api.responses[0].released is True
+        expected = get_expected_log_lines(['line 1', 'line 2', 'partial'],
+                                          task_type='worker',
+                                          task_idx=0)
+        assert get_log_lines(ws1) == expected
+        assert get_log_lines(ws2) == expected
+        assert tailer.error is None
+        assert self.registry == {}
+
+    def test_replays_the_backlog_to_late_subscribers(self):
+        k8s_api = FakeK8SApi()
+        ws1, ws_manager1 = self.get_ws_manager()
+        ws2, ws_manager2 = self.get_ws_manager()
+
+        async def run():
+            tailer = self.get_tailer(k8s_api)
+            tailer.subscribe(ws_manager=ws_manager1)
+            await tailer.replay(ws=ws1)
+            await asyncio.sleep(0)
+            response = k8s_api.responses[0]
+            await response.content.chunks.put(b'line 1\nline 2\n')
+            await asyncio.sleep(0.2)
+
+            tailer.subscribe(ws_manager=ws_manager2)
+            await tailer.replay(ws=ws2)
+            await response.content.chunks.put(b'line 3\n')
+            await asyncio.sleep(0.2)
+            tailer.stop()
+            await asyncio.wait([tailer.task])
+
+        self.run(run())
+        assert get_log_lines(ws1) == get_expected_log_lines(['line 1', 'line 2', 'line 3'])
+        assert get_log_lines(ws2) == get_expected_log_lines(['line 1', 'line 2', 'line 3'])
+
+    def test_backlog_is_bounded(self):
+        k8s_api = FakeK8SApi()
+        ws, ws_manager = self.get_ws_manager()
+
+        async def run():
+            tailer = self.get_tailer(k8s_api)
+            tailer.subscribe(ws_manager=ws_manager)
+            await tailer.broadcast([b'line 1', b'line 2', b'line 3'])
+            tailer.stop()
+            await asyncio.wait([tailer.task])
+            return tailer
+
+        with patch('streams.log_tailer.LOG_BACKLOG_LINES', 2):
+            tailer = self.run(run())
+        assert list(tailer.backlog) == ['line 2', 'line 3']
+        assert get_log_lines(ws) == get_expected_log_lines(['line 1', 'line 2', 'line 3'])
+
+    def test_unsubscribe_stops_the_tailer(self):
+        k8s_api = FakeK8SApi()
+        _, ws_manager1 = self.get_ws_manager()
+        _, ws_manager2 = self.get_ws_manager()
+
+        async def run():
+            tailer = self.get_tailer(k8s_api)
+            tailer.subscribe(ws_manager=ws_manager1)
+            tailer.subscribe(ws_manager=ws_manager2)
+            await asyncio.sleep(0)
+
+            tailer.unsubscribe(ws_manager=ws_manager1)
+            await asyncio.sleep(0)
+            assert tailer.is_done is False
+            assert self.registry == {tailer.key: tailer}
+
+            tailer.unsubscribe(ws_manager=ws_manager2)
+            await asyncio.wait([tailer.task])
+            return tailer
+
+        tailer = self.run(run())
+        assert tailer.task.cancelled() is True
+        assert tailer.error is None
+        assert k8s_api.responses[0].released is True
+        assert self.registry == {}
+        # A new viewer gets a new tailer
+        assert self.get_tailer(k8s_api) is not tailer
+
+    def test_errors_are_logged_and_notified(self):
+        k8s_api = FakeK8SApi(error=ValueError('Pod not found'))
+        request = FakeRequest()
+        ws, ws_manager = self.get_ws_manager()
+
+        with patch('streams.log_tailer.logger.warning') as mock_warning:
+            self.run(log_job_pod(request=request,
+                                 k8s_api=k8s_api,
+                                 ws=ws,
+                                 ws_manager=ws_manager,
+                                 pod_id='pod',
+                                 container='container',
+                                 namespace='namespace'))
+
+        assert mock_warning.call_count == 1
+        assert ws.messages[-1]['status'] == 'error'
+        assert request.app.log_tailers == {}
+        # The exception of the tailer's task was retrieved
+        assert self.loop_errors == []
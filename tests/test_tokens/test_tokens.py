@@ -1,12 +1,23 @@
+import json
+
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
+import redis
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
 
 import conf
 
 from db.models.tokens import Token
+from db.redis.tokens_cache import RedisTokensCache
+from factories.factory_users import UserFactory
+from scopes.authentication.token import TokenAuthentication
+from scopes.authentication.tokens_cache import tokens_cache
 from tests.utils import BaseTest
 
 
@@ -28,3 +39,113 @@ class TokenTest(BaseTest):
 
         token = Token(scopes=['project:read', 'project:write'])
         assert token.scopes == ['project:read', 'project:write']
+
+
+@pytest.mark.api_tokens_mark
+class TokensCacheTest(BaseTest):
+    def setUp(self):
+        super().setUp()
+        tokens_cache.clear()
+        self.user = UserFactory()
+        self.token = Token.objects.get(user=self.user)
+        self.authentication = TokenAuthentication()
+
+    def test_authenticate_credentials_uses_the_cache(self):
+        assert tokens_cache.get(self.token.key) is None
+        user, token = self.authentication.authenticate_credentials(self.token.key)
+        assert user == self.user
+        assert token == self.token
+        assert tokens_cache.get(self.token.key) == self.token
+        assert RedisTokensCache.get(self.token.key) is not None
+
+        with CaptureQueriesContext(connection) as queries:
+            user, token = self.authentication.authenticate_credentials(self.token.key)
+        assert len(queries) == 0
+        assert user == self.user
+        assert token == self.token
+
+        # The redis cache is used if the local cache is empty
+        tokens_cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            user, _ = self.authentication.authenticate_credentials(self.token.key)
+        assert len(queries) == 0
+        assert user == self.user
+
+    def test_refresh_token_invalidates_the_cache(self):
+        old_key = self.token.key
+        self.authentication.authenticate_credentials(old_key)
+        self.token.refresh()
+
+        assert tokens_cache.get(old_key) is None
+        assert RedisTokensCache.get(old_key) is None
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(old_key)
+        _, token = self.authentication.authenticate_credentials(self.token.key)
+        assert token == self.token
+
+    def test_delete_token_invalidates_the_cache(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        self.token.delete()
+        assert tokens_cache.get(self.token.key) is None
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_deactivate_user_invalidates_the_cache(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+        assert tokens_cache.get(self.token.key) is None
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_expired_token_invalidates_the_cache(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        Token.objects.filter(id=self.token.id).update(
+            started_at=timezone.now() - timedelta(days=conf.get('TTL_TOKEN') + 10))
+        # The update does not send signals, the cached token is still valid until it expires
+        tokens_cache.clear()
+        RedisTokensCache.delete([self.token.key])
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+        assert tokens_cache.get(self.token.key) is None
+
+    def test_cache_stats(self):
+        with patch('stats.incr') as mock_incr:
+            self.authentication.authenticate_credentials(self.token.key)
+            self.authentication.authenticate_credentials(self.token.key)
+        keys = [call[0][0] for call in mock_incr.call_args_list]
+        assert keys == ['tokens_cache.local.miss',
+                        'tokens_cache.redis.miss',
+                        'tokens_cache.local.hit']
+
+    def test_cached_tokens_are_json(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        payload = json.loads(RedisTokensCache.get(self.token.key).decode())
+        assert payload['token']['key'] == self.token.key
+        assert payload['token']['user_id'] == self.user.id
+        assert payload['user']['username'] == self.user.username
+        assert 'password' not in payload['user']
+
+        tokens_cache.clear()
+        token = tokens_cache.get(self.token.key)
+        assert token == self.token
+        assert token.user == self.user
+        assert token.started_at == self.token.started_at.replace(
+            microsecond=self.token.started_at.microsecond // 1000 * 1000)
+        # The fields that are not cached are deferred
+        assert token.user.password == self.user.password
+
+    def test_invalid_cached_tokens_are_ignored(self):
+        RedisTokensCache.set(self.token.key, b'invalid', ttl=60)
+        assert tokens_cache.get(self.token.key) is None
+        user, _ = self.authentication.authenticate_credentials(self.token.key)
+        assert user == self.user
+
+    def test_invalidate_without_redis(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        with patch.object(RedisTokensCache, 'delete', side_effect=redis.RedisError):
+            self.user.is_active = False
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            with patch.object(RedisTokensCache, 'get', side_effect=redis.RedisError):
+                self.authentication.authenticate_credentials(self.token.key)
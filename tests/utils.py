@@ -5,6 +5,7 @@ import tempfile
 import uuid
 
 from collections import Mapping
+from contextlib import contextmanager
 from urllib.parse import urlparse
 
 import redis
@@ -17,8 +18,10 @@ from rest_framework import status
 
 from django.conf import settings
 from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.test import Client, TestCase
 from django.test.client import FakePayload
+from django.test.utils import CaptureQueriesContext
 
 import activitylogs
 import auditor
@@ -274,6 +277,17 @@ class BaseTest(TestCase):
 
         current_app.send_task = send_task
 
+    @contextmanager
+    def assert_max_queries(self, num, using=DEFAULT_DB_ALIAS):
+        """Similar to `assertNumQueries` but checks a maximum number of queries."""
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+        queries = ['{}. {}'.format(i, query['sql'])
+                   for i, query in enumerate(context.captured_queries, start=1)]
+        self.assertLessEqual(len(context), num, '{} queries executed, at most {} expected\n'
+                                                'Captured queries were:\n{}'.format(
+                                                    len(context), num, '\n'.join(queries)))
+
     def disable_experiment_groups_runner(self):
         patcher = patch('scheduler.tasks.experiment_groups.experiments_group_create.apply_async')
         patcher.start()